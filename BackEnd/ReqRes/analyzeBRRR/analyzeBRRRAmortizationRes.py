@@ -0,0 +1,22 @@
+from typing import List
+
+from pydantic import BaseModel
+
+
+class AmortizationRow(BaseModel):
+    """One monthly payment; `balance` is what's owed after it."""
+    month: int
+    payment: float
+    principal: float
+    interest: float
+    balance: float
+
+
+class analyzeBRRRAmortizationRes(BaseModel):
+    loan_amount: float
+    interest_rate: float
+    loan_term_years: int
+    monthly_payment: float
+    total_interest: float
+    total_paid: float
+    schedule: List[AmortizationRow]
@@ -0,0 +1,29 @@
+"""Request model for bulk BRRRR screening."""
+
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+from ReqRes.analyzeBRRR.analyzeBRRRReq import analyzeBRRRReq
+
+
+class analyzeBRRRBatchReq(BaseModel):
+    """Many BRRRR deals evaluated in one vectorized pass.
+
+    Send exactly one of:
+    - `deals`: a list of regular `/analyze/brrr` payloads, or
+    - `columns`: columnar arrays keyed by field name or alias
+      (e.g. `{"arv_in_thousands": [...], "purchasePrice": [...]}`), which
+      skips per-row model parsing and is the fastest option for large lists.
+    """
+
+    deals: Optional[List[analyzeBRRRReq]] = None
+    columns: Optional[Dict[str, List[float]]] = Field(
+        None, description="Columnar inputs; omitted optional columns use the single-deal defaults"
+    )
+
+    @model_validator(mode="after")
+    def _exactly_one_source(self):
+        if (self.deals is None) == (self.columns is None):
+            raise ValueError("Provide exactly one of `deals` or `columns`.")
+        return self
@@ -0,0 +1,20 @@
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+class BatchRowError(BaseModel):
+    """Validation failure for one input row (`index` is 0-based)."""
+    index: int
+    detail: str
+
+
+class analyzeBRRRBatchRes(BaseModel):
+    """Columnar BRRRR metrics: `metrics[name][i]` belongs to input row `i`.
+
+    Rows listed in `errors` have `None` for every metric.
+    """
+    count: int
+    valid_count: int
+    metrics: Dict[str, List[Optional[float]]]
+    errors: List[BatchRowError]
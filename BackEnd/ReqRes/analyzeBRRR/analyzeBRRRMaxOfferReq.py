@@ -0,0 +1,35 @@
+"""Request models for the maximum-offer solver."""
+
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+from ReqRes.analyzeBRRR.analyzeBRRRReq import analyzeBRRRReq
+
+
+class OfferTarget(BaseModel):
+    """A lower bound on one result metric, e.g. `{"metric": "dscr", "min": 1.25}`.
+    Percent metrics (`roi`, `cash_on_cash`) are in percent. Only metrics that
+    don't grow with the purchase price can be targets."""
+
+    metric: str
+    min: float
+
+
+class analyzeBRRRMaxOfferReq(BaseModel):
+    """Send exactly one of `deal` or `deals`. The deal's own purchase price
+    is ignored; it is what gets solved for."""
+
+    deal: Optional[analyzeBRRRReq] = None
+    deals: Optional[List[analyzeBRRRReq]] = Field(None, min_length=1)
+    targets: List[OfferTarget] = Field(..., min_length=1)
+    max_price_in_thousands: Optional[float] = Field(
+        None, gt=0, description="Upper search bound (default: the deal's ARV)"
+    )
+    tolerance_in_thousands: float = Field(0.01, gt=0, le=10, description="Price resolution; offers round down to it")
+
+    @model_validator(mode="after")
+    def _exactly_one_source(self):
+        if (self.deal is None) == (self.deals is None):
+            raise ValueError("Provide exactly one of `deal` or `deals`.")
+        return self
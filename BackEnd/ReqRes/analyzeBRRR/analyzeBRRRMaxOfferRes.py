@@ -0,0 +1,26 @@
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+class MaxOfferResult(BaseModel):
+    """Solver outcome for input deal `index`.
+
+    `max_purchase_price` is in dollars (ready for `/send-offer`). `binding`
+    lists the targets that fail just above the offer, or - when
+    `feasible` is false - the ones no price can satisfy. `capped` means the
+    targets still hold at the upper bound. `metrics` are evaluated at the
+    offer price.
+    """
+    index: int
+    feasible: bool
+    capped: bool
+    max_purchase_price_in_thousands: Optional[float] = None
+    max_purchase_price: Optional[float] = None
+    binding: List[str]
+    metrics: Optional[Dict[str, float]] = None
+    detail: Optional[str] = None
+
+
+class analyzeBRRRMaxOfferRes(BaseModel):
+    results: List[MaxOfferResult]
@@ -0,0 +1,70 @@
+"""Request models for Monte Carlo deal simulation."""
+
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from ReqRes.analyzeBRRR.analyzeBRRRReq import analyzeBRRRReq
+
+# Per deal: what one inline simulation handles in well under a second.
+MAX_DRAWS = 200_000
+# Draws x deals per request, checked by `monte_carlo.run` (like the
+# sensitivity grid's `vector_calc.MAX_GRID_POINTS`).
+MAX_TOTAL_DRAWS = 2_000_000
+
+
+class Distribution(BaseModel):
+    """Sampling distribution for one uncertain input.
+
+    - `normal`: `mean`, `sd`
+    - `uniform`: `low`, `high`
+    - `triangular`: `low`, `mode`, `high`
+    """
+
+    kind: Literal["normal", "uniform", "triangular"]
+    mean: float = 0.0
+    sd: float = Field(0.0, ge=0)
+    low: Optional[float] = None
+    mode: Optional[float] = None
+    high: Optional[float] = None
+
+    @model_validator(mode="after")
+    def _params_for_kind(self):
+        if self.kind == "uniform" and (self.low is None or self.high is None or self.low > self.high):
+            raise ValueError("uniform needs `low` <= `high`.")
+        if self.kind == "triangular" and (
+            None in (self.low, self.mode, self.high) or not self.low <= self.mode <= self.high
+        ):
+            raise ValueError("triangular needs `low` <= `mode` <= `high`.")
+        return self
+
+
+class BRRRMonteCarloAssumptions(BaseModel):
+    """Which inputs vary. Unset inputs stay at the deal's value."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    arv_pct: Optional[Distribution] = Field(None, description="% change applied to ARV")
+    rehab_overrun_pct: Optional[Distribution] = Field(None, description="% overrun applied to rehab cost")
+    months_delta: Optional[Distribution] = Field(None, description="Months added to months until refi (min 1)")
+    rent_pct: Optional[Distribution] = Field(None, description="% change applied to rent")
+    interest_rate_delta: Optional[Distribution] = Field(None, description="Percentage points added to the refi rate")
+
+
+class analyzeBRRRMonteCarloReq(BaseModel):
+    """Send exactly one of `deal` or `deals`. With `parallel`, multiple deals
+    fan out across a process pool; results are identical either way.
+    `draws` times the number of deals may not exceed `MAX_TOTAL_DRAWS`."""
+
+    deal: Optional[analyzeBRRRReq] = None
+    deals: Optional[List[analyzeBRRRReq]] = Field(None, min_length=1, max_length=200)
+    assumptions: BRRRMonteCarloAssumptions = Field(default_factory=BRRRMonteCarloAssumptions)
+    draws: int = Field(10_000, ge=1, le=MAX_DRAWS)
+    seed: Optional[int] = Field(None, ge=0, description="Omit for a random seed (echoed in the response)")
+    parallel: bool = False
+
+    @model_validator(mode="after")
+    def _exactly_one_source(self):
+        if (self.deal is None) == (self.deals is None):
+            raise ValueError("Provide exactly one of `deal` or `deals`.")
+        return self
@@ -0,0 +1,31 @@
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+class MetricDistribution(BaseModel):
+    mean: float
+    std: float
+    percentiles: Dict[str, float]
+
+
+class MonteCarloResult(BaseModel):
+    """Simulation summary for one deal.
+
+    Draws that fail input validation (or can't be evaluated) are excluded;
+    probabilities are shares of `valid_draws`. For BRRRR, `roi` and
+    `cash_on_cash` summarize only finite returns: draws that leave no cash
+    in the deal are counted in `share_infinite_return` instead.
+    """
+    draws: int
+    valid_draws: int
+    metrics: Dict[str, Optional[MetricDistribution]]
+    prob_negative_net_profit: float
+    prob_negative_cash_flow: Optional[float] = None
+    share_infinite_return: Optional[float] = None
+
+
+class analyzeBRRRMonteCarloRes(BaseModel):
+    """`results[i]` belongs to the i-th deal; `seed` reproduces the run."""
+    seed: int
+    results: List[MonteCarloResult]
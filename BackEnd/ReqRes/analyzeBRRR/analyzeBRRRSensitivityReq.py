@@ -0,0 +1,39 @@
+"""Request model for BRRRR sensitivity grids."""
+
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+from ReqRes.analyzeBRRR.analyzeBRRRReq import analyzeBRRRReq
+
+# Same cap as `vector_calc.MAX_GRID_POINTS`: no single axis may exceed the
+# whole grid budget.
+MAX_AXIS_STEPS = 250_000
+
+
+class SensitivityAxis(BaseModel):
+    """One swept input. Send either explicit `values` or `start`/`stop`/`steps`
+    (inclusive, evenly spaced)."""
+
+    field: str = Field(..., description="`analyzeBRRRReq` field name or alias, e.g. `arv_in_thousands` or `interestRate`")
+    values: Optional[List[float]] = Field(None, min_length=1, max_length=MAX_AXIS_STEPS)
+    start: Optional[float] = None
+    stop: Optional[float] = None
+    steps: Optional[int] = Field(None, ge=1, le=MAX_AXIS_STEPS)
+
+    @model_validator(mode="after")
+    def _values_or_range(self):
+        has_range = None not in (self.start, self.stop, self.steps)
+        if (self.values is None) == (not has_range):
+            raise ValueError("Provide either `values` or all of `start`, `stop` and `steps`.")
+        return self
+
+
+class analyzeBRRRSensitivityReq(BaseModel):
+    """A single BRRRR deal evaluated over the cartesian grid of 1-3 axes."""
+
+    deal: analyzeBRRRReq
+    axes: List[SensitivityAxis] = Field(..., min_length=1, max_length=3)
+    metrics: Optional[List[str]] = Field(
+        None, description="Subset of metrics to return (default: all headline metrics)"
+    )
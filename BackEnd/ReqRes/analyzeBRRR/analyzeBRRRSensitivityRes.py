@@ -0,0 +1,25 @@
+from typing import Any, Dict, List
+
+from pydantic import BaseModel
+
+from ReqRes.analyzeBRRR.analyzeBRRRBatchRes import BatchRowError
+
+
+class SensitivityAxisRes(BaseModel):
+    field: str
+    values: List[float]
+
+
+class analyzeBRRRSensitivityRes(BaseModel):
+    """Metric grids: `metrics[name][i][j][k]` is the value at
+    `axes[0].values[i]`, `axes[1].values[j]`, `axes[2].values[k]`.
+
+    `errors[].index` is the row-major (C-order) flat index of the grid point;
+    invalid points are `None` in every grid.
+    """
+    axes: List[SensitivityAxisRes]
+    shape: List[int]
+    count: int
+    valid_count: int
+    metrics: Dict[str, List[Any]]
+    errors: List[BatchRowError]
@@ -0,0 +1,27 @@
+"""Request model for bulk Flip screening."""
+
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+from ReqRes.analyzeFlip.analyzeFlipReq import analyzeFlipReq
+
+
+class analyzeFlipBatchReq(BaseModel):
+    """Many Flip deals evaluated in one vectorized pass.
+
+    Same shape as `analyzeBRRRBatchReq`: send exactly one of `deals` (a list
+    of `/analyze/flip` payloads) or `columns` (arrays keyed by field name or
+    alias, e.g. `{"salePrice": [...], "holdingTime": [...]}`).
+    """
+
+    deals: Optional[List[analyzeFlipReq]] = None
+    columns: Optional[Dict[str, List[float]]] = Field(
+        None, description="Columnar inputs; omitted optional columns use the single-deal defaults"
+    )
+
+    @model_validator(mode="after")
+    def _exactly_one_source(self):
+        if (self.deals is None) == (self.columns is None):
+            raise ValueError("Provide exactly one of `deals` or `columns`.")
+        return self
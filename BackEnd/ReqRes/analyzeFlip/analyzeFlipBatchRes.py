@@ -0,0 +1,18 @@
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+from ReqRes.analyzeBRRR.analyzeBRRRBatchRes import BatchRowError
+
+
+class analyzeFlipBatchRes(BaseModel):
+    """Columnar Flip metrics: `metrics[name][i]` belongs to input row `i`.
+
+    Besides the `analyzeFlipRes` headline fields, `metrics` carries
+    `hml_amount`, `selling_costs` and `capital_gains_tax`. Rows listed in
+    `errors` have `None` for every metric.
+    """
+    count: int
+    valid_count: int
+    metrics: Dict[str, List[Optional[float]]]
+    errors: List[BatchRowError]
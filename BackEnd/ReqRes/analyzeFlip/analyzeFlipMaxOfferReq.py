@@ -0,0 +1,26 @@
+"""Request model for the Flip maximum-offer solver."""
+
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+from ReqRes.analyzeBRRR.analyzeBRRRMaxOfferReq import OfferTarget
+from ReqRes.analyzeFlip.analyzeFlipReq import analyzeFlipReq
+
+
+class analyzeFlipMaxOfferReq(BaseModel):
+    """Send exactly one of `deal` or `deals` (see `analyzeBRRRMaxOfferReq`)."""
+
+    deal: Optional[analyzeFlipReq] = None
+    deals: Optional[List[analyzeFlipReq]] = Field(None, min_length=1)
+    targets: List[OfferTarget] = Field(..., min_length=1)
+    max_price_in_thousands: Optional[float] = Field(
+        None, gt=0, description="Upper search bound (default: the sale price)"
+    )
+    tolerance_in_thousands: float = Field(0.01, gt=0, le=10, description="Price resolution; offers round down to it")
+
+    @model_validator(mode="after")
+    def _exactly_one_source(self):
+        if (self.deal is None) == (self.deals is None):
+            raise ValueError("Provide exactly one of `deal` or `deals`.")
+        return self
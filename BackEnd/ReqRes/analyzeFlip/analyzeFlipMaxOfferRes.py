@@ -0,0 +1,9 @@
+from typing import List
+
+from pydantic import BaseModel
+
+from ReqRes.analyzeBRRR.analyzeBRRRMaxOfferRes import MaxOfferResult
+
+
+class analyzeFlipMaxOfferRes(BaseModel):
+    results: List[MaxOfferResult]
@@ -0,0 +1,36 @@
+"""Request model for Monte Carlo Flip simulation."""
+
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from ReqRes.analyzeBRRR.analyzeBRRRMonteCarloReq import MAX_DRAWS, Distribution
+from ReqRes.analyzeFlip.analyzeFlipReq import analyzeFlipReq
+
+
+class FlipMonteCarloAssumptions(BaseModel):
+    """Which inputs vary. Unset inputs stay at the deal's value."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    arv_pct: Optional[Distribution] = Field(None, description="% change applied to the sale price")
+    rehab_overrun_pct: Optional[Distribution] = Field(None, description="% overrun applied to rehab cost")
+    months_delta: Optional[Distribution] = Field(None, description="Months added to holding time (min 1)")
+    interest_rate_delta: Optional[Distribution] = Field(None, description="Percentage points added to the HML rate")
+
+
+class analyzeFlipMonteCarloReq(BaseModel):
+    """Send exactly one of `deal` or `deals` (see `analyzeBRRRMonteCarloReq`)."""
+
+    deal: Optional[analyzeFlipReq] = None
+    deals: Optional[List[analyzeFlipReq]] = Field(None, min_length=1, max_length=200)
+    assumptions: FlipMonteCarloAssumptions = Field(default_factory=FlipMonteCarloAssumptions)
+    draws: int = Field(10_000, ge=1, le=MAX_DRAWS)
+    seed: Optional[int] = Field(None, ge=0, description="Omit for a random seed (echoed in the response)")
+    parallel: bool = False
+
+    @model_validator(mode="after")
+    def _exactly_one_source(self):
+        if (self.deal is None) == (self.deals is None):
+            raise ValueError("Provide exactly one of `deal` or `deals`.")
+        return self
@@ -0,0 +1,13 @@
+from typing import List
+
+from pydantic import BaseModel
+
+from ReqRes.analyzeBRRR.analyzeBRRRMonteCarloRes import MonteCarloResult
+
+
+class analyzeFlipMonteCarloRes(BaseModel):
+    """`results[i]` belongs to the i-th deal; `seed` reproduces the run.
+    BRRRR-only fields (`prob_negative_cash_flow`, `share_infinite_return`)
+    are null."""
+    seed: int
+    results: List[MonteCarloResult]
@@ -0,0 +1,12 @@
+from typing import List
+
+from pydantic import BaseModel, Field
+
+from ReqRes.email.sendOfferReq import SendOfferReq
+
+# One campaign per request; larger lists should be split client-side.
+MAX_BATCH_OFFERS = 500
+
+
+class SendOfferBatchReq(BaseModel):
+    offers: List[SendOfferReq] = Field(..., min_length=1, max_length=MAX_BATCH_OFFERS)
@@ -0,0 +1,31 @@
+from typing import List, Literal, Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class SendOfferBatchResult(BaseModel):
+    """Outcome for input offer `index`.
+
+    `queued` rows carry the tracking id of the new email. `duplicate` means
+    the same agent + property appears earlier in the batch (`duplicate_of`)
+    or was already queued or sent (`id` is that email). `rejected` rows were
+    not queued; see `detail`.
+    """
+    index: int
+    agent_email: str
+    property_address: str
+    status: Literal["queued", "duplicate", "rejected"]
+    id: Optional[UUID] = None
+    duplicate_of: Optional[int] = None
+    detail: Optional[str] = None
+
+
+class SendOfferBatchRes(BaseModel):
+    queued: int
+    duplicates: int
+    rejected: int
+    # Sending is throttled to these provider caps.
+    max_per_minute: int
+    max_per_day: int
+    results: List[SendOfferBatchResult]
@@ -1,6 +1,28 @@
+from datetime import datetime
+from typing import Literal, Optional
+from uuid import UUID
+
 from pydantic import BaseModel
 
+OfferEmailStatus = Literal["queued", "sending", "sent", "failed"]
+
+
 class SendOfferRes(BaseModel):
     message: str
     success: bool
+    # Tracking id of the queued email; poll GET /send-offer/{id}.
+    id: Optional[UUID] = None
+    status: Optional[OfferEmailStatus] = None
+
 
+class OfferEmailStatusRes(BaseModel):
+    id: UUID
+    status: OfferEmailStatus
+    to_address: str
+    subject: str
+    attempts: int
+    last_error: Optional[str] = None
+    created_at: datetime
+    # Set while a retry is scheduled.
+    next_attempt_at: Optional[datetime] = None
+    sent_at: Optional[datetime] = None
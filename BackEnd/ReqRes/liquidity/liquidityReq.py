@@ -116,3 +116,24 @@ class LiquiditySettingsRes(BaseModel):
     updated_at: Optional[str] = None
 
     model_config = {"from_attributes": True}
+
+
+class LiquiditySeriesRes(BaseModel):
+    """Daily balances over [start, end], as parallel arrays.
+
+    `dates[i]`, `net_k[i]` and `balance_k[i]` describe the same day;
+    `balance_k` is the end-of-day balance including recurring projections.
+    """
+    start: date
+    end: date
+    opening_balance_k: float
+    opening_balance_date: date
+    reserve_k: float
+    dates: list[str]
+    net_k: list[float]
+    balance_k: list[float]
+    min_balance_k: float
+    min_balance_dates: list[str]
+    first_negative_date: Optional[str] = None
+    negative_days: int
+    first_reserve_breach_date: Optional[str] = None
@@ -0,0 +1,22 @@
+import uuid
+from typing import List, Literal
+
+from pydantic import BaseModel, Field
+
+# A book is rendered in one request; keep it to what a meeting can use.
+MAX_PORTFOLIO_DEALS = 100
+
+
+class PortfolioDealRef(BaseModel):
+    id: uuid.UUID
+    deal_type: Literal["BRRRR", "FLIP"]
+
+
+class portfolioPdfReq(BaseModel):
+    """Saved deals to bind into one report, in the order given.
+
+    `source` picks the active pipeline or the bought deals.
+    """
+    title: str = Field("Portfolio Report", max_length=120)
+    source: Literal["active", "bought"] = "active"
+    deals: List[PortfolioDealRef] = Field(..., min_length=1, max_length=MAX_PORTFOLIO_DEALS)
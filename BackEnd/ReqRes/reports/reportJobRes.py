@@ -0,0 +1,16 @@
+from typing import Literal, Optional
+
+from pydantic import BaseModel
+
+
+class reportJobRes(BaseModel):
+    """State of a background PDF render.
+
+    `job_id` is the report's cache key, so submitting the same report twice
+    returns the same job. `download_url` serves the PDF once `status` is
+    `done`.
+    """
+    job_id: str
+    status: Literal["pending", "running", "done", "failed"]
+    detail: Optional[str] = None
+    download_url: str
@@ -0,0 +1,237 @@
+"""Query-plan benchmark: transaction_ledger hot paths before and after the
+composite indexes.
+
+Run from BackEnd/:
+
+    python -m benchmarks.bench_ledger_indexes              # 1M rows, SQLite file
+    python -m benchmarks.bench_ledger_indexes --rows 200000
+    LEDGER_BENCH_URL=postgresql+psycopg2://localhost/ledger_bench \\
+        python -m benchmarks.bench_ledger_indexes
+
+Seeds the ledger (almost three years across a few hundred properties),
+then reports p50 / p99 latency and the query plan for
+
+  * ingest        one live webhook line through `ingest_webhook_transaction`
+                  (insert, waterfall lookups, commit),
+  * rent window   the `cumulative_rent_received` ledger SUM,
+  * bucket window the `window_bucket_allocated` ledger SUM,
+  * audit page    a 50-row keyset page of `transaction_service.list_transactions`
+                  at a random depth, overall and for one property,
+
+first with the pre-migration indexes (external_id, property_id), then with
+the composite ones `_run_migrations` adds. The month-to-date aggregates
+for the seeded history are left empty so the window lookups run their
+ledger SUM. A Postgres URL must point at an empty scratch database; the
+treasury tables are dropped afterwards.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+from sqlalchemy import create_engine, event, insert, text  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from db import Base  # noqa: E402
+from treasury.models.transaction_ledger import TransactionLedger  # noqa: E402
+from treasury.repositories.transaction_repository import LedgerFilters  # noqa: E402
+from treasury.schemas.webhook_schemas import BankWebhookPayload  # noqa: E402
+from treasury.services import (  # noqa: E402
+    rent_milestone_service,
+    settlement_service,
+    transaction_routing_service,
+    transaction_service,
+    webhook_parser_service,
+)
+from treasury.tests.conftest import _TREASURY_TABLES  # noqa: E402
+from treasury.tests.test_nightly_sync_bulk import _seed  # noqa: E402
+
+_COMPOSITE_INDEXES = (
+    "ix_transaction_ledger_rent_window",
+    "ix_transaction_ledger_bucket_window",
+    "ix_transaction_ledger_timestamp_id",
+    "ix_transaction_ledger_property_timestamp_id",
+)
+_LEGACY_INDEX = "ix_transaction_ledger_property_id"
+_HISTORY_START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+_HISTORY_DAYS = 1_000
+_PAGE_SIZE = 50
+_CHUNK = 20_000
+
+
+def _ledger_row(rng, n_properties):
+    row = {
+        "property_id": f"prop-{rng.randrange(n_properties)}",
+        "timestamp": _HISTORY_START + timedelta(days=rng.randrange(_HISTORY_DAYS), seconds=rng.randrange(86_400)),
+        "amount": Decimal(rng.randrange(5_000, 250_000)) / 100,
+        "is_real_bank_tx": True,
+        "sub_bucket_assignment": None,
+        "transaction_type": "Rent",
+    }
+    kind = rng.random()
+    if kind < 0.25:
+        row.update(is_real_bank_tx=False, sub_bucket_assignment=rng.choice(["Tax", "General Reserve"]))
+    elif kind < 0.45:
+        row.update(amount=-row["amount"], transaction_type=rng.choice(["Repair", "P&I"]))
+    row["description"] = f"{row['transaction_type']} (seed)"
+    return row
+
+
+def _seed_ledger(engine, rows, n_properties):
+    rng = random.Random(0)
+    with engine.begin() as conn:
+        for offset in range(0, rows, _CHUNK):
+            conn.execute(
+                insert(TransactionLedger),
+                [_ledger_row(rng, n_properties) for _ in range(min(_CHUNK, rows - offset))],
+            )
+
+
+def _use_indexes(engine, composite):
+    """Switch between the pre-migration and the composite index set;
+    returns the seconds spent building indexes."""
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        for index in TransactionLedger.__table__.indexes:
+            if index.name in _COMPOSITE_INDEXES:
+                if composite:
+                    index.create(conn, checkfirst=True)
+                else:
+                    index.drop(conn, checkfirst=True)
+        conn.execute(text(f"DROP INDEX IF EXISTS {_LEGACY_INDEX}"))
+        if not composite:
+            conn.execute(text(f"CREATE INDEX {_LEGACY_INDEX} ON transaction_ledger (property_id)"))
+        conn.execute(text("ANALYZE" if engine.dialect.name == "sqlite" else "ANALYZE transaction_ledger"))
+    return time.perf_counter() - started
+
+
+def _plan(db, fn):
+    """Query plan of the first ledger statement `fn` issues."""
+    captured = []
+
+    def listener(conn, cursor, sql, params, *rest):
+        if "from transaction_ledger" in sql.lower():
+            captured.append((sql, params))
+
+    event.listen(db.get_bind(), "before_cursor_execute", listener)
+    try:
+        fn()
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", listener)
+    sql, params = captured[0]
+    explain = "EXPLAIN QUERY PLAN" if db.get_bind().dialect.name == "sqlite" else "EXPLAIN"
+    rows = db.connection().exec_driver_sql(f"{explain} {sql}", params).all()
+    return "; ".join(str(row[-1]).strip() for row in rows)
+
+
+def _workload(rng, n_properties, samples, ingest_month):
+    """(label, [callables]) per operation; each callable takes a session."""
+
+    def moment():
+        return _HISTORY_START + timedelta(days=rng.randrange(_HISTORY_DAYS), seconds=rng.randrange(86_400))
+
+    def rent_window(pid, when):
+        # Off the month boundary so the lookup skips the aggregate.
+        start = rent_milestone_service._window_start(when) + timedelta(seconds=1)
+        return lambda db: rent_milestone_service.cumulative_rent_received(db, pid, start, when)
+
+    def bucket_window(pid, bucket, when):
+        return lambda db: settlement_service.window_bucket_allocated(db, pid, bucket, as_of=when)
+
+    def audit_page(pid, when):
+        cursor = transaction_service.encode_cursor(TransactionLedger(timestamp=when, transaction_id="f" * 32))
+        filters = LedgerFilters(property_id=pid)
+        return lambda db: transaction_service.list_transactions(db, filters, limit=_PAGE_SIZE, cursor=cursor)
+
+    def ingest(i, when):
+        payload = webhook_parser_service.parse_bank_webhook(BankWebhookPayload(
+            property_id=f"prop-{rng.randrange(n_properties)}",
+            amount=Decimal(rng.randrange(20_000, 160_000)) / 100,
+            description=f"rent #{i}",
+            timestamp=when,
+            category="rent",
+            external_id=f"bench-{ingest_month:%Y%m}-{i}",
+        ))
+        return lambda db: transaction_routing_service.ingest_webhook_transaction(db, payload)
+
+    pid = lambda: f"prop-{rng.randrange(n_properties)}"  # noqa: E731
+    return [
+        ("ingest", [ingest(i, ingest_month + timedelta(minutes=i)) for i in range(samples)]),
+        ("rent window", [rent_window(pid(), moment()) for _ in range(samples)]),
+        ("bucket window", [
+            bucket_window(pid(), rng.choice(["Tax", "General Reserve"]), moment()) for _ in range(samples)
+        ]),
+        ("audit page", [audit_page(None, moment()) for _ in range(samples)]),
+        ("audit page/prop", [audit_page(pid(), moment()) for _ in range(samples)]),
+    ]
+
+
+def _measure(db, workload):
+    results = {}
+    for label, calls in workload:
+        plan = _plan(db, lambda: calls[0](db))
+        timings = []
+        for call in calls[1:]:
+            started = time.perf_counter()
+            call(db)
+            timings.append((time.perf_counter() - started) * 1e3)
+            db.expunge_all()
+        cuts = statistics.quantiles(timings, n=100, method="inclusive")
+        results[label] = (cuts[49], cuts[98], plan)
+    return results
+
+
+def bench(rows: int = 1_000_000, n_properties: int = 300, samples: int = 200, url: str = None) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(url or f"sqlite:///{tmp}/ledger_bench.db")
+        Base.metadata.create_all(bind=engine, tables=_TREASURY_TABLES)
+        try:
+            with sessionmaker(bind=engine)() as db:
+                _seed(db, n_properties)
+            _use_indexes(engine, composite=False)
+            started = time.perf_counter()
+            _seed_ledger(engine, rows, n_properties)
+            print(f"seeded {rows:,} ledger rows in {time.perf_counter() - started:.1f} s ({engine.dialect.name})")
+
+            phases = {}
+            for phase, month in (("before", datetime(2027, 1, 1, tzinfo=timezone.utc)),
+                                 ("after", datetime(2027, 2, 1, tzinfo=timezone.utc))):
+                if phase == "after":
+                    print(f"built composite indexes in {_use_indexes(engine, composite=True):.1f} s")
+                with sessionmaker(bind=engine)() as db:
+                    workload = _workload(random.Random(phase == "after"), n_properties, samples, month)
+                    phases[phase] = _measure(db, workload)
+        finally:
+            if url:
+                Base.metadata.drop_all(bind=engine, tables=_TREASURY_TABLES)
+            engine.dispose()
+
+    print(f"\n{'':16s} {'before p50':>11s} {'p99':>9s} {'after p50':>11s} {'p99':>9s}   (ms)")
+    for label, (p50, p99, _) in phases["before"].items():
+        a50, a99, _ = phases["after"][label]
+        print(f"{label:16s} {p50:11.2f} {p99:9.2f} {a50:11.2f} {a99:9.2f}")
+    print()
+    for label in phases["before"]:
+        print(f"{label}:\n  before: {phases['before'][label][2]}\n  after:  {phases['after'][label][2]}")
+
+
+def _main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="ledger rows to seed (default 1M)")
+    parser.add_argument("--properties", type=int, default=300)
+    parser.add_argument("--samples", type=int, default=200, help="timed calls per operation")
+    parser.add_argument("--url", default=os.environ.get("LEDGER_BENCH_URL"),
+                        help="database URL (default: a temporary SQLite file)")
+    args = parser.parse_args()
+    bench(args.rows, args.properties, args.samples, args.url)
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,83 @@
+"""Micro-benchmark: numpy liquidity series vs. a per-occurrence loop.
+
+Run from BackEnd/:
+
+    python -m benchmarks.bench_liquidity_series
+
+Five years of history plus a two-year horizon, with daily, weekly and
+monthly rules and a few hundred one-off transactions: the shape that made
+the browser-side expansion slow.
+"""
+
+import calendar
+import random
+import timeit
+from datetime import date, timedelta
+
+from liquidity_series import Rule, build_series
+
+_DAYS = {"daily": 1, "weekly": 7, "biweekly": 14}
+_MONTHS = {"monthly": 1, "quarterly": 3, "yearly": 12}
+
+
+def loop_series(transactions, rules, opening_k, opening_date, start, end):
+    """The frontend algorithm: expand every occurrence, bucket by day, walk."""
+    lo = min(start, opening_date)
+    net = {}
+    for d, amount in transactions:
+        net[d] = net.get(d, 0.0) + amount
+    for rule in rules:
+        i = 0
+        while rule.occurrences is None or i < rule.occurrences:
+            if rule.frequency in _DAYS:
+                d = rule.start_date + timedelta(days=i * _DAYS[rule.frequency] * rule.interval)
+            else:
+                t = rule.start_date.month - 1 + i * _MONTHS[rule.frequency] * rule.interval
+                y, m = rule.start_date.year + t // 12, t % 12 + 1
+                d = date(y, m, min(rule.start_date.day, calendar.monthrange(y, m)[1]))
+            if d > end or (rule.end_date and d > rule.end_date):
+                break
+            if d >= lo:
+                net[d] = net.get(d, 0.0) + rule.amount_k
+            i += 1
+    balance, out, day = opening_k, [], lo
+    while day <= end:
+        if day >= opening_date:
+            balance += net.get(day, 0.0)
+        if day >= start:
+            out.append(balance)
+        day += timedelta(days=1)
+    return out
+
+
+def _workload(seed=0):
+    rng = random.Random(seed)
+    start, end = date(2021, 1, 1), date(2027, 12, 31)
+    transactions = [
+        (start + timedelta(days=rng.randrange((end - start).days)), rng.uniform(-50, 50)) for _ in range(400)
+    ]
+    rules = [
+        Rule(amount_k=rng.uniform(-3, 3), start_date=start + timedelta(days=rng.randrange(400)),
+             frequency=freq, interval=1)
+        for freq in ["daily"] * 5 + ["weekly"] * 10 + ["monthly"] * 20
+    ]
+    return transactions, rules, 100.0, start, start, end
+
+
+def bench():
+    args = _workload()
+    expected = loop_series(*args)
+    got = build_series(*args)["balance_k"]
+    assert max(abs(a - b) for a, b in zip(expected, got)) < 1e-6 * len(got)
+
+    repeat = 5
+    old = min(timeit.repeat(lambda: loop_series(*args), number=1, repeat=repeat))
+    new = min(timeit.repeat(lambda: build_series(*args), number=1, repeat=repeat))
+    print(f"{len(got)} days, {len(args[1])} rules, {len(args[0])} one-offs; best of {repeat}")
+    print(f"  loop:  {old * 1e3:8.2f} ms")
+    print(f"  numpy: {new * 1e3:8.2f} ms")
+    print(f"  speedup: {old / new:.1f}x")
+
+
+if __name__ == "__main__":
+    bench()
@@ -0,0 +1,65 @@
+"""Micro-benchmark: cached annuity factor vs. the old per-call Decimal power.
+
+Run from BackEnd/:
+
+    python -m benchmarks.bench_mortgage_payment
+
+Calls `calc_mortgage_payment` the way list/export requests do: many deals
+sharing a small set of (rate, term) pairs.
+"""
+
+import os
+import random
+import timeit
+from decimal import Decimal
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+import main  # noqa: E402
+
+
+def uncached_payment(arv, ltv, interest_rate, loan_term_years):
+    """`calc_mortgage_payment` before the annuity-factor cache."""
+    loan_amount = arv * ltv
+    monthly_interest_rate = (interest_rate / Decimal("100.0")) / Decimal("12.0")
+    total_payments = loan_term_years * 12
+    factor = (1 + monthly_interest_rate) ** total_payments
+    denominator = factor - 1
+    return loan_amount * monthly_interest_rate * factor / denominator
+
+
+def _deals(n, seed=0):
+    rng = random.Random(seed)
+    rates = [Decimal(r) for r in ("6.5", "6.75", "7", "7.25", "7.5", "8")]
+    return [
+        (Decimal(rng.randint(150, 450)), Decimal("0.75"), rng.choice(rates), rng.choice((15, 30)))
+        for _ in range(n)
+    ]
+
+
+def bench():
+    deals = _deals(10_000)
+    assert all(main.calc_mortgage_payment(*d) == uncached_payment(*d) for d in deals)
+
+    def run(fn):
+        for d in deals:
+            fn(*d)
+
+    repeat = 5
+    old = min(timeit.repeat(lambda: run(uncached_payment), number=1, repeat=repeat))
+    main.annuity_factor.cache_clear()
+    new = min(timeit.repeat(lambda: run(main.calc_mortgage_payment), number=1, repeat=repeat))
+    print(f"{len(deals)} payments, best of {repeat}")
+    print(f"  uncached: {old * 1e3:8.2f} ms  ({old / len(deals) * 1e6:.2f} us/call)")
+    print(f"  cached:   {new * 1e3:8.2f} ms  ({new / len(deals) * 1e6:.2f} us/call)")
+    print(f"  speedup:  {old / new:.1f}x   {main.annuity_factor.cache_info()}")
+
+    args = (Decimal("200000"), Decimal("7"), 30)
+    main.amortization_schedule.cache_clear()
+    cold = timeit.timeit(lambda: main.amortization_schedule(*args), number=1)
+    warm = timeit.timeit(lambda: main.amortization_schedule(*args), number=1000) / 1000
+    print(f"360-month schedule: cold {cold * 1e3:.2f} ms, cached {warm * 1e6:.2f} us")
+
+
+if __name__ == "__main__":
+    bench()
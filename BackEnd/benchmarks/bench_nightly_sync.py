@@ -0,0 +1,52 @@
+"""Micro-benchmark: nightly-sync ingestion, per-row commits vs. one bulk
+transaction.
+
+Run from BackEnd/:
+
+    python -m benchmarks.bench_nightly_sync
+
+Ingests a 2,000-line bank batch across 40 properties into a file-backed
+SQLite database (so every commit pays for a real fsync-backed write).
+"""
+
+import os
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from db import Base  # noqa: E402
+from treasury.services import transaction_routing_service  # noqa: E402
+from treasury.tests.conftest import _TREASURY_TABLES  # noqa: E402
+from treasury.tests.test_nightly_sync_bulk import _random_batch, _seed  # noqa: E402
+
+
+def _run(label, ingest, batch, n_properties):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{tmp}/bench.db")
+        Base.metadata.create_all(bind=engine, tables=_TREASURY_TABLES)
+        with sessionmaker(bind=engine)() as db:
+            _seed(db, n_properties)
+            started = time.perf_counter()
+            ingest(db, batch)
+            elapsed = time.perf_counter() - started
+        engine.dispose()
+    print(f"{label:9s} {elapsed * 1e3:9.1f} ms  {len(batch) / elapsed:8.0f} lines/s")
+
+
+def bench(lines: int = 2_000, n_properties: int = 40) -> None:
+    batch = _random_batch(0, n=lines, n_properties=n_properties)
+    _run(
+        "per-row",
+        lambda db, b: [transaction_routing_service.ingest_webhook_transaction(db, p) for p in b],
+        batch,
+        n_properties,
+    )
+    _run("bulk", transaction_routing_service.ingest_webhook_batch, batch, n_properties)
+
+
+if __name__ == "__main__":
+    bench()
@@ -0,0 +1,43 @@
+"""Micro-benchmark: PDF report renders per second.
+
+Run from BackEnd/:
+
+    python -m benchmarks.bench_pdf_render
+
+Renders the single-deal report for a BRRRR and a Flip deal and a 30-deal
+portfolio book, each with full calculation breakdowns.
+"""
+
+import io
+import os
+import timeit
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+import deal_pdf  # noqa: E402
+import main  # noqa: E402
+from tests.test_brrr_batch import _brrr_payload  # noqa: E402
+from tests.test_flip_batch import _flip_payload  # noqa: E402
+
+
+def bench(repeat: int = 5, number: int = 20) -> None:
+    brrr = main.calculate_brrr_results(_brrr_payload()).model_dump()
+    flip = main.calculate_flip_results(_flip_payload()).model_dump()
+    book = [
+        {"address": f"{i} Main St", "deal_type": "BRRRR" if i % 2 else "FLIP", "result": brrr if i % 2 else flip}
+        for i in range(30)
+    ]
+
+    cases = [
+        ("BRRRR report", lambda: deal_pdf.build_deal_pdf("1 Main St", "BRRRR", brrr), number),
+        ("Flip report", lambda: deal_pdf.build_deal_pdf("1 Main St", "FLIP", flip), number),
+        ("30-deal book", lambda: deal_pdf.build_portfolio_pdf("Bench", book, io.BytesIO()), 1),
+    ]
+    for label, fn, n in cases:
+        fn()  # warm-up (font metrics, lazily built registries)
+        best = min(timeit.repeat(fn, number=n, repeat=repeat)) / n
+        print(f"{label:14s} {best * 1e3:8.2f} ms  {1 / best:7.1f} renders/s")
+
+
+if __name__ == "__main__":
+    bench()
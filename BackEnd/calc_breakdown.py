@@ -11,12 +11,13 @@ anything.
 from __future__ import annotations
 
 from decimal import Decimal
-from typing import Iterable, Union
+from typing import Callable, Iterable, Optional, Union
 
 from pydantic import BaseModel
 
 
 Number = Union[Decimal, float, int]
+Formula = Union[str, Callable[[], str]]
 
 
 def fmt_money(value: Number) -> str:
@@ -58,24 +59,46 @@ class CalcBreakdown:
     only the lines relevant to a given result (Cash Flow, ROI, Net Profit, ...).
     The same step can contribute to multiple metrics (e.g. mortgage payment is
     used by both `cash_flow` and `dscr`) by passing a list of keys.
+
+    `formula` may be a zero-argument callable; it is only invoked (and its
+    f-string formatted) in `to_dict`. A breakdown created with
+    `enabled=False` ignores every `add` and serializes to `None`, which lets
+    callers that never show the narration (list endpoints, exports) skip the
+    string work entirely.
     """
 
-    def __init__(self) -> None:
-        self._steps: dict[str, list[CalcStep]] = {}
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self._steps: dict[str, list[tuple[str, Number, Formula]]] = {}
 
     def add(
         self,
         keys: Union[str, Iterable[str]],
         label: str,
         value: Number,
-        formula: str,
+        formula: Formula,
     ) -> None:
+        if not self.enabled:
+            return
         if isinstance(keys, str):
             keys = (keys,)
-        step = CalcStep(label=label, value=float(value), formula=formula)
+        step = (label, value, formula)
         for k in keys:
             self._steps.setdefault(k, []).append(step)
 
-    def to_dict(self) -> dict[str, list[dict]]:
+    def to_dict(self) -> Optional[dict[str, list[dict]]]:
         """Serialize for inclusion in a Pydantic response model."""
-        return {k: [s.model_dump() for s in v] for k, v in self._steps.items()}
+        if not self.enabled:
+            return None
+        rendered: dict[int, dict] = {}
+        out: dict[str, list[dict]] = {}
+        for k, steps in self._steps.items():
+            out[k] = []
+            for step in steps:
+                # Steps shared across keys are rendered once.
+                if id(step) not in rendered:
+                    label, value, formula = step
+                    text = formula() if callable(formula) else formula
+                    rendered[id(step)] = CalcStep(label=label, value=float(value), formula=text).model_dump()
+                out[k].append(rendered[id(step)])
+        return out
@@ -1,6 +1,9 @@
+import uuid
+
 from sqlalchemy.orm import Session
 from typing import Union, List
 
+from deal_metrics import discard_metrics, refresh_metrics
 from models import BrrrActiveDeal, FlipActiveDeal
 from ReqRes.activeDeal.activeDealReq import BrrrActiveDealCreate, FlipActiveDealCreate
 
@@ -11,6 +14,7 @@ def add_brrr_deal(db: Session, deal_data: BrrrActiveDealCreate) -> BrrrActiveDea
     db.add(db_deal)
     db.commit()
     db.refresh(db_deal)
+    refresh_metrics(db, db_deal)
     return db_deal
 
 
@@ -20,6 +24,7 @@ def add_flip_deal(db: Session, deal_data: FlipActiveDealCreate) -> FlipActiveDea
     db.add(db_deal)
     db.commit()
     db.refresh(db_deal)
+    refresh_metrics(db, db_deal)
     return db_deal
 
 
@@ -31,8 +36,32 @@ def get_all_flip_deals(db: Session) -> List[FlipActiveDeal]:
     return db.query(FlipActiveDeal).order_by(FlipActiveDeal.created_at.desc()).all()
 
 
+def parse_deal_id(deal_id) -> uuid.UUID | None:
+    """Deal IDs arrive as path strings; a malformed one simply matches nothing."""
+    if isinstance(deal_id, uuid.UUID):
+        return deal_id
+    try:
+        return uuid.UUID(str(deal_id))
+    except ValueError:
+        return None
+
+
+def get_brrr_deal(db: Session, deal_id: str) -> BrrrActiveDeal | None:
+    parsed = parse_deal_id(deal_id)
+    if parsed is None:
+        return None
+    return db.query(BrrrActiveDeal).filter(BrrrActiveDeal.id == parsed).first()
+
+
+def get_flip_deal(db: Session, deal_id: str) -> FlipActiveDeal | None:
+    parsed = parse_deal_id(deal_id)
+    if parsed is None:
+        return None
+    return db.query(FlipActiveDeal).filter(FlipActiveDeal.id == parsed).first()
+
+
 def update_brrr_deal(db: Session, deal_id: str, deal_data: BrrrActiveDealCreate) -> BrrrActiveDeal | None:
-    db_deal = db.query(BrrrActiveDeal).filter(BrrrActiveDeal.id == deal_id).first()
+    db_deal = get_brrr_deal(db, deal_id)
     if not db_deal:
         return None
     
@@ -43,11 +72,12 @@ def update_brrr_deal(db: Session, deal_id: str, deal_data: BrrrActiveDealCreate)
     
     db.commit()
     db.refresh(db_deal)
+    refresh_metrics(db, db_deal)
     return db_deal
 
 
 def update_flip_deal(db: Session, deal_id: str, deal_data: FlipActiveDealCreate) -> FlipActiveDeal | None:
-    db_deal = db.query(FlipActiveDeal).filter(FlipActiveDeal.id == deal_id).first()
+    db_deal = get_flip_deal(db, deal_id)
     if not db_deal:
         return None
     
@@ -58,31 +88,34 @@ def update_flip_deal(db: Session, deal_id: str, deal_data: FlipActiveDealCreate)
     
     db.commit()
     db.refresh(db_deal)
+    refresh_metrics(db, db_deal)
     return db_deal
 
 
 def delete_brrr_deal(db: Session, deal_id: str) -> bool:
-    db_deal = db.query(BrrrActiveDeal).filter(BrrrActiveDeal.id == deal_id).first()
+    db_deal = get_brrr_deal(db, deal_id)
     if not db_deal:
         return False
     
+    discard_metrics(db, db_deal)
     db.delete(db_deal)
     db.commit()
     return True
 
 
 def delete_flip_deal(db: Session, deal_id: str) -> bool:
-    db_deal = db.query(FlipActiveDeal).filter(FlipActiveDeal.id == deal_id).first()
+    db_deal = get_flip_deal(db, deal_id)
     if not db_deal:
         return False
     
+    discard_metrics(db, db_deal)
     db.delete(db_deal)
     db.commit()
     return True
 
 
 def duplicate_brrr_deal(db: Session, deal_id: str) -> BrrrActiveDeal | None:
-    original_deal = db.query(BrrrActiveDeal).filter(BrrrActiveDeal.id == deal_id).first()
+    original_deal = get_brrr_deal(db, deal_id)
     if not original_deal:
         return None
     
@@ -96,10 +129,11 @@ def duplicate_brrr_deal(db: Session, deal_id: str) -> BrrrActiveDeal | None:
     db.add(new_deal)
     db.commit()
     db.refresh(new_deal)
+    refresh_metrics(db, new_deal)
     return new_deal
 
 def duplicate_flip_deal(db: Session, deal_id: str) -> FlipActiveDeal | None:
-    original_deal = db.query(FlipActiveDeal).filter(FlipActiveDeal.id == deal_id).first()
+    original_deal = get_flip_deal(db, deal_id)
     if not original_deal:
         return None
     
@@ -113,4 +147,5 @@ def duplicate_flip_deal(db: Session, deal_id: str) -> FlipActiveDeal | None:
     db.add(new_deal)
     db.commit()
     db.refresh(new_deal)
+    refresh_metrics(db, new_deal)
     return new_deal
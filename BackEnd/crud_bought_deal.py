@@ -1,6 +1,8 @@
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
+from crud_active_deal import parse_deal_id
+from deal_metrics import discard_metrics, refresh_metrics
 from models import BoughtBrrrDeal, BoughtFlipDeal, BrrrActiveDeal, FlipActiveDeal
 from ReqRes.boughtDeal.boughtDealReq import BoughtBrrrDealCreate, BoughtFlipDealCreate
 
@@ -11,6 +13,7 @@ def add_bought_brrr_deal(db: Session, deal_data: BoughtBrrrDealCreate) -> Bought
     db.add(db_deal)
     db.commit()
     db.refresh(db_deal)
+    refresh_metrics(db, db_deal)
     return db_deal
 
 
@@ -20,6 +23,7 @@ def add_bought_flip_deal(db: Session, deal_data: BoughtFlipDealCreate) -> Bought
     db.add(db_deal)
     db.commit()
     db.refresh(db_deal)
+    refresh_metrics(db, db_deal)
     return db_deal
 
 
@@ -31,8 +35,22 @@ def get_all_bought_flip_deals(db: Session) -> List[BoughtFlipDeal]:
     return db.query(BoughtFlipDeal).order_by(BoughtFlipDeal.created_at.desc()).all()
 
 
+def get_bought_brrr_deal(db: Session, deal_id: str) -> Optional[BoughtBrrrDeal]:
+    parsed = parse_deal_id(deal_id)
+    if parsed is None:
+        return None
+    return db.query(BoughtBrrrDeal).filter(BoughtBrrrDeal.id == parsed).first()
+
+
+def get_bought_flip_deal(db: Session, deal_id: str) -> Optional[BoughtFlipDeal]:
+    parsed = parse_deal_id(deal_id)
+    if parsed is None:
+        return None
+    return db.query(BoughtFlipDeal).filter(BoughtFlipDeal.id == parsed).first()
+
+
 def update_bought_brrr_deal(db: Session, deal_id: str, deal_data: BoughtBrrrDealCreate) -> Optional[BoughtBrrrDeal]:
-    db_deal = db.query(BoughtBrrrDeal).filter(BoughtBrrrDeal.id == deal_id).first()
+    db_deal = get_bought_brrr_deal(db, deal_id)
     if not db_deal:
         return None
     
@@ -43,11 +61,12 @@ def update_bought_brrr_deal(db: Session, deal_id: str, deal_data: BoughtBrrrDeal
     
     db.commit()
     db.refresh(db_deal)
+    refresh_metrics(db, db_deal)
     return db_deal
 
 
 def update_bought_flip_deal(db: Session, deal_id: str, deal_data: BoughtFlipDealCreate) -> Optional[BoughtFlipDeal]:
-    db_deal = db.query(BoughtFlipDeal).filter(BoughtFlipDeal.id == deal_id).first()
+    db_deal = get_bought_flip_deal(db, deal_id)
     if not db_deal:
         return None
     
@@ -58,22 +77,25 @@ def update_bought_flip_deal(db: Session, deal_id: str, deal_data: BoughtFlipDeal
     
     db.commit()
     db.refresh(db_deal)
+    refresh_metrics(db, db_deal)
     return db_deal
 
 
 def delete_bought_brrr_deal(db: Session, deal_id: str) -> bool:
-    db_deal = db.query(BoughtBrrrDeal).filter(BoughtBrrrDeal.id == deal_id).first()
+    db_deal = get_bought_brrr_deal(db, deal_id)
     if not db_deal:
         return False
+    discard_metrics(db, db_deal)
     db.delete(db_deal)
     db.commit()
     return True
 
 
 def delete_bought_flip_deal(db: Session, deal_id: str) -> bool:
-    db_deal = db.query(BoughtFlipDeal).filter(BoughtFlipDeal.id == deal_id).first()
+    db_deal = get_bought_flip_deal(db, deal_id)
     if not db_deal:
         return False
+    discard_metrics(db, db_deal)
     db.delete(db_deal)
     db.commit()
     return True
@@ -101,6 +123,7 @@ def create_bought_from_active_brrr(db: Session, source_deal: BrrrActiveDeal) ->
     db.add(new_deal)
     db.commit()
     db.refresh(new_deal)
+    refresh_metrics(db, new_deal)
     return new_deal
 
 
@@ -114,4 +137,5 @@ def create_bought_from_active_flip(db: Session, source_deal: FlipActiveDeal) ->
     db.add(new_deal)
     db.commit()
     db.refresh(new_deal)
+    refresh_metrics(db, new_deal)
     return new_deal
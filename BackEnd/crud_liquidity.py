@@ -13,6 +13,9 @@ from ReqRes.liquidity.liquidityReq import (
     LiquiditySettingsUpdate,
 )
 from datetime import date
+from types import SimpleNamespace
+
+import liquidity_daily
 
 
 # --- Transactions ---
@@ -32,6 +35,7 @@ def add_transaction(db: Session, data: LiquidityTransactionCreate) -> LiquidityT
         amount_k=data.amount_k,
     )
     db.add(txn)
+    liquidity_daily.apply_transaction_change(db, new=(txn.effective_date, txn.amount_k))
     db.commit()
     db.refresh(txn)
     return txn
@@ -41,12 +45,14 @@ def update_transaction(db: Session, txn_id: str, data: LiquidityTransactionUpdat
     txn = db.query(LiquidityTransaction).filter(LiquidityTransaction.id == txn_id).first()
     if not txn:
         return None
+    old = (txn.effective_date, txn.amount_k)
     if data.effective_date is not None:
         txn.effective_date = data.effective_date
     if data.description is not None:
         txn.description = data.description
     if data.amount_k is not None:
         txn.amount_k = data.amount_k
+    liquidity_daily.apply_transaction_change(db, old=old, new=(txn.effective_date, txn.amount_k))
     db.commit()
     db.refresh(txn)
     return txn
@@ -57,6 +63,7 @@ def delete_transaction(db: Session, txn_id: str) -> bool:
     if not txn:
         return False
     db.delete(txn)
+    liquidity_daily.apply_transaction_change(db, old=(txn.effective_date, txn.amount_k))
     db.commit()
     return True
 
@@ -72,6 +79,18 @@ def get_all_recurring(db: Session) -> list[LiquidityRecurringTransaction]:
     )
 
 
+def _rule_snapshot(rule: LiquidityRecurringTransaction) -> SimpleNamespace:
+    """Pre-update copy of the fields that place a rule's occurrences."""
+    return SimpleNamespace(
+        amount_k=rule.amount_k,
+        start_date=rule.start_date,
+        end_date=rule.end_date,
+        occurrences=rule.occurrences,
+        frequency=rule.frequency,
+        interval=rule.interval,
+    )
+
+
 def get_recurring(db: Session, rule_id: str) -> LiquidityRecurringTransaction | None:
     return (
         db.query(LiquidityRecurringTransaction)
@@ -97,6 +116,7 @@ def add_recurring(
         interval=data.interval,
     )
     db.add(rule)
+    liquidity_daily.apply_rule_change(db, new=rule)
     db.commit()
     db.refresh(rule)
     return rule
@@ -117,6 +137,7 @@ def update_recurring(
     )
     if not rule:
         return None
+    old = _rule_snapshot(rule)
 
     if data.description is not None:
         rule.description = data.description
@@ -144,6 +165,7 @@ def update_recurring(
     if rule.end_date is not None and rule.end_date < rule.start_date:
         raise ValueError("end_date must be on or after start_date.")
 
+    liquidity_daily.apply_rule_change(db, old=old, new=rule)
     db.commit()
     db.refresh(rule)
     return rule
@@ -158,6 +180,7 @@ def delete_recurring(db: Session, rule_id: str) -> bool:
     if not rule:
         return False
     db.delete(rule)
+    liquidity_daily.apply_rule_change(db, old=rule)
     db.commit()
     return True
 
@@ -170,6 +193,8 @@ def get_settings(db: Session) -> LiquiditySettings | None:
 
 def upsert_settings(db: Session, data: LiquiditySettingsUpdate) -> LiquiditySettings:
     settings = db.query(LiquiditySettings).filter(LiquiditySettings.id == 1).first()
+    old_opening_k = settings.opening_balance_k if settings else None
+    old_opening_date = settings.opening_balance_date if settings else None
     if not settings:
         settings = LiquiditySettings(
             id=1,
@@ -185,6 +210,7 @@ def upsert_settings(db: Session, data: LiquiditySettingsUpdate) -> LiquiditySett
             settings.opening_balance_date = data.opening_balance_date
         if data.reserve_k is not None:
             settings.reserve_k = data.reserve_k
+    liquidity_daily.apply_settings_change(db, old_opening_k, old_opening_date, settings)
     db.commit()
     db.refresh(settings)
     return settings
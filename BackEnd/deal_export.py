@@ -0,0 +1,122 @@
+"""Streaming NDJSON / CSV export of the deal portfolio with computed metrics.
+
+The list endpoints build every response model before sending a byte, which
+is fine for the board but not for the nightly BI pull. Here rows are read
+with `yield_per`, metrics come from the `deal_metrics` cache (recomputed on
+the fly, without writing back, for stale rows) and each row is serialized
+and sent as soon as it is built, so worker memory stays flat regardless of
+portfolio size.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import logging
+from itertools import islice
+from typing import Callable, Iterator, Literal, Optional, Sequence
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+import deal_metrics
+
+logger = logging.getLogger(__name__)
+
+ExportFormat = Literal["ndjson", "csv"]
+
+EXPORT_BATCH_SIZE = 200
+
+# Per-deal narration is far too large for a bulk export.
+_EXCLUDED = frozenset({"breakdowns"})
+
+_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def export_columns(*response_models) -> list[str]:
+    """Ordered union of the wire keys of `response_models`, plus `error`."""
+    columns: dict[str, None] = {}
+    for model in response_models:
+        for name, info in model.model_fields.items():
+            if name not in _EXCLUDED:
+                columns.setdefault(info.alias or name, None)
+    columns.setdefault("error", None)
+    return list(columns)
+
+
+def _batches(query, size: int) -> Iterator[list]:
+    rows = iter(query.yield_per(size))
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+def iter_deal_rows(
+    session_factory: Callable[[], Session],
+    models: Sequence[tuple[type, str]],
+    build: Callable,
+    batch_size: Optional[int] = None,
+) -> Iterator[dict]:
+    """Yield one JSON-ready dict per deal, table by table, newest first.
+
+    Opens its own session: FastAPI closes `get_db` sessions before a
+    streaming body is consumed. A deal whose metrics can't be computed is
+    still exported, with its calculator error in `error`. The session's
+    identity map is weak-referencing, so finished batches are freed as
+    soon as they go out of scope.
+    """
+    batch_size = batch_size or EXPORT_BATCH_SIZE
+    with session_factory() as db:
+        for model, deal_type in models:
+            query = db.query(model).order_by(model.created_at.desc(), model.id.desc())
+            for batch in _batches(query, batch_size):
+                cached = deal_metrics.load_metrics(db, batch, persist=False)
+                for deal in batch:
+                    try:
+                        res = build(deal, False, cached.get(deal.id))
+                        yield res.model_dump(mode="json", by_alias=True, exclude=set(_EXCLUDED))
+                    except Exception as exc:  # noqa: BLE001
+                        detail = getattr(exc, "detail", None) or str(exc)
+                        logger.warning("Export: %s %s failed: %s", deal_type, deal.id, detail)
+                        yield {
+                            "id": str(deal.id),
+                            "deal_type": deal_type,
+                            "address": deal.address,
+                            "error": detail,
+                        }
+
+
+def _ndjson(rows: Iterator[dict]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(row) + "\n"
+
+
+def _csv(rows: Iterator[dict], columns: list[str]) -> Iterator[str]:
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=columns, restval="", extrasaction="ignore")
+    writer.writeheader()
+    for row in rows:
+        writer.writerow({
+            k: json.dumps(v) if isinstance(v, (dict, list)) else v
+            for k, v in row.items()
+        })
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+    tail = buf.getvalue()
+    if tail:
+        yield tail
+
+
+def streaming_export(
+    rows: Iterator[dict],
+    columns: list[str],
+    fmt: ExportFormat,
+    basename: str,
+) -> StreamingResponse:
+    body = _csv(rows, columns) if fmt == "csv" else _ndjson(rows)
+    return StreamingResponse(
+        body,
+        media_type=_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{basename}.{fmt}"'},
+    )
@@ -0,0 +1,207 @@
+"""Keyset pagination, filtering and sparse fieldsets for the deal lists.
+
+BRRRR and Flip deals live in separate tables but the board shows them as one
+list ordered by `created_at DESC`. Pages are cut with a keyset cursor over
+`(created_at, id)` so each table is read with an indexed range query instead
+of loading every row and sorting in Python. Column filters (`section`,
+`stage`, `bought_stage`) run in SQL; metric filters (`min_cash_flow`,
+`min_roi`) run against the materialized `deal_metrics` payloads.
+"""
+
+from __future__ import annotations
+
+import base64
+import heapq
+import json
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, Optional, Sequence
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session, defer
+
+import deal_metrics
+
+# JSON / free-text columns that dominate the payload. They are only loaded
+# when a `fields=` whitelist asks for them (or no whitelist is given).
+HEAVY_COLUMNS: tuple[str, ...] = ("sold_comps", "rent_comps", "sale_comps", "notes")
+
+# Always returned with a sparse fieldset so clients can key, route and page.
+ALWAYS_INCLUDED: frozenset[str] = frozenset({"id", "deal_type", "created_at"})
+
+MAX_PAGE_SIZE = 500
+
+# BRRRR `roi` sentinels (see `offer_solver`): -1 means no cash is left in the
+# deal, an infinite return that meets any floor; -2 means non-positive cash
+# flow and meets none. Flip ROI is a plain percentage.
+_INFINITE_RETURN = -1.0
+_NO_CASH_FLOW = -2.0
+
+
+def encode_cursor(deal) -> str:
+    raw = json.dumps([deal.created_at.isoformat(), deal.id.hex])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """Inverse of `encode_cursor`; raises `ValueError` for anything malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, deal_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), uuid.UUID(deal_id)
+    except (TypeError, ValueError, json.JSONDecodeError) as exc:
+        raise ValueError("Invalid cursor.") from exc
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> Optional[frozenset[str]]:
+    """Turn `fields=a,b,c` into a whitelist; `None` means "everything"."""
+    if fields is None:
+        return None
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = sorted(requested - set(allowed))
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}.")
+    return frozenset(requested | ALWAYS_INCLUDED)
+
+
+def deferred_columns(whitelist: Optional[frozenset[str]]) -> tuple[str, ...]:
+    if whitelist is None:
+        return ()
+    return tuple(c for c in HEAVY_COLUMNS if c not in whitelist)
+
+
+@dataclass
+class DealFilters:
+    deal_type: Optional[str] = None
+    section: Optional[int] = None
+    stage: Optional[int] = None
+    bought_stage: Optional[str] = None
+    min_cash_flow: Optional[float] = None
+    min_roi: Optional[float] = None
+
+    def models(self, brrr_model, flip_model) -> list:
+        if self.deal_type == "BRRRR":
+            return [brrr_model]
+        if self.deal_type == "FLIP":
+            return [flip_model]
+        # Flips have no monthly cash flow, so that filter rules them out.
+        return [brrr_model] if self.min_cash_flow is not None else [brrr_model, flip_model]
+
+    @property
+    def has_metric_filters(self) -> bool:
+        return self.min_cash_flow is not None or self.min_roi is not None
+
+    def column_clauses(self, model) -> list:
+        clauses = []
+        if self.section is not None:
+            clauses.append(model.section == self.section)
+        if self.stage is not None:
+            clauses.append(model.stage == self.stage)
+        if self.bought_stage is not None and hasattr(model, "bought_stage"):
+            clauses.append(model.bought_stage == self.bought_stage)
+        return clauses
+
+    def accepts(self, metrics: Optional[dict], brrr: bool = False) -> bool:
+        if not self.has_metric_filters:
+            return True
+        if metrics is None:
+            return False
+        for name, floor in (("cash_flow", self.min_cash_flow), ("roi", self.min_roi)):
+            if floor is None:
+                continue
+            value = metrics.get(name)
+            if brrr and name == "roi" and value in (_INFINITE_RETURN, _NO_CASH_FLOW):
+                if value == _NO_CASH_FLOW:
+                    return False
+                continue
+            if value is None or value < floor:
+                return False
+        return True
+
+
+@dataclass
+class DealPage:
+    deals: list
+    metrics: dict
+    next_cursor: Optional[str]
+
+
+def _sort_key(deal):
+    return (deal.created_at, deal.id)
+
+
+def _query(db: Session, model, filters: DealFilters, after, limit: Optional[int], defer_cols: Sequence[str]):
+    q = db.query(model).filter(*filters.column_clauses(model))
+    deferrable = [getattr(model, c) for c in defer_cols if hasattr(model, c)]
+    if deferrable:
+        q = q.options(*(defer(c) for c in deferrable))
+    if after is not None:
+        created_at, deal_id = after
+        q = q.filter(or_(
+            model.created_at < created_at,
+            and_(model.created_at == created_at, model.id < deal_id),
+        ))
+    q = q.order_by(model.created_at.desc(), model.id.desc())
+    if limit is not None:
+        q = q.limit(limit)
+    return q.all()
+
+
+def _merged_chunk(db: Session, models, filters: DealFilters, after, chunk: Optional[int], defer_cols):
+    """Next run of rows across `models` in global `(created_at, id) DESC` order.
+
+    Each table returns at most `chunk` rows. Once a table fills its chunk,
+    older rows from the other tables can't be emitted until that table is
+    read further, so the run stops at the newest such "horizon".
+    Returns `(rows, exhausted)`.
+    """
+    per_model = [_query(db, m, filters, after, chunk, defer_cols) for m in models]
+    full = [rows for rows in per_model if chunk is not None and len(rows) == chunk]
+    merged = list(heapq.merge(*per_model, key=_sort_key, reverse=True))
+    if not full:
+        return merged, True
+    horizon = max(_sort_key(rows[-1]) for rows in full)
+    return [d for d in merged if _sort_key(d) >= horizon], False
+
+
+def fetch_page(
+    db: Session,
+    models: Sequence,
+    filters: DealFilters,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    defer_cols: Sequence[str] = (),
+    with_metrics: bool = True,
+) -> DealPage:
+    """Read one page of deals (all of them when `limit` is None)."""
+    after = decode_cursor(cursor) if cursor else None
+    need_metrics = with_metrics or filters.has_metric_filters
+    chunk = None
+    if limit is not None:
+        chunk = limit + 1
+        if filters.has_metric_filters:
+            chunk = max(2 * chunk, 100)
+
+    picked: list = []
+    metrics: dict = {}
+    while True:
+        rows, exhausted = _merged_chunk(db, models, filters, after, chunk, defer_cols)
+        if need_metrics and rows:
+            metrics.update(deal_metrics.load_metrics(db, rows))
+        for deal in rows:
+            if filters.accepts(metrics.get(deal.id), brrr=deal_metrics.is_brrr(deal)):
+                picked.append(deal)
+        if not rows or (after is not None and _sort_key(rows[-1]) >= after):
+            # Nothing new, or the backend compared the keyset inconsistently
+            # (e.g. SQLite text timestamps in mixed formats): stop rather than spin.
+            break
+        after = _sort_key(rows[-1])
+        if exhausted or (limit is not None and len(picked) > limit):
+            break
+
+    next_cursor = None
+    if limit is not None and len(picked) > limit:
+        picked = picked[:limit]
+        next_cursor = encode_cursor(picked[-1])
+    return DealPage(deals=picked, metrics=metrics, next_cursor=next_cursor)
@@ -0,0 +1,257 @@
+"""Persisted, invalidation-aware cache of computed deal metrics.
+
+List endpoints used to rerun the full BRRRR/Flip calculators for every row on
+every request. Instead, each saved deal gets a `DealMetrics` row holding its
+headline metrics plus a hash of the inputs they were computed from:
+
+- CRUD writes (`add_*`, `update_*`, `duplicate_*`, `create_bought_from_active_*`)
+  call `refresh_metrics`, which only recalculates when the input hash moved
+  (a stage drag or note edit leaves the metrics untouched).
+- List reads call `load_metrics`, one query per table. Rows that are missing
+  or stale (e.g. edited outside the API) are recomputed and stored in place.
+
+Run `python deal_metrics.py backfill` after deploying to populate existing
+deals, and `python deal_metrics.py check --sample 50` to recompute a random
+sample and report drift between the cache and the live calculators.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import random
+from typing import Iterable, Optional, Sequence, Union
+
+from sqlalchemy.orm import Session
+
+from models import (
+    BrrrActiveDeal, FlipActiveDeal, BoughtBrrrDeal, BoughtFlipDeal, DealMetrics,
+)
+from ReqRes.analyzeBRRR.analyzeBRRRReq import analyzeBRRRReq
+from ReqRes.analyzeFlip.analyzeFlipReq import analyzeFlipReq
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the calculator formulas change so every cached row is
+# treated as stale and recomputed on next read (or by `backfill`).
+METRICS_VERSION = 1
+
+Deal = Union[BrrrActiveDeal, FlipActiveDeal, BoughtBrrrDeal, BoughtFlipDeal]
+
+DEAL_MODELS: tuple[type, ...] = (BrrrActiveDeal, FlipActiveDeal, BoughtBrrrDeal, BoughtFlipDeal)
+_BRRR_MODELS = (BrrrActiveDeal, BoughtBrrrDeal)
+
+_BRRR_INPUTS: tuple[str, ...] = tuple(analyzeBRRRReq.model_fields)
+_FLIP_INPUTS: tuple[str, ...] = tuple(analyzeFlipReq.model_fields)
+
+# Absolute tolerance (dollars / percentage points) used by `check`.
+DRIFT_TOLERANCE = 0.005
+
+
+def is_brrr(deal: Deal) -> bool:
+    return isinstance(deal, _BRRR_MODELS)
+
+
+def _canonical(value) -> str:
+    # Numeric columns round-trip as Decimal with driver-dependent scale
+    # ("150" vs "150.00"), so compare them as floats.
+    if isinstance(value, bool) or value is None:
+        return repr(value)
+    return repr(float(value))
+
+
+def input_hash(deal: Deal) -> str:
+    """Fingerprint of everything the calculator reads from `deal`."""
+    fields = _BRRR_INPUTS if is_brrr(deal) else _FLIP_INPUTS
+    material = [METRICS_VERSION, deal.__tablename__]
+    material.extend(_canonical(getattr(deal, f)) for f in fields)
+    return hashlib.sha256(json.dumps(material).encode()).hexdigest()
+
+
+def compute_metrics(deal: Deal) -> dict:
+    """Run the authoritative Decimal calculator without breakdown narration."""
+    # Local import: the calculators live in `main`, which imports the CRUD
+    # modules that import us.
+    from main import calculate_brrr_results, calculate_flip_results
+
+    calc = calculate_brrr_results if is_brrr(deal) else calculate_flip_results
+    return calc(deal, include_breakdown=False).model_dump(exclude={"breakdowns"})
+
+
+def _store(db: Session, deal: Deal, row: Optional[DealMetrics], digest: str, metrics: dict) -> DealMetrics:
+    if row is None:
+        row = DealMetrics(deal_table=deal.__tablename__, deal_id=deal.id)
+        db.add(row)
+    row.input_hash = digest
+    row.metrics = metrics
+    row.cash_flow = metrics.get("cash_flow")
+    row.roi = metrics.get("roi")
+    row.net_profit = metrics.get("net_profit")
+    return row
+
+
+def _get_row(db: Session, deal: Deal) -> Optional[DealMetrics]:
+    return db.get(DealMetrics, (deal.__tablename__, deal.id))
+
+
+def refresh_metrics(db: Session, deal: Deal, commit: bool = True) -> Optional[DealMetrics]:
+    """Bring `deal`'s cached metrics up to date after a write.
+
+    No-op when the inputs are unchanged. Calculator errors (e.g. a 0% rate
+    that can't be amortized) are logged and leave no cache row, so the
+    list endpoint recomputes — and surfaces the error — exactly as before.
+    """
+    digest = input_hash(deal)
+    row = _get_row(db, deal)
+    if row is not None and row.input_hash == digest:
+        return row
+    try:
+        metrics = compute_metrics(deal)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Skipping metrics cache for %s %s: %s", deal.__tablename__, deal.id, exc)
+        if row is not None:
+            db.delete(row)
+            if commit:
+                db.commit()
+        return None
+    row = _store(db, deal, row, digest, metrics)
+    if commit:
+        db.commit()
+    return row
+
+
+def discard_metrics(db: Session, deal: Deal) -> None:
+    """Drop the cache row for a deal that is being deleted (caller commits)."""
+    row = _get_row(db, deal)
+    if row is not None:
+        db.delete(row)
+
+
+def load_metrics(db: Session, deals: Sequence[Deal], persist: bool = True) -> dict:
+    """Return `{deal.id: metrics}` for `deals`, healing missing/stale rows.
+
+    Deals whose metrics can't be computed are left out of the result; the
+    caller falls back to the live calculator for them. With `persist=False`
+    stale rows are recomputed but not written back (used while a streaming
+    `yield_per` cursor is open, where a commit would close it).
+    """
+    by_table: dict[str, list[Deal]] = {}
+    for deal in deals:
+        by_table.setdefault(deal.__tablename__, []).append(deal)
+
+    out: dict = {}
+    dirty = False
+    for table, table_deals in by_table.items():
+        rows = {
+            r.deal_id: r
+            for r in db.query(DealMetrics).filter(
+                DealMetrics.deal_table == table,
+                DealMetrics.deal_id.in_([d.id for d in table_deals]),
+            )
+        }
+        for deal in table_deals:
+            row = rows.get(deal.id)
+            digest = input_hash(deal)
+            if row is not None and row.input_hash == digest:
+                out[deal.id] = row.metrics
+                continue
+            try:
+                metrics = compute_metrics(deal)
+            except Exception:  # noqa: BLE001
+                continue
+            out[deal.id] = metrics
+            if persist:
+                _store(db, deal, row, digest, metrics)
+                dirty = True
+    if dirty:
+        db.commit()
+    return out
+
+
+# --- Maintenance commands ---
+
+def backfill(db: Session, models: Iterable[type] = DEAL_MODELS, batch_size: int = 200) -> dict:
+    """Compute metrics for every deal whose cache row is missing or stale."""
+    counts = {}
+    for model in models:
+        refreshed = 0
+        for deal in db.query(model).yield_per(batch_size):
+            row = _get_row(db, deal)
+            if row is None or row.input_hash != input_hash(deal):
+                if refresh_metrics(db, deal, commit=False) is not None:
+                    refreshed += 1
+        db.commit()
+        counts[model.__tablename__] = refreshed
+    return counts
+
+
+def check(db: Session, sample: int = 50, seed: Optional[int] = None) -> dict:
+    """Recompute a random sample per table and report cache drift.
+
+    Returns per-table counts plus a list of problems:
+    `missing` (no cache row), `stale` (input hash moved), or `drift`
+    (hash matches but stored values disagree with a fresh calculation —
+    a formula change without a `METRICS_VERSION` bump).
+    """
+    rng = random.Random(seed)
+    report = {"tables": {}, "problems": []}
+    for model in DEAL_MODELS:
+        ids = [row[0] for row in db.query(model.id).all()]
+        picked = rng.sample(ids, min(sample, len(ids)))
+        checked = 0
+        for deal_id in picked:
+            deal = db.get(model, deal_id)
+            row = _get_row(db, deal)
+            checked += 1
+            problem = {"deal_table": model.__tablename__, "deal_id": str(deal_id)}
+            if row is None:
+                report["problems"].append({**problem, "kind": "missing"})
+                continue
+            if row.input_hash != input_hash(deal):
+                report["problems"].append({**problem, "kind": "stale"})
+                continue
+            try:
+                fresh = compute_metrics(deal)
+            except Exception as exc:  # noqa: BLE001
+                report["problems"].append({**problem, "kind": "error", "detail": str(exc)})
+                continue
+            drifted = {
+                name: {"cached": row.metrics.get(name), "fresh": value}
+                for name, value in fresh.items()
+                if isinstance(value, (int, float))
+                and (
+                    not isinstance(row.metrics.get(name), (int, float))
+                    or abs(row.metrics[name] - value) > DRIFT_TOLERANCE
+                )
+            }
+            if drifted:
+                report["problems"].append({**problem, "kind": "drift", "fields": drifted})
+        report["tables"][model.__tablename__] = {"total": len(ids), "checked": checked}
+    return report
+
+
+def _main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Maintain the deal_metrics cache.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("backfill", help="compute metrics for every missing/stale deal")
+    check_parser = sub.add_parser("check", help="recompute a sample and report drift")
+    check_parser.add_argument("--sample", type=int, default=50, help="deals per table (default 50)")
+    check_parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    import main  # noqa: F401  (runs migrations so the table exists)
+    from db import SessionLocal
+
+    with SessionLocal() as db:
+        if args.command == "backfill":
+            print(json.dumps(backfill(db), indent=2))
+            return 0
+        report = check(db, sample=args.sample, seed=args.seed)
+        print(json.dumps(report, indent=2))
+        return 1 if report["problems"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(_main())
@@ -7,6 +7,9 @@ Renders a one-shot, professional report with:
      `calculate_brrr_results` / `calculate_flip_results`, grouped per metric.
   4. Branded footer + disclaimer on every page.
 
+`build_portfolio_pdf` binds the same per-deal sections into one book behind
+a cover page that summarizes every deal.
+
 The renderer is intentionally tolerant of unknown shapes: it accepts a plain
 dict for `result` (so callers can pass either a Pydantic model dump or a raw
 dict, including DB-backed deal rows merged with calc output).
@@ -15,15 +18,20 @@ dict, including DB-backed deal rows merged with calc output).
 from __future__ import annotations
 
 import io
+import tempfile
 from datetime import datetime
-from typing import Any, Iterable
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Iterable, Iterator, Mapping
 
+from reportlab import rl_config
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
 from reportlab.lib.pagesizes import LETTER
 from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
 from reportlab.lib.units import inch
 from reportlab.platypus import (
+    PageBreak,
     Paragraph,
     SimpleDocTemplate,
     Spacer,
@@ -32,6 +40,15 @@ from reportlab.platypus import (
 )
 
 
+# Page streams are zlib-compressed either way; the default extra ASCII85 pass
+# only keeps files 7-bit clean, which nothing downstream needs, and costs a
+# quarter of the render time in reportlab's pure-Python encoder.
+rl_config.useA85 = 0
+
+# Part of the report cache key (`pdf_jobs.report_key`): bump whenever the
+# layout or wording changes so cached reports are rendered again.
+TEMPLATE_VERSION = "2"
+
 # Big Whales brand palette.
 BRAND_NAVY = colors.HexColor("#0B1F3A")
 BRAND_BLUE = colors.HexColor("#2563EB")
@@ -80,9 +97,12 @@ def _num(v: Any, decimals: int = 2) -> str:
         return "-"
 
 
-def _styles() -> dict[str, ParagraphStyle]:
+@lru_cache(maxsize=None)
+def _styles() -> Mapping[str, ParagraphStyle]:
+    """Paragraph styles, built once per process and shared read-only by
+    every render."""
     base = getSampleStyleSheet()
-    return {
+    return MappingProxyType({
         "title": ParagraphStyle(
             "BWTitle", parent=base["Title"],
             fontName="Helvetica-Bold", fontSize=22,
@@ -118,7 +138,7 @@ def _styles() -> dict[str, ParagraphStyle]:
             fontName="Helvetica-Bold", fontSize=9,
             textColor=colors.white, alignment=TA_CENTER,
         ),
-    }
+    })
 
 
 # Order of (key, label) tuples used to render the high-level summary tables
@@ -180,12 +200,31 @@ def _summary_rows(result: dict, deal_type: str) -> list[list[str]]:
     return rows
 
 
-def _breakdown_table(steps: Iterable[dict], styles: dict[str, ParagraphStyle]) -> Table:
-    rows: list[list[Any]] = [[
-        Paragraph("<b>Step</b>", styles["body"]),
-        Paragraph("<b>Formula</b>", styles["body"]),
-        Paragraph("<b>Value</b>", styles["body"]),
-    ]]
+# Table styles are plain command lists that `Table.setStyle` copies, so one
+# instance of each serves every render.
+_BREAKDOWN_TABLE_STYLE = TableStyle([
+    ("BACKGROUND", (0, 0), (-1, 0), BRAND_NAVY),
+    ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+    ("FONTSIZE", (0, 0), (-1, -1), 10),
+    ("FONTNAME", (2, 1), (2, -1), "Helvetica-Bold"),
+    ("TEXTCOLOR", (2, 1), (2, -1), BRAND_INK),
+    ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, BRAND_PALE]),
+    ("BOX", (0, 0), (-1, -1), 0.5, BRAND_BORDER),
+    ("INNERGRID", (0, 0), (-1, -1), 0.25, BRAND_BORDER),
+    ("VALIGN", (0, 0), (-1, -1), "TOP"),
+    ("LEFTPADDING", (0, 0), (-1, -1), 6),
+    ("RIGHTPADDING", (0, 0), (-1, -1), 6),
+    ("TOPPADDING", (0, 0), (-1, -1), 5),
+    ("BOTTOMPADDING", (0, 0), (-1, -1), 5),
+])
+
+
+def _breakdown_table(steps: Iterable[dict], styles: Mapping[str, ParagraphStyle]) -> Table:
+    # Only the label and formula can wrap; the header and the value column
+    # are plain strings styled by the table, which skips Paragraph layout for
+    # a third of the cells (the bulk of the render time).
+    rows: list[list[Any]] = [["Step", "Formula", "Value"]]
     for step in steps:
         label = step.get("label", "")
         formula = step.get("formula", "")
@@ -193,60 +232,71 @@ def _breakdown_table(steps: Iterable[dict], styles: dict[str, ParagraphStyle]) -
         rows.append([
             Paragraph(label, styles["body"]),
             Paragraph(formula, styles["body"]),
-            Paragraph(f"<b>{_money(value)}</b>", styles["body"]),
+            _money(value),
         ])
     table = Table(rows, colWidths=[1.6 * inch, 4.0 * inch, 1.1 * inch], repeatRows=1)
-    table.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (-1, 0), BRAND_NAVY),
-        ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, BRAND_PALE]),
-        ("BOX", (0, 0), (-1, -1), 0.5, BRAND_BORDER),
-        ("INNERGRID", (0, 0), (-1, -1), 0.25, BRAND_BORDER),
-        ("VALIGN", (0, 0), (-1, -1), "TOP"),
-        ("LEFTPADDING", (0, 0), (-1, -1), 6),
-        ("RIGHTPADDING", (0, 0), (-1, -1), 6),
-        ("TOPPADDING", (0, 0), (-1, -1), 5),
-        ("BOTTOMPADDING", (0, 0), (-1, -1), 5),
-    ]))
+    table.setStyle(_BREAKDOWN_TABLE_STYLE)
     return table
 
 
+_SUMMARY_TABLE_STYLE = TableStyle([
+    ("BACKGROUND", (0, 0), (-1, 0), BRAND_NAVY),
+    ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+    ("FONTSIZE", (0, 0), (-1, -1), 10),
+    ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, BRAND_PALE]),
+    ("BOX", (0, 0), (-1, -1), 0.5, BRAND_BORDER),
+    ("INNERGRID", (0, 0), (-1, -1), 0.25, BRAND_BORDER),
+    ("LEFTPADDING", (0, 0), (-1, -1), 8),
+    ("RIGHTPADDING", (0, 0), (-1, -1), 8),
+    ("TOPPADDING", (0, 0), (-1, -1), 6),
+    ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
+    ("ALIGN", (1, 0), (1, -1), "RIGHT"),
+    ("FONTNAME", (1, 1), (1, -1), "Helvetica-Bold"),
+    ("TEXTCOLOR", (1, 1), (1, -1), BRAND_INK),
+])
+
+
 def _summary_table(rows: list[list[str]]) -> Table:
     table = Table(rows, colWidths=[3.0 * inch, 3.7 * inch], repeatRows=1)
-    table.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (-1, 0), BRAND_NAVY),
-        ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-        ("FONTSIZE", (0, 0), (-1, -1), 10),
-        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, BRAND_PALE]),
-        ("BOX", (0, 0), (-1, -1), 0.5, BRAND_BORDER),
-        ("INNERGRID", (0, 0), (-1, -1), 0.25, BRAND_BORDER),
-        ("LEFTPADDING", (0, 0), (-1, -1), 8),
-        ("RIGHTPADDING", (0, 0), (-1, -1), 8),
-        ("TOPPADDING", (0, 0), (-1, -1), 6),
-        ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
-        ("ALIGN", (1, 0), (1, -1), "RIGHT"),
-        ("FONTNAME", (1, 1), (1, -1), "Helvetica-Bold"),
-        ("TEXTCOLOR", (1, 1), (1, -1), BRAND_INK),
-    ]))
+    table.setStyle(_SUMMARY_TABLE_STYLE)
     return table
 
 
-def _header_block(address: str, deal_type: str, styles: dict[str, ParagraphStyle]) -> Table:
-    badge_color = BRAND_BLUE if deal_type == "BRRRR" else BRAND_AMBER
-    badge = Table(
-        [[Paragraph(deal_type, styles["badge"])]],
-        colWidths=[0.9 * inch],
-    )
-    badge.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (-1, -1), badge_color),
-        ("BOX", (0, 0), (-1, -1), 0.5, badge_color),
+def _badge_style(color) -> TableStyle:
+    return TableStyle([
+        ("BACKGROUND", (0, 0), (-1, -1), color),
+        ("BOX", (0, 0), (-1, -1), 0.5, color),
         ("ALIGN", (0, 0), (-1, -1), "CENTER"),
         ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
         ("TOPPADDING", (0, 0), (-1, -1), 4),
         ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
-    ]))
+    ])
+
+
+def _header_style(color) -> TableStyle:
+    return TableStyle([
+        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+        ("SPAN", (0, 1), (1, 1)),
+        ("LINEBELOW", (0, 1), (-1, 1), 2, color),
+        ("BOTTOMPADDING", (0, 1), (-1, 1), 6),
+    ])
+
+
+# (badge style, header style) per deal type; anything else renders as a Flip.
+_HEADER_STYLES = {
+    "BRRRR": (_badge_style(BRAND_BLUE), _header_style(BRAND_BLUE)),
+    "FLIP": (_badge_style(BRAND_AMBER), _header_style(BRAND_AMBER)),
+}
+
+
+def _header_block(address: str, deal_type: str, styles: Mapping[str, ParagraphStyle]) -> Table:
+    badge_style, header_style = _HEADER_STYLES.get(deal_type, _HEADER_STYLES["FLIP"])
+    badge = Table(
+        [[Paragraph(deal_type, styles["badge"])]],
+        colWidths=[0.9 * inch],
+    )
+    badge.setStyle(badge_style)
     title = Paragraph(f"<b>{address or 'Property'}</b>", styles["title"])
     sub = Paragraph(
         f"Deal Report &middot; Generated {datetime.now().strftime('%b %d, %Y')}",
@@ -256,19 +306,15 @@ def _header_block(address: str, deal_type: str, styles: dict[str, ParagraphStyle
         [[title, badge], [sub, ""]],
         colWidths=[5.3 * inch, 1.4 * inch],
     )
-    block.setStyle(TableStyle([
-        ("VALIGN", (0, 0), (-1, -1), "TOP"),
-        ("SPAN", (0, 1), (1, 1)),
-        ("LINEBELOW", (0, 1), (-1, 1), 2, badge_color),
-        ("BOTTOMPADDING", (0, 1), (-1, 1), 6),
-    ]))
+    block.setStyle(header_style)
     return block
 
 
-def _draw_branding(canvas, doc):
-    """Persistent footer drawn on every page."""
-    canvas.saveState()
-    width, _ = LETTER
+_BRANDING_FORM = "BWBranding"
+
+
+def _draw_static_branding(canvas) -> None:
+    width, height = LETTER
     # Left: Big Whales signature.
     canvas.setFont("Helvetica-Bold", 11)
     canvas.setFillColor(BRAND_NAVY)
@@ -279,10 +325,6 @@ def _draw_branding(canvas, doc):
         0.6 * inch, 0.4 * inch,
         "Real-estate analytics by big whales \u2022 BigWhalesLLC@gmail.com",
     )
-    # Right: page number.
-    canvas.drawRightString(
-        width - 0.6 * inch, 0.4 * inch, f"Page {doc.page}",
-    )
     # Disclaimer line above footer.
     canvas.setFont("Helvetica-Oblique", 7)
     canvas.drawCentredString(
@@ -292,39 +334,50 @@ def _draw_branding(canvas, doc):
     )
     # Top accent stripe.
     canvas.setFillColor(BRAND_NAVY)
-    canvas.rect(0, LETTER[1] - 0.18 * inch, width, 0.18 * inch, fill=1, stroke=0)
+    canvas.rect(0, height - 0.18 * inch, width, 0.18 * inch, fill=1, stroke=0)
     canvas.setFillColor(BRAND_AMBER)
-    canvas.rect(0, LETTER[1] - 0.22 * inch, width, 0.04 * inch, fill=1, stroke=0)
-    canvas.restoreState()
+    canvas.rect(0, height - 0.22 * inch, width, 0.04 * inch, fill=1, stroke=0)
 
 
-def build_deal_pdf(
-    address: str,
-    deal_type: str,
-    result: dict,
-    breakdowns: dict | None = None,
-) -> bytes:
-    """Render a Big Whales branded deal report PDF and return raw bytes.
+def _draw_branding(canvas, doc):
+    """Persistent header stripe and footer drawn on every page.
 
-    `result` should be a flat dict of the calculator output (e.g. the
-    `analyzeBRRRRes` / `analyzeFlipRes` model_dump). `breakdowns` is the
-    `breakdowns` dict from the same response; when omitted we look it up on
-    `result["breakdowns"]`.
+    Everything but the page number is recorded once per document as a form
+    XObject, so later pages only reference it.
     """
-    deal_type = (deal_type or "BRRRR").upper()
-    if breakdowns is None:
-        breakdowns = result.get("breakdowns") or {}
+    if not canvas.hasForm(_BRANDING_FORM):
+        canvas.beginForm(_BRANDING_FORM)
+        _draw_static_branding(canvas)
+        canvas.endForm()
+    canvas.saveState()
+    canvas.doForm(_BRANDING_FORM)
+    # Right: page number.
+    canvas.setFont("Helvetica", 8)
+    canvas.setFillColor(BRAND_MUTED)
+    canvas.drawRightString(
+        LETTER[0] - 0.6 * inch, 0.4 * inch, f"Page {doc.page}",
+    )
+    canvas.restoreState()
 
-    styles = _styles()
-    buf = io.BytesIO()
-    doc = SimpleDocTemplate(
-        buf, pagesize=LETTER,
+
+def _document(out: Any, title: str) -> SimpleDocTemplate:
+    return SimpleDocTemplate(
+        out, pagesize=LETTER,
         leftMargin=0.6 * inch, rightMargin=0.6 * inch,
         topMargin=0.55 * inch, bottomMargin=0.95 * inch,
-        title=f"Big Whales Deal Report - {address or 'Property'}",
+        title=title,
         author="Big Whales AY LLC",
     )
 
+
+def _deal_flowables(
+    address: str,
+    deal_type: str,
+    result: dict,
+    breakdowns: dict,
+    styles: Mapping[str, ParagraphStyle],
+) -> list[Any]:
+    """Header, summary table and breakdown sections for one deal."""
     flow: list[Any] = []
     flow.append(_header_block(address, deal_type, styles))
     flow.append(Spacer(1, 0.1 * inch))
@@ -348,6 +401,134 @@ def build_deal_pdf(
         flow.append(Paragraph(label, styles["h3"]))
         flow.append(_breakdown_table(steps, styles))
         flow.append(Spacer(1, 0.1 * inch))
+    return flow
+
+
+def build_deal_pdf(
+    address: str,
+    deal_type: str,
+    result: dict,
+    breakdowns: dict | None = None,
+) -> bytes:
+    """Render a Big Whales branded deal report PDF and return raw bytes.
 
+    `result` should be a flat dict of the calculator output (e.g. the
+    `analyzeBRRRRes` / `analyzeFlipRes` model_dump). `breakdowns` is the
+    `breakdowns` dict from the same response; when omitted we look it up on
+    `result["breakdowns"]`.
+    """
+    deal_type = (deal_type or "BRRRR").upper()
+    if breakdowns is None:
+        breakdowns = result.get("breakdowns") or {}
+
+    styles = _styles()
+    buf = io.BytesIO()
+    doc = _document(buf, f"Big Whales Deal Report - {address or 'Property'}")
+    flow = _deal_flowables(address, deal_type, result, breakdowns, styles)
     doc.build(flow, onFirstPage=_draw_branding, onLaterPages=_draw_branding)
     return buf.getvalue()
+
+
+# --- Portfolio book ---
+
+# Cover-page columns: (header, BRRRR key, FLIP key, formatter, summed in the total row).
+_PORTFOLIO_COLUMNS = [
+    ("Net Profit", "net_profit", "net_profit", _money, True),
+    ("ROI", "roi", "roi", _pct, False),
+    ("Cash Needed", "total_cash_needed_for_deal", "total_cash_needed", _money, True),
+    ("Cash Flow / mo", "cash_flow", None, _money, True),
+]
+
+# Rendered books are spooled in memory up to this size, then on disk.
+PORTFOLIO_SPOOL_BYTES = 8 * 1024 * 1024
+STREAM_CHUNK_BYTES = 64 * 1024
+
+
+_PORTFOLIO_TABLE_STYLE = TableStyle([
+    ("BACKGROUND", (0, 0), (-1, 0), BRAND_NAVY),
+    ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+    ("FONTSIZE", (0, 0), (-1, -1), 9),
+    ("ROWBACKGROUNDS", (0, 1), (-1, -2), [colors.white, BRAND_PALE]),
+    ("FONTNAME", (0, -1), (-1, -1), "Helvetica-Bold"),
+    ("LINEABOVE", (0, -1), (-1, -1), 1, BRAND_NAVY),
+    ("BOX", (0, 0), (-1, -1), 0.5, BRAND_BORDER),
+    ("INNERGRID", (0, 0), (-1, -2), 0.25, BRAND_BORDER),
+    ("ALIGN", (2, 0), (-1, -1), "RIGHT"),
+    ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+])
+
+
+def _portfolio_table(deals: list[dict], styles: Mapping[str, ParagraphStyle]) -> Table:
+    rows: list[list[Any]] = [["Property", "Type"] + [c[0] for c in _PORTFOLIO_COLUMNS]]
+    totals = [0.0] * len(_PORTFOLIO_COLUMNS)
+    for deal in deals:
+        result = deal.get("result") or {}
+        row: list[Any] = [Paragraph(deal.get("address") or "Property", styles["body"]), deal["deal_type"]]
+        for i, (_, brrr_key, flip_key, fmt, summed) in enumerate(_PORTFOLIO_COLUMNS):
+            key = brrr_key if deal["deal_type"] == "BRRRR" else flip_key
+            value = result.get(key) if key else None
+            row.append("-" if value is None else fmt(value))
+            if summed and value is not None:
+                totals[i] += float(value)
+        rows.append(row)
+    rows.append(["Total", ""] + [
+        _money(total) if summed else "" for total, (*_, summed) in zip(totals, _PORTFOLIO_COLUMNS)
+    ])
+
+    table = Table(
+        rows, colWidths=[2.3 * inch, 0.7 * inch, 1.0 * inch, 0.7 * inch, 1.0 * inch, 1.0 * inch], repeatRows=1,
+    )
+    table.setStyle(_PORTFOLIO_TABLE_STYLE)
+    return table
+
+
+def build_portfolio_pdf(title: str, deals: list[dict], out: Any) -> None:
+    """Render a multi-deal report into the binary file object `out`.
+
+    Each entry of `deals` has `address`, `deal_type`, and either `result`
+    (a calculator model_dump including `breakdowns`) or `error`, a message
+    printed in place of that deal's section. The book is a cover page with
+    one summary row per deal, then one section per deal laid out like
+    `build_deal_pdf`.
+    """
+    styles = _styles()
+    doc = _document(out, f"Big Whales Portfolio Report - {title}")
+
+    flow: list[Any] = [
+        Paragraph(title, styles["title"]),
+        Paragraph(
+            f"{len(deals)} deal{'s' if len(deals) != 1 else ''} &middot; "
+            f"Generated {datetime.now().strftime('%b %d, %Y')}",
+            styles["subtitle"],
+        ),
+        Paragraph("Portfolio Summary", styles["h2"]),
+        _portfolio_table(deals, styles),
+    ]
+    for deal in deals:
+        deal_type = (deal.get("deal_type") or "BRRRR").upper()
+        flow.append(PageBreak())
+        if deal.get("error"):
+            flow.append(_header_block(deal.get("address"), deal_type, styles))
+            flow.append(Paragraph(f"This deal could not be evaluated: {deal['error']}", styles["body"]))
+            continue
+        result = deal["result"]
+        flow.extend(_deal_flowables(deal.get("address"), deal_type, result, result.get("breakdowns") or {}, styles))
+
+    doc.build(flow, onFirstPage=_draw_branding, onLaterPages=_draw_branding)
+
+
+def stream_portfolio_pdf(title: str, deals: list[dict]) -> Iterator[bytes]:
+    """Yield the portfolio book in chunks.
+
+    reportlab only writes the file when the whole document is built, so the
+    book is spooled (memory, then disk past PORTFOLIO_SPOOL_BYTES) and
+    streamed from there; a 30-deal book never sits in one `bytes` object.
+    Rendering starts on the first `next()`, after the response headers are
+    sent.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=PORTFOLIO_SPOOL_BYTES) as spool:
+        build_portfolio_pdf(title, deals, spool)
+        spool.seek(0)
+        while chunk := spool.read(STREAM_CHUNK_BYTES):
+            yield chunk
@@ -0,0 +1,409 @@
+"""Persisted outbound email queue with a background SMTP dispatcher.
+
+`/send-offer` writes an `OutboundEmail` row and returns; a `Dispatcher`
+thread delivers due rows over one authenticated SMTP session that it keeps
+open across messages (Gmail throttles repeated logins), and reconnects only
+when the server drops it or it has sat idle.
+
+Delivery state lives in the table, so queued mail survives restarts and
+several API processes can share the queue: a row is claimed with a
+conditional UPDATE that also sets a lease (`next_attempt_at` pushed
+`SENDING_LEASE` ahead). A process that dies mid-send leaves the row in
+`sending`, and it becomes due again once the lease expires.
+
+Each pass connects and logs in once before claiming anything. If the
+server can't be reached or rejects the login, that says nothing about the
+messages: the pass ends, the row in hand (if the session dropped mid-pass)
+goes back to `queued` without using up an attempt, and the dispatcher backs
+off. Per-message failures (4xx replies, a dropped connection) are retried
+with exponential backoff; 5xx replies to the sender, recipients or data,
+and exhausting `MAX_ATTEMPTS`, mark the row `failed`.
+
+Sending is throttled to the provider's caps (`EMAIL_MAX_PER_MINUTE`,
+`EMAIL_MAX_PER_DAY`; defaults sit under Gmail's limits). The budget is
+counted from `sent_at` in the table, so it holds across restarts and
+processes; a pass that finds no budget sends nothing and rows stay queued.
+
+SMTP settings come from the environment: `EMAIL_SMTP_HOST` (default
+smtp.gmail.com), `EMAIL_SMTP_PORT` (465), `EMAIL_SMTP_SSL` (1),
+`EMAIL_SENDER` and `EMAIL_PASSWORD`. Point them at a local stub (plain SMTP,
+no password) in tests.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import smtplib
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy import func, or_, update
+from sqlalchemy.orm import Session
+
+from models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SENDER = "BigWhalesLLC@gmail.com"
+GMAIL_HOST = "smtp.gmail.com"
+
+MAX_ATTEMPTS = 6
+BACKOFF_BASE = timedelta(seconds=30)
+BACKOFF_MAX = timedelta(minutes=30)
+SENDING_LEASE = timedelta(minutes=10)
+# Rows claimed per pass; the SMTP session stays open across them.
+BATCH_SIZE = 50
+POLL_SECONDS = 5.0
+# Provider send caps; Gmail allows ~500 recipients/day on consumer accounts.
+DEFAULT_MAX_PER_MINUTE = 20
+DEFAULT_MAX_PER_DAY = 450
+# Close the SMTP session after this long without mail to send.
+IDLE_SECONDS = 60.0
+
+QUEUED, SENDING, SENT, FAILED = "queued", "sending", "sent", "failed"
+
+
+class EmailConfigError(RuntimeError):
+    """Raised when SMTP credentials are missing."""
+
+
+class SmtpUnavailable(RuntimeError):
+    """Raised when the SMTP server can't be reached or rejects the login."""
+
+
+@dataclass(frozen=True)
+class SmtpSettings:
+    host: str
+    port: int
+    use_ssl: bool
+    sender: str
+    password: Optional[str]
+    max_per_minute: int = DEFAULT_MAX_PER_MINUTE
+    max_per_day: int = DEFAULT_MAX_PER_DAY
+
+
+def load_settings() -> SmtpSettings:
+    password = (os.getenv("EMAIL_PASSWORD") or "").strip() or None
+    host = os.getenv("EMAIL_SMTP_HOST") or GMAIL_HOST
+    if password is None and host == GMAIL_HOST:
+        raise EmailConfigError("Email password not configured")
+    if password is not None and host == GMAIL_HOST and len(password) != 16:
+        logger.warning("Email password length is %d (expected 16 for Gmail App Password)", len(password))
+    return SmtpSettings(
+        host=host,
+        port=int(os.getenv("EMAIL_SMTP_PORT") or 465),
+        use_ssl=(os.getenv("EMAIL_SMTP_SSL") or "1").strip().lower() not in ("0", "false", "no"),
+        sender=os.getenv("EMAIL_SENDER") or DEFAULT_SENDER,
+        password=password,
+        max_per_minute=int(os.getenv("EMAIL_MAX_PER_MINUTE") or DEFAULT_MAX_PER_MINUTE),
+        max_per_day=int(os.getenv("EMAIL_MAX_PER_DAY") or DEFAULT_MAX_PER_DAY),
+    )
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+# --- SMTP session ---
+
+class SmtpSession:
+    """One lazily opened, authenticated SMTP connection reused across sends."""
+
+    def __init__(self, settings: SmtpSettings):
+        self.settings = settings
+        self._smtp: Optional[smtplib.SMTP] = None
+        self.last_used = 0.0
+        self.connects = 0
+
+    def _open(self) -> smtplib.SMTP:
+        s = self.settings
+        try:
+            smtp = smtplib.SMTP_SSL(s.host, s.port, timeout=30) if s.use_ssl else smtplib.SMTP(s.host, s.port, timeout=30)
+        except (smtplib.SMTPException, OSError) as exc:
+            raise SmtpUnavailable(f"Can't connect to {s.host}:{s.port}: {exc}") from exc
+        try:
+            if s.password:
+                smtp.login(s.sender, s.password)
+        except (smtplib.SMTPException, OSError) as exc:
+            smtp.close()
+            raise SmtpUnavailable(f"Login to {s.host}:{s.port} failed: {exc}") from exc
+        except BaseException:
+            smtp.close()
+            raise
+        self.connects += 1
+        logger.info("SMTP session opened to %s:%s", s.host, s.port)
+        return smtp
+
+    def connect(self) -> None:
+        """Open and authenticate the session unless it already is; raises
+        `SmtpUnavailable`."""
+        if self._smtp is None:
+            self._smtp = self._open()
+
+    def send(self, msg: MIMEMultipart) -> None:
+        self.connect()
+        try:
+            self._smtp.send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            # Idle connections get dropped server-side; retry once on a fresh one.
+            self.close()
+            self._smtp = self._open()
+            self._smtp.send_message(msg)
+        except (smtplib.SMTPException, OSError):
+            # Recipient-level rejections leave the session usable, but a 4xx/5xx
+            # at the connection level may not; start clean next time.
+            self.close()
+            raise
+        self.last_used = time.monotonic()
+
+    def close(self) -> None:
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            self._smtp.close()
+        self._smtp = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._smtp is not None
+
+
+# --- Queue ---
+
+def enqueue(
+    db: Session,
+    to_address: str,
+    subject: str,
+    html_body: str,
+    kind: str = "offer",
+    dedupe_key: Optional[str] = None,
+) -> OutboundEmail:
+    [row] = enqueue_many(db, [(to_address, subject, html_body, dedupe_key)], kind=kind)
+    return row
+
+
+def enqueue_many(
+    db: Session,
+    messages: Iterable[tuple[str, str, str, Optional[str]]],
+    kind: str = "offer",
+) -> list[OutboundEmail]:
+    """Queue `(to_address, subject, html_body, dedupe_key)` tuples in one commit."""
+    rows = [
+        OutboundEmail(kind=kind, to_address=to, subject=subject, html_body=body, dedupe_key=key)
+        for to, subject, body, key in messages
+    ]
+    db.add_all(rows)
+    db.commit()
+    for row in rows:
+        db.refresh(row)
+    return rows
+
+
+def find_active_duplicates(db: Session, keys: Iterable[str], kind: str = "offer") -> dict[str, OutboundEmail]:
+    """Latest queued, sending or sent email per dedupe key."""
+    keys = set(keys)
+    if not keys:
+        return {}
+    rows = (
+        db.query(OutboundEmail)
+        .filter(
+            OutboundEmail.kind == kind,
+            OutboundEmail.dedupe_key.in_(keys),
+            OutboundEmail.status != FAILED,
+        )
+        .order_by(OutboundEmail.created_at)
+    )
+    return {row.dedupe_key: row for row in rows}
+
+
+def send_budget(db: Session, settings: SmtpSettings, now: datetime) -> int:
+    """Messages that may still go out now without exceeding the rate caps."""
+    def sent_since(start: datetime) -> int:
+        return db.query(func.count(OutboundEmail.id)).filter(OutboundEmail.sent_at > start).scalar()
+
+    return max(0, min(
+        settings.max_per_minute - sent_since(now - timedelta(minutes=1)),
+        settings.max_per_day - sent_since(now - timedelta(days=1)),
+    ))
+
+
+def build_message(row: OutboundEmail, sender: str) -> MIMEMultipart:
+    msg = MIMEMultipart()
+    msg["From"] = sender
+    msg["To"] = row.to_address
+    msg["Subject"] = row.subject
+    msg.attach(MIMEText(row.html_body, "html"))
+    return msg
+
+
+def backoff(attempts: int) -> timedelta:
+    return min(BACKOFF_BASE * (2 ** max(attempts - 1, 0)), BACKOFF_MAX)
+
+
+def _is_permanent(exc: Exception) -> bool:
+    """Only a 5xx about this message (sender, recipients or data) fails the row."""
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in exc.recipients.values())
+    if isinstance(exc, (smtplib.SMTPSenderRefused, smtplib.SMTPDataError)):
+        return exc.smtp_code >= 500
+    return False
+
+
+def _claim(db: Session, row_id, now: datetime) -> bool:
+    result = db.execute(
+        update(OutboundEmail)
+        .where(
+            OutboundEmail.id == row_id,
+            OutboundEmail.status.in_((QUEUED, SENDING)),
+            OutboundEmail.next_attempt_at <= now,
+        )
+        .values(status=SENDING, next_attempt_at=now + SENDING_LEASE)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount == 1
+
+
+def process_due(
+    session_factory: Callable[[], Session],
+    smtp: SmtpSession,
+    now: Optional[datetime] = None,
+    limit: int = BATCH_SIZE,
+) -> int:
+    """Deliver up to `limit` due emails over `smtp`, within the rate caps;
+    returns how many were attempted.
+
+    Raises `SmtpUnavailable` if the session can't be opened; rows not yet
+    sent stay queued and keep their attempt counts.
+    """
+    now = now or _utcnow()
+    started = time.monotonic()
+    with session_factory() as db:
+        limit = min(limit, send_budget(db, smtp.settings, now))
+        if limit <= 0:
+            return 0
+        due = [
+            row_id for (row_id,) in db.query(OutboundEmail.id)
+            .filter(
+                or_(OutboundEmail.status == QUEUED, OutboundEmail.status == SENDING),
+                OutboundEmail.next_attempt_at <= now,
+            )
+            .order_by(OutboundEmail.next_attempt_at, OutboundEmail.created_at)
+            .limit(limit)
+        ]
+        if not due:
+            return 0
+        smtp.connect()
+        attempted = 0
+        for row_id in due:
+            if not _claim(db, row_id, now):
+                continue  # another dispatcher got it
+            row = db.get(OutboundEmail, row_id, populate_existing=True)
+            try:
+                smtp.send(build_message(row, smtp.settings.sender))
+            except SmtpUnavailable:
+                # The reconnect after a drop failed; not this message's fault.
+                row.status = QUEUED
+                row.next_attempt_at = now
+                db.commit()
+                raise
+            except Exception as exc:  # noqa: BLE001 - every failure is recorded on the row
+                attempted += 1
+                row.attempts += 1
+                row.last_error = f"{type(exc).__name__}: {exc}"[:500]
+                if _is_permanent(exc) or row.attempts >= MAX_ATTEMPTS:
+                    row.status = FAILED
+                    logger.error("Email %s to %s failed permanently: %s", row.id, row.to_address, row.last_error)
+                else:
+                    row.status = QUEUED
+                    row.next_attempt_at = now + backoff(row.attempts)
+                    logger.warning("Email %s to %s failed (attempt %d), retrying: %s",
+                                   row.id, row.to_address, row.attempts, row.last_error)
+            else:
+                attempted += 1
+                row.attempts += 1
+                row.status = SENT
+                row.sent_at = now + timedelta(seconds=time.monotonic() - started)
+                row.last_error = None
+                logger.info("Email %s sent to %s", row.id, row.to_address)
+            db.commit()
+        return attempted
+
+
+class Dispatcher:
+    """Background thread draining the queue; `wake()` after enqueueing."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        settings_loader: Callable[[], SmtpSettings] = load_settings,
+        poll_seconds: float = POLL_SECONDS,
+        idle_seconds: float = IDLE_SECONDS,
+    ):
+        self.session_factory = session_factory
+        self.settings_loader = settings_loader
+        self.poll_seconds = poll_seconds
+        self.idle_seconds = idle_seconds
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.smtp: Optional[SmtpSession] = None
+        self._config_error_logged = False
+        # Consecutive passes that couldn't open the SMTP session.
+        self.unavailable_passes = 0
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="email-dispatcher", daemon=True)
+        self._thread.start()
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.clear()
+            attempted = 0
+            try:
+                if self.smtp is None:
+                    self.smtp = SmtpSession(self.settings_loader())
+                attempted = process_due(self.session_factory, self.smtp)
+                self.unavailable_passes = 0
+            except SmtpUnavailable as exc:
+                self.unavailable_passes += 1
+                delay = backoff(self.unavailable_passes).total_seconds()
+                logger.warning("Email dispatcher backing off %.0fs: %s", delay, exc)
+                # Not `_wake`: new mail shouldn't cut the backoff short.
+                self._stop.wait(delay)
+                continue
+            except EmailConfigError as exc:
+                # Log once; settings are re-read every poll until they're fixed.
+                if not self._config_error_logged:
+                    logger.error("Email dispatcher idle: %s", exc)
+                    self._config_error_logged = True
+            except Exception:  # noqa: BLE001 - keep the thread alive (e.g. DB restarts)
+                logger.exception("Email dispatcher pass failed")
+            if attempted:
+                continue  # more may be due
+            if self.smtp is not None and self.smtp.is_open and time.monotonic() - self.smtp.last_used > self.idle_seconds:
+                self.smtp.close()
+            self._wake.wait(self.poll_seconds)
+        if self.smtp is not None:
+            self.smtp.close()
@@ -0,0 +1,387 @@
+"""Materialized daily net/balance table for the liquidity timeline.
+
+`liquidity_daily_balances` holds one row per day of the default timeline
+window (`liquidity_series.default_range`). Each row has the day's net flow,
+including recurring-rule occurrences, and the end-of-day balance.
+`GET /liquidity/series` reads a window inside that range with one
+indexed range scan instead of expanding every rule and transaction.
+
+The default window ends a fixed horizon after today, so it rolls past the
+table a day after a rebuild. Reads then extend the table forward to the
+current horizon (plus `EXTEND_AHEAD_DAYS`, so that happens about once a
+month), carrying the last stored balance. A window reaching past even that
+gets the covered days from the table and only the rest computed.
+
+The table is kept current incrementally, like `deal_metrics`:
+
+- `crud_liquidity` writes call `apply_transaction_change`,
+  `apply_rule_change` or `apply_settings_change` before they commit. A
+  change only touches the days it moves. `net_k` is adjusted on those days
+  and `balance_k` is shifted from the first one onward (balances are
+  prefix sums of net). A handful of changed days becomes one range UPDATE
+  per day. Anything larger, such as a daily rule, rewrites the suffix in a
+  single pass.
+- A change outside the materialized range, or a moved opening-balance
+  date, rebuilds the table instead. Reads rebuild lazily if the table is
+  empty.
+
+Run `python liquidity_daily.py rebuild` after deploying, and
+`python liquidity_daily.py verify` to compare the table against a full
+recomputation.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any, Mapping, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import bindparam, func, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+import liquidity_series
+from models import (
+    LiquidityDailyBalance,
+    LiquidityRecurringTransaction,
+    LiquiditySettings,
+    LiquidityTransaction,
+)
+
+# Up to this many changed days are applied as one range UPDATE each; past
+# it the balance suffix is read once and rewritten.
+RANGE_UPDATE_MAX_DAYS = 8
+# |stored - recomputed| allowed by `verify` ($k, i.e. a tenth of a cent).
+VERIFY_TOLERANCE = 1e-4
+# Extending the table forward writes this many days past the current
+# default horizon, so a rolling window doesn't extend it on every read.
+EXTEND_AHEAD_DAYS = 30
+
+_Q = Decimal("0.0001")
+
+
+def _settings(db: Session) -> Optional[LiquiditySettings]:
+    return db.query(LiquiditySettings).filter(LiquiditySettings.id == 1).first()
+
+
+def coverage(db: Session) -> Optional[tuple[date, date]]:
+    """First and last materialized day, or None if the table is empty."""
+    lo, hi = db.query(func.min(LiquidityDailyBalance.day), func.max(LiquidityDailyBalance.day)).one()
+    return (lo, hi) if lo is not None else None
+
+
+def _compute(db: Session, settings: LiquiditySettings, start: date, end: date) -> dict[str, Any]:
+    transactions = [
+        (d, float(a))
+        for d, a in db.query(LiquidityTransaction.effective_date, LiquidityTransaction.amount_k)
+    ]
+    rules = [liquidity_series.rule_from_model(r) for r in db.query(LiquidityRecurringTransaction)]
+    return liquidity_series.build_series(
+        transactions, rules,
+        float(settings.opening_balance_k), settings.opening_balance_date,
+        start, end, float(settings.reserve_k),
+    )
+
+
+def materialized_range(db: Session, settings: LiquiditySettings, today: Optional[date] = None) -> tuple[date, date]:
+    lo, hi = db.query(
+        func.min(LiquidityTransaction.effective_date), func.max(LiquidityTransaction.effective_date)
+    ).one()
+    return liquidity_series.default_range(
+        [d for d in (lo, hi) if d is not None], settings.opening_balance_date, today=today
+    )
+
+
+def _insert(db: Session, start: date, net: Sequence[float], balance: Sequence[float]) -> int:
+    rows = [
+        {"day": start + timedelta(days=i), "net_k": Decimal(str(n)), "balance_k": Decimal(str(b))}
+        for i, (n, b) in enumerate(zip(net, balance))
+    ]
+    if rows:
+        db.execute(LiquidityDailyBalance.__table__.insert(), rows)
+    return len(rows)
+
+
+def rebuild(db: Session, commit: bool = True, today: Optional[date] = None) -> int:
+    """Recompute the whole table; returns the number of days written."""
+    db.query(LiquidityDailyBalance).delete(synchronize_session=False)
+    settings = _settings(db)
+    written = 0
+    if settings is not None:
+        start, end = materialized_range(db, settings, today=today)
+        series = _compute(db, settings, start, end)
+        written = _insert(db, start, series["net_k"], series["balance_k"])
+    if commit:
+        db.commit()
+    return written
+
+
+def _days_after(db: Session, settings: LiquiditySettings, last: date, end: date) -> Optional[tuple[np.ndarray, np.ndarray]]:
+    """Net flow and balance for the days after the last materialized one
+    through `end`, carried on from its stored balance. None if `last` is
+    before the opening date (the carry would be wrong; never the case for
+    a table built by `rebuild`)."""
+    if last < settings.opening_balance_date:
+        return None
+    start = last + timedelta(days=1)
+    net = np.zeros((end - start).days + 1, dtype=np.float64)
+    for d, amount in db.query(LiquidityTransaction.effective_date, LiquidityTransaction.amount_k).filter(
+        LiquidityTransaction.effective_date >= start, LiquidityTransaction.effective_date <= end
+    ):
+        net[(d - start).days] += float(amount)
+    origin = np.datetime64(start, "D")
+    for rule in db.query(LiquidityRecurringTransaction):
+        rule = liquidity_series.rule_from_model(rule)
+        dates = liquidity_series.occurrence_dates(rule, start, end)
+        if dates.size:
+            np.add.at(net, (dates - origin).astype(np.int64), rule.amount_k)
+    carried = float(db.get(LiquidityDailyBalance, last).balance_k)
+    return np.round(net, 4), np.round(carried + np.cumsum(net), 4)
+
+
+def extend(db: Session, through: date, commit: bool = True) -> int:
+    """Materialize the days after the last stored one through `through`;
+    returns the number of days written (0 if already covered)."""
+    settings = _settings(db)
+    bounds = coverage(db)
+    if settings is None or bounds is None or through <= bounds[1]:
+        return 0
+    tail = _days_after(db, settings, bounds[1], through)
+    if tail is None:
+        return 0
+    written = _insert(db, bounds[1] + timedelta(days=1), *tail)
+    if commit:
+        db.commit()
+    return written
+
+
+# --- Incremental maintenance ---
+
+def apply_deltas(db: Session, deltas: Mapping[date, Decimal]) -> None:
+    """Add `deltas[day]` to that day's net flow and every balance from it on.
+
+    No-op while nothing is materialized; rebuilds if a day falls outside
+    the materialized range. Does not commit.
+    """
+    deltas = {d: Decimal(v) for d, v in deltas.items() if v}
+    if not deltas:
+        return
+    bounds = coverage(db)
+    settings = _settings(db)
+    if bounds is None or settings is None:
+        return
+    lo, hi = bounds
+    if min(deltas) < lo or max(deltas) > hi:
+        rebuild(db, commit=False)
+        return
+
+    table = LiquidityDailyBalance.__table__
+    db.execute(
+        update(table).where(table.c.day == bindparam("d")).values(net_k=table.c.net_k + bindparam("delta")),
+        [{"d": d, "delta": v} for d, v in deltas.items()],
+    )
+    # Flows before the opening date are already in the opening balance, so
+    # they change that day's net but no balance.
+    anchor = settings.opening_balance_date
+    shifts = {d: v for d, v in deltas.items() if d >= anchor}
+    if not shifts:
+        return
+    if len(shifts) <= RANGE_UPDATE_MAX_DAYS:
+        db.execute(
+            update(table).where(table.c.day >= bindparam("d")).values(balance_k=table.c.balance_k + bindparam("delta")),
+            [{"d": d, "delta": v} for d, v in shifts.items()],
+        )
+        return
+
+    first = min(shifts)
+    days, balances = zip(*db.query(LiquidityDailyBalance.day, LiquidityDailyBalance.balance_k)
+                         .filter(LiquidityDailyBalance.day >= first)
+                         .order_by(LiquidityDailyBalance.day))
+    step = np.zeros(len(days), dtype=object)
+    for d, v in shifts.items():
+        step[(d - first).days] = v
+    shift = np.cumsum(step)
+    db.execute(
+        update(table).where(table.c.day == bindparam("d")).values(balance_k=bindparam("b")),
+        [{"d": d, "b": (b + s).quantize(_Q)} for d, b, s in zip(days, balances, shift)],
+    )
+
+
+def apply_transaction_change(
+    db: Session,
+    old: Optional[tuple[date, Decimal]] = None,
+    new: Optional[tuple[date, Decimal]] = None,
+) -> None:
+    """Fold a one-off transaction's `(effective_date, amount_k)` change in."""
+    deltas: dict[date, Decimal] = {}
+    if old is not None:
+        deltas[old[0]] = deltas.get(old[0], Decimal(0)) - Decimal(old[1])
+    if new is not None:
+        deltas[new[0]] = deltas.get(new[0], Decimal(0)) + Decimal(new[1])
+    apply_deltas(db, deltas)
+
+
+def _rule_deltas(rule: Any, sign: int, lo: date, hi: date, into: dict[date, Decimal]) -> None:
+    dates, counts = np.unique(
+        liquidity_series.occurrence_dates(liquidity_series.rule_from_model(rule), lo, hi), return_counts=True
+    )
+    amount = Decimal(str(rule.amount_k)) * sign
+    for d, n in zip(dates.tolist(), counts.tolist()):
+        into[d] = into.get(d, Decimal(0)) + amount * n
+
+
+def apply_rule_change(db: Session, old: Any = None, new: Any = None) -> None:
+    """Fold a recurring rule's change in; `old`/`new` are rule snapshots
+    (anything with the `LiquidityRecurringTransaction` fields)."""
+    bounds = coverage(db)
+    if bounds is None:
+        return
+    deltas: dict[date, Decimal] = {}
+    if old is not None:
+        _rule_deltas(old, -1, *bounds, deltas)
+    if new is not None:
+        _rule_deltas(new, 1, *bounds, deltas)
+    apply_deltas(db, deltas)
+
+
+def apply_settings_change(
+    db: Session,
+    old_opening_k: Optional[Decimal],
+    old_opening_date: Optional[date],
+    settings: LiquiditySettings,
+) -> None:
+    """A new opening date moves the anchor (rebuild); a new opening balance
+    shifts every balance (days before the anchor sit at it)."""
+    if coverage(db) is None:
+        return
+    if old_opening_date != settings.opening_balance_date:
+        rebuild(db, commit=False)
+        return
+    delta = Decimal(settings.opening_balance_k) - Decimal(old_opening_k)
+    if delta:
+        table = LiquidityDailyBalance.__table__
+        db.execute(update(table).values(balance_k=table.c.balance_k + delta))
+
+
+# --- Reads ---
+
+def read_series(
+    db: Session, start: date, end: date, today: Optional[date] = None
+) -> Optional[dict[str, Any]]:
+    """`/liquidity/series` payload for [start, end] from the table, or None
+    when the window starts before it (the caller computes it).
+
+    A window ending past the table first extends it to the current default
+    horizon; days past that are computed from the last stored balance.
+    """
+    settings = _settings(db)
+    if settings is None:
+        return None
+    bounds = coverage(db)
+    if bounds is None:
+        rebuild(db, today=today)
+        bounds = coverage(db)
+    if bounds is None or start < bounds[0]:
+        return None
+    lo, hi = bounds
+    horizon = materialized_range(db, settings, today=today)[1]
+    if end > hi and horizon > hi:
+        try:
+            extend(db, horizon + timedelta(days=EXTEND_AHEAD_DAYS))
+        except IntegrityError:
+            db.rollback()  # another request extended it first
+        lo, hi = coverage(db)
+
+    rows = (
+        db.query(LiquidityDailyBalance.net_k, LiquidityDailyBalance.balance_k)
+        .filter(LiquidityDailyBalance.day >= start, LiquidityDailyBalance.day <= end)
+        .order_by(LiquidityDailyBalance.day)
+        .all()
+    )
+    if len(rows) != max(0, (min(end, hi) - start).days + 1):
+        return None
+    values = np.array(rows, dtype=np.float64).reshape(-1, 2)
+    net, balance = values[:, 0], values[:, 1]
+    if end > hi:
+        tail = _days_after(db, settings, hi, end)
+        if tail is None:
+            return None
+        skip = max(0, (start - hi).days - 1)
+        net = np.concatenate([net, tail[0][skip:]])
+        balance = np.concatenate([balance, tail[1][skip:]])
+    return liquidity_series.series_payload(
+        start, end,
+        float(settings.opening_balance_k), settings.opening_balance_date, float(settings.reserve_k),
+        net, balance,
+    )
+
+
+def verify(db: Session, limit: int = 20) -> dict[str, Any]:
+    """Compare the table with a full recomputation over its range.
+
+    Reports `days`, `mismatch_count` and up to `limit` mismatching days, plus
+    `missing_days` (gaps) and `range_current` (false when the table doesn't
+    cover today's default window; the next read extends it forward, a
+    rebuild fixes anything else).
+    """
+    settings = _settings(db)
+    bounds = coverage(db)
+    report: dict[str, Any] = {
+        "days": 0, "mismatch_count": 0, "mismatches": [], "missing_days": 0, "range_current": True,
+    }
+    if settings is None or bounds is None:
+        report["range_current"] = settings is None
+        return report
+    lo, hi = bounds
+    want_lo, want_hi = materialized_range(db, settings)
+    report["range_current"] = lo <= want_lo and want_hi <= hi
+    expected = _compute(db, settings, lo, hi)
+    stored = {
+        d: (float(n), float(b))
+        for d, n, b in db.query(
+            LiquidityDailyBalance.day, LiquidityDailyBalance.net_k, LiquidityDailyBalance.balance_k
+        )
+    }
+    report["days"] = len(expected["dates"])
+    for iso, net, balance in zip(expected["dates"], expected["net_k"], expected["balance_k"]):
+        day = date.fromisoformat(iso)
+        if day not in stored:
+            report["missing_days"] += 1
+            continue
+        stored_net, stored_balance = stored[day]
+        if abs(stored_net - net) > VERIFY_TOLERANCE or abs(stored_balance - balance) > VERIFY_TOLERANCE:
+            report["mismatch_count"] += 1
+            if len(report["mismatches"]) < limit:
+                report["mismatches"].append({
+                    "day": iso,
+                    "stored_net_k": stored_net, "expected_net_k": net,
+                    "stored_balance_k": stored_balance, "expected_balance_k": balance,
+                })
+    return report
+
+
+def _main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Maintain the liquidity_daily_balances table.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("rebuild", help="recompute every materialized day")
+    verify_parser = sub.add_parser("verify", help="compare the table with a full recomputation")
+    verify_parser.add_argument("--limit", type=int, default=20, help="mismatches to list (default 20)")
+    args = parser.parse_args(argv)
+
+    import main  # noqa: F401  (runs migrations so the table exists)
+    from db import SessionLocal
+
+    with SessionLocal() as db:
+        if args.command == "rebuild":
+            print(json.dumps({"days": rebuild(db)}, indent=2))
+            return 0
+        report = verify(db, limit=args.limit)
+        print(json.dumps(report, indent=2))
+        return 1 if report["mismatch_count"] or report["missing_days"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(_main())
@@ -0,0 +1,203 @@
+"""Server-side daily liquidity series.
+
+Python counterpart of `buildDailyLiquiditySeries` / `expandAllRecurringRules`
+in `frontend/src/utils/liquidityEngine.ts`, with the same semantics:
+
+* `opening_balance_k` is the balance at the start of `opening_balance_date`;
+  days before the anchor are flat at the opening balance, and flows dated
+  before it are ignored (they are already in the opening balance).
+* Recurring rules step from `start_date` by `frequency` x `interval`; month
+  based cadences clamp the day (Jan 31 + 1 month == Feb 28/29). `end_date`
+  and `occurrences` both cap a rule, whichever fires first.
+
+Occurrences are generated per rule as numpy date arrays and summed into a
+per-day net array with `np.add.at`, so cost scales with days in range
+rather than with rules x occurrences in Python. Unlike the browser, rules
+are expanded from the opening-balance date and not just from the visible
+range. That way the balance carried into `start` includes every
+occurrence before it, and there is no 2000-occurrence safety cap (the
+range length bounds the work). The browser also drops the anchor day's own
+flows whenever the range starts after it; here they always count.
+
+All amounts are in $k.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Iterable, Optional, Sequence
+
+import numpy as np
+
+_DAY_STEPS = {"daily": 1, "weekly": 7, "biweekly": 14}
+_MONTH_STEPS = {"monthly": 1, "quarterly": 3, "yearly": 12}
+
+# Longest series one request may ask for (~30 years of days).
+MAX_SERIES_DAYS = 11_000
+
+# computeDefaultRange() defaults on the frontend.
+DEFAULT_LOOKBACK_DAYS = 90
+DEFAULT_HORIZON_MONTHS = 24
+DEFAULT_PADDING_DAYS = 60
+
+
+@dataclass(frozen=True)
+class Rule:
+    amount_k: float
+    start_date: date
+    frequency: str
+    interval: int = 1
+    end_date: Optional[date] = None
+    occurrences: Optional[int] = None
+
+
+def rule_from_model(rule: Any) -> Rule:
+    """`Rule` from a `LiquidityRecurringTransaction` (or anything shaped like one)."""
+    return Rule(
+        amount_k=float(rule.amount_k),
+        start_date=rule.start_date,
+        frequency=rule.frequency,
+        interval=rule.interval or 1,
+        end_date=rule.end_date,
+        occurrences=rule.occurrences,
+    )
+
+
+def _d64(d: date) -> np.datetime64:
+    return np.datetime64(d, "D")
+
+
+def occurrence_dates(rule: Rule, lo: date, hi: date) -> np.ndarray:
+    """`datetime64[D]` dates of `rule`'s occurrences inside [lo, hi]."""
+    stop = min(hi, rule.end_date) if rule.end_date is not None else hi
+    if rule.start_date > stop:
+        return np.empty(0, dtype="datetime64[D]")
+    interval = max(1, rule.interval or 1)
+    start = _d64(rule.start_date)
+
+    if rule.frequency in _DAY_STEPS:
+        step = _DAY_STEPS[rule.frequency] * interval
+        k_min = max(0, -(-(lo - rule.start_date).days // step))
+        k = np.arange(k_min, (stop - rule.start_date).days // step + 1, dtype=np.int64)
+        dates = start + k * step
+    elif rule.frequency in _MONTH_STEPS:
+        step = _MONTH_STEPS[rule.frequency] * interval
+
+        def months_to(d: date) -> int:
+            return (d.year - rule.start_date.year) * 12 + d.month - rule.start_date.month
+
+        # One step of slack below `lo`: the clamped day may fall either side.
+        k_min = max(0, months_to(lo) // step - 1)
+        k = np.arange(k_min, months_to(stop) // step + 1, dtype=np.int64)
+        month = start.astype("datetime64[M]") + k * step
+        first = month.astype("datetime64[D]")
+        month_len = ((month + 1).astype("datetime64[D]") - first).astype(np.int64)
+        dates = first + np.minimum(rule.start_date.day, month_len) - 1
+    else:
+        # Unreachable while the Literal type holds; mirror the frontend.
+        k = np.zeros(1, dtype=np.int64)
+        dates = np.array([start])
+
+    keep = (dates >= _d64(lo)) & (dates <= _d64(stop))
+    if rule.occurrences is not None:
+        keep &= k < rule.occurrences
+    return dates[keep]
+
+
+def default_range(
+    one_off_dates: Iterable[date],
+    opening_balance_date: date,
+    today: Optional[date] = None,
+) -> tuple[date, date]:
+    """Same window as the frontend's `computeDefaultRange`."""
+    today = today or date.today()
+    earliest = latest = opening_balance_date
+    for d in one_off_dates:
+        earliest, latest = min(earliest, d), max(latest, d)
+    horizon = today + timedelta(days=DEFAULT_HORIZON_MONTHS * 30)
+    return (
+        min(earliest, today - timedelta(days=DEFAULT_LOOKBACK_DAYS)),
+        max(latest, horizon) + timedelta(days=DEFAULT_PADDING_DAYS),
+    )
+
+
+def check_range(start: date, end: date) -> None:
+    if end < start:
+        raise ValueError("end must be on or after start")
+    if (end - start).days + 1 > MAX_SERIES_DAYS:
+        raise ValueError(f"Range is limited to {MAX_SERIES_DAYS} days")
+
+
+def build_series(
+    transactions: Sequence[tuple[date, float]],
+    rules: Sequence[Rule],
+    opening_balance_k: float,
+    opening_balance_date: date,
+    start: date,
+    end: date,
+    reserve_k: float = 0.0,
+) -> dict[str, Any]:
+    """Columnar daily series over [start, end] (inclusive)."""
+    check_range(start, end)
+
+    # Flows count from the anchor; the window reaches back to it so the
+    # balance carried into `start` is right.
+    lo = min(start, opening_balance_date)
+    n = (end - lo).days + 1
+    net = np.zeros(n, dtype=np.float64)
+    origin = _d64(lo)
+
+    if transactions:
+        when = np.array([d for d, _ in transactions], dtype="datetime64[D]")
+        amount = np.array([a for _, a in transactions], dtype=np.float64)
+        keep = (when >= origin) & (when <= _d64(end))
+        np.add.at(net, (when[keep] - origin).astype(np.int64), amount[keep])
+    for rule in rules:
+        dates = occurrence_dates(rule, lo, end)
+        if dates.size:
+            np.add.at(net, (dates - origin).astype(np.int64), rule.amount_k)
+
+    anchor = (opening_balance_date - lo).days
+    flows = net.copy()
+    flows[:anchor] = 0.0
+    balance = np.round(opening_balance_k + np.cumsum(flows), 4)
+
+    offset = (start - lo).days
+    return series_payload(
+        start, end, opening_balance_k, opening_balance_date, reserve_k,
+        np.round(net[offset:], 4), balance[offset:],
+    )
+
+
+def series_payload(
+    start: date,
+    end: date,
+    opening_balance_k: float,
+    opening_balance_date: date,
+    reserve_k: float,
+    net: np.ndarray,
+    balance: np.ndarray,
+) -> dict[str, Any]:
+    """Response shape shared by live computation and `liquidity_daily` reads;
+    `net`/`balance` hold one value per day of [start, end]."""
+    dates = np.arange(_d64(start), _d64(end) + 1)
+    min_balance = float(balance.min())
+    negative = np.flatnonzero(balance < 0)
+    breach = np.flatnonzero((balance < reserve_k) & (balance >= 0))
+    iso = dates.astype(str).tolist()
+    return {
+        "start": start,
+        "end": end,
+        "opening_balance_k": opening_balance_k,
+        "opening_balance_date": opening_balance_date,
+        "reserve_k": reserve_k,
+        "dates": iso,
+        "net_k": net.tolist(),
+        "balance_k": balance.tolist(),
+        "min_balance_k": min_balance,
+        "min_balance_dates": [iso[i] for i in np.flatnonzero(balance == min_balance)],
+        "first_negative_date": iso[negative[0]] if negative.size else None,
+        "negative_days": int(negative.size),
+        "first_reserve_breach_date": iso[breach[0]] if breach.size else None,
+    }
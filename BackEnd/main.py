@@ -1,15 +1,37 @@
-from typing import Union, List, Optional
+from typing import Union, List, Optional, Literal
 from decimal import Decimal
 from datetime import datetime, date as date_cls
+from functools import lru_cache
+from urllib.parse import quote
 
-from fastapi import Depends, FastAPI, HTTPException, Body, File, Form, UploadFile, Query
+from fastapi import Depends, FastAPI, HTTPException, Body, File, Form, UploadFile, Query, Request
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.orm import Session, sessionmaker
 
 from ReqRes.analyzeBRRR.analyzeBRRRReq import analyzeBRRRReq
 from ReqRes.analyzeBRRR.analyzeBRRRRes import analyzeBRRRRes
+from ReqRes.analyzeBRRR.analyzeBRRRBatchReq import analyzeBRRRBatchReq
+from ReqRes.analyzeBRRR.analyzeBRRRBatchRes import analyzeBRRRBatchRes
+from ReqRes.analyzeBRRR.analyzeBRRRSensitivityReq import analyzeBRRRSensitivityReq
+from ReqRes.analyzeBRRR.analyzeBRRRSensitivityRes import analyzeBRRRSensitivityRes
+from ReqRes.analyzeBRRR.analyzeBRRRMonteCarloReq import analyzeBRRRMonteCarloReq
+from ReqRes.analyzeBRRR.analyzeBRRRMonteCarloRes import analyzeBRRRMonteCarloRes
+from ReqRes.analyzeBRRR.analyzeBRRRMaxOfferReq import analyzeBRRRMaxOfferReq
+from ReqRes.analyzeBRRR.analyzeBRRRMaxOfferRes import analyzeBRRRMaxOfferRes
+from ReqRes.analyzeBRRR.analyzeBRRRAmortizationRes import analyzeBRRRAmortizationRes
+from ReqRes.reports.reportJobRes import reportJobRes
+from ReqRes.reports.portfolioPdfReq import portfolioPdfReq
 from ReqRes.analyzeFlip.analyzeFlipReq import analyzeFlipReq
 from ReqRes.analyzeFlip.analyzeFlipRes import analyzeFlipRes
+from ReqRes.analyzeFlip.analyzeFlipBatchReq import analyzeFlipBatchReq
+from ReqRes.analyzeFlip.analyzeFlipBatchRes import analyzeFlipBatchRes
+from ReqRes.analyzeFlip.analyzeFlipMonteCarloReq import analyzeFlipMonteCarloReq
+from ReqRes.analyzeFlip.analyzeFlipMonteCarloRes import analyzeFlipMonteCarloRes
+from ReqRes.analyzeFlip.analyzeFlipMaxOfferReq import analyzeFlipMaxOfferReq
+from ReqRes.analyzeFlip.analyzeFlipMaxOfferRes import analyzeFlipMaxOfferRes
 from ReqRes.activeDeal.activeDealReq import (
     BrrrActiveDealCreate, BrrrActiveDealRes,
     FlipActiveDealCreate, FlipActiveDealRes
@@ -21,14 +43,14 @@ from ReqRes.boughtDeal.boughtDealReq import (
 
 from crud_active_deal import (
     add_brrr_deal, add_flip_deal,
-    get_all_brrr_deals, get_all_flip_deals,
+    get_brrr_deal, get_flip_deal,
     update_brrr_deal, update_flip_deal,
     delete_brrr_deal, delete_flip_deal,
     duplicate_brrr_deal, duplicate_flip_deal
 )
 from crud_bought_deal import (
     add_bought_brrr_deal, add_bought_flip_deal,
-    get_all_bought_brrr_deals, get_all_bought_flip_deals,
+    get_bought_brrr_deal, get_bought_flip_deal,
     update_bought_brrr_deal, update_bought_flip_deal,
     delete_bought_brrr_deal, delete_bought_flip_deal,
     create_bought_from_active_brrr, create_bought_from_active_flip
@@ -50,7 +72,7 @@ from ReqRes.liquidity.liquidityReq import (
     LiquidityTransactionCreate, LiquidityTransactionUpdate, LiquidityTransactionRes,
     LiquidityRecurringTransactionCreate, LiquidityRecurringTransactionUpdate,
     LiquidityRecurringTransactionRes,
-    LiquiditySettingsUpdate, LiquiditySettingsRes,
+    LiquiditySettingsUpdate, LiquiditySettingsRes, LiquiditySeriesRes,
 )
 from ReqRes.pipelineTemplate import (
     PipelineTemplateUpsert,
@@ -58,12 +80,14 @@ from ReqRes.pipelineTemplate import (
     PipelineTemplateStatsRes,
 )
 from ReqRes.email.sendOfferReq import SendOfferReq
-from ReqRes.email.sendOfferRes import SendOfferRes
+from ReqRes.email.sendOfferRes import SendOfferRes, OfferEmailStatusRes
+from ReqRes.email.sendOfferBatchReq import SendOfferBatchReq
+from ReqRes.email.sendOfferBatchRes import SendOfferBatchRes, SendOfferBatchResult
 from db import Base, engine, SessionLocal, get_db
 from models import (
     BrrrActiveDeal, FlipActiveDeal, BoughtBrrrDeal, BoughtFlipDeal,
     LiquidityTransaction, LiquidityRecurringTransaction, PipelineTemplate,
-    RepsPerson, RepsProperty, RepsActivityCategory,
+    RepsPerson, RepsProperty, RepsActivityCategory, OutboundEmail,
     DEFAULT_BRRRR_STAGE_SLUGS_BY_LEGACY_INT,
     DEFAULT_FLIP_STAGE_SLUGS_BY_LEGACY_INT,
     LIQUIDITY_RECURRING_FREQUENCIES,
@@ -80,14 +104,24 @@ from ReqRes.reps.repsReq import (
 import crud_reps
 import reps_service
 import mercury_service
+import mercury_cache
+import liquidity_series
+import liquidity_daily
+import vector_calc
+import monte_carlo
+import offer_solver
+import deal_metrics
+import deal_listing
+import deal_export
+import pdf_jobs
+import email_queue
+from offer_email import render_offer_email, dedupe_key as offer_dedupe_key
 from mercury_service import MercuryApiError, MercuryConfigError
 from calc_breakdown import CalcBreakdown, fmt_money, fmt_pct, fmt_num
-from deal_pdf import build_deal_pdf
-from sqlalchemy import text, inspect as sa_inspect
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from deal_pdf import build_deal_pdf, stream_portfolio_pdf
+from sqlalchemy import func, text, inspect as sa_inspect
 import os
+import uuid
 import logging
 
 from dotenv import load_dotenv
@@ -97,6 +131,7 @@ load_dotenv()
 # Register treasury ORM models so `create_all` picks up the new tables.
 import treasury.models  # noqa: F401
 from treasury.controllers import router as treasury_router
+from treasury.services import ledger_aggregate_service
 
 # Configure logging
 logging.basicConfig(
@@ -284,18 +319,76 @@ def _run_migrations():
             prop_cols.remove("target_reserve_allocation")
 
     if "transaction_ledger" in table_names:
+        ledger_cols = [col["name"] for col in inspector.get_columns("transaction_ledger")]
         with engine.begin() as conn:
             conn.execute(text(
                 "UPDATE transaction_ledger "
                 "SET sub_bucket_assignment = NULL "
                 "WHERE sub_bucket_assignment = 'Insurance'"
             ))
+            # Bank transaction id for idempotent webhook / nightly-sync ingestion.
+            if "external_id" not in ledger_cols:
+                conn.execute(text("ALTER TABLE transaction_ledger ADD COLUMN external_id VARCHAR"))
+            conn.execute(text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS ix_transaction_ledger_external_id "
+                "ON transaction_ledger (external_id)"
+            ))
+            # Month-to-date window sums (rent received, Tax / Reserve
+            # allocated); `amount` last so the SUM never touches the table.
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_transaction_ledger_rent_window ON transaction_ledger "
+                "(property_id, transaction_type, is_real_bank_tx, timestamp, amount)"
+            ))
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_transaction_ledger_bucket_window ON transaction_ledger "
+                "(property_id, sub_bucket_assignment, is_real_bank_tx, timestamp, amount)"
+            ))
+            # Audit log keyset pages `(timestamp, transaction_id) DESC`,
+            # overall and per property. The latter supersedes the
+            # single-column property_id index; the timestamp-only pair
+            # predates the transaction_id tiebreak.
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_transaction_ledger_timestamp_id "
+                "ON transaction_ledger (timestamp DESC, transaction_id DESC)"
+            ))
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_transaction_ledger_property_timestamp_id "
+                "ON transaction_ledger (property_id, timestamp DESC, transaction_id DESC)"
+            ))
+            for stale_index in (
+                "ix_transaction_ledger_property_id",
+                "ix_transaction_ledger_timestamp",
+                "ix_transaction_ledger_property_timestamp",
+            ):
+                conn.execute(text(f"DROP INDEX IF EXISTS {stale_index}"))
 
     # Migrate `bought_stage` from INTEGER -> TEXT, mapping legacy numeric IDs
     # to the stable slug IDs used by the default pipeline template. Idempotent.
     _migrate_bought_stage_to_string(inspector, "bought_brrrr_deals", DEFAULT_BRRRR_STAGE_SLUGS_BY_LEGACY_INT)
     _migrate_bought_stage_to_string(inspector, "bought_flip_deals", DEFAULT_FLIP_STAGE_SLUGS_BY_LEGACY_INT)
 
+    # Offer dedupe and the send-rate window arrived after `outbound_emails`.
+    if "outbound_emails" in table_names:
+        columns = [col["name"] for col in inspector.get_columns("outbound_emails")]
+        with engine.begin() as conn:
+            if "dedupe_key" not in columns:
+                conn.execute(text("ALTER TABLE outbound_emails ADD COLUMN dedupe_key VARCHAR"))
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_outbound_emails_dedupe_key ON outbound_emails (dedupe_key)"
+            ))
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_outbound_emails_sent_at ON outbound_emails (sent_at)"
+            ))
+
+    # Keyset pagination on the deal lists walks `(created_at, id) DESC`.
+    for deal_table in ("active_deals", "flip_deals", "bought_brrrr_deals", "bought_flip_deals"):
+        if deal_table in table_names:
+            with engine.begin() as conn:
+                conn.execute(text(
+                    f"CREATE INDEX IF NOT EXISTS ix_{deal_table}_created_at_id "
+                    f"ON {deal_table} (created_at DESC, id DESC)"
+                ))
+
 
 def _migrate_bought_stage_to_string(
     inspector,
@@ -360,6 +453,12 @@ with SessionLocal() as _seed_db:
         crud_reps.ensure_activity_category_defaults(_seed_db)
     except Exception as _exc:  # pragma: no cover
         logger.warning("Failed to seed REPS activity categories: %s", _exc)
+    # First boot with the monthly ledger aggregates: build them from the ledger.
+    try:
+        ledger_aggregate_service.ensure_backfilled(_seed_db)
+    except Exception as _exc:  # pragma: no cover
+        _seed_db.rollback()
+        logger.warning("Failed to backfill ledger monthly aggregates: %s", _exc)
 
 
 app.add_middleware(
@@ -374,6 +473,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 
@@ -483,16 +583,70 @@ def calc_cash_out_routi(arv, ltv, down_payment_precent, purchase_price, rehab_co
 
 
 
-def calc_mortgage_payment(arv, ltv, interest_rate, loan_term_years):
-    loan_amount = arv * ltv
+# The Decimal power below only depends on (rate, term), and list views,
+# exports and batch requests hit the same handful of pairs over and over.
+# Bounded so a stream of odd rates can't grow it without limit.
+@lru_cache(maxsize=1024)
+def annuity_factor(interest_rate: Decimal, loan_term_years: int) -> tuple[Decimal, Decimal, Decimal]:
+    """`(monthly rate, (1 + r) ** n, (1 + r) ** n - 1)` for a fixed-rate loan."""
     monthly_interest_rate = (interest_rate / Decimal("100.0")) / Decimal("12.0")
     total_payments = loan_term_years * 12
     factor = (1 + monthly_interest_rate) ** total_payments
-    denominator = factor - 1
+    return monthly_interest_rate, factor, factor - 1
+
+
+def calc_mortgage_payment(arv, ltv, interest_rate, loan_term_years):
+    loan_amount = arv * ltv
+    monthly_interest_rate, factor, denominator = annuity_factor(interest_rate, loan_term_years)
     if denominator == 0:
         raise HTTPException(status_code=400, detail="Unable to calculate mortgage payment.")
     return loan_amount * monthly_interest_rate * factor / denominator
 
+
+@lru_cache(maxsize=128)
+def amortization_schedule(loan_amount: Decimal, interest_rate: Decimal, loan_term_years: int) -> dict:
+    """Month-by-month principal/interest/balance for a fixed-rate loan.
+
+    Cached, so callers must treat the result as read-only. Amounts are
+    rounded to cents per row; the last payment absorbs the rounding so the
+    balance ends at exactly zero.
+    """
+    monthly_interest_rate, factor, denominator = annuity_factor(interest_rate, loan_term_years)
+    if denominator == 0:
+        raise HTTPException(status_code=400, detail="Unable to calculate mortgage payment.")
+    cent = Decimal("0.01")
+    payment = (loan_amount * monthly_interest_rate * factor / denominator).quantize(cent)
+    total_payments = loan_term_years * 12
+
+    schedule = []
+    balance = loan_amount.quantize(cent)
+    total_interest = Decimal("0")
+    for month in range(1, total_payments + 1):
+        interest = (balance * monthly_interest_rate).quantize(cent)
+        principal = payment - interest
+        if month == total_payments or principal > balance:
+            principal = balance
+        balance -= principal
+        total_interest += interest
+        schedule.append({
+            "month": month,
+            "payment": float(principal + interest),
+            "principal": float(principal),
+            "interest": float(interest),
+            "balance": float(balance),
+        })
+        if balance == 0:
+            break
+    return {
+        "loan_amount": float(loan_amount),
+        "interest_rate": float(interest_rate),
+        "loan_term_years": loan_term_years,
+        "monthly_payment": float(payment),
+        "total_interest": float(total_interest),
+        "total_paid": float(loan_amount.quantize(cent) + total_interest),
+        "schedule": schedule,
+    }
+
 def calc_cash_on_cash(cash_out_from_deal, cash_flow):
     if cash_out_from_deal >= 0: return Decimal("-1") 
     elif cash_flow <= 0: return Decimal("-2")
@@ -534,10 +688,12 @@ def get_total_cash_needed_for_deal(down_payment_precent, purchase_price, holding
     total_cash_needed_with_buffer = down_payment_in_cash + total_holding_cash + total_closing_buy + HML_points_in_cash + total_rehab_cash_needed + total_interest_cash
     return (total_cash_needed_without_buffer, total_cash_needed_with_buffer)
 
-def calculate_brrr_results(payload) -> analyzeBRRRRes:
+def calculate_brrr_results(payload, include_breakdown: bool = True) -> analyzeBRRRRes:
     # Self-documenting calculation: each intermediate variable below registers
     # its own CalcStep next to the line that produces it. Math is unchanged.
-    breakdown = CalcBreakdown()
+    # Formulas are passed as lambdas so nothing is formatted unless the caller
+    # asked for the breakdown (list endpoints don't; `breakdowns` is then None).
+    breakdown = CalcBreakdown(enabled=include_breakdown)
 
     arv = thousands_to_dollars(payload.arv_in_thousands)
     purchase_price = thousands_to_dollars(payload.purchase_price_in_thousands)
@@ -554,7 +710,7 @@ def calculate_brrr_results(payload) -> analyzeBRRRRes:
         "cash_flow",
         "Monthly Operating Expenses",
         operating_expenses,
-        f"Rent ({fmt_money(payload.rent)}) × (Vacancy {fmt_pct(payload.vacancy_percent)} + Mgmt {fmt_pct(payload.property_managment_fee_precentages_from_rent)} + Maint {fmt_pct(payload.maintenance_percent)} + CapEx {fmt_pct(payload.capex_percent_of_rent)}) + Taxes ({fmt_money(payload.annual_property_taxes)})/12 + Insurance ({fmt_money(payload.annual_insurance)})/12 + HOA ({fmt_money(payload.montly_hoa)}) = {fmt_money(operating_expenses)}",
+        lambda: f"Rent ({fmt_money(payload.rent)}) × (Vacancy {fmt_pct(payload.vacancy_percent)} + Mgmt {fmt_pct(payload.property_managment_fee_precentages_from_rent)} + Maint {fmt_pct(payload.maintenance_percent)} + CapEx {fmt_pct(payload.capex_percent_of_rent)}) + Taxes ({fmt_money(payload.annual_property_taxes)})/12 + Insurance ({fmt_money(payload.annual_insurance)})/12 + HOA ({fmt_money(payload.montly_hoa)}) = {fmt_money(operating_expenses)}",
     )
     closing_costs_buy = thousands_to_dollars(payload.closing_costs_buy_in_thousands)
     closing_cost_refi = thousands_to_dollars(payload.closing_cost_refi_in_thousands)
@@ -569,14 +725,14 @@ def calculate_brrr_results(payload) -> analyzeBRRRRes:
         ["cash_out", "equity"],
         "Refi Loan Amount",
         _brrr_loan_amount,
-        f"ARV ({fmt_money(arv)}) × LTV {fmt_pct(payload.ltv_as_precent)} = {fmt_money(_brrr_loan_amount)}",
+        lambda: f"ARV ({fmt_money(arv)}) × LTV {fmt_pct(payload.ltv_as_precent)} = {fmt_money(_brrr_loan_amount)}",
     )
     _brrr_hml_payoff = get_HML_amount(purchase_price, payload.down_payment, rehab_cost, payload.use_HM_for_rehab)
     breakdown.add(
         "cash_out",
         "HML Payoff at Refi",
         _brrr_hml_payoff,
-        (f"Purchase Loan + Rehab ({fmt_money(_brrr_hml_payoff)}) — full HM stack carried into refi"
+        (lambda: f"Purchase Loan + Rehab ({fmt_money(_brrr_hml_payoff)}) — full HM stack carried into refi"
          if payload.use_HM_for_rehab
          else f"Purchase Loan only = (1 − Down Payment {fmt_pct(payload.down_payment)}) × Purchase ({fmt_money(purchase_price)}) = {fmt_money(_brrr_hml_payoff)}"),
     )
@@ -586,13 +742,13 @@ def calculate_brrr_results(payload) -> analyzeBRRRRes:
         "cash_out",
         "Total Cash Invested (pre-refi)",
         _brrr_total_cash_invested,
-        f"Down Payment ({fmt_money(_brrr_down_payment_cash)}) + Closing ({fmt_money(closing_costs_buy)}) + HML Points ({fmt_money(HML_points_in_cash)}) + Rehab Out-of-Pocket ({fmt_money(rehab_cost * (1 - int(payload.use_HM_for_rehab)))}) + HML Interest ({fmt_money(HML_interest_in_cash)}) + Holding ({fmt_money(holding_cost_until_refi)}) = {fmt_money(_brrr_total_cash_invested)}",
+        lambda: f"Down Payment ({fmt_money(_brrr_down_payment_cash)}) + Closing ({fmt_money(closing_costs_buy)}) + HML Points ({fmt_money(HML_points_in_cash)}) + Rehab Out-of-Pocket ({fmt_money(rehab_cost * (1 - int(payload.use_HM_for_rehab)))}) + HML Interest ({fmt_money(HML_interest_in_cash)}) + Holding ({fmt_money(holding_cost_until_refi)}) = {fmt_money(_brrr_total_cash_invested)}",
     )
     breakdown.add(
         ["net_profit", "roi", "cash_on_cash", "cash_out"],
         "Cash Out from Deal",
         cash_out_from_deal,
-        f"Refi Loan ({fmt_money(_brrr_loan_amount)}) − HML Payoff ({fmt_money(_brrr_hml_payoff)}) − Refi Closing ({fmt_money(closing_cost_refi)}) − Refi Points ({fmt_money(refi_points_in_cash)}) − Cash Reserve ({fmt_money(cash_reserve_in_cash)}) − Total Cash Invested ({fmt_money(_brrr_total_cash_invested)}) = {fmt_money(cash_out_from_deal)}",
+        lambda: f"Refi Loan ({fmt_money(_brrr_loan_amount)}) − HML Payoff ({fmt_money(_brrr_hml_payoff)}) − Refi Closing ({fmt_money(closing_cost_refi)}) − Refi Points ({fmt_money(refi_points_in_cash)}) − Cash Reserve ({fmt_money(cash_reserve_in_cash)}) − Total Cash Invested ({fmt_money(_brrr_total_cash_invested)}) = {fmt_money(cash_out_from_deal)}",
     )
     cash_out_routi = calc_cash_out_routi(arv, ltv, payload.down_payment, purchase_price, rehab_cost, closing_cost_refi, refi_points_in_cash, payload.use_HM_for_rehab, cash_reserve_in_cash)
     mortgage_payment = calc_mortgage_payment(arv, ltv, payload.interest_rate, payload.loan_term_years)
@@ -600,7 +756,7 @@ def calculate_brrr_results(payload) -> analyzeBRRRRes:
         ["cash_flow", "dscr"],
         "Monthly Mortgage Payment",
         mortgage_payment,
-        f"Amortize Loan ({fmt_money(_brrr_loan_amount)} = ARV {fmt_money(arv)} × LTV {fmt_pct(payload.ltv_as_precent)}) at {fmt_pct(payload.interest_rate)}/yr over {payload.loan_term_years} years = {fmt_money(mortgage_payment)}",
+        lambda: f"Amortize Loan ({fmt_money(_brrr_loan_amount)} = ARV {fmt_money(arv)} × LTV {fmt_pct(payload.ltv_as_precent)}) at {fmt_pct(payload.interest_rate)}/yr over {payload.loan_term_years} years = {fmt_money(mortgage_payment)}",
     )
 
     net_operating_income = payload.rent - operating_expenses
@@ -608,14 +764,14 @@ def calculate_brrr_results(payload) -> analyzeBRRRRes:
         "cash_flow",
         "Net Operating Income (NOI)",
         net_operating_income,
-        f"Rent ({fmt_money(payload.rent)}) − Operating Expenses ({fmt_money(operating_expenses)}) = {fmt_money(net_operating_income)}",
+        lambda: f"Rent ({fmt_money(payload.rent)}) − Operating Expenses ({fmt_money(operating_expenses)}) = {fmt_money(net_operating_income)}",
     )
     cash_flow = net_operating_income - mortgage_payment
     breakdown.add(
         ["cash_flow", "roi", "cash_on_cash"],
         "Monthly Cash Flow",
         cash_flow,
-        f"NOI ({fmt_money(net_operating_income)}) − Mortgage ({fmt_money(mortgage_payment)}) = {fmt_money(cash_flow)}",
+        lambda: f"NOI ({fmt_money(net_operating_income)}) − Mortgage ({fmt_money(mortgage_payment)}) = {fmt_money(cash_flow)}",
     )
     dscr =  calcDSCR(payload.rent, payload.annual_property_taxes, payload.annual_insurance, payload.montly_hoa, mortgage_payment)
     # Decompose PITIA only for the formula narrative (matches calcDSCR internals).
@@ -624,16 +780,16 @@ def calculate_brrr_results(payload) -> analyzeBRRRRes:
         "dscr",
         "DSCR",
         dscr,
-        (f"Rent ({fmt_money(payload.rent)}) / PITIA ({fmt_money(_brrr_pitia)} = Mortgage + Taxes/12 + Ins/12 + HOA) = {fmt_num(dscr)}"
+        (lambda: f"Rent ({fmt_money(payload.rent)}) / PITIA ({fmt_money(_brrr_pitia)} = Mortgage + Taxes/12 + Ins/12 + HOA) = {fmt_num(dscr)}"
          if _brrr_pitia else "PITIA is 0 → DSCR undefined"),
     )
     cash_on_cash = calc_cash_on_cash(cash_out_from_deal, cash_flow)
-    if cash_out_from_deal >= 0:
-        _brrr_coc_formula = f"Cash Out ({fmt_money(cash_out_from_deal)}) ≥ 0 → no equity at risk (∞)"
-    elif cash_flow <= 0:
-        _brrr_coc_formula = f"Cash Flow ({fmt_money(cash_flow)}) ≤ 0 → CoC undefined (-∞)"
-    else:
-        _brrr_coc_formula = f"Annual Cash Flow ({fmt_money(cash_flow * 12)}) / |Cash Out| ({fmt_money(abs(cash_out_from_deal))}) × 100 = {fmt_pct(cash_on_cash)}"
+    def _brrr_coc_formula():
+        if cash_out_from_deal >= 0:
+            return f"Cash Out ({fmt_money(cash_out_from_deal)}) ≥ 0 → no equity at risk (∞)"
+        elif cash_flow <= 0:
+            return f"Cash Flow ({fmt_money(cash_flow)}) ≤ 0 → CoC undefined (-∞)"
+        return f"Annual Cash Flow ({fmt_money(cash_flow * 12)}) / |Cash Out| ({fmt_money(abs(cash_out_from_deal))}) × 100 = {fmt_pct(cash_on_cash)}"
     breakdown.add("cash_on_cash", "Cash on Cash", cash_on_cash, _brrr_coc_formula)
     # Cash reserve is treated as an immediate principal paydown on the DSCR
     # loan, so the post-refi loan balance is `arv*ltv - cash_reserve`. That
@@ -644,22 +800,22 @@ def calculate_brrr_results(payload) -> analyzeBRRRRes:
         ["net_profit", "roi", "equity"],
         "Equity (post-refi)",
         equity,
-        f"ARV ({fmt_money(arv)}) × (1 − LTV {fmt_pct(payload.ltv_as_precent)}) + Cash Reserve ({fmt_money(cash_reserve_in_cash)}) = {fmt_money(equity)}",
+        lambda: f"ARV ({fmt_money(arv)}) × (1 − LTV {fmt_pct(payload.ltv_as_precent)}) + Cash Reserve ({fmt_money(cash_reserve_in_cash)}) = {fmt_money(equity)}",
     )
     net_profit = equity + cash_out_from_deal
     breakdown.add(
         ["net_profit", "roi"],
         "Net Profit",
         net_profit,
-        f"Equity ({fmt_money(equity)}) + Cash Out ({fmt_money(cash_out_from_deal)}) = {fmt_money(net_profit)}",
+        lambda: f"Equity ({fmt_money(equity)}) + Cash Out ({fmt_money(cash_out_from_deal)}) = {fmt_money(net_profit)}",
     )
     roi = calc_roi(cash_out_from_deal, cash_flow, net_profit)
-    if cash_out_from_deal >= 0:
-        _brrr_roi_formula = f"Cash Out ({fmt_money(cash_out_from_deal)}) ≥ 0 → no equity at risk (∞)"
-    elif cash_flow <= 0:
-        _brrr_roi_formula = f"Cash Flow ({fmt_money(cash_flow)}) ≤ 0 → ROI undefined (-∞)"
-    else:
-        _brrr_roi_formula = f"(Annual Cash Flow ({fmt_money(cash_flow * 12)}) + Net Profit ({fmt_money(net_profit)})) / |Cash Out| ({fmt_money(abs(cash_out_from_deal))}) × 100 = {fmt_pct(roi)}"
+    def _brrr_roi_formula():
+        if cash_out_from_deal >= 0:
+            return f"Cash Out ({fmt_money(cash_out_from_deal)}) ≥ 0 → no equity at risk (∞)"
+        elif cash_flow <= 0:
+            return f"Cash Flow ({fmt_money(cash_flow)}) ≤ 0 → ROI undefined (-∞)"
+        return f"(Annual Cash Flow ({fmt_money(cash_flow * 12)}) + Net Profit ({fmt_money(net_profit)})) / |Cash Out| ({fmt_money(abs(cash_out_from_deal))}) × 100 = {fmt_pct(roi)}"
     breakdown.add("roi", "ROI", roi, _brrr_roi_formula)
     total_cash_needed_without_buffer, total_cash_needed_with_buffer = get_total_cash_needed_for_deal(payload.down_payment, purchase_price, holding_cost_until_refi, closing_costs_buy, HML_points_in_cash, rehab_cost, HML_interest_in_cash, payload.use_HM_for_rehab)
     # Surface the same components the helper sums internally so the user can
@@ -669,25 +825,25 @@ def calculate_brrr_results(payload) -> analyzeBRRRRes:
         ["total_cash_needed_for_deal", "total_cash_needed_for_deal_with_buffer"],
         "Down Payment (cash)",
         _brrr_down_payment_cash,
-        f"{fmt_pct(payload.down_payment)} × Purchase ({fmt_money(purchase_price)}) = {fmt_money(_brrr_down_payment_cash)}",
+        lambda: f"{fmt_pct(payload.down_payment)} × Purchase ({fmt_money(purchase_price)}) = {fmt_money(_brrr_down_payment_cash)}",
     )
     breakdown.add(
         ["total_cash_needed_for_deal", "total_cash_needed_for_deal_with_buffer"],
         "Closing Costs (Buy)",
         closing_costs_buy,
-        f"{fmt_money(closing_costs_buy)}",
+        lambda: f"{fmt_money(closing_costs_buy)}",
     )
     breakdown.add(
         ["total_cash_needed_for_deal", "total_cash_needed_for_deal_with_buffer"],
         "HML Points (cash)",
         HML_points_in_cash,
-        f"{fmt_pct(payload.HML_points)} × HML Amount ({fmt_money(_brrr_hml_payoff)}) = {fmt_money(HML_points_in_cash)}",
+        lambda: f"{fmt_pct(payload.HML_points)} × HML Amount ({fmt_money(_brrr_hml_payoff)}) = {fmt_money(HML_points_in_cash)}",
     )
     breakdown.add(
         ["total_cash_needed_for_deal", "total_cash_needed_for_deal_with_buffer"],
         "Rehab Cash (out-of-pocket)",
         _brrr_rehab_cash_needed,
-        (f"Rehab ({fmt_money(rehab_cost)}) is financed via HM → no out-of-pocket = {fmt_money(_brrr_rehab_cash_needed)}"
+        (lambda: f"Rehab ({fmt_money(rehab_cost)}) is financed via HM → no out-of-pocket = {fmt_money(_brrr_rehab_cash_needed)}"
          if payload.use_HM_for_rehab
          else f"Rehab ({fmt_money(rehab_cost)}) paid in cash = {fmt_money(_brrr_rehab_cash_needed)}"),
     )
@@ -695,19 +851,19 @@ def calculate_brrr_results(payload) -> analyzeBRRRRes:
         "total_cash_needed_for_deal",
         "HML Interest (cash, until refi)",
         HML_interest_in_cash,
-        f"{fmt_money(HML_interest_in_cash)} accrued over {payload.Months_until_refi} months at {fmt_pct(payload.HML_interest_rate)}/yr",
+        lambda: f"{fmt_money(HML_interest_in_cash)} accrued over {payload.Months_until_refi} months at {fmt_pct(payload.HML_interest_rate)}/yr",
     )
     breakdown.add(
         "total_cash_needed_for_deal",
         "Holding Costs (until refi)",
         holding_cost_until_refi,
-        f"Taxes + Insurance + HOA accrued over {payload.Months_until_refi} months = {fmt_money(holding_cost_until_refi)}",
+        lambda: f"Taxes + Insurance + HOA accrued over {payload.Months_until_refi} months = {fmt_money(holding_cost_until_refi)}",
     )
     breakdown.add(
         "total_cash_needed_for_deal",
         "Total Cash Needed",
         total_cash_needed_without_buffer,
-        f"Down Payment ({fmt_money(_brrr_down_payment_cash)}) + Closing ({fmt_money(closing_costs_buy)}) + HML Points ({fmt_money(HML_points_in_cash)}) + Rehab Cash ({fmt_money(_brrr_rehab_cash_needed)}) + HML Interest ({fmt_money(HML_interest_in_cash)}) + Holding ({fmt_money(holding_cost_until_refi)}) = {fmt_money(total_cash_needed_without_buffer)}",
+        lambda: f"Down Payment ({fmt_money(_brrr_down_payment_cash)}) + Closing ({fmt_money(closing_costs_buy)}) + HML Points ({fmt_money(HML_points_in_cash)}) + Rehab Cash ({fmt_money(_brrr_rehab_cash_needed)}) + HML Interest ({fmt_money(HML_interest_in_cash)}) + Holding ({fmt_money(holding_cost_until_refi)}) = {fmt_money(total_cash_needed_without_buffer)}",
     )
     # Buffered version applies the same multipliers the helper uses internally
     # (closing × 1.1, holding × 1.5, HML interest × 1.5, rehab × 1.5).
@@ -718,25 +874,25 @@ def calculate_brrr_results(payload) -> analyzeBRRRRes:
         "total_cash_needed_for_deal_with_buffer",
         "Closing × 1.1 buffer",
         _brrr_buffered_closing,
-        f"Closing ({fmt_money(closing_costs_buy)}) × 1.1 = {fmt_money(_brrr_buffered_closing)}",
+        lambda: f"Closing ({fmt_money(closing_costs_buy)}) × 1.1 = {fmt_money(_brrr_buffered_closing)}",
     )
     breakdown.add(
         "total_cash_needed_for_deal_with_buffer",
         "HML Interest × 1.5 buffer",
         _brrr_buffered_interest,
-        f"HML Interest ({fmt_money(HML_interest_in_cash)}) × 1.5 = {fmt_money(_brrr_buffered_interest)}",
+        lambda: f"HML Interest ({fmt_money(HML_interest_in_cash)}) × 1.5 = {fmt_money(_brrr_buffered_interest)}",
     )
     breakdown.add(
         "total_cash_needed_for_deal_with_buffer",
         "Holding × 1.5 buffer",
         _brrr_buffered_holding,
-        f"Holding ({fmt_money(holding_cost_until_refi)}) × 1.5 = {fmt_money(_brrr_buffered_holding)}",
+        lambda: f"Holding ({fmt_money(holding_cost_until_refi)}) × 1.5 = {fmt_money(_brrr_buffered_holding)}",
     )
     breakdown.add(
         "total_cash_needed_for_deal_with_buffer",
         "Total Cash Needed (Buffered)",
         total_cash_needed_with_buffer,
-        f"Down Payment ({fmt_money(_brrr_down_payment_cash)}) + Closing×1.1 ({fmt_money(_brrr_buffered_closing)}) + HML Points ({fmt_money(HML_points_in_cash)}) + Rehab Cash ({fmt_money(_brrr_rehab_cash_needed)}) + HML Interest×1.5 ({fmt_money(_brrr_buffered_interest)}) + Holding×1.5 ({fmt_money(_brrr_buffered_holding)}) = {fmt_money(total_cash_needed_with_buffer)}",
+        lambda: f"Down Payment ({fmt_money(_brrr_down_payment_cash)}) + Closing×1.1 ({fmt_money(_brrr_buffered_closing)}) + HML Points ({fmt_money(HML_points_in_cash)}) + Rehab Cash ({fmt_money(_brrr_rehab_cash_needed)}) + HML Interest×1.5 ({fmt_money(_brrr_buffered_interest)}) + Holding×1.5 ({fmt_money(_brrr_buffered_holding)}) = {fmt_money(total_cash_needed_with_buffer)}",
     )
 
     return analyzeBRRRRes(
@@ -784,10 +940,11 @@ def validate_flip_inputs(payload: analyzeFlipReq):
     if validation_errors:
         raise HTTPException(status_code=400, detail=" ".join(validation_errors))
 
-def calculate_flip_results(payload: analyzeFlipReq) -> analyzeFlipRes:
+def calculate_flip_results(payload: analyzeFlipReq, include_breakdown: bool = True) -> analyzeFlipRes:
     # Self-documenting calculation: each intermediate variable below registers
     # its own CalcStep next to the line that produces it. Math is unchanged.
-    breakdown = CalcBreakdown()
+    # See `calculate_brrr_results` for how `include_breakdown` is honoured.
+    breakdown = CalcBreakdown(enabled=include_breakdown)
 
     purchase_price = thousands_to_dollars(payload.purchase_price_in_thousands)
     rehab_cost_base = thousands_to_dollars(payload.rehab_cost_in_thousands)
@@ -797,7 +954,7 @@ def calculate_flip_results(payload: analyzeFlipReq) -> analyzeFlipRes:
         "net_profit",
         "Rehab Cost (with contingency)",
         rehab_cost,
-        f"Base ({fmt_money(rehab_cost_base)}) + Contingency {fmt_pct(payload.rehab_contingency_percent)} ({fmt_money(contingency)}) = {fmt_money(rehab_cost)}",
+        lambda: f"Base ({fmt_money(rehab_cost_base)}) + Contingency {fmt_pct(payload.rehab_contingency_percent)} ({fmt_money(contingency)}) = {fmt_money(rehab_cost)}",
     )
     sale_price = thousands_to_dollars(payload.sale_price_in_thousands)
     closing_costs_buy = thousands_to_dollars(payload.closing_costs_buy_in_thousands)
@@ -807,7 +964,7 @@ def calculate_flip_results(payload: analyzeFlipReq) -> analyzeFlipRes:
         "total_hml_interest",
         "HML Amount",
         hml_amount,
-        (f"Purchase Loan + Rehab ({fmt_money(hml_amount)}) — full HM stack"
+        (lambda: f"Purchase Loan + Rehab ({fmt_money(hml_amount)}) — full HM stack"
          if payload.use_HM_for_rehab
          else f"Purchase Loan only = (1 − Down Payment {fmt_pct(payload.down_payment)}) × Purchase ({fmt_money(purchase_price)}) = {fmt_money(hml_amount)}"),
     )
@@ -816,7 +973,7 @@ def calculate_flip_results(payload: analyzeFlipReq) -> analyzeFlipRes:
         "net_profit",
         "HML Points (cash)",
         hml_points_cash,
-        f"{fmt_pct(payload.HML_points)} × HML Amount ({fmt_money(hml_amount)}) = {fmt_money(hml_points_cash)}",
+        lambda: f"{fmt_pct(payload.HML_points)} × HML Amount ({fmt_money(hml_amount)}) = {fmt_money(hml_points_cash)}",
     )
     
     monthly_interest = (payload.HML_interest_rate / Decimal("100.0") / Decimal("12.0")) * hml_amount
@@ -824,14 +981,14 @@ def calculate_flip_results(payload: analyzeFlipReq) -> analyzeFlipRes:
         "total_hml_interest",
         "Monthly HML Interest",
         monthly_interest,
-        f"HML Amount ({fmt_money(hml_amount)}) × {fmt_pct(payload.HML_interest_rate)}/yr ÷ 12 = {fmt_money(monthly_interest)}",
+        lambda: f"HML Amount ({fmt_money(hml_amount)}) × {fmt_pct(payload.HML_interest_rate)}/yr ÷ 12 = {fmt_money(monthly_interest)}",
     )
     total_hml_interest = monthly_interest * payload.holding_time_months
     breakdown.add(
         ["net_profit", "total_hml_interest", "total_holding_costs"],
         "Total HML Interest (over holding period)",
         total_hml_interest,
-        f"Monthly Interest ({fmt_money(monthly_interest)}) × {payload.holding_time_months} mos = {fmt_money(total_hml_interest)}",
+        lambda: f"Monthly Interest ({fmt_money(monthly_interest)}) × {payload.holding_time_months} mos = {fmt_money(total_hml_interest)}",
     )
     
     monthly_taxes = payload.annual_property_taxes / Decimal("12.0")
@@ -842,7 +999,7 @@ def calculate_flip_results(payload: analyzeFlipReq) -> analyzeFlipRes:
         ["net_profit", "total_holding_costs"],
         "Total Operating Costs (during holding)",
         total_operating,
-        f"(Taxes/12 ({fmt_money(monthly_taxes)}) + Insurance/12 ({fmt_money(monthly_insurance)}) + HOA ({fmt_money(payload.montly_hoa)}) + Utilities ({fmt_money(payload.monthly_utilities)})) × {payload.holding_time_months} mos = {fmt_money(total_operating)}",
+        lambda: f"(Taxes/12 ({fmt_money(monthly_taxes)}) + Insurance/12 ({fmt_money(monthly_insurance)}) + HOA ({fmt_money(payload.montly_hoa)}) + Utilities ({fmt_money(payload.monthly_utilities)})) × {payload.holding_time_months} mos = {fmt_money(total_operating)}",
     )
     
     total_holding_costs = total_hml_interest + total_operating
@@ -850,7 +1007,7 @@ def calculate_flip_results(payload: analyzeFlipReq) -> analyzeFlipRes:
         ["net_profit", "total_holding_costs"],
         "Total Holding Costs",
         total_holding_costs,
-        f"HML Interest ({fmt_money(total_hml_interest)}) + Operating ({fmt_money(total_operating)}) = {fmt_money(total_holding_costs)}",
+        lambda: f"HML Interest ({fmt_money(total_hml_interest)}) + Operating ({fmt_money(total_operating)}) = {fmt_money(total_holding_costs)}",
     )
     
     agent_fees_percent = payload.buyer_agent_selling_fee + payload.seller_agent_selling_fee
@@ -859,7 +1016,7 @@ def calculate_flip_results(payload: analyzeFlipReq) -> analyzeFlipRes:
         "net_profit",
         "Selling Costs",
         selling_costs,
-        f"Sale Price ({fmt_money(sale_price)}) × Agent Fees {fmt_pct(agent_fees_percent)} + Closing ({fmt_money(thousands_to_dollars(payload.selling_closing_costs_in_thousands))}) = {fmt_money(selling_costs)}",
+        lambda: f"Sale Price ({fmt_money(sale_price)}) × Agent Fees {fmt_pct(agent_fees_percent)} + Closing ({fmt_money(thousands_to_dollars(payload.selling_closing_costs_in_thousands))}) = {fmt_money(selling_costs)}",
     )
     
     down_payment_cash = (payload.down_payment / Decimal("100.0")) * purchase_price
@@ -867,19 +1024,19 @@ def calculate_flip_results(payload: analyzeFlipReq) -> analyzeFlipRes:
         ["total_cash_needed", "total_cash_needed_with_buffer"],
         "Down Payment (cash)",
         down_payment_cash,
-        f"{fmt_pct(payload.down_payment)} × Purchase ({fmt_money(purchase_price)}) = {fmt_money(down_payment_cash)}",
+        lambda: f"{fmt_pct(payload.down_payment)} × Purchase ({fmt_money(purchase_price)}) = {fmt_money(down_payment_cash)}",
     )
     breakdown.add(
         ["total_cash_needed", "total_cash_needed_with_buffer"],
         "Closing Costs (Buy)",
         closing_costs_buy,
-        f"{fmt_money(closing_costs_buy)}",
+        lambda: f"{fmt_money(closing_costs_buy)}",
     )
     breakdown.add(
         ["total_cash_needed", "total_cash_needed_with_buffer"],
         "HML Points (cash)",
         hml_points_cash,
-        f"{fmt_pct(payload.HML_points)} × HML Amount ({fmt_money(hml_amount)}) = {fmt_money(hml_points_cash)}",
+        lambda: f"{fmt_pct(payload.HML_points)} × HML Amount ({fmt_money(hml_amount)}) = {fmt_money(hml_points_cash)}",
     )
 
     total_cash_needed_without_buffer, total_cash_needed_with_buffer = get_total_cash_needed_for_deal(payload.down_payment, purchase_price, total_operating, closing_costs_buy, hml_points_cash, rehab_cost, total_hml_interest, payload.use_HM_for_rehab)
@@ -888,7 +1045,7 @@ def calculate_flip_results(payload: analyzeFlipReq) -> analyzeFlipRes:
         ["total_cash_needed", "total_cash_needed_with_buffer"],
         "Rehab Cash (out-of-pocket)",
         rehab_cash,
-        (f"Rehab ({fmt_money(rehab_cost)}) is financed via HM → no out-of-pocket = {fmt_money(rehab_cash)}"
+        (lambda: f"Rehab ({fmt_money(rehab_cost)}) is financed via HM → no out-of-pocket = {fmt_money(rehab_cash)}"
          if payload.use_HM_for_rehab
          else f"Rehab ({fmt_money(rehab_cost)}) paid in cash = {fmt_money(rehab_cash)}"),
     )
@@ -896,19 +1053,19 @@ def calculate_flip_results(payload: analyzeFlipReq) -> analyzeFlipRes:
         "total_cash_needed",
         "HML Interest (cash, during holding)",
         total_hml_interest,
-        f"Monthly Interest × {payload.holding_time_months} mos = {fmt_money(total_hml_interest)}",
+        lambda: f"Monthly Interest × {payload.holding_time_months} mos = {fmt_money(total_hml_interest)}",
     )
     breakdown.add(
         "total_cash_needed",
         "Operating Costs (during holding)",
         total_operating,
-        f"Monthly Operating × {payload.holding_time_months} mos = {fmt_money(total_operating)}",
+        lambda: f"Monthly Operating × {payload.holding_time_months} mos = {fmt_money(total_operating)}",
     )
     breakdown.add(
         "total_cash_needed",
         "Total Cash Needed",
         total_cash_needed_without_buffer,
-        f"Down Payment ({fmt_money(down_payment_cash)}) + Closing ({fmt_money(closing_costs_buy)}) + HML Points ({fmt_money(hml_points_cash)}) + Rehab Cash ({fmt_money(rehab_cash)}) + HML Interest ({fmt_money(total_hml_interest)}) + Operating ({fmt_money(total_operating)}) = {fmt_money(total_cash_needed_without_buffer)}",
+        lambda: f"Down Payment ({fmt_money(down_payment_cash)}) + Closing ({fmt_money(closing_costs_buy)}) + HML Points ({fmt_money(hml_points_cash)}) + Rehab Cash ({fmt_money(rehab_cash)}) + HML Interest ({fmt_money(total_hml_interest)}) + Operating ({fmt_money(total_operating)}) = {fmt_money(total_cash_needed_without_buffer)}",
     )
     # Buffered version mirrors `get_total_cash_needed_for_deal` internals:
     # operating × 1.5, interest × 1.5, closing × 1.1.
@@ -919,25 +1076,25 @@ def calculate_flip_results(payload: analyzeFlipReq) -> analyzeFlipRes:
         "total_cash_needed_with_buffer",
         "Closing × 1.1 buffer",
         _flip_buffered_closing,
-        f"Closing ({fmt_money(closing_costs_buy)}) × 1.1 = {fmt_money(_flip_buffered_closing)}",
+        lambda: f"Closing ({fmt_money(closing_costs_buy)}) × 1.1 = {fmt_money(_flip_buffered_closing)}",
     )
     breakdown.add(
         "total_cash_needed_with_buffer",
         "HML Interest × 1.5 buffer",
         _flip_buffered_interest,
-        f"HML Interest ({fmt_money(total_hml_interest)}) × 1.5 = {fmt_money(_flip_buffered_interest)}",
+        lambda: f"HML Interest ({fmt_money(total_hml_interest)}) × 1.5 = {fmt_money(_flip_buffered_interest)}",
     )
     breakdown.add(
         "total_cash_needed_with_buffer",
         "Operating × 1.5 buffer",
         _flip_buffered_operating,
-        f"Operating ({fmt_money(total_operating)}) × 1.5 = {fmt_money(_flip_buffered_operating)}",
+        lambda: f"Operating ({fmt_money(total_operating)}) × 1.5 = {fmt_money(_flip_buffered_operating)}",
     )
     breakdown.add(
         "total_cash_needed_with_buffer",
         "Total Cash Needed (Buffered)",
         total_cash_needed_with_buffer,
-        f"Down Payment ({fmt_money(down_payment_cash)}) + Closing×1.1 ({fmt_money(_flip_buffered_closing)}) + HML Points ({fmt_money(hml_points_cash)}) + Rehab Cash ({fmt_money(rehab_cash)}) + HML Interest×1.5 ({fmt_money(_flip_buffered_interest)}) + Operating×1.5 ({fmt_money(_flip_buffered_operating)}) = {fmt_money(total_cash_needed_with_buffer)}",
+        lambda: f"Down Payment ({fmt_money(down_payment_cash)}) + Closing×1.1 ({fmt_money(_flip_buffered_closing)}) + HML Points ({fmt_money(hml_points_cash)}) + Rehab Cash ({fmt_money(rehab_cash)}) + HML Interest×1.5 ({fmt_money(_flip_buffered_interest)}) + Operating×1.5 ({fmt_money(_flip_buffered_operating)}) = {fmt_money(total_cash_needed_with_buffer)}",
     )
     
     total_cash_invested = down_payment_cash + closing_costs_buy + hml_points_cash + total_holding_costs + rehab_cash
@@ -945,7 +1102,7 @@ def calculate_flip_results(payload: analyzeFlipReq) -> analyzeFlipRes:
         "roi",
         "Total Cash Invested",
         total_cash_invested,
-        f"Down Payment ({fmt_money(down_payment_cash)}) + Closing ({fmt_money(closing_costs_buy)}) + HML Points ({fmt_money(hml_points_cash)}) + Holding ({fmt_money(total_holding_costs)}) + Rehab Out-of-Pocket ({fmt_money(rehab_cash)}) = {fmt_money(total_cash_invested)}",
+        lambda: f"Down Payment ({fmt_money(down_payment_cash)}) + Closing ({fmt_money(closing_costs_buy)}) + HML Points ({fmt_money(hml_points_cash)}) + Holding ({fmt_money(total_holding_costs)}) + Rehab Out-of-Pocket ({fmt_money(rehab_cash)}) = {fmt_money(total_cash_invested)}",
     )
     
     # Cost basis for profit calc
@@ -954,7 +1111,7 @@ def calculate_flip_results(payload: analyzeFlipReq) -> analyzeFlipRes:
         "net_profit",
         "Total Cost Basis",
         total_cost_basis,
-        f"Purchase ({fmt_money(purchase_price)}) + Rehab ({fmt_money(rehab_cost)}) + Closing ({fmt_money(closing_costs_buy)}) + Holding ({fmt_money(total_holding_costs)}) + Selling ({fmt_money(selling_costs)}) + HML Points ({fmt_money(hml_points_cash)}) = {fmt_money(total_cost_basis)}",
+        lambda: f"Purchase ({fmt_money(purchase_price)}) + Rehab ({fmt_money(rehab_cost)}) + Closing ({fmt_money(closing_costs_buy)}) + Holding ({fmt_money(total_holding_costs)}) + Selling ({fmt_money(selling_costs)}) + HML Points ({fmt_money(hml_points_cash)}) = {fmt_money(total_cost_basis)}",
     )
     
     gross_profit = sale_price - total_cost_basis
@@ -962,7 +1119,7 @@ def calculate_flip_results(payload: analyzeFlipReq) -> analyzeFlipRes:
         "net_profit",
         "Gross Profit",
         gross_profit,
-        f"Sale Price ({fmt_money(sale_price)}) − Total Cost Basis ({fmt_money(total_cost_basis)}) = {fmt_money(gross_profit)}",
+        lambda: f"Sale Price ({fmt_money(sale_price)}) − Total Cost Basis ({fmt_money(total_cost_basis)}) = {fmt_money(gross_profit)}",
     )
     
     cap_gains = Decimal("0")
@@ -972,7 +1129,7 @@ def calculate_flip_results(payload: analyzeFlipReq) -> analyzeFlipRes:
         "net_profit",
         "Capital Gains Tax",
         cap_gains,
-        (f"Gross Profit ({fmt_money(gross_profit)}) × {fmt_pct(payload.capital_gains_tax_rate)} = {fmt_money(cap_gains)}"
+        (lambda: f"Gross Profit ({fmt_money(gross_profit)}) × {fmt_pct(payload.capital_gains_tax_rate)} = {fmt_money(cap_gains)}"
          if gross_profit > 0 else f"Gross Profit ≤ 0 → no tax owed = {fmt_money(cap_gains)}"),
     )
         
@@ -981,7 +1138,7 @@ def calculate_flip_results(payload: analyzeFlipReq) -> analyzeFlipRes:
         ["net_profit", "roi"],
         "Net Profit (after tax)",
         net_profit,
-        f"Gross Profit ({fmt_money(gross_profit)}) − Capital Gains Tax ({fmt_money(cap_gains)}) = {fmt_money(net_profit)}",
+        lambda: f"Gross Profit ({fmt_money(gross_profit)}) − Capital Gains Tax ({fmt_money(cap_gains)}) = {fmt_money(net_profit)}",
     )
     
     roi = (net_profit / total_cash_invested) * Decimal("100.0") if total_cash_invested > 0 else Decimal("0")
@@ -989,7 +1146,7 @@ def calculate_flip_results(payload: analyzeFlipReq) -> analyzeFlipRes:
         ["roi", "annualized_roi"],
         "ROI",
         roi,
-        (f"Net Profit ({fmt_money(net_profit)}) / Total Cash Invested ({fmt_money(total_cash_invested)}) × 100 = {fmt_pct(roi)}"
+        (lambda: f"Net Profit ({fmt_money(net_profit)}) / Total Cash Invested ({fmt_money(total_cash_invested)}) × 100 = {fmt_pct(roi)}"
          if total_cash_invested > 0 else "Total Cash Invested is 0 → ROI = 0%"),
     )
     years = payload.holding_time_months / Decimal("12.0")
@@ -998,7 +1155,7 @@ def calculate_flip_results(payload: analyzeFlipReq) -> analyzeFlipRes:
         "annualized_roi",
         "Annualized ROI",
         annualized_roi,
-        (f"ROI ({fmt_pct(roi)}) / Holding Years ({fmt_num(years)}) = {fmt_pct(annualized_roi)}"
+        (lambda: f"ROI ({fmt_pct(roi)}) / Holding Years ({fmt_num(years)}) = {fmt_pct(annualized_roi)}"
          if years > 0 else "Holding time is 0 → Annualized ROI = 0%"),
     )
     
@@ -1013,15 +1170,217 @@ def calculate_flip_results(payload: analyzeFlipReq) -> analyzeFlipRes:
 
 # --- Endpoints ---
 
+# Numeric backends. `exact` is the Decimal engine above: authoritative for
+# saved deals and PDFs, and the only one that produces breakdowns. `fast`
+# evaluates the same formulas in float64 through `vector_calc`, for screening.
+# tests/test_precision.py keeps the two within a cent of each other.
+Precision = Literal["exact", "fast"]
+
+
+def _fast_single(run_batch, columns, result_model, **extra):
+    out = run_batch(columns)
+    if out["errors"]:
+        raise HTTPException(status_code=400, detail=out["errors"][0]["detail"])
+    return result_model(**{name: values[0] for name, values in out["metrics"].items()}, **extra)
+
+
 @app.post("/analyze/brrr", response_model=analyzeBRRRRes)
-def analyze_brrr(payload: analyzeBRRRReq) -> analyzeBRRRRes:
+def analyze_brrr(payload: analyzeBRRRReq, include_breakdown: bool = True, precision: Precision = "exact") -> analyzeBRRRRes:
+    if precision == "fast":
+        return _fast_single(
+            vector_calc.analyze_brrr_batch, vector_calc.brrr_columns_from_payloads([payload]), analyzeBRRRRes,
+        )
     validate_brrr_inputs(payload)
-    return calculate_brrr_results(payload)
+    return calculate_brrr_results(payload, include_breakdown=include_breakdown)
 
 @app.post("/analyze/flip", response_model=analyzeFlipRes)
-def analyze_flip(payload: analyzeFlipReq) -> analyzeFlipRes:
+def analyze_flip(payload: analyzeFlipReq, include_breakdown: bool = True, precision: Precision = "exact") -> analyzeFlipRes:
+    if precision == "fast":
+        return _fast_single(
+            vector_calc.analyze_flip_batch, vector_calc.flip_columns_from_payloads([payload]), analyzeFlipRes,
+            messages=[],
+        )
     validate_flip_inputs(payload)
-    return calculate_flip_results(payload)
+    return calculate_flip_results(payload, include_breakdown=include_breakdown)
+
+
+# Bulk screening: same formulas as above evaluated column-wise with NumPy (see
+# `vector_calc`). Invalid rows are reported by index instead of failing the batch.
+
+# `precision=exact` runs the Decimal engine row by row instead; it's much
+# slower but returns exactly what `/analyze/brrr` would for each row.
+
+def _payloads_from_columns(model, columns):
+    keys = [(name, model.model_fields[name].alias or name) for name in columns]
+    payloads = []
+    for i in range(vector_calc.column_length(columns)):
+        try:
+            payloads.append(model.model_validate({key: float(columns[name][i]) for name, key in keys}))
+        except ValidationError as exc:
+            payloads.append(f"Invalid input: {exc.errors()[0]['msg']}.")
+    return payloads
+
+
+# Flip batch metrics that `analyzeFlipRes` only carries as breakdown steps.
+_FLIP_BREAKDOWN_METRICS = {
+    "hml_amount": ("total_hml_interest", "HML Amount"),
+    "selling_costs": ("net_profit", "Selling Costs"),
+    "capital_gains_tax": ("net_profit", "Capital Gains Tax"),
+}
+
+
+def _exact_metric(result, name, from_breakdown):
+    if name not in from_breakdown:
+        return float(getattr(result, name))
+    key, label = from_breakdown[name]
+    return next(step.value for step in result.breakdowns[key] if step.label == label)
+
+
+def _exact_batch(payloads, validate, calculate, metrics, from_breakdown=None):
+    from_breakdown = from_breakdown or {}
+    values = {name: [] for name in metrics}
+    errors = []
+    for index, payload in enumerate(payloads):
+        result = None
+        try:
+            if isinstance(payload, str):
+                raise HTTPException(status_code=400, detail=payload)
+            validate(payload)
+            result = calculate(payload, include_breakdown=bool(from_breakdown))
+        except HTTPException as exc:
+            errors.append({"index": index, "detail": exc.detail})
+        for name in metrics:
+            values[name].append(None if result is None else _exact_metric(result, name, from_breakdown))
+    return {
+        "count": len(payloads),
+        "valid_count": len(payloads) - len(errors),
+        "metrics": values,
+        "errors": errors,
+    }
+
+
+@app.post("/analyze/brrr/batch", response_model=analyzeBRRRBatchRes)
+def analyze_brrr_batch(payload: analyzeBRRRBatchReq, precision: Precision = "fast") -> analyzeBRRRBatchRes:
+    try:
+        if payload.deals is not None:
+            columns = vector_calc.brrr_columns_from_payloads(payload.deals)
+        else:
+            columns = vector_calc.brrr_columns_from_mapping(payload.columns)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if precision == "exact":
+        deals = payload.deals if payload.deals is not None else _payloads_from_columns(analyzeBRRRReq, columns)
+        return _exact_batch(deals, validate_brrr_inputs, calculate_brrr_results, vector_calc.BRRR_METRICS)
+    return vector_calc.analyze_brrr_batch(columns)
+
+
+@app.post("/analyze/flip/batch", response_model=analyzeFlipBatchRes)
+def analyze_flip_batch(payload: analyzeFlipBatchReq, precision: Precision = "fast") -> analyzeFlipBatchRes:
+    try:
+        if payload.deals is not None:
+            columns = vector_calc.flip_columns_from_payloads(payload.deals)
+        else:
+            columns = vector_calc.flip_columns_from_mapping(payload.columns)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if precision == "exact":
+        deals = payload.deals if payload.deals is not None else _payloads_from_columns(analyzeFlipReq, columns)
+        return _exact_batch(
+            deals, validate_flip_inputs, calculate_flip_results, vector_calc.FLIP_METRICS, _FLIP_BREAKDOWN_METRICS,
+        )
+    return vector_calc.analyze_flip_batch(columns)
+
+
+# Slider/heatmap support: one deal swept over up to three inputs in a single
+# vectorized pass, instead of one `/analyze/brrr` call per grid point.
+
+@app.post("/analyze/brrr/sensitivity", response_model=analyzeBRRRSensitivityRes)
+def analyze_brrr_sensitivity(payload: analyzeBRRRSensitivityReq) -> analyzeBRRRSensitivityRes:
+    try:
+        vector_calc.check_grid_size([vector_calc.axis_length(axis.values, axis.steps) for axis in payload.axes])
+        axes = [
+            (
+                vector_calc.resolve_brrr_field(axis.field),
+                vector_calc.axis_values(axis.values, axis.start, axis.stop, axis.steps),
+            )
+            for axis in payload.axes
+        ]
+        base = vector_calc.brrr_columns_from_payloads([payload.deal])
+        return vector_calc.analyze_brrr_sensitivity(base, axes, payload.metrics)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+# Refi loan schedule for the deal page. Built once per (amount, rate, term)
+# and served from `amortization_schedule`'s cache afterwards.
+
+@app.get("/analyze/brrr/amortization", response_model=analyzeBRRRAmortizationRes)
+def analyze_brrr_amortization(
+    loan_amount: Decimal = Query(..., gt=0),
+    interest_rate: Decimal = Query(..., ge=0, le=100),
+    loan_term_years: int = Query(30, ge=1, le=50),
+) -> analyzeBRRRAmortizationRes:
+    return amortization_schedule(loan_amount, interest_rate, loan_term_years)
+
+
+# Offer generation: highest purchase price meeting the analyst's targets,
+# solved by vectorized bisection over every deal at once (see `offer_solver`).
+
+def _solve_max_offer(model, columns, payload):
+    targets = [(t.metric, t.min) for t in payload.targets]
+    try:
+        results = offer_solver.solve_max_price(
+            model, columns, targets,
+            upper=payload.max_price_in_thousands,
+            tolerance=payload.tolerance_in_thousands,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return {"results": results}
+
+
+@app.post("/analyze/brrr/max-offer", response_model=analyzeBRRRMaxOfferRes)
+def analyze_brrr_max_offer(payload: analyzeBRRRMaxOfferReq) -> analyzeBRRRMaxOfferRes:
+    deals = payload.deals if payload.deals is not None else [payload.deal]
+    return _solve_max_offer(offer_solver.BRRR, vector_calc.brrr_columns_from_payloads(deals), payload)
+
+
+@app.post("/analyze/flip/max-offer", response_model=analyzeFlipMaxOfferRes)
+def analyze_flip_max_offer(payload: analyzeFlipMaxOfferReq) -> analyzeFlipMaxOfferRes:
+    deals = payload.deals if payload.deals is not None else [payload.deal]
+    return _solve_max_offer(offer_solver.FLIP, vector_calc.flip_columns_from_payloads(deals), payload)
+
+# Risk simulation: sampled inputs run through the vectorized formulas (see
+# `monte_carlo`). The deal itself must pass the regular validation first.
+
+@app.post("/analyze/brrr/montecarlo", response_model=analyzeBRRRMonteCarloRes)
+def analyze_brrr_montecarlo(payload: analyzeBRRRMonteCarloReq) -> analyzeBRRRMonteCarloRes:
+    deals = payload.deals if payload.deals is not None else [payload.deal]
+    for deal in deals:
+        validate_brrr_inputs(deal)
+    bases = [vector_calc.brrr_columns_from_payloads([deal]) for deal in deals]
+    try:
+        return monte_carlo.run(
+            monte_carlo.simulate_brrr, bases, payload.assumptions.model_dump(),
+            payload.draws, payload.seed, payload.parallel,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@app.post("/analyze/flip/montecarlo", response_model=analyzeFlipMonteCarloRes)
+def analyze_flip_montecarlo(payload: analyzeFlipMonteCarloReq) -> analyzeFlipMonteCarloRes:
+    deals = payload.deals if payload.deals is not None else [payload.deal]
+    for deal in deals:
+        validate_flip_inputs(deal)
+    bases = [vector_calc.flip_columns_from_payloads([deal]) for deal in deals]
+    try:
+        return monte_carlo.run(
+            monte_carlo.simulate_flip, bases, payload.assumptions.model_dump(),
+            payload.draws, payload.seed, payload.parallel,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
 
 
 # --- PDF Deal Report ---
@@ -1040,75 +1399,289 @@ def _disposition(value: str) -> str:
     return "attachment" if (value or "").lower() == "attachment" else "inline"
 
 
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = [t.strip().removeprefix("W/") for t in header.split(",")]
+    return "*" in tags or etag in tags
+
+
+def _pdf_response(request: Request, key: str, pdf_bytes: Optional[bytes], filename: str, disposition: str) -> Response:
+    etag = f'"{key}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    headers["Content-Disposition"] = f'{_disposition(disposition)}; filename="{filename}"'
+    return Response(content=pdf_bytes, media_type="application/pdf", headers=headers)
+
+
+def _pdf_report(request: Request, deal_type: str, payload, address: str, disposition: str, mode: str, calculate):
+    """Serve a deal report from the disk cache, rendering it on a miss.
+
+    `mode=job` queues the render in the `pdf_jobs` pool and returns 202 with
+    the job instead of the PDF. `calculate` only runs on a cache miss (and,
+    for jobs, when no render of the report is already in flight).
+    """
+    key = pdf_jobs.report_key(deal_type, address, payload.model_dump(mode="json"))
+    filename = f"BigWhales_{deal_type}_{_safe_filename(address)}.pdf"
+    if mode == "job":
+        job = pdf_jobs.status(key)
+        if job is None or job["status"] == "failed":
+            try:
+                pdf_jobs.submit(key, address, deal_type, calculate().model_dump())
+            except pdf_jobs.RenderQueueFull as exc:
+                raise HTTPException(status_code=503, detail=str(exc))
+            job = pdf_jobs.status(key) or {"job_id": key, "status": "done", "detail": None}
+        return JSONResponse(
+            status_code=202,
+            content=reportJobRes(**job, download_url=_job_download_url(key, filename)).model_dump(),
+        )
+
+    if _etag_matches(request, f'"{key}"'):
+        return _pdf_response(request, key, None, filename, disposition)
+    pdf_bytes = pdf_jobs.read_cached(key)
+    if pdf_bytes is None:
+        pdf_bytes = build_deal_pdf(address=address, deal_type=deal_type, result=calculate().model_dump())
+        pdf_jobs.store(pdf_jobs.cache_path(key), pdf_bytes)
+        pdf_jobs.prune_cache()
+    return _pdf_response(request, key, pdf_bytes, filename, disposition)
+
+
+def _job_download_url(key: str, filename: str) -> str:
+    return f"/reports/jobs/{key}/pdf?filename={quote(filename)}"
+
+
 @app.post("/reports/brrr-pdf")
 def report_brrr_pdf(
     payload: analyzeBRRRReq,
+    request: Request,
     address: str = "Property",
     disposition: str = "inline",
+    mode: Literal["sync", "job"] = "sync",
 ) -> Response:
     validate_brrr_inputs(payload)
-    result = calculate_brrr_results(payload)
-    pdf_bytes = build_deal_pdf(
-        address=address,
-        deal_type="BRRRR",
-        result=result.model_dump(),
-    )
-    filename = f"BigWhales_BRRRR_{_safe_filename(address)}.pdf"
-    return Response(
-        content=pdf_bytes,
-        media_type="application/pdf",
-        headers={"Content-Disposition": f'{_disposition(disposition)}; filename="{filename}"'},
+    return _pdf_report(
+        request, "BRRRR", payload, address, disposition, mode, lambda: calculate_brrr_results(payload),
     )
 
 
 @app.post("/reports/flip-pdf")
 def report_flip_pdf(
     payload: analyzeFlipReq,
+    request: Request,
     address: str = "Property",
     disposition: str = "inline",
+    mode: Literal["sync", "job"] = "sync",
 ) -> Response:
     validate_flip_inputs(payload)
-    result = calculate_flip_results(payload)
-    pdf_bytes = build_deal_pdf(
-        address=address,
-        deal_type="FLIP",
-        result=result.model_dump(),
-    )
-    filename = f"BigWhales_FLIP_{_safe_filename(address)}.pdf"
-    return Response(
-        content=pdf_bytes,
+    return _pdf_report(
+        request, "FLIP", payload, address, disposition, mode, lambda: calculate_flip_results(payload),
+    )
+
+
+@app.get("/reports/jobs/{job_id}", response_model=reportJobRes)
+def report_job_status(job_id: str, filename: str = "report.pdf") -> reportJobRes:
+    job = pdf_jobs.status(job_id) if _is_report_key(job_id) else None
+    if job is None:
+        raise HTTPException(status_code=404, detail="Report job not found")
+    return reportJobRes(**job, download_url=_job_download_url(job_id, filename))
+
+
+@app.get("/reports/jobs/{job_id}/pdf")
+def report_job_pdf(
+    job_id: str,
+    request: Request,
+    filename: str = "report.pdf",
+    disposition: str = "inline",
+) -> Response:
+    pdf_bytes = pdf_jobs.read_cached(job_id) if _is_report_key(job_id) else None
+    if pdf_bytes is None:
+        job = pdf_jobs.status(job_id) if _is_report_key(job_id) else None
+        if job is None:
+            raise HTTPException(status_code=404, detail="Report job not found")
+        raise HTTPException(status_code=409, detail=f"Report is {job['status']}.")
+    stem = _safe_filename(filename.removesuffix(".pdf"))
+    return _pdf_response(request, job_id, pdf_bytes, f"{stem}.pdf", disposition)
+
+
+def _is_report_key(value: str) -> bool:
+    # Job ids are sha256 hex digests; anything else must not reach the filesystem.
+    return len(value) == 64 and all(c in "0123456789abcdef" for c in value)
+
+
+# Portfolio book: one PDF for a hand-picked set of saved deals.
+
+_PORTFOLIO_MODELS = {
+    "active": {"BRRRR": BrrrActiveDeal, "FLIP": FlipActiveDeal},
+    "bought": {"BRRRR": BoughtBrrrDeal, "FLIP": BoughtFlipDeal},
+}
+_PORTFOLIO_CALCULATORS = {"BRRRR": calculate_brrr_results, "FLIP": calculate_flip_results}
+
+
+@app.post("/reports/portfolio-pdf")
+def report_portfolio_pdf(
+    payload: portfolioPdfReq,
+    disposition: str = "inline",
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    """Cover page with a summary row per deal, then one section per deal.
+
+    Deals are loaded with one query per table and calculated up front so a
+    missing id is a 404 rather than a truncated download; the PDF itself is
+    rendered while the response streams.
+    """
+    found = {}
+    for deal_type, model in _PORTFOLIO_MODELS[payload.source].items():
+        ids = [ref.id for ref in payload.deals if ref.deal_type == deal_type]
+        if ids:
+            for deal in db.query(model).filter(model.id.in_(ids)):
+                found[(deal_type, deal.id)] = deal
+    missing = [str(ref.id) for ref in payload.deals if (ref.deal_type, ref.id) not in found]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Deals not found: {', '.join(missing)}")
+
+    sections = []
+    for ref in payload.deals:
+        deal = found[(ref.deal_type, ref.id)]
+        section = {"address": deal.address, "deal_type": ref.deal_type}
+        try:
+            section["result"] = _PORTFOLIO_CALCULATORS[ref.deal_type](deal).model_dump()
+        except HTTPException as exc:
+            # Saved deals can hold inputs the calculator rejects; say so in
+            # that deal's section instead of failing the whole book.
+            section["error"] = exc.detail
+        sections.append(section)
+
+    filename = f"BigWhales_Portfolio_{_safe_filename(payload.title)}.pdf"
+    return StreamingResponse(
+        stream_portfolio_pdf(payload.title, sections),
         media_type="application/pdf",
         headers={"Content-Disposition": f'{_disposition(disposition)}; filename="{filename}"'},
     )
 
 
-def create_deal_response(deal: Union[BrrrActiveDeal, FlipActiveDeal]):
+def create_deal_response(
+    deal: Union[BrrrActiveDeal, FlipActiveDeal],
+    include_breakdown: bool = True,
+    metrics: Optional[dict] = None,
+    skip_columns: tuple = (),
+):
+    # `metrics` is a cached `deal_metrics` payload; when given (list views)
+    # the calculators are skipped entirely. `skip_columns` are heavy columns
+    # deferred by a sparse `fields=` query, so they must not be touched here.
     if isinstance(deal, BrrrActiveDeal):
-        calc = calculate_brrr_results(deal)
-        deal_data = {c.name: getattr(deal, c.name) for c in deal.__table__.columns}
-        deal_data.update(calc.model_dump())
+        calc = metrics if metrics is not None else calculate_brrr_results(deal, include_breakdown=include_breakdown).model_dump()
+        deal_data = {c.name: getattr(deal, c.name) for c in deal.__table__.columns if c.name not in skip_columns}
+        deal_data.update(calc)
         deal_data['deal_type'] = "BRRRR"
         return BrrrActiveDealRes.model_validate(deal_data)
     elif isinstance(deal, FlipActiveDeal):
-        calc = calculate_flip_results(deal)
-        deal_data = {c.name: getattr(deal, c.name) for c in deal.__table__.columns}
-        deal_data.update(calc.model_dump())
+        calc = metrics if metrics is not None else calculate_flip_results(deal, include_breakdown=include_breakdown).model_dump()
+        deal_data = {c.name: getattr(deal, c.name) for c in deal.__table__.columns if c.name not in skip_columns}
+        deal_data.update(calc)
         deal_data['deal_type'] = "FLIP"
         return FlipActiveDealRes.model_validate(deal_data)
     return None
 
+def _deal_fields(*models) -> set[str]:
+    # Keys as they appear on the wire (aliases), which is what `fields=` names.
+    return {info.alias or name for m in models for name, info in m.model_fields.items()}
+
+
+_ACTIVE_DEAL_FIELDS = _deal_fields(BrrrActiveDealRes, FlipActiveDealRes)
+_BOUGHT_DEAL_FIELDS = _deal_fields(BoughtBrrrDealRes, BoughtFlipDealRes)
+
+
+def _list_deals(
+    db: Session,
+    models: tuple,
+    build,
+    allowed_fields: set[str],
+    filters: deal_listing.DealFilters,
+    include_breakdown: bool,
+    limit: Optional[int],
+    cursor: Optional[str],
+    fields: Optional[str],
+):
+    """Shared body of the active/bought list endpoints.
+
+    Without `limit`, `cursor` or `fields` this returns the same full list as
+    before. Paged responses carry the next cursor in `X-Next-Cursor`;
+    `fields=` responses bypass `response_model` so only the requested keys
+    (plus id/deal_type/created_at) are serialized.
+    """
+    try:
+        whitelist = deal_listing.parse_fields(fields, allowed_fields)
+        page = deal_listing.fetch_page(
+            db,
+            filters.models(*models),
+            filters,
+            limit=limit,
+            cursor=cursor,
+            defer_cols=deal_listing.deferred_columns(whitelist),
+            with_metrics=not include_breakdown,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    cached = {} if include_breakdown else page.metrics
+    skipped = deal_listing.deferred_columns(whitelist)
+    deals = [build(d, include_breakdown, cached.get(d.id), skipped) for d in page.deals]
+    headers = {"X-Next-Cursor": page.next_cursor} if page.next_cursor else {}
+    if whitelist is None and not headers:
+        return deals
+    if whitelist is None:
+        content = jsonable_encoder(deals)
+    else:
+        content = [
+            {k: v for k, v in d.model_dump(mode="json", by_alias=True).items() if k in whitelist}
+            for d in deals
+        ]
+    return JSONResponse(content=content, headers=headers)
+
+
 @app.get("/active-deals", response_model=List[Union[BrrrActiveDealRes, FlipActiveDealRes]])
-def get_active_deals(db: Session = Depends(get_db)):
-    brrr_deals = get_all_brrr_deals(db)
-    flip_deals = get_all_flip_deals(db)
-    
-    all_deals = []
-    all_deals.extend([create_deal_response(d) for d in brrr_deals])
-    all_deals.extend([create_deal_response(d) for d in flip_deals])
-    
-    # Sort by created_at desc
-    all_deals.sort(key=lambda x: x.created_at, reverse=True)
-    return all_deals
+def get_active_deals(
+    include_breakdown: bool = False,
+    limit: Optional[int] = Query(None, ge=1, le=deal_listing.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    deal_type: Optional[Literal["BRRRR", "FLIP"]] = None,
+    section: Optional[int] = None,
+    stage: Optional[int] = None,
+    min_cash_flow: Optional[float] = None,
+    min_roi: Optional[float] = None,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    # The board never renders breakdowns, so list calls skip the narration by
+    # default (fetch it per deal via `/active-deals/{id}/breakdown`) and read
+    # the materialized metrics instead of recalculating every row.
+    filters = deal_listing.DealFilters(
+        deal_type=deal_type, section=section, stage=stage,
+        min_cash_flow=min_cash_flow, min_roi=min_roi,
+    )
+    return _list_deals(
+        db, (BrrrActiveDeal, FlipActiveDeal), create_deal_response, _ACTIVE_DEAL_FIELDS,
+        filters, include_breakdown, limit, cursor, fields,
+    )
+
+
+_ACTIVE_EXPORT_COLUMNS = deal_export.export_columns(BrrrActiveDealRes, FlipActiveDealRes)
+
+
+@app.get("/active-deals/export")
+def export_active_deals(
+    fmt: deal_export.ExportFormat = Query("ndjson", alias="format"),
+    db: Session = Depends(get_db),
+):
+    # Streams every active deal with its metrics; see `deal_export`.
+    rows = deal_export.iter_deal_rows(
+        sessionmaker(bind=db.get_bind(), autoflush=False),
+        ((BrrrActiveDeal, "BRRRR"), (FlipActiveDeal, "FLIP")),
+        create_deal_response,
+    )
+    return deal_export.streaming_export(rows, _ACTIVE_EXPORT_COLUMNS, fmt, "active-deals")
 
 
 @app.post("/active-deals", response_model=Union[BrrrActiveDealRes, FlipActiveDealRes])
@@ -1174,35 +1747,78 @@ def duplicate_deal(deal_id: str, deal_type: str = "BRRRR", db: Session = Depends
         
     raise HTTPException(status_code=404, detail="Deal not found")
 
+@app.get("/active-deals/{deal_id}/breakdown", response_model=Union[analyzeBRRRRes, analyzeFlipRes])
+def get_active_deal_breakdown(deal_id: str, deal_type: str = "BRRRR", db: Session = Depends(get_db)):
+    """Full calculation (with breakdown narration) for a single saved deal."""
+    if deal_type == "BRRRR":
+        deal = get_brrr_deal(db, deal_id)
+        if deal: return calculate_brrr_results(deal)
+    elif deal_type == "FLIP":
+        deal = get_flip_deal(db, deal_id)
+        if deal: return calculate_flip_results(deal)
+
+    raise HTTPException(status_code=404, detail="Deal not found")
+
 
 # --- Bought Deals ---
 
-def create_bought_deal_response(deal: Union[BoughtBrrrDeal, BoughtFlipDeal]):
+def create_bought_deal_response(
+    deal: Union[BoughtBrrrDeal, BoughtFlipDeal],
+    include_breakdown: bool = True,
+    metrics: Optional[dict] = None,
+    skip_columns: tuple = (),
+):
     if isinstance(deal, BoughtBrrrDeal):
-        calc = calculate_brrr_results(deal)
-        deal_data = {c.name: getattr(deal, c.name) for c in deal.__table__.columns}
-        deal_data.update(calc.model_dump())
+        calc = metrics if metrics is not None else calculate_brrr_results(deal, include_breakdown=include_breakdown).model_dump()
+        deal_data = {c.name: getattr(deal, c.name) for c in deal.__table__.columns if c.name not in skip_columns}
+        deal_data.update(calc)
         deal_data['deal_type'] = "BRRRR"
         return BoughtBrrrDealRes.model_validate(deal_data)
     elif isinstance(deal, BoughtFlipDeal):
-        calc = calculate_flip_results(deal)
-        deal_data = {c.name: getattr(deal, c.name) for c in deal.__table__.columns}
-        deal_data.update(calc.model_dump())
+        calc = metrics if metrics is not None else calculate_flip_results(deal, include_breakdown=include_breakdown).model_dump()
+        deal_data = {c.name: getattr(deal, c.name) for c in deal.__table__.columns if c.name not in skip_columns}
+        deal_data.update(calc)
         deal_data['deal_type'] = "FLIP"
         return BoughtFlipDealRes.model_validate(deal_data)
     return None
 
 @app.get("/bought-deals", response_model=List[Union[BoughtBrrrDealRes, BoughtFlipDealRes]])
-def get_bought_deals(db: Session = Depends(get_db)):
-    brrr_deals = get_all_bought_brrr_deals(db)
-    flip_deals = get_all_bought_flip_deals(db)
+def get_bought_deals(
+    include_breakdown: bool = False,
+    limit: Optional[int] = Query(None, ge=1, le=deal_listing.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    deal_type: Optional[Literal["BRRRR", "FLIP"]] = None,
+    section: Optional[int] = None,
+    stage: Optional[int] = None,
+    bought_stage: Optional[str] = None,
+    min_cash_flow: Optional[float] = None,
+    min_roi: Optional[float] = None,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    filters = deal_listing.DealFilters(
+        deal_type=deal_type, section=section, stage=stage, bought_stage=bought_stage,
+        min_cash_flow=min_cash_flow, min_roi=min_roi,
+    )
+    return _list_deals(
+        db, (BoughtBrrrDeal, BoughtFlipDeal), create_bought_deal_response, _BOUGHT_DEAL_FIELDS,
+        filters, include_breakdown, limit, cursor, fields,
+    )
+
+_BOUGHT_EXPORT_COLUMNS = deal_export.export_columns(BoughtBrrrDealRes, BoughtFlipDealRes)
 
-    all_deals = []
-    all_deals.extend([create_bought_deal_response(d) for d in brrr_deals])
-    all_deals.extend([create_bought_deal_response(d) for d in flip_deals])
 
-    all_deals.sort(key=lambda x: x.created_at, reverse=True)
-    return all_deals
+@app.get("/bought-deals/export")
+def export_bought_deals(
+    fmt: deal_export.ExportFormat = Query("ndjson", alias="format"),
+    db: Session = Depends(get_db),
+):
+    rows = deal_export.iter_deal_rows(
+        sessionmaker(bind=db.get_bind(), autoflush=False),
+        ((BoughtBrrrDeal, "BRRRR"), (BoughtFlipDeal, "FLIP")),
+        create_bought_deal_response,
+    )
+    return deal_export.streaming_export(rows, _BOUGHT_EXPORT_COLUMNS, fmt, "bought-deals")
 
 @app.post("/bought-deals", response_model=Union[BoughtBrrrDealRes, BoughtFlipDealRes])
 def add_bought_deal(
@@ -1237,16 +1853,27 @@ def delete_bought_deal(deal_id: str, deal_type: str = "BRRRR", db: Session = Dep
 
     raise HTTPException(status_code=404, detail="Bought deal not found")
 
+@app.get("/bought-deals/{deal_id}/breakdown", response_model=Union[analyzeBRRRRes, analyzeFlipRes])
+def get_bought_deal_breakdown(deal_id: str, deal_type: str = "BRRRR", db: Session = Depends(get_db)):
+    if deal_type == "BRRRR":
+        deal = get_bought_brrr_deal(db, deal_id)
+        if deal: return calculate_brrr_results(deal)
+    elif deal_type == "FLIP":
+        deal = get_bought_flip_deal(db, deal_id)
+        if deal: return calculate_flip_results(deal)
+
+    raise HTTPException(status_code=404, detail="Bought deal not found")
+
 @app.post("/bought-deals/from-active/{deal_id}", response_model=Union[BoughtBrrrDealRes, BoughtFlipDealRes])
 def move_to_bought(deal_id: str, deal_type: str = "BRRRR", db: Session = Depends(get_db)):
     if deal_type == "BRRRR":
-        source = db.query(BrrrActiveDeal).filter(BrrrActiveDeal.id == deal_id).first()
+        source = get_brrr_deal(db, deal_id)
         if not source:
             raise HTTPException(status_code=404, detail="Source BRRRR deal not found")
         new_deal = create_bought_from_active_brrr(db, source)
         return create_bought_deal_response(new_deal)
     elif deal_type == "FLIP":
-        source = db.query(FlipActiveDeal).filter(FlipActiveDeal.id == deal_id).first()
+        source = get_flip_deal(db, deal_id)
         if not source:
             raise HTTPException(status_code=404, detail="Source FLIP deal not found")
         new_deal = create_bought_from_active_flip(db, source)
@@ -1257,231 +1884,121 @@ def move_to_bought(deal_id: str, deal_type: str = "BRRRR", db: Session = Depends
 
 # --- Email Logic ---
 
-def send_offer_email(details: SendOfferReq):
-    logger.info(f"Starting email send process for property: {details.property_address}")
-    logger.info(f"Recipient: {details.agent_email} (Agent: {details.agent_name})")
-    
-    sender_email = "BigWhalesLLC@gmail.com"
-    sender_password = os.getenv("EMAIL_PASSWORD")
-    
-    if not sender_password:
-        logger.error("EMAIL_PASSWORD environment variable is not set")
-        return False, "Email password not configured"
-    
-    # Strip any whitespace (common issue when copying/pasting)
-    sender_password = sender_password.strip()
-    
-    if len(sender_password) != 16:
-        logger.warning(f"Email password length is {len(sender_password)} (expected 16 for Gmail App Password)")
-    
-    logger.info(f"Email password found (length: {len(sender_password)})")
-    logger.info(f"Email password starts with: {sender_password[:2]}... (masked for security)")
-    
-    subject = f"Cash Offer for {details.property_address}"
-    logger.info(f"Email subject: {subject}")
-    
-    body = f"""
-<html>
-  <head>
-    <style>
-      body {{
-        font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-        color: #2c3e50;
-        line-height: 1.7;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        margin: 0;
-        padding: 40px 20px;
-      }}
-      .container {{
-        max-width: 650px;
-        margin: 0 auto;
-        background-color: #ffffff;
-        padding: 45px;
-        border-radius: 12px;
-        box-shadow: 0 10px 40px rgba(0,0,0,0.15);
-        border-top: 6px solid #3498db;
-      }}
-      .greeting {{
-        font-size: 18px;
-        color: #2c3e50;
-        margin-bottom: 20px;
-        font-weight: 500;
-      }}
-      .intro {{
-        font-size: 16px;
-        color: #34495e;
-        margin-bottom: 25px;
-      }}
-      .highlight {{
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        padding: 25px 30px;
-        border-radius: 10px;
-        margin: 30px 0;
-        box-shadow: 0 4px 15px rgba(102, 126, 234, 0.3);
-      }}
-      .highlight p {{
-        margin: 12px 0;
-        font-weight: 600;
-        font-size: 16px;
-        color: #ffffff;
-        line-height: 1.8;
-      }}
-      .highlight p:first-child {{
-        font-size: 20px;
-        font-weight: 700;
-        margin-bottom: 18px;
-        padding-bottom: 15px;
-        border-bottom: 2px solid rgba(255,255,255,0.3);
-      }}
-      .highlight a {{
-        color: #ffffff;
-        text-decoration: underline;
-        font-weight: 600;
-      }}
-      .cta {{
-        font-size: 17px;
-        color: #2c3e50;
-        font-weight: 600;
-        margin: 30px 0;
-        text-align: center;
-        padding: 15px;
-        background-color: #ecf0f1;
-        border-radius: 8px;
-      }}
-      .footer {{
-        margin-top: 45px;
-        padding: 35px;
-        background: linear-gradient(135deg, #2c3e50 0%, #34495e 100%);
-        border-radius: 10px;
-        text-align: center;
-        box-shadow: 0 4px 15px rgba(0,0,0,0.2);
-      }}
-      .footer p {{
-        margin: 8px 0;
-        font-size: 20px;
-        color: #ffffff;
-        font-weight: 600;
-      }}
-      .footer-name {{
-        font-size: 24px !important;
-        font-weight: 700 !important;
-        margin-bottom: 15px !important;
-        letter-spacing: 0.5px;
-      }}
-      .footer-contact {{
-        font-size: 18px !important;
-        font-weight: 500 !important;
-        margin: 10px 0 !important;
-      }}
-      .footer a {{
-        color: #3498db;
-        text-decoration: none;
-        font-weight: 600;
-        font-size: 18px;
-      }}
-      .footer a:hover {{
-        color: #5dade2;
-        text-decoration: underline;
-      }}
-      a {{
-        color: #3498db;
-        text-decoration: none;
-        font-weight: 600;
-      }}
-      a:hover {{
-        color: #2980b9;
-        text-decoration: underline;
-      }}
-      strong {{
-        color: #2c3e50;
-        font-weight: 700;
-      }}
-    </style>
-  </head>
-  <body>
-    <div class="container">
-      <p class="greeting">Hi {details.agent_name},</p>
-      <p class="intro">I’m writing to you regarding the property at <strong>{details.property_address}</strong></p>
-      <p class="intro">We are local investors purchasing under our entity, Big Whales AY LLC. (<a href="https://drive.google.com/file/d/1HxskELeQFfljFngV5OFvjuhDeUbQ1Dyx/view">LLC Formation</a>)</p>
-      
-      <p class="intro">I have structured an offer to eliminate risks for the seller. I am offering a clean, fast closing:</p>
-      
-      <div class="highlight">
-        <p>Purchase Price: ${details.purchase_price:,.2f}</p>
-        <p>Terms: 100% - Hard Money (No Financing Contingency) (<a href="https://drive.google.com/file/d/1uP2FbFpFc5SVHWBdVcBCoAfhBijTzyBP/view">PreApproval</a>)</p>
-        <p>Inspection: {details.inspection_period_days}-Day inspection period - We are purchasing "As-Is" and will not ask for repairs.</p>
-        <p>Closing: 14 Days (or sooner if title is ready)</p>
-        <p>Earnest Money: $5,000 can be wired as soon as today</p>
-        <p>Other Contingencies: None</p>
-      </div>
-
-      <p class="cta">We are ready to sign and get this moving today.</p>
-      
-      <div class="footer">
-        <p class="footer-name">Yarden Kelly - Big Whales AY LLC</p>
-        <p class="footer-contact">(786)-600-7210</p>
-        <p class="footer-contact"><a href="mailto:BigWhalesLLC@gmail.com">BigWhalesLLC@gmail.com</a></p>
-      </div>
-    </div>
-  </body>
-</html>
-    """
+_email_dispatcher = email_queue.Dispatcher(SessionLocal)
 
-    logger.info("Creating email message")
-    msg = MIMEMultipart()
-    msg['From'] = sender_email
-    msg['To'] = details.agent_email
-    msg['Subject'] = subject
-    msg.attach(MIMEText(body, 'html'))
-    logger.info("Email message created successfully")
 
-    try:
-        logger.info("Connecting to SMTP server (smtp.gmail.com:465)")
-        # Using Gmail's SSL port 465
-        server = smtplib.SMTP_SSL('smtp.gmail.com', 465)
-        logger.info("SMTP connection established")
-        
-        logger.info("Attempting to login to SMTP server")
-        server.login(sender_email, sender_password)
-        logger.info("SMTP login successful")
-        
-        logger.info(f"Sending email to {details.agent_email}")
-        server.send_message(msg)
-        logger.info("Email sent successfully")
-        
-        server.quit()
-        logger.info("SMTP connection closed")
-        return True, "Email sent successfully"
-    except smtplib.SMTPAuthenticationError as e:
-        logger.error(f"SMTP Authentication Error: {e}")
-        logger.error(f"Error code: {e.smtp_code}, Error message: {e.smtp_error}")
-        return False, f"Authentication failed: {str(e)}"
-    except smtplib.SMTPException as e:
-        logger.error(f"SMTP Error: {e}")
-        return False, f"SMTP error: {str(e)}"
-    except Exception as e:
-        logger.error(f"Unexpected error sending email: {type(e).__name__}: {e}")
-        import traceback
-        logger.error(f"Traceback: {traceback.format_exc()}")
-        return False, f"Error sending email: {str(e)}"
+@app.on_event("startup")
+def _start_email_dispatcher():
+    _email_dispatcher.start()
+
+
+@app.on_event("shutdown")
+def _stop_email_dispatcher():
+    _email_dispatcher.stop()
+
+
+def _offer_email_res(row: OutboundEmail) -> OfferEmailStatusRes:
+    return OfferEmailStatusRes(
+        id=row.id,
+        status=row.status,
+        to_address=row.to_address,
+        subject=row.subject,
+        attempts=row.attempts,
+        last_error=row.last_error,
+        created_at=row.created_at,
+        next_attempt_at=row.next_attempt_at if row.status == email_queue.QUEUED else None,
+        sent_at=row.sent_at,
+    )
+
 
 @app.post("/send-offer", response_model=SendOfferRes)
-def send_offer_route(payload: SendOfferReq):
+def send_offer_route(payload: SendOfferReq, db: Session = Depends(get_db)):
+    """Queue the offer email and return its tracking id; delivery (with
+    retries) happens on the email dispatcher, see `GET /send-offer/{id}`."""
     logger.info(f"Received send-offer request: property={payload.property_address}, agent={payload.agent_name}, email={payload.agent_email}")
     try:
-        success, message = send_offer_email(payload)
-        if not success:
-            logger.error(f"Email send failed: {message}")
-            raise HTTPException(status_code=500, detail=f"Failed to send email: {message}")
-        logger.info("Email send completed successfully")
-        return SendOfferRes(message=message, success=success)
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Unexpected error in send_offer_route: {type(e).__name__}: {e}")
-        import traceback
-        logger.error(f"Traceback: {traceback.format_exc()}")
-        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+        email_queue.load_settings()
+    except email_queue.EmailConfigError as e:
+        logger.error(f"Email send failed: {e}")
+        raise HTTPException(status_code=503, detail=str(e))
+    subject, body = render_offer_email(payload)
+    row = email_queue.enqueue(
+        db, payload.agent_email, subject, body, kind="offer",
+        dedupe_key=offer_dedupe_key(payload.agent_email, payload.property_address),
+    )
+    _email_dispatcher.wake()
+    logger.info(f"Offer email {row.id} queued for {payload.agent_email}")
+    return SendOfferRes(message="Offer queued", success=True, id=row.id, status=row.status)
+
+
+def _looks_like_email(address: str) -> bool:
+    local, at, domain = address.strip().rpartition("@")
+    return bool(at and local and "." in domain and not any(c.isspace() for c in address.strip()))
+
+
+@app.post("/send-offer/batch", response_model=SendOfferBatchRes)
+def send_offer_batch_route(payload: SendOfferBatchReq, db: Session = Depends(get_db)):
+    """Queue an offer campaign in one request.
+
+    Each offer is rendered from the compiled template. Repeats of the same
+    agent + property, within the batch or already queued or sent, are
+    reported as duplicates rather than sent again. Delivery is throttled to
+    the provider caps; poll each queued `id` for its outcome.
+    """
+    try:
+        settings = email_queue.load_settings()
+    except email_queue.EmailConfigError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    keys = [offer_dedupe_key(o.agent_email, o.property_address) for o in payload.offers]
+    existing = email_queue.find_active_duplicates(db, keys, kind="offer")
+    results: list[SendOfferBatchResult] = []
+    first_index: dict[str, int] = {}
+    pending: list[tuple[int, tuple[str, str, str, str]]] = []
+    for index, (offer, key) in enumerate(zip(payload.offers, keys)):
+        result = SendOfferBatchResult(
+            index=index, agent_email=offer.agent_email,
+            property_address=offer.property_address, status="queued",
+        )
+        if not _looks_like_email(offer.agent_email):
+            result.status, result.detail = "rejected", "Invalid agent email address"
+        elif key in first_index:
+            result.status, result.duplicate_of = "duplicate", first_index[key]
+            result.detail = f"Same agent and property as offer {first_index[key]}"
+        elif key in existing:
+            prior = existing[key]
+            result.status, result.id = "duplicate", prior.id
+            result.detail = f"Offer already {prior.status}"
+        else:
+            first_index[key] = index
+            subject, body = render_offer_email(offer)
+            pending.append((index, (offer.agent_email.strip(), subject, body, key)))
+        results.append(result)
+
+    if pending:
+        rows = email_queue.enqueue_many(db, [message for _, message in pending], kind="offer")
+        for (index, _), row in zip(pending, rows):
+            results[index].id = row.id
+        _email_dispatcher.wake()
+
+    counts = {status: sum(r.status == status for r in results) for status in ("queued", "duplicate", "rejected")}
+    logger.info(f"Offer batch: {counts['queued']} queued, {counts['duplicate']} duplicates, {counts['rejected']} rejected")
+    return SendOfferBatchRes(
+        queued=counts["queued"],
+        duplicates=counts["duplicate"],
+        rejected=counts["rejected"],
+        max_per_minute=settings.max_per_minute,
+        max_per_day=settings.max_per_day,
+        results=results,
+    )
+
+
+@app.get("/send-offer/{email_id}", response_model=OfferEmailStatusRes)
+def get_offer_email_status(email_id: uuid.UUID, db: Session = Depends(get_db)):
+    row = db.get(OutboundEmail, email_id)
+    if row is None or row.kind != "offer":
+        raise HTTPException(status_code=404, detail="Email not found")
+    return _offer_email_res(row)
 
 
 # --- Liquidity Timeline ---
@@ -1611,22 +2128,87 @@ def update_liquidity_settings(data: LiquiditySettingsUpdate, db: Session = Depen
     )
 
 
+@app.get("/liquidity/series", response_model=LiquiditySeriesRes)
+def get_liquidity_series(
+    start: Optional[date_cls] = Query(None, alias="from"),
+    end: Optional[date_cls] = Query(None, alias="to"),
+    db: Session = Depends(get_db),
+):
+    """Daily liquidity series (one-off transactions plus expanded recurring
+    rules) computed server-side; same semantics as the frontend engine.
+
+    `from`/`to` default to the frontend's default window. Windows starting
+    inside the materialized range are read from `liquidity_daily_balances`
+    (extended forward as the default window rolls); earlier windows are
+    computed on the fly.
+    """
+    settings = get_settings(db)
+    opening_k = float(settings.opening_balance_k) if settings else 0.0
+    opening_date = settings.opening_balance_date if settings else date_cls.today()
+    reserve_k = float(settings.reserve_k) if settings else 5.0
+
+    if start is None or end is None:
+        first, last = db.query(
+            func.min(LiquidityTransaction.effective_date), func.max(LiquidityTransaction.effective_date)
+        ).one()
+        default_start, default_end = liquidity_series.default_range(
+            [d for d in (first, last) if d is not None], opening_date
+        )
+        start, end = start or default_start, end or default_end
+    try:
+        liquidity_series.check_range(start, end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    materialized = liquidity_daily.read_series(db, start, end)
+    if materialized is not None:
+        return materialized
+    transactions = [
+        (effective_date, float(amount_k))
+        for effective_date, amount_k in db.query(
+            LiquidityTransaction.effective_date, LiquidityTransaction.amount_k
+        )
+    ]
+    rules = [liquidity_series.rule_from_model(rule) for rule in get_all_recurring(db)]
+    return liquidity_series.build_series(transactions, rules, opening_k, opening_date, start, end, reserve_k)
+
+
+_mercury_balance_cache = mercury_cache.BalanceCache(SessionLocal)
+
+
 @app.get("/liquidity/mercury-balance")
-def get_mercury_balance():
+def get_mercury_balance(refresh: bool = False):
     """
-    Fetch the live sum of all active Mercury account balances, in $k.
+    Sum of all active Mercury account balances, in $k, as of `as_of`.
 
     The frontend uses this to re-anchor the liquidity timeline's opening
-    balance to today on page load.
+    balance to today on page load. Served from cache; a `stale` balance is
+    refreshed in the background. `refresh=true` waits for a live fetch.
     """
     try:
-        return mercury_service.summarize_balance()
+        return _mercury_balance_cache.get(force_refresh=refresh)
     except MercuryConfigError as e:
         raise HTTPException(status_code=503, detail=str(e))
     except MercuryApiError as e:
         raise HTTPException(status_code=502, detail=str(e))
 
 
+@app.get("/liquidity/mercury-balance/history")
+def get_mercury_balance_history(
+    start: Optional[date_cls] = None,
+    end: Optional[date_cls] = None,
+    daily: bool = True,
+    db: Session = Depends(get_db),
+):
+    """Recorded Mercury balances (actuals) for plotting on the timeline.
+
+    `daily` keeps the last snapshot of each UTC day.
+    """
+    if start is not None and end is not None and end < start:
+        raise HTTPException(status_code=400, detail="end must be on or after start")
+    return {"points": mercury_cache.history(db, start=start, end=end, daily=daily)}
+
+
 # --- Pipeline Templates (bought-deal stages/substages) ---
 
 _VALID_DEAL_TYPES = {"BRRRR", "FLIP"}
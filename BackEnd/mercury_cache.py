@@ -0,0 +1,184 @@
+"""Stale-while-revalidate cache for the Mercury balance summary.
+
+`GET /liquidity/mercury-balance` used to call Mercury on every page load.
+`BalanceCache.get()` now answers from memory: a summary younger than
+`ttl` is served as is, and an older one is served straight away (flagged
+`stale`) while a single background thread refreshes it. Only a cold cache
+waits on Mercury.
+
+Every successful refresh is also written to `mercury_balance_snapshots`.
+That table warms the cache after a restart and doubles as the history of
+actual balances that the liquidity timeline plots (`history()`).
+
+TTL comes from `MERCURY_CACHE_TTL_SECONDS` (default 300).
+"""
+
+from __future__ import annotations
+
+import copy
+import logging
+import os
+import threading
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Optional
+
+from sqlalchemy.orm import Session
+
+import mercury_service
+from models import MercuryBalanceSnapshot
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 300
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _aware(dt: datetime) -> datetime:
+    # SQLite hands back naive datetimes; everything here is stored in UTC.
+    return dt if dt.tzinfo is not None else dt.replace(tzinfo=timezone.utc)
+
+
+class BalanceCache:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        fetch: Callable[[], dict[str, Any]] = mercury_service.summarize_balance,
+        ttl: Optional[timedelta] = None,
+    ):
+        self.session_factory = session_factory
+        self.fetch = fetch
+        self.ttl = ttl or timedelta(seconds=int(os.getenv("MERCURY_CACHE_TTL_SECONDS") or DEFAULT_TTL_SECONDS))
+        self._lock = threading.Lock()
+        self._summary: Optional[dict[str, Any]] = None
+        self._as_of: Optional[datetime] = None
+        self._loaded = False
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._last_error: Optional[str] = None
+
+    # --- Reads ---
+
+    def get(self, force_refresh: bool = False, now: Optional[datetime] = None) -> dict[str, Any]:
+        """Cached summary plus `as_of`, `stale`, `refreshing` and
+        `refresh_error`.
+
+        Raises the `mercury_service` errors only when nothing is cached (or
+        `force_refresh` is set) and the fetch fails.
+        """
+        now = now or _utcnow()
+        self._load_latest_snapshot()
+        with self._lock:
+            summary, as_of = self._summary, self._as_of
+        if summary is None or force_refresh:
+            self.refresh()
+            with self._lock:
+                summary, as_of = self._summary, self._as_of
+        elif now - as_of >= self.ttl:
+            self.refresh_in_background()
+        return self._response(summary, as_of, now)
+
+    def _response(self, summary: dict[str, Any], as_of: datetime, now: datetime) -> dict[str, Any]:
+        with self._lock:
+            refreshing = self._refresh_thread is not None and self._refresh_thread.is_alive()
+            last_error = self._last_error
+        out = copy.deepcopy(summary)
+        out["as_of"] = as_of.isoformat()
+        out["stale"] = now - as_of >= self.ttl
+        out["refreshing"] = refreshing
+        out["refresh_error"] = last_error
+        return out
+
+    def _load_latest_snapshot(self) -> None:
+        """Warm the in-process cache from the newest snapshot, once."""
+        if self._loaded:
+            return
+        with self.session_factory() as db:
+            row = db.query(MercuryBalanceSnapshot).order_by(MercuryBalanceSnapshot.as_of.desc()).first()
+            snapshot = (copy.deepcopy(row.summary), _aware(row.as_of)) if row is not None else None
+        with self._lock:
+            if snapshot is not None and (self._as_of is None or snapshot[1] > self._as_of):
+                self._summary, self._as_of = snapshot
+            self._loaded = True
+
+    # --- Refresh ---
+
+    def refresh(self) -> None:
+        """Fetch from Mercury now, record a snapshot and update the cache."""
+        try:
+            summary = self.fetch()
+        except (mercury_service.MercuryApiError, mercury_service.MercuryConfigError) as e:
+            with self._lock:
+                self._last_error = str(e)
+            raise
+        as_of = _utcnow()
+        with self.session_factory() as db:
+            db.add(MercuryBalanceSnapshot(
+                as_of=as_of,
+                total_balance_k=summary["total_balance_k"],
+                total_available_k=summary["total_available_k"],
+                account_count=summary["account_count"],
+                workspace_count=summary["workspace_count"],
+                summary=summary,
+            ))
+            db.commit()
+        with self._lock:
+            self._summary, self._as_of, self._last_error = summary, as_of, None
+
+    def refresh_in_background(self) -> Optional[threading.Thread]:
+        """Start a refresh unless one is already running; returns its thread."""
+        with self._lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return self._refresh_thread
+            thread = threading.Thread(target=self._refresh_quietly, name="mercury-refresh", daemon=True)
+            self._refresh_thread = thread
+        thread.start()
+        return thread
+
+    def _refresh_quietly(self) -> None:
+        try:
+            self.refresh()
+        except (mercury_service.MercuryApiError, mercury_service.MercuryConfigError) as e:
+            logger.warning("Background Mercury refresh failed; serving cached balance: %s", e)
+        except Exception:  # noqa: BLE001 - a daemon thread has nobody to raise to
+            logger.exception("Background Mercury refresh failed")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._summary = self._as_of = self._last_error = None
+            self._loaded = False
+
+
+def history(
+    db: Session,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    daily: bool = False,
+) -> list[dict[str, Any]]:
+    """Recorded balances in time order, optionally the last one per UTC day."""
+    query = db.query(
+        MercuryBalanceSnapshot.as_of,
+        MercuryBalanceSnapshot.total_balance_k,
+        MercuryBalanceSnapshot.total_available_k,
+    )
+    if start is not None:
+        query = query.filter(MercuryBalanceSnapshot.as_of >= datetime.combine(start, datetime.min.time(), timezone.utc))
+    if end is not None:
+        query = query.filter(
+            MercuryBalanceSnapshot.as_of < datetime.combine(end + timedelta(days=1), datetime.min.time(), timezone.utc)
+        )
+    points: list[dict[str, Any]] = []
+    for as_of, balance, available in query.order_by(MercuryBalanceSnapshot.as_of):
+        as_of = _aware(as_of)
+        point = {
+            "as_of": as_of.isoformat(),
+            "date": as_of.date().isoformat(),
+            "total_balance_k": float(balance),
+            "total_available_k": float(available),
+        }
+        if daily and points and points[-1]["date"] == point["date"]:
+            points[-1] = point
+        else:
+            points.append(point)
+    return points
@@ -7,20 +7,32 @@ Account balances from all workspaces are aggregated.
 
 All amounts are returned in $k (thousands of dollars) to match the
 liquidity feature's internal representation.
+
+Workspaces are fetched concurrently over one shared keep-alive
+`requests.Session`, so the page waits for the slowest workspace rather than
+the sum of all of them, and repeat loads skip the TLS handshake. The whole
+fetch gets `MERCURY_TIMEOUT_SECONDS` end to end; a workspace that overruns,
+fails, or is still queued behind the pool when the budget runs out lands in
+`workspace_errors` without discarding the others.
 """
 
 from __future__ import annotations
 
 import logging
 import os
-from typing import Any
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
 MERCURY_API_BASE = "https://api.mercury.com/api/v1"
 MERCURY_TIMEOUT_SECONDS = 15
+# Upper bound on workspaces fetched at once (and pooled connections kept).
+MAX_CONCURRENT_WORKSPACES = 8
 
 # Account statuses considered "live" cash that should count toward liquidity.
 ACTIVE_ACCOUNT_STATUSES = {"active"}
@@ -62,6 +74,32 @@ def discover_tokens() -> dict[str, str]:
     return tokens
 
 
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    """Process-wide session; its connection pool is shared by every workspace
+    fetch (urllib3 pools are thread-safe)."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=MAX_CONCURRENT_WORKSPACES)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def _reset_session() -> None:
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
 def _fetch_accounts_for_token(token: str) -> list[dict[str, Any]]:
     """Raw `GET /accounts` for a single workspace token."""
     url = f"{MERCURY_API_BASE}/accounts"
@@ -70,7 +108,7 @@ def _fetch_accounts_for_token(token: str) -> list[dict[str, Any]]:
         "Accept": "application/json",
     }
     try:
-        resp = requests.get(url, headers=headers, timeout=MERCURY_TIMEOUT_SECONDS)
+        resp = _get_session().get(url, headers=headers, timeout=MERCURY_TIMEOUT_SECONDS)
     except requests.RequestException as e:
         raise MercuryApiError(f"request failed: {e}") from e
 
@@ -172,9 +210,29 @@ def summarize_balance() -> dict[str, Any]:
     total_available = 0.0
     counted = 0
 
-    for label in sorted(tokens.keys()):
+    labels = sorted(tokens.keys())
+    # requests' timeout bounds each socket read, not the whole response, so
+    # the wait below also enforces the budget end to end. Stragglers are left
+    # to finish in the background and their results dropped; workspaces still
+    # queued behind `MAX_CONCURRENT_WORKSPACES` are cancelled.
+    executor = ThreadPoolExecutor(
+        max_workers=min(len(labels), MAX_CONCURRENT_WORKSPACES),
+        thread_name_prefix="mercury",
+    )
+    try:
+        futures = {label: executor.submit(_fetch_accounts_for_token, tokens[label]) for label in labels}
+        wait(futures.values(), timeout=MERCURY_TIMEOUT_SECONDS)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    for label in labels:
+        future = futures[label]
         try:
-            raw = _fetch_accounts_for_token(tokens[label])
+            if future.cancelled():
+                raise MercuryApiError(f"not started within {MERCURY_TIMEOUT_SECONDS}s (too many workspaces queued)")
+            if not future.done():
+                raise MercuryApiError(f"timed out after {MERCURY_TIMEOUT_SECONDS}s")
+            raw = future.result()
         except MercuryApiError as e:
             logger.warning("Mercury workspace %s failed: %s", label, e)
             errors.append({"workspace": label, "error": str(e)})
@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Date, JSON, func, Numeric, Uuid
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Date, JSON, func, Numeric, Uuid, Text
 from sqlalchemy.orm import declarative_mixin, declared_attr
+from datetime import datetime, timezone
 import uuid
 
 from db import Base
@@ -160,6 +161,30 @@ class BoughtFlipDeal(Base, BaseDeal):
     source_deal_id = Column(Uuid(as_uuid=True), nullable=True)
 
 
+class DealMetrics(Base):
+    """Materialized headline metrics for one saved deal.
+
+    Keyed by the deal's table + id (the four deal tables have independent
+    PKs). `input_hash` fingerprints the calculator inputs the row was
+    computed from, so a read can tell a fresh row from a stale one without
+    recalculating. `metrics` holds the `analyzeBRRRRes` / `analyzeFlipRes`
+    fields minus `breakdowns`; `cash_flow` / `roi` / `net_profit` are copied
+    into real columns so list filters can run in SQL.
+    Maintained by `deal_metrics`; never edit by hand.
+    """
+
+    __tablename__ = "deal_metrics"
+
+    deal_table = Column(String, primary_key=True)
+    deal_id = Column(Uuid(as_uuid=True), primary_key=True)
+    input_hash = Column(String(64), nullable=False)
+    metrics = Column(JSON, nullable=False)
+    cash_flow = Column(Float, nullable=True)
+    roi = Column(Float, nullable=True)
+    net_profit = Column(Float, nullable=True)
+    computed_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
 class PipelineTemplate(Base):
     """Persisted bought-deal pipeline template, one row per deal type.
 
@@ -244,6 +269,18 @@ class LiquidityRecurringTransaction(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
 
+class LiquidityDailyBalance(Base):
+    """One day of the materialized liquidity timeline (see `liquidity_daily`).
+    net_k: that day's flows (one-off + recurring); balance_k: end-of-day
+    balance. Both in $k. Derived data: safe to delete and rebuild.
+    """
+    __tablename__ = "liquidity_daily_balances"
+
+    day = Column(Date, primary_key=True)
+    net_k = Column(Numeric(14, 4), nullable=False)
+    balance_k = Column(Numeric(14, 4), nullable=False)
+
+
 class RepsPerson(Base):
     """Audit-trail contact (contractor, agent, lender, etc.) referenced from REPS log entries."""
 
@@ -316,3 +353,47 @@ class LiquiditySettings(Base):
     opening_balance_date = Column(Date, nullable=False)
     reserve_k = Column(Numeric(14, 4), nullable=False, default=5)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class OutboundEmail(Base):
+    """An email waiting for, or done with, delivery by `email_queue`.
+    status: queued -> sending -> sent | failed; failed transient sends go
+    back to queued with next_attempt_at pushed out by the backoff.
+    Timestamps are set Python-side in UTC so the dispatcher can compare them
+    on every backend.
+    """
+    __tablename__ = "outbound_emails"
+
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    kind = Column(String, nullable=False, default="offer")
+    to_address = Column(String, nullable=False)
+    subject = Column(String, nullable=False)
+    html_body = Column(Text, nullable=False)
+    status = Column(String, nullable=False, default="queued", index=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False, default=_utcnow, index=True)
+    last_error = Column(String, nullable=True)
+    # Agent email + normalised property address (offer_email.dedupe_key).
+    dedupe_key = Column(String, nullable=True, index=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, default=_utcnow)
+    sent_at = Column(DateTime(timezone=True), nullable=True, index=True)
+
+
+class MercuryBalanceSnapshot(Base):
+    """One successful Mercury balance refresh (see `mercury_cache`).
+    Totals are in $k; `summary` is the full `summarize_balance()` payload so
+    a restarted process can serve the last balance without calling Mercury.
+    """
+    __tablename__ = "mercury_balance_snapshots"
+
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    as_of = Column(DateTime(timezone=True), nullable=False, default=_utcnow, index=True)
+    total_balance_k = Column(Numeric(14, 4), nullable=False)
+    total_available_k = Column(Numeric(14, 4), nullable=False)
+    account_count = Column(Integer, nullable=False)
+    workspace_count = Column(Integer, nullable=False)
+    summary = Column(JSON, nullable=False)
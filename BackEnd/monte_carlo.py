@@ -0,0 +1,235 @@
+"""Monte Carlo risk simulation for BRRRR and Flip deals.
+
+Each deal is expanded into `draws` copies whose uncertain inputs (ARV, rehab
+overrun, months until refi / holding time, rent, interest rate) are sampled
+from the requested distributions, then evaluated in one pass through the
+vectorized formulas in `vector_calc` (the same math as
+`calculate_brrr_results` / `calculate_flip_results`). 100k draws of one deal
+take a few tens of milliseconds on one core.
+
+Randomness comes from `numpy.random.SeedSequence`: the request seed is
+spawned into one independent child stream per deal, so results are
+reproducible and identical whether deals run inline or in the process pool.
+
+This module deliberately doesn't import `main` so pool workers start without
+touching the database.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import multiprocessing
+import os
+import secrets
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Mapping, Optional, Sequence
+
+import numpy as np
+
+import vector_calc
+from ReqRes.analyzeBRRR.analyzeBRRRMonteCarloReq import MAX_DRAWS, MAX_TOTAL_DRAWS
+from vector_calc import Columns
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES: tuple[int, ...] = (5, 10, 25, 50, 75, 90, 95)
+
+# Which input column each named assumption perturbs, and how:
+# "pct" scales the base value by (1 + sample / 100), "delta" adds the sample.
+BRRR_ASSUMPTIONS: dict[str, tuple[str, str]] = {
+    "arv_pct": ("arv_in_thousands", "pct"),
+    "rehab_overrun_pct": ("rehab_cost_in_thousands", "pct"),
+    "months_delta": ("Months_until_refi", "delta"),
+    "rent_pct": ("rent", "pct"),
+    "interest_rate_delta": ("interest_rate", "delta"),
+}
+FLIP_ASSUMPTIONS: dict[str, tuple[str, str]] = {
+    "arv_pct": ("sale_price_in_thousands", "pct"),
+    "rehab_overrun_pct": ("rehab_cost_in_thousands", "pct"),
+    "months_delta": ("holding_time_months", "delta"),
+    "interest_rate_delta": ("HML_interest_rate", "delta"),
+}
+
+# Sampled inputs are clipped to stay physically meaningful; anything the
+# validation rules would still reject is dropped from the statistics.
+_FLOORS = {
+    "Months_until_refi": 1.0,
+    "holding_time_months": 1.0,
+    "arv_in_thousands": 0.0,
+    "sale_price_in_thousands": 0.0,
+    "rent": 0.0,
+    "rehab_cost_in_thousands": 0.0,
+    "interest_rate": 0.0,
+    "HML_interest_rate": 0.0,
+}
+
+BRRR_SUMMARY_METRICS = ("cash_out", "cash_flow", "roi", "net_profit", "cash_on_cash")
+FLIP_SUMMARY_METRICS = ("net_profit", "roi", "annualized_roi", "total_cash_needed")
+
+
+def sample(dist: Mapping, rng: np.random.Generator, n: int) -> np.ndarray:
+    """Draw `n` samples from a `{"kind": ..., params}` distribution spec."""
+    kind = dist["kind"]
+    if kind == "normal":
+        return rng.normal(dist.get("mean", 0.0), dist.get("sd", 0.0), n)
+    if kind == "uniform":
+        return rng.uniform(dist["low"], dist["high"], n)
+    if kind == "triangular":
+        if dist["low"] == dist["high"]:
+            return np.full(n, float(dist["low"]))
+        return rng.triangular(dist["low"], dist["mode"], dist["high"], n)
+    raise ValueError(f"Unknown distribution kind: {kind}.")
+
+
+def _draw_columns(
+    base: Columns,
+    assumptions: Mapping[str, Optional[Mapping]],
+    mapping: Mapping[str, tuple[str, str]],
+    rng: np.random.Generator,
+    draws: int,
+) -> Columns:
+    columns = {name: np.full(draws, column[0]) for name, column in base.items()}
+    # Iterate in the fixed `mapping` order so a seed always maps to the same
+    # samples regardless of the order assumptions were sent in.
+    for key, (field, mode) in mapping.items():
+        dist = assumptions.get(key)
+        if dist is None:
+            continue
+        draws_ = sample(dist, rng, draws)
+        values = columns[field] * (1.0 + draws_ / 100.0) if mode == "pct" else columns[field] + draws_
+        floor = _FLOORS.get(field)
+        columns[field] = values if floor is None else np.maximum(values, floor)
+    return columns
+
+
+def _summary(values: np.ndarray) -> Optional[dict]:
+    if values.size == 0:
+        return None
+    pct = np.percentile(values, PERCENTILES)
+    return {
+        "mean": float(values.mean()),
+        "std": float(values.std()),
+        "percentiles": {f"p{p}": float(v) for p, v in zip(PERCENTILES, pct)},
+    }
+
+
+def _share(mask: np.ndarray, n: int) -> float:
+    return float(mask.sum() / n) if n else 0.0
+
+
+def _valid_mask(columns: Columns, results: Columns, rules, first_metric: str) -> np.ndarray:
+    invalid = np.zeros(vector_calc.column_length(columns), dtype=bool)
+    for idx in vector_calc.validate_columns(columns, rules):
+        invalid[idx] = True
+    return ~invalid & ~np.isnan(results[first_metric])
+
+
+def simulate_brrr(base: Columns, assumptions: Mapping, draws: int, seed: np.random.SeedSequence) -> dict:
+    rng = np.random.default_rng(seed)
+    columns = _draw_columns(base, assumptions, BRRR_ASSUMPTIONS, rng, draws)
+    with np.errstate(all="ignore"):
+        results = vector_calc.calculate_brrr_columns(columns)
+    ok = _valid_mask(columns, results, vector_calc.BRRR_RULES, "cash_flow")
+    r = {k: v[ok] for k, v in results.items()}
+    n = int(ok.sum())
+
+    # `cash_on_cash` / `roi` use sentinels: -1 when no cash is left in the
+    # deal (infinite return), -2 when cash flow is non-positive. Summarize
+    # only the finite returns and report the sentinel shares separately.
+    infinite = r["cash_out"] >= 0
+    finite = ~infinite & (r["cash_flow"] > 0)
+    metrics = {}
+    for name in BRRR_SUMMARY_METRICS:
+        values = r[name][finite] if name in ("roi", "cash_on_cash") else r[name]
+        metrics[name] = _summary(values)
+    return {
+        "draws": draws,
+        "valid_draws": n,
+        "metrics": metrics,
+        "prob_negative_net_profit": _share(r["net_profit"] < 0, n),
+        "prob_negative_cash_flow": _share(r["cash_flow"] < 0, n),
+        "share_infinite_return": _share(infinite, n),
+    }
+
+
+def simulate_flip(base: Columns, assumptions: Mapping, draws: int, seed: np.random.SeedSequence) -> dict:
+    rng = np.random.default_rng(seed)
+    columns = _draw_columns(base, assumptions, FLIP_ASSUMPTIONS, rng, draws)
+    with np.errstate(all="ignore"):
+        results = vector_calc.calculate_flip_columns(columns)
+    ok = _valid_mask(columns, results, vector_calc.FLIP_RULES, "net_profit")
+    r = {k: v[ok] for k, v in results.items()}
+    n = int(ok.sum())
+    return {
+        "draws": draws,
+        "valid_draws": n,
+        "metrics": {name: _summary(r[name]) for name in FLIP_SUMMARY_METRICS},
+        "prob_negative_net_profit": _share(r["net_profit"] < 0, n),
+        "prob_negative_cash_flow": None,
+        "share_infinite_return": None,
+    }
+
+
+# --- Many deals ---
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Lazily start one shared worker pool (spawned, not forked: the API
+    process is multi-threaded)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            workers = int(os.getenv("MONTE_CARLO_WORKERS", 0)) or os.cpu_count() or 1
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            atexit.register(_pool.shutdown, wait=False, cancel_futures=True)
+        return _pool
+
+
+def _reset_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def run(
+    simulate: Callable[[Columns, Mapping, int, np.random.SeedSequence], dict],
+    bases: Sequence[Columns],
+    assumptions: Mapping,
+    draws: int,
+    seed: Optional[int] = None,
+    parallel: bool = False,
+) -> dict:
+    """Simulate every deal in `bases`; fan out to the pool when `parallel`."""
+    if not 1 <= draws <= MAX_DRAWS:
+        raise ValueError(f"draws must be between 1 and {MAX_DRAWS}.")
+    total = draws * len(bases)
+    if total > MAX_TOTAL_DRAWS:
+        raise ValueError(
+            f"{len(bases)} deals x {draws} draws is {total} draws; the maximum per request is {MAX_TOTAL_DRAWS}."
+        )
+    if seed is None:
+        # Report a seed the dashboard (JS numbers) can send back verbatim.
+        seed = secrets.randbits(53)
+    children = np.random.SeedSequence(seed).spawn(len(bases))
+    results = None
+    if parallel and len(bases) > 1:
+        try:
+            pool = _get_pool()
+            futures = [pool.submit(simulate, b, assumptions, draws, s) for b, s in zip(bases, children)]
+            results = [f.result() for f in futures]
+        except BrokenProcessPool:
+            # A worker died (OOM kill, bad interpreter state). Drop the pool so
+            # the next request starts a fresh one, and finish this one inline.
+            logger.warning("Monte Carlo process pool broke; running inline.", exc_info=True)
+            _reset_pool()
+    if results is None:
+        results = [simulate(b, assumptions, draws, s) for b, s in zip(bases, children)]
+    return {"seed": seed, "results": results}
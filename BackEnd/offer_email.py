@@ -0,0 +1,224 @@
+"""Offer email rendering.
+
+The offer HTML is parsed once at import into alternating literal chunks and
+field names, so rendering an email is an escape-and-join over a handful of
+fields. A campaign of hundreds of offers renders in well under a
+millisecond per recipient. Field values are HTML-escaped: agent names and
+addresses come straight from user input.
+"""
+
+from __future__ import annotations
+
+import html
+import re
+from string import Formatter
+from typing import Mapping
+
+from ReqRes.email.sendOfferReq import SendOfferReq
+
+_OFFER_SUBJECT = "Cash Offer for {property_address}"
+
+# Fields: agent_name, property_address, purchase_price (pre-formatted),
+# inspection_period_days. CSS braces are doubled, as in str.format.
+_OFFER_HTML = """<html>
+  <head>
+    <style>
+      body {{
+        font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+        color: #2c3e50;
+        line-height: 1.7;
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        margin: 0;
+        padding: 40px 20px;
+      }}
+      .container {{
+        max-width: 650px;
+        margin: 0 auto;
+        background-color: #ffffff;
+        padding: 45px;
+        border-radius: 12px;
+        box-shadow: 0 10px 40px rgba(0,0,0,0.15);
+        border-top: 6px solid #3498db;
+      }}
+      .greeting {{
+        font-size: 18px;
+        color: #2c3e50;
+        margin-bottom: 20px;
+        font-weight: 500;
+      }}
+      .intro {{
+        font-size: 16px;
+        color: #34495e;
+        margin-bottom: 25px;
+      }}
+      .highlight {{
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        padding: 25px 30px;
+        border-radius: 10px;
+        margin: 30px 0;
+        box-shadow: 0 4px 15px rgba(102, 126, 234, 0.3);
+      }}
+      .highlight p {{
+        margin: 12px 0;
+        font-weight: 600;
+        font-size: 16px;
+        color: #ffffff;
+        line-height: 1.8;
+      }}
+      .highlight p:first-child {{
+        font-size: 20px;
+        font-weight: 700;
+        margin-bottom: 18px;
+        padding-bottom: 15px;
+        border-bottom: 2px solid rgba(255,255,255,0.3);
+      }}
+      .highlight a {{
+        color: #ffffff;
+        text-decoration: underline;
+        font-weight: 600;
+      }}
+      .cta {{
+        font-size: 17px;
+        color: #2c3e50;
+        font-weight: 600;
+        margin: 30px 0;
+        text-align: center;
+        padding: 15px;
+        background-color: #ecf0f1;
+        border-radius: 8px;
+      }}
+      .footer {{
+        margin-top: 45px;
+        padding: 35px;
+        background: linear-gradient(135deg, #2c3e50 0%, #34495e 100%);
+        border-radius: 10px;
+        text-align: center;
+        box-shadow: 0 4px 15px rgba(0,0,0,0.2);
+      }}
+      .footer p {{
+        margin: 8px 0;
+        font-size: 20px;
+        color: #ffffff;
+        font-weight: 600;
+      }}
+      .footer-name {{
+        font-size: 24px !important;
+        font-weight: 700 !important;
+        margin-bottom: 15px !important;
+        letter-spacing: 0.5px;
+      }}
+      .footer-contact {{
+        font-size: 18px !important;
+        font-weight: 500 !important;
+        margin: 10px 0 !important;
+      }}
+      .footer a {{
+        color: #3498db;
+        text-decoration: none;
+        font-weight: 600;
+        font-size: 18px;
+      }}
+      .footer a:hover {{
+        color: #5dade2;
+        text-decoration: underline;
+      }}
+      a {{
+        color: #3498db;
+        text-decoration: none;
+        font-weight: 600;
+      }}
+      a:hover {{
+        color: #2980b9;
+        text-decoration: underline;
+      }}
+      strong {{
+        color: #2c3e50;
+        font-weight: 700;
+      }}
+    </style>
+  </head>
+  <body>
+    <div class="container">
+      <p class="greeting">Hi {agent_name},</p>
+      <p class="intro">I’m writing to you regarding the property at <strong>{property_address}</strong></p>
+      <p class="intro">We are local investors purchasing under our entity, Big Whales AY LLC. (<a href="https://drive.google.com/file/d/1HxskELeQFfljFngV5OFvjuhDeUbQ1Dyx/view">LLC Formation</a>)</p>
+      
+      <p class="intro">I have structured an offer to eliminate risks for the seller. I am offering a clean, fast closing:</p>
+      
+      <div class="highlight">
+        <p>Purchase Price: ${purchase_price}</p>
+        <p>Terms: 100% - Hard Money (No Financing Contingency) (<a href="https://drive.google.com/file/d/1uP2FbFpFc5SVHWBdVcBCoAfhBijTzyBP/view">PreApproval</a>)</p>
+        <p>Inspection: {inspection_period_days}-Day inspection period - We are purchasing "As-Is" and will not ask for repairs.</p>
+        <p>Closing: 14 Days (or sooner if title is ready)</p>
+        <p>Earnest Money: $5,000 can be wired as soon as today</p>
+        <p>Other Contingencies: None</p>
+      </div>
+
+      <p class="cta">We are ready to sign and get this moving today.</p>
+      
+      <div class="footer">
+        <p class="footer-name">Yarden Kelly - Big Whales AY LLC</p>
+        <p class="footer-contact">(786)-600-7210</p>
+        <p class="footer-contact"><a href="mailto:BigWhalesLLC@gmail.com">BigWhalesLLC@gmail.com</a></p>
+      </div>
+    </div>
+  </body>
+</html>
+"""
+
+
+class CompiledTemplate:
+    """A str.format-style template split into literals and field names."""
+
+    def __init__(self, source: str):
+        literals, fields, pending = [], [], []
+        for literal, field, spec, conversion in Formatter().parse(source):
+            if spec or conversion:
+                raise ValueError(f"Format specs are not supported in templates (field {field!r})")
+            # Escaped braces arrive as separate literal-only entries; merge them.
+            pending.append(literal)
+            if field is not None:
+                literals.append("".join(pending))
+                fields.append(field)
+                pending = []
+        literals.append("".join(pending))
+        self._literals = tuple(literals)
+        self.fields = tuple(fields)
+
+    def render(self, values: Mapping[str, str], escape: bool = True) -> str:
+        parts = [self._literals[0]]
+        for field, literal in zip(self.fields, self._literals[1:]):
+            value = str(values[field])
+            parts.append(html.escape(value) if escape else value)
+            parts.append(literal)
+        return "".join(parts)
+
+
+OFFER_SUBJECT = CompiledTemplate(_OFFER_SUBJECT)
+OFFER_HTML = CompiledTemplate(_OFFER_HTML)
+
+
+def offer_fields(details: SendOfferReq) -> dict[str, str]:
+    return {
+        "agent_name": details.agent_name,
+        "property_address": details.property_address,
+        "purchase_price": f"{details.purchase_price:,.2f}",
+        "inspection_period_days": str(details.inspection_period_days),
+    }
+
+
+def render_offer_email(details: SendOfferReq) -> tuple[str, str]:
+    """Subject and HTML body of the cash-offer email to a listing agent."""
+    fields = offer_fields(details)
+    return OFFER_SUBJECT.render(fields, escape=False), OFFER_HTML.render(fields)
+
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def dedupe_key(agent_email: str, property_address: str) -> str:
+    """Identity of an offer for duplicate detection: the agent's address
+    (case-insensitive) plus the property address with case, whitespace and
+    trailing punctuation normalised."""
+    address = _WHITESPACE.sub(" ", property_address).strip().rstrip(".,").casefold()
+    return f"{agent_email.strip().casefold()}|{address}"
@@ -0,0 +1,174 @@
+"""Maximum-offer solver: the highest purchase price that still meets targets.
+
+Every allowed target metric is non-increasing in `purchase_price_in_thousands`
+(a higher price means more down payment, a larger HML payoff and more cash
+left in the deal; DSCR and cash flow don't depend on price at all). That
+makes the feasible set an interval `(0, p*]`, so p* is found by bisection.
+Metrics that grow with price (cash needed, HML amount, holding costs...)
+would break that, so only each model's `target_metrics` are accepted.
+All deals in a request are bisected together: each step is one vectorized
+`vector_calc` evaluation of every deal at its current midpoint, so a batch
+of offers costs ~30 array passes regardless of size.
+
+Targets are lower bounds (`metric >= min`). For the BRRRR `cash_on_cash` /
+`roi` sentinels, -1 (no cash left in the deal, i.e. an infinite return)
+satisfies any target and -2 (non-positive cash flow) fails every target.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Callable, Mapping, Sequence
+
+import numpy as np
+
+import vector_calc
+from vector_calc import Columns
+
+PRICE_FIELD = "purchase_price_in_thousands"
+
+# Don't bisect forever on huge bounds; 60 halvings is far below $0.01.
+_MAX_ITERATIONS = 60
+
+
+@dataclass(frozen=True)
+class OfferModel:
+    """Deal-type specific pieces the solver needs."""
+
+    calculate: Callable[[Columns], Columns]
+    rules: Sequence
+    metrics: tuple[str, ...]
+    target_metrics: frozenset[str]
+    sentinel_metrics: frozenset[str]
+    upper_field: str
+    undefined_error: str
+
+
+BRRR = OfferModel(
+    vector_calc.calculate_brrr_columns, vector_calc.BRRR_RULES, vector_calc.BRRR_METRICS,
+    frozenset({"cash_flow", "dscr", "cash_out", "cash_out_routi", "cash_on_cash", "roi", "equity", "net_profit"}),
+    frozenset({"cash_on_cash", "roi"}), "arv_in_thousands", vector_calc.MORTGAGE_ERROR,
+)
+FLIP = OfferModel(
+    vector_calc.calculate_flip_columns, vector_calc.FLIP_RULES, vector_calc.FLIP_METRICS,
+    frozenset({"net_profit", "roi", "annualized_roi"}),
+    frozenset(), "sale_price_in_thousands", vector_calc.UNDEFINED_ERROR,
+)
+
+
+def _evaluate(model: OfferModel, columns: Columns, price: np.ndarray) -> Columns:
+    with np.errstate(all="ignore"):
+        return model.calculate({**columns, PRICE_FIELD: price})
+
+
+def _failing(model: OfferModel, results: Columns, constraints: Sequence[tuple[str, float]]) -> dict[str, np.ndarray]:
+    """Per constraint, a boolean array of the rows that miss it (NaN misses)."""
+    out = {}
+    for metric, minimum in constraints:
+        values = results[metric]
+        meets = values >= minimum
+        if metric in model.sentinel_metrics:
+            meets = np.where(values == -1.0, True, np.where(values == -2.0, False, meets))
+        out[f"{metric} >= {minimum:g}"] = ~meets
+    return out
+
+
+def _all_met(failing: Mapping[str, np.ndarray], n: int) -> np.ndarray:
+    ok = np.ones(n, dtype=bool)
+    for miss in failing.values():
+        ok &= ~miss
+    return ok
+
+
+def _binding(failing: Mapping[str, np.ndarray], i: int) -> list[str]:
+    return [label for label, miss in failing.items() if miss[i]]
+
+
+def solve_max_price(
+    model: OfferModel,
+    columns: Columns,
+    constraints: Sequence[tuple[str, float]],
+    upper: np.ndarray | None = None,
+    tolerance: float = 0.01,
+) -> list[dict]:
+    """Highest price (in thousands, a multiple of `tolerance`) meeting every
+    constraint, per row of `columns`; shaped like `MaxOfferResult`.
+
+    `upper` bounds the search (default: the deal's ARV / sale price). A row
+    whose constraints still hold at `upper` returns `upper` with `capped`.
+    """
+    unknown = sorted({m for m, _ in constraints} - set(model.metrics))
+    if unknown:
+        raise ValueError(f"Unknown metrics: {', '.join(unknown)}.")
+    rising = sorted({m for m, _ in constraints} - model.target_metrics)
+    if rising:
+        raise ValueError(f"Metrics can't be used as targets (they don't fall as price rises): {', '.join(rising)}.")
+    if tolerance <= 0:
+        raise ValueError("tolerance must be positive.")
+
+    n = vector_calc.column_length(columns)
+    upper = np.asarray(columns[model.upper_field] if upper is None else upper, dtype=float)
+    upper = np.broadcast_to(upper, (n,)).copy()
+
+    # The price itself is solved for, so validate everything else at the bound.
+    errors = vector_calc.validate_columns({**columns, PRICE_FIELD: np.maximum(upper, tolerance)}, model.rules)
+    valid = np.ones(n, dtype=bool)
+    if errors:
+        valid[list(errors)] = False
+    bound_ok = upper >= tolerance
+    for i in np.flatnonzero(valid & ~bound_ok):
+        errors[int(i)] = ["Upper price bound must be at least the tolerance."]
+        valid[i] = False
+
+    lo = np.full(n, tolerance)
+    hi = np.maximum(upper, tolerance)
+    fail_lo = _failing(model, _evaluate(model, columns, lo), constraints)
+    fail_hi = _failing(model, _evaluate(model, columns, hi), constraints)
+    feasible_lo = _all_met(fail_lo, n) & valid
+    capped = _all_met(fail_hi, n) & feasible_lo
+    active = feasible_lo & ~capped
+
+    if active.any():
+        span = float((hi - lo)[active].max())
+        steps = min(_MAX_ITERATIONS, max(0, math.ceil(math.log2(span / tolerance)) + 1))
+        for _ in range(steps):
+            mid = (lo + hi) / 2.0
+            ok = _all_met(_failing(model, _evaluate(model, columns, mid), constraints), n)
+            lo = np.where(active & ok, mid, lo)
+            hi = np.where(active & ~ok, mid, hi)
+        fail_hi = _failing(model, _evaluate(model, columns, hi), constraints)
+
+    # Offer on the tolerance grid, rounding down (monotonicity keeps it feasible).
+    price = np.where(capped, upper, np.floor(lo / tolerance) * tolerance)
+    price = np.where(active & (price < tolerance), tolerance, price)
+    solved = _evaluate(model, columns, price)
+
+    out = []
+    for i in range(n):
+        row = {
+            "index": i,
+            "feasible": bool(feasible_lo[i]),
+            "capped": bool(capped[i]),
+            "max_purchase_price_in_thousands": None,
+            "max_purchase_price": None,
+            "binding": [],
+            "metrics": None,
+            "detail": None,
+        }
+        if not valid[i]:
+            row["detail"] = " ".join(errors[i])
+        elif not feasible_lo[i]:
+            if np.isnan(solved[model.metrics[0]][i]):
+                row["detail"] = model.undefined_error
+            else:
+                row["binding"] = _binding(fail_lo, i)
+                row["detail"] = "Targets can't be met at any price."
+        else:
+            p = round(float(price[i]), 6)
+            row["max_purchase_price_in_thousands"] = p
+            row["max_purchase_price"] = round(p * 1000.0, 2)
+            row["binding"] = [] if capped[i] else _binding(fail_hi, i)
+            row["metrics"] = {m: float(solved[m][i]) for m in model.metrics}
+        out.append(row)
+    return out
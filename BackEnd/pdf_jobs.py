@@ -0,0 +1,215 @@
+"""Background PDF report rendering with an on-disk result cache.
+
+A report is identified by a hash of everything it shows: deal type, address,
+the deal inputs, the render date (printed in the header) and
+`deal_pdf.TEMPLATE_VERSION`. That hash is the cache file name, the job id and
+the ETag. A repeat request for the same report is served from disk without
+recalculating the deal, and any API process that shares the cache directory
+can serve a report another process rendered.
+
+Renders run in a bounded process pool. reportlab is pure Python and holds
+the GIL, so rendering in the request thread stalls every other request. The
+caller computes the calculator output and ships it to the worker as a plain
+dict, so a worker only needs this module and `deal_pdf`; importing `main`
+here would run its migrations in every spawned worker.
+"""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date
+from typing import Any, Mapping, Optional
+
+import deal_pdf
+
+logger = logging.getLogger(__name__)
+
+# Jobs queued or rendering at once; beyond this submit() refuses new work.
+MAX_PENDING = 200
+# Oldest cached reports are removed once the directory holds more than this.
+MAX_CACHED_FILES = 2000
+# Recent failures kept so `status` can report them; the oldest are dropped.
+MAX_FAILED_JOBS = 200
+
+
+class RenderQueueFull(RuntimeError):
+    """Raised when MAX_PENDING renders are already queued."""
+
+
+# --- Cache ---
+
+def cache_dir() -> str:
+    path = os.getenv("PDF_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "bigwhales-pdf-cache")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def report_key(deal_type: str, address: str, inputs: Mapping[str, Any]) -> str:
+    blob = json.dumps(
+        {
+            "template": deal_pdf.TEMPLATE_VERSION,
+            "date": date.today().isoformat(),
+            "deal_type": deal_type,
+            "address": address,
+            "inputs": inputs,
+        },
+        sort_keys=True, separators=(",", ":"), default=str,
+    )
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+def cache_path(key: str, directory: Optional[str] = None) -> str:
+    return os.path.join(directory or cache_dir(), f"{key}.pdf")
+
+
+def read_cached(key: str) -> Optional[bytes]:
+    try:
+        with open(cache_path(key), "rb") as fh:
+            return fh.read()
+    except FileNotFoundError:
+        return None
+
+
+def store(path: str, pdf_bytes: bytes) -> None:
+    """Write atomically so concurrent readers never see a partial file."""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(pdf_bytes)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def prune_cache(directory: Optional[str] = None, keep: Optional[int] = None) -> int:
+    """Delete the least recently written reports beyond `keep` (default
+    `MAX_CACHED_FILES`); returns the count."""
+    directory = directory or cache_dir()
+    keep = MAX_CACHED_FILES if keep is None else keep
+    entries = []
+    for entry in os.scandir(directory):
+        if entry.name.endswith(".pdf"):
+            try:
+                entries.append((entry.stat().st_mtime, entry.path))
+            except FileNotFoundError:
+                continue
+    entries.sort(reverse=True)
+    removed = 0
+    for _, path in entries[keep:]:
+        try:
+            os.unlink(path)
+            removed += 1
+        except FileNotFoundError:
+            pass
+    return removed
+
+
+def render(path: str, address: str, deal_type: str, result: dict) -> int:
+    """Render a report into the cache file at `path`; returns its size.
+
+    Runs in a pool worker, so the PDF bytes never cross the process pipe.
+    """
+    pdf_bytes = deal_pdf.build_deal_pdf(address=address, deal_type=deal_type, result=result)
+    store(path, pdf_bytes)
+    return len(pdf_bytes)
+
+
+# --- Jobs ---
+
+_pool: Optional[ProcessPoolExecutor] = None
+_jobs: dict[str, Future] = {}
+_failures: OrderedDict[str, str] = OrderedDict()
+_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Lazily start the render pool (spawned, not forked: the API process is
+    multi-threaded). Call with `_lock` held."""
+    global _pool
+    if _pool is None:
+        workers = int(os.getenv("PDF_WORKERS", 0)) or min(4, os.cpu_count() or 1)
+        _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        atexit.register(_pool.shutdown, wait=False, cancel_futures=True)
+    return _pool
+
+
+def _reset_pool() -> None:
+    global _pool
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def _finished(key: str, future: Future) -> None:
+    exc = future.exception()
+    with _lock:
+        if _jobs.get(key) is future:
+            # The cache file (or the failure entry) is now the record of this job.
+            del _jobs[key]
+            if exc is not None:
+                _failures[key] = str(exc) or type(exc).__name__
+                _failures.move_to_end(key)
+                while len(_failures) > MAX_FAILED_JOBS:
+                    _failures.popitem(last=False)
+    if exc is None:
+        prune_cache()
+        return
+    logger.error("PDF render %s failed: %s", key, exc)
+    if isinstance(exc, BrokenProcessPool):
+        _reset_pool()
+
+
+def submit(key: str, address: str, deal_type: str, result: dict) -> str:
+    """Queue a render unless the report is cached or already in flight.
+
+    Returns the job id (the report key). A failed job is retried on resubmit.
+    """
+    path = cache_path(key)
+    if os.path.exists(path):
+        return key
+    with _lock:
+        current = _jobs.get(key)
+        if current is not None and not current.done():
+            return key
+        if sum(not f.done() for f in _jobs.values()) >= MAX_PENDING:
+            raise RenderQueueFull("Too many reports are rendering; try again shortly.")
+        future = _get_pool().submit(render, path, address, deal_type, result)
+        _jobs[key] = future
+        _failures.pop(key, None)
+    future.add_done_callback(lambda f: _finished(key, f))
+    return key
+
+
+def status(key: str) -> Optional[dict]:
+    """`{"job_id", "status", "detail"}`, or None for an unknown job.
+
+    `status` is one of `pending`, `running`, `done` or `failed`.
+    """
+    if os.path.exists(cache_path(key)):
+        return {"job_id": key, "status": "done", "detail": None}
+    with _lock:
+        future = _jobs.get(key)
+        failure = _failures.get(key)
+    if future is None:
+        if failure is not None:
+            return {"job_id": key, "status": "failed", "detail": failure}
+        return None
+    if not future.done():
+        return {"job_id": key, "status": "running" if future.running() else "pending", "detail": None}
+    exc = future.exception()
+    if exc is not None:
+        return {"job_id": key, "status": "failed", "detail": str(exc) or type(exc).__name__}
+    # Finished but the file is gone (pruned between the two checks).
+    return None
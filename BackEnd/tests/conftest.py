@@ -0,0 +1,47 @@
+"""Shared fixtures for the deal-analysis test suite."""
+
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from db import Base, get_db
+
+
+@pytest.fixture()
+def db_session():
+    import main  # noqa: F401  (registers every ORM model on Base.metadata)
+
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+@pytest.fixture()
+def api_client(db_session):
+    import main
+
+    def _override_get_db():
+        yield db_session
+
+    main.app.dependency_overrides[get_db] = _override_get_db
+    try:
+        with TestClient(main.app) as test_client:
+            yield test_client
+    finally:
+        main.app.dependency_overrides.pop(get_db, None)
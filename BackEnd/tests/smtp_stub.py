@@ -0,0 +1,119 @@
+"""Minimal in-process SMTP server for exercising `email_queue` without a network.
+
+Speaks just enough ESMTP for `smtplib` (EHLO/HELO, AUTH PLAIN, MAIL, RCPT,
+DATA, RSET, NOOP, QUIT) over plain TCP, records what it receives, and can be
+told to reject upcoming messages or logins, or hang up on the client.
+"""
+
+import base64
+import email
+import socketserver
+import threading
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def _reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self) -> None:
+        stub: SmtpStub = self.server.stub
+        with stub.lock:
+            stub.connections += 1
+        self._reply("220 stub ESMTP")
+        mail_from, rcpts = None, []
+        while True:
+            raw = self.rfile.readline()
+            if not raw:
+                return
+            line = raw.decode().rstrip("\r\n")
+            verb = line.split(" ", 1)[0].upper()
+            if verb == "EHLO":
+                self._reply("250-stub")
+                self._reply("250 AUTH PLAIN")
+            elif verb == "HELO":
+                self._reply("250 stub")
+            elif verb == "AUTH":
+                _authzid, user, password = base64.b64decode(line.split()[2]).decode().split("\0")
+                with stub.lock:
+                    stub.logins.append((user, password))
+                    reject = stub.reject_logins
+                if reject:
+                    self._reply("535 5.7.8 Username and Password not accepted")
+                else:
+                    self._reply("235 Authentication successful")
+            elif verb == "MAIL":
+                with stub.lock:
+                    failure = stub._failures.pop(0) if stub._failures else None
+                    hang_up = stub._hang_ups > 0
+                    if hang_up:
+                        stub._hang_ups -= 1
+                if hang_up:
+                    return
+                if failure is not None:
+                    self._reply(f"{failure} Injected failure")
+                    continue
+                mail_from, rcpts = line.split(":", 1)[1].strip(), []
+                self._reply("250 OK")
+            elif verb == "RCPT":
+                rcpts.append(line.split(":", 1)[1].strip())
+                self._reply("250 OK")
+            elif verb == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                lines = []
+                while True:
+                    data = self.rfile.readline()
+                    if data in (b".\r\n", b""):
+                        break
+                    lines.append(data[1:] if data.startswith(b"..") else data)
+                with stub.lock:
+                    stub.messages.append(email.message_from_bytes(b"".join(lines)))
+                    stub.envelopes.append((mail_from, rcpts))
+                self._reply("250 OK queued")
+            elif verb in ("RSET", "NOOP"):
+                self._reply("250 OK")
+            elif verb == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("502 Command not implemented")
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class SmtpStub:
+    """`with SmtpStub() as stub:` serves on 127.0.0.1:`stub.port`."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.logins: list[tuple[str, str]] = []
+        # Answer every AUTH with 535 while set.
+        self.reject_logins = False
+        self.messages: list[email.message.Message] = []
+        self.envelopes: list[tuple[str, list[str]]] = []
+        self._failures: list[int] = []
+        self._hang_ups = 0
+        self._server = _Server(("127.0.0.1", 0), _Handler)
+        self._server.stub = self
+        self.port = self._server.server_address[1]
+
+    def fail_next(self, code: int, count: int = 1) -> None:
+        """Answer the next `count` MAIL FROM commands with `code`."""
+        with self.lock:
+            self._failures.extend([code] * count)
+
+    def hang_up_next(self, count: int = 1) -> None:
+        """Close the connection instead of answering the next MAIL FROM."""
+        with self.lock:
+            self._hang_ups += count
+
+    def __enter__(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
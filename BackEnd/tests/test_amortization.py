@@ -0,0 +1,57 @@
+"""Annuity-factor cache and the refi amortization schedule."""
+
+from decimal import Decimal
+
+import pytest
+
+import main
+
+
+def _uncached_payment(arv, ltv, interest_rate, loan_term_years):
+    loan_amount = arv * ltv
+    monthly_interest_rate = (interest_rate / Decimal("100.0")) / Decimal("12.0")
+    factor = (1 + monthly_interest_rate) ** (loan_term_years * 12)
+    return loan_amount * monthly_interest_rate * factor / (factor - 1)
+
+
+@pytest.mark.parametrize("rate, term", [("7.25", 30), ("6", 15), ("0.125", 40), ("12.5", 1)])
+def test_cached_payment_is_identical(rate, term):
+    args = (Decimal("285000"), Decimal("0.75"), Decimal(rate), term)
+    assert main.calc_mortgage_payment(*args) == _uncached_payment(*args)
+    hits = main.annuity_factor.cache_info().hits
+    assert main.calc_mortgage_payment(*args) == _uncached_payment(*args)
+    assert main.annuity_factor.cache_info().hits == hits + 1
+
+
+def test_schedule_adds_up(api_client):
+    res = api_client.get("/analyze/brrr/amortization", params={
+        "loan_amount": 200000, "interest_rate": 7, "loan_term_years": 30,
+    })
+    assert res.status_code == 200, res.text
+    out = res.json()
+    rows = out["schedule"]
+    expected = main.calc_mortgage_payment(Decimal("200000"), Decimal("1"), Decimal("7"), 30)
+    assert out["monthly_payment"] == pytest.approx(float(expected), abs=0.005)
+    assert len(rows) == 360 and rows[-1]["balance"] == 0
+    assert sum(r["principal"] for r in rows) == pytest.approx(200000, abs=0.01)
+    assert sum(r["interest"] for r in rows) == pytest.approx(out["total_interest"], abs=0.01)
+    assert out["total_paid"] == pytest.approx(200000 + out["total_interest"], abs=0.01)
+    assert all(r["payment"] == out["monthly_payment"] for r in rows[:-1])
+    # Cent rounding of the level payment drifts a few dollars over 30 years.
+    assert abs(rows[-1]["payment"] - out["monthly_payment"]) < 10
+    assert rows[0]["interest"] == pytest.approx(200000 * 0.07 / 12, abs=0.005)
+
+    hits = main.amortization_schedule.cache_info().hits
+    again = api_client.get("/analyze/brrr/amortization", params={
+        "loan_amount": 200000, "interest_rate": 7, "loan_term_years": 30,
+    })
+    assert again.json() == out
+    assert main.amortization_schedule.cache_info().hits == hits + 1
+
+
+def test_zero_rate_and_bad_params(api_client):
+    res = api_client.get("/analyze/brrr/amortization", params={"loan_amount": 1000, "interest_rate": 0})
+    assert res.status_code == 400
+    assert res.json()["detail"] == "Unable to calculate mortgage payment."
+    assert api_client.get("/analyze/brrr/amortization", params={"loan_amount": 0, "interest_rate": 5}).status_code == 422
+    assert api_client.get("/analyze/brrr/amortization", params={"interest_rate": 5}).status_code == 422
@@ -0,0 +1,137 @@
+"""Parity tests: the vectorized BRRRR batch engine must reproduce
+`calculate_brrr_results` / `validate_brrr_inputs` row for row.
+"""
+
+import random
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+
+import vector_calc
+from main import calculate_brrr_results, validate_brrr_inputs
+from ReqRes.analyzeBRRR.analyzeBRRRReq import analyzeBRRRReq
+
+
+def _brrr_payload(**overrides) -> analyzeBRRRReq:
+    values = dict(
+        arv_in_thousands=Decimal("250"),
+        purchase_price_in_thousands=Decimal("150"),
+        rehab_cost_in_thousands=Decimal("40"),
+        rehab_contingency_percent=Decimal("10"),
+        down_payment=Decimal("10"),
+        closing_costs_buy_in_thousands=Decimal("4"),
+        use_HM_for_rehab=True,
+        HML_points=Decimal("2"),
+        Months_until_refi=Decimal("6"),
+        HML_interest_rate=Decimal("12"),
+        closing_cost_refi_in_thousands=Decimal("5"),
+        refi_points=Decimal("1.5"),
+        cash_reserve_in_thousands=Decimal("0"),
+        loan_term_years=30,
+        ltv_as_precent=Decimal("75"),
+        interest_rate=Decimal("7.25"),
+        rent=Decimal("2100"),
+        vacancy_percent=Decimal("5"),
+        property_managment_fee_precentages_from_rent=Decimal("8"),
+        maintenance_percent=Decimal("5"),
+        capex_percent_of_rent=Decimal("5"),
+        annual_property_taxes=Decimal("3000"),
+        annual_insurance=Decimal("1800"),
+        montly_hoa=Decimal("0"),
+    )
+    values.update(overrides)
+    by_alias = {
+        (analyzeBRRRReq.model_fields[k].alias or k): v for k, v in values.items()
+    }
+    return analyzeBRRRReq.model_validate(by_alias)
+
+
+def _random_brrr_payload(rng: random.Random) -> analyzeBRRRReq:
+    def d(lo, hi, places=2):
+        return Decimal(str(round(rng.uniform(lo, hi), places)))
+
+    return _brrr_payload(
+        arv_in_thousands=d(80, 900),
+        purchase_price_in_thousands=d(40, 600),
+        rehab_cost_in_thousands=d(0, 150),
+        rehab_contingency_percent=d(0, 25),
+        down_payment=d(0, 30),
+        closing_costs_buy_in_thousands=d(0, 15),
+        use_HM_for_rehab=rng.random() < 0.5,
+        HML_points=d(0, 4),
+        Months_until_refi=d(1, 18, 1),
+        HML_interest_rate=d(8, 15),
+        closing_cost_refi_in_thousands=d(0, 10),
+        refi_points=d(0, 3),
+        cash_reserve_in_thousands=d(0, 30),
+        loan_term_years=rng.choice([15, 20, 25, 30, 40]),
+        ltv_as_precent=d(50, 85),
+        interest_rate=d(3, 11),
+        rent=d(600, 6000),
+        vacancy_percent=d(0, 10),
+        property_managment_fee_precentages_from_rent=d(0, 12),
+        maintenance_percent=d(0, 10),
+        capex_percent_of_rent=d(0, 10),
+        annual_property_taxes=d(0, 12000),
+        annual_insurance=d(0, 5000),
+        montly_hoa=d(0, 400),
+    )
+
+
+def test_batch_metrics_match_scalar_engine_to_the_cent():
+    rng = random.Random(1234)
+    payloads = [_random_brrr_payload(rng) for _ in range(300)]
+
+    result = vector_calc.analyze_brrr_batch(vector_calc.brrr_columns_from_payloads(payloads))
+
+    assert result["count"] == 300
+    assert result["errors"] == []
+    for i, payload in enumerate(payloads):
+        scalar = calculate_brrr_results(payload)
+        for metric in vector_calc.BRRR_METRICS:
+            assert result["metrics"][metric][i] == pytest.approx(
+                getattr(scalar, metric), abs=0.005
+            ), (i, metric)
+
+
+def test_invalid_rows_are_reported_by_index_with_scalar_messages():
+    payloads = [
+        _brrr_payload(),
+        _brrr_payload(rent=Decimal("0"), down_payment=Decimal("120")),
+        _brrr_payload(),
+        _brrr_payload(interest_rate=Decimal("0")),
+    ]
+
+    result = vector_calc.analyze_brrr_batch(vector_calc.brrr_columns_from_payloads(payloads))
+
+    with pytest.raises(HTTPException) as scalar_error:
+        validate_brrr_inputs(payloads[1])
+    assert result["errors"] == [
+        {"index": 1, "detail": scalar_error.value.detail},
+        {"index": 3, "detail": "Unable to calculate mortgage payment."},
+    ]
+    assert result["valid_count"] == 2
+    assert result["metrics"]["cash_flow"][1] is None
+    assert result["metrics"]["cash_flow"][3] is None
+    assert result["metrics"]["cash_flow"][0] == result["metrics"]["cash_flow"][2]
+
+
+def test_batch_endpoint_accepts_deal_list_and_columns(api_client):
+    deal = _brrr_payload().model_dump(by_alias=True, mode="json")
+    by_list = api_client.post("/analyze/brrr/batch", json={"deals": [deal, deal]})
+    assert by_list.status_code == 200
+
+    columns = {key: [float(value)] * 2 for key, value in deal.items()}
+    by_columns = api_client.post("/analyze/brrr/batch", json={"columns": columns})
+    assert by_columns.status_code == 200
+    assert by_columns.json()["metrics"] == by_list.json()["metrics"]
+
+    single = api_client.post("/analyze/brrr", json=deal).json()
+    assert by_list.json()["metrics"]["roi"][0] == pytest.approx(single["roi"], abs=0.005)
+
+
+def test_batch_endpoint_rejects_missing_required_columns(api_client):
+    res = api_client.post("/analyze/brrr/batch", json={"columns": {"rent": [2000.0]}})
+    assert res.status_code == 400
+    assert "Missing required columns" in res.json()["detail"]
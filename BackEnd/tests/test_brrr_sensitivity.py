@@ -0,0 +1,93 @@
+"""The sensitivity grid must match `calculate_brrr_results` at every point."""
+
+from decimal import Decimal
+
+import pytest
+
+import vector_calc
+from main import calculate_brrr_results
+from tests.test_brrr_batch import _brrr_payload
+
+
+def _body(axes, **extra):
+    deal = _brrr_payload().model_dump(mode="json", by_alias=True)
+    return {"deal": deal, "axes": axes, **extra}
+
+
+def test_grid_matches_scalar_calculator(api_client):
+    arvs = [200.0, 250.0, 310.0]
+    res = api_client.post("/analyze/brrr/sensitivity", json=_body([
+        {"field": "arv_in_thousands", "values": arvs},
+        {"field": "interestRate", "start": 5, "stop": 8, "steps": 4},
+        {"field": "rent", "values": [1500, 2500]},
+    ]))
+    assert res.status_code == 200, res.text
+    out = res.json()
+    assert out["shape"] == [3, 4, 2]
+    assert out["count"] == out["valid_count"] == 24
+    assert [a["field"] for a in out["axes"]] == ["arv_in_thousands", "interest_rate", "rent"]
+    rates = out["axes"][1]["values"]
+    assert rates == pytest.approx([5, 6, 7, 8])
+
+    for i, arv in enumerate(arvs):
+        for j, rate in enumerate(rates):
+            for k, rent in enumerate([1500, 2500]):
+                expected = calculate_brrr_results(_brrr_payload(
+                    arv_in_thousands=Decimal(str(arv)),
+                    interest_rate=Decimal(str(rate)),
+                    rent=Decimal(rent),
+                ), include_breakdown=False)
+                for name in vector_calc.BRRR_METRICS:
+                    assert out["metrics"][name][i][j][k] == pytest.approx(
+                        float(getattr(expected, name)), abs=0.005
+                    ), (name, arv, rate, rent)
+
+
+def test_metric_subset_and_invalid_points(api_client):
+    res = api_client.post("/analyze/brrr/sensitivity", json=_body(
+        [{"field": "monthsUntilRefi", "values": [-1, 0, 6, 12]}],
+        metrics=["cash_flow", "roi"],
+    ))
+    assert res.status_code == 200
+    out = res.json()
+    assert set(out["metrics"]) == {"cash_flow", "roi"}
+    assert out["metrics"]["roi"][:2] == [None, None]
+    assert None not in out["metrics"]["roi"][2:]
+    assert [e["index"] for e in out["errors"]] == [0, 1]
+    assert out["errors"][0]["detail"] == "Months until refi must be a positive number."
+
+
+@pytest.mark.parametrize("body, detail", [
+    (_body([{"field": "nope", "values": [1]}]), "Unknown field: nope."),
+    (_body([{"field": "rent", "values": [1]}, {"field": "rent", "values": [2]}]), "Each field may only be swept once."),
+    (_body([{"field": "rent", "values": [1]}], metrics=["irr"]), "Unknown metrics: irr."),
+    (_body([
+        {"field": "rent", "start": 1, "stop": 2, "steps": 100},
+        {"field": "arv_in_thousands", "start": 1, "stop": 2, "steps": 100},
+        {"field": "interest_rate", "start": 1, "stop": 2, "steps": 100},
+    ]), "maximum"),
+])
+def test_bad_requests(api_client, body, detail):
+    res = api_client.post("/analyze/brrr/sensitivity", json=body)
+    assert res.status_code == 400
+    assert detail in res.json()["detail"]
+
+
+def test_axis_needs_values_or_range(api_client):
+    res = api_client.post("/analyze/brrr/sensitivity", json=_body([{"field": "rent", "start": 1}]))
+    assert res.status_code == 422
+    res = api_client.post("/analyze/brrr/sensitivity", json=_body([{"field": f, "values": [1]} for f in ("rent", "arv_in_thousands", "interest_rate", "refi_points")]))
+    assert res.status_code == 422
+
+
+def test_oversized_axes_are_rejected_before_allocation(api_client, monkeypatch):
+    res = api_client.post("/analyze/brrr/sensitivity", json=_body([{"field": "rent", "start": 1, "stop": 2, "steps": 10**9}]))
+    assert res.status_code == 422
+
+    monkeypatch.setattr(vector_calc.np, "linspace", pytest.fail)
+    res = api_client.post("/analyze/brrr/sensitivity", json=_body([
+        {"field": "rent", "start": 1, "stop": 2, "steps": 1_000},
+        {"field": "arv_in_thousands", "start": 1, "stop": 2, "steps": 1_000},
+    ]))
+    assert res.status_code == 400
+    assert "1000000 points" in res.json()["detail"]
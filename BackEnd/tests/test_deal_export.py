@@ -0,0 +1,84 @@
+"""Streaming NDJSON / CSV export of the deal portfolio."""
+
+import csv
+import io
+import json
+
+from models import BrrrActiveDeal
+from tests.test_deal_listing import FLIP_DEAL, _seed
+from tests.test_lazy_breakdown import BRRR_DEAL
+
+
+def _ndjson(res):
+    return [json.loads(line) for line in res.text.splitlines()]
+
+
+def test_ndjson_export_matches_list_endpoint(api_client, db_session):
+    _seed(api_client, db_session, n_brrr=4, n_flip=3)
+    res = api_client.get("/active-deals/export")
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("application/x-ndjson")
+    assert 'filename="active-deals.ndjson"' in res.headers["content-disposition"]
+
+    exported = {row["id"]: row for row in _ndjson(res)}
+    listed = {row["id"]: row for row in api_client.get("/active-deals").json()}
+    assert exported.keys() == listed.keys()
+    for deal_id, row in exported.items():
+        assert "breakdowns" not in row
+        expected = {k: v for k, v in listed[deal_id].items() if k != "breakdowns"}
+        assert row == expected
+
+
+def test_export_is_batched(api_client, db_session, monkeypatch):
+    import deal_export
+
+    monkeypatch.setattr(deal_export, "EXPORT_BATCH_SIZE", 2)
+    _seed(api_client, db_session, n_brrr=5, n_flip=3)
+    rows = _ndjson(api_client.get("/active-deals/export"))
+    assert len(rows) == 8
+    assert [r["deal_type"] for r in rows] == ["BRRRR"] * 5 + ["FLIP"] * 3
+
+
+def test_csv_export(api_client, db_session):
+    api_client.post("/active-deals", json=BRRR_DEAL)
+    api_client.post("/active-deals", json=FLIP_DEAL)
+    res = api_client.get("/active-deals/export", params={"format": "csv"})
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/csv")
+
+    reader = csv.DictReader(io.StringIO(res.text))
+    rows = list(reader)
+    assert len(rows) == 2
+    assert {"id", "deal_type", "purchasePrice", "cash_flow", "roi", "error"} <= set(reader.fieldnames)
+    assert "breakdowns" not in reader.fieldnames
+    brrr = next(r for r in rows if r["deal_type"] == "BRRRR")
+    flip = next(r for r in rows if r["deal_type"] == "FLIP")
+    assert brrr["error"] == "" and float(brrr["cash_flow"])
+    assert flip["cash_flow"] == "" and flip["notes"].startswith("long notes")
+
+
+def test_csv_export_of_empty_portfolio_is_just_a_header(api_client):
+    res = api_client.get("/bought-deals/export", params={"format": "csv"})
+    assert res.status_code == 200
+    assert "id" in res.text.splitlines()[0].split(",")
+    assert len(res.text.splitlines()) == 1
+
+
+def test_uncomputable_deal_is_exported_with_error(api_client, db_session):
+    created = api_client.post("/active-deals", json=BRRR_DEAL).json()
+    api_client.post("/active-deals", json={**BRRR_DEAL, "address": "OK St"})
+    deal = db_session.query(BrrrActiveDeal).filter(BrrrActiveDeal.address == "12 Elm St").one()
+    deal.interest_rate = 0
+    db_session.commit()
+
+    rows = {r["id"]: r for r in _ndjson(api_client.get("/active-deals/export"))}
+    assert rows[created["id"]]["error"] == "Unable to calculate mortgage payment."
+    assert sum("error" not in r for r in rows.values()) == 1
+
+
+def test_bought_export(api_client, db_session):
+    created = api_client.post("/active-deals", json=BRRR_DEAL).json()
+    bought = api_client.post(f"/bought-deals/from-active/{created['id']}").json()
+    rows = _ndjson(api_client.get("/bought-deals/export"))
+    assert [r["id"] for r in rows] == [bought["id"]]
+    assert rows[0]["boughtStage"] == "purchase"
@@ -0,0 +1,148 @@
+"""Keyset pagination, filters and sparse fieldsets on the deal list endpoints."""
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from deal_listing import DealFilters
+from models import BoughtBrrrDeal, BoughtFlipDeal, BrrrActiveDeal, FlipActiveDeal
+from tests.test_lazy_breakdown import BRRR_DEAL
+
+
+FLIP_DEAL = {
+    "deal_type": "FLIP",
+    "section": 2,
+    "stage": 1,
+    "address": "9 Oak Ave",
+    "purchasePrice": "200",
+    "rehabCost": "30",
+    "down_payment": "10",
+    "HMLInterestRate": "12",
+    "salePrice": "320",
+    "holdingTime": 6,
+    "notes": "long notes " * 50,
+}
+
+
+def _seed(api_client, db_session, n_brrr=7, n_flip=5):
+    """Create deals with distinct, interleaved `created_at` timestamps."""
+    ids = []
+    for i in range(n_brrr):
+        body = {**BRRR_DEAL, "address": f"{i} Elm St", "stage": 1 + i % 2, "rent": str(1500 + 200 * i)}
+        ids.append(api_client.post("/active-deals", json=body).json()["id"])
+    for i in range(n_flip):
+        ids.append(api_client.post("/active-deals", json={**FLIP_DEAL, "address": f"{i} Oak Ave"}).json()["id"])
+
+    base = datetime(2024, 1, 1)
+    deals = db_session.query(BrrrActiveDeal).all() + db_session.query(FlipActiveDeal).all()
+    for offset, deal in enumerate(deals):
+        # Interleave the two tables and include a tie to exercise the id tiebreak.
+        deal.created_at = base + timedelta(minutes=(offset * 7) % len(deals) // 2)
+    db_session.commit()
+    return ids
+
+
+def _walk(api_client, path, **params):
+    seen, cursor = [], None
+    while True:
+        query = {**params, **({"cursor": cursor} if cursor else {})}
+        res = api_client.get(path, params=query)
+        assert res.status_code == 200, res.text
+        seen.extend(res.json())
+        cursor = res.headers.get("x-next-cursor")
+        if not cursor:
+            return seen
+
+
+def test_pages_cover_the_full_list_in_order(api_client, db_session):
+    _seed(api_client, db_session)
+    full = api_client.get("/active-deals").json()
+    assert len(full) == 12
+    assert "x-next-cursor" not in api_client.get("/active-deals").headers
+
+    for limit in (1, 3, 5, 12, 50):
+        paged = _walk(api_client, "/active-deals", limit=limit)
+        assert [d["id"] for d in paged] == [d["id"] for d in full]
+
+    keys = [(d["created_at"], d["id"]) for d in full]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_filters(api_client, db_session):
+    _seed(api_client, db_session)
+
+    flips = _walk(api_client, "/active-deals", limit=2, deal_type="FLIP")
+    assert len(flips) == 5 and {d["deal_type"] for d in flips} == {"FLIP"}
+
+    stage_two = api_client.get("/active-deals", params={"stage": 2}).json()
+    assert len(stage_two) == 3 and {d["stage"] for d in stage_two} == {2}
+
+    full = api_client.get("/active-deals").json()
+    floor = sorted(d["cash_flow"] for d in full if d["deal_type"] == "BRRRR")[3]
+    rich = _walk(api_client, "/active-deals", limit=2, min_cash_flow=floor)
+    assert len(rich) == 4
+    assert all(d["deal_type"] == "BRRRR" and d["cash_flow"] >= floor for d in rich)
+    assert [d["id"] for d in rich] == [d["id"] for d in full if d["id"] in {r["id"] for r in rich}]
+
+
+def test_sparse_fields_drop_heavy_columns(api_client, db_session):
+    _seed(api_client, db_session, n_brrr=1, n_flip=1)
+    res = api_client.get("/active-deals", params={"fields": "address,purchasePrice,roi"})
+    assert res.status_code == 200
+    for deal in res.json():
+        assert set(deal) == {"id", "deal_type", "created_at", "address", "purchasePrice", "roi"}
+
+    with_notes = api_client.get("/active-deals", params={"fields": "notes", "deal_type": "FLIP"}).json()
+    assert with_notes[0]["notes"].startswith("long notes")
+
+
+def test_bad_parameters_are_rejected(api_client, db_session):
+    assert api_client.get("/active-deals", params={"fields": "address,nope"}).status_code == 400
+    assert api_client.get("/active-deals", params={"cursor": "garbage"}).status_code == 400
+    assert api_client.get("/active-deals", params={"limit": 0}).status_code == 422
+    assert api_client.get("/bought-deals", params={"deal_type": "CONDO"}).status_code == 422
+
+
+def test_bought_deals_filter_by_bought_stage(api_client, db_session):
+    ids = _seed(api_client, db_session, n_brrr=3, n_flip=1)
+    for deal_id in ids[:2]:
+        api_client.post(f"/bought-deals/from-active/{deal_id}")
+    api_client.post(f"/bought-deals/from-active/{ids[3]}", params={"deal_type": "FLIP"})
+
+    # SQLite stores `server_default=now()` without microseconds; pin explicit
+    # timestamps so keyset comparisons see one format (Postgres doesn't care).
+    base = datetime(2024, 2, 1)
+    bought = db_session.query(BoughtBrrrDeal).all() + db_session.query(BoughtFlipDeal).all()
+    for offset, deal in enumerate(bought):
+        deal.created_at = base + timedelta(minutes=offset % 2)
+    db_session.commit()
+
+    everything = api_client.get("/bought-deals").json()
+    assert len(everything) == 3
+    first = everything[0]
+    deal = db_session.query(BoughtBrrrDeal).filter(BoughtBrrrDeal.id == uuid.UUID(first["id"])).one_or_none()
+    deal = deal or db_session.query(BoughtFlipDeal).filter(BoughtFlipDeal.id == uuid.UUID(first["id"])).one()
+    deal.bought_stage = "rehab"
+    db_session.commit()
+
+    rehab = api_client.get("/bought-deals", params={"bought_stage": "rehab"}).json()
+    assert [d["id"] for d in rehab] == [first["id"]]
+    paged = _walk(api_client, "/bought-deals", limit=1)
+    assert [d["id"] for d in paged] == [d["id"] for d in everything]
+
+
+@pytest.mark.parametrize("min_roi", [-50.0, 0.0, 25.0, 1e6])
+def test_brrr_infinite_roi_sentinel_meets_any_floor(min_roi):
+    assert DealFilters(min_roi=min_roi).accepts({"cash_flow": 300.0, "roi": -1.0}, brrr=True)
+
+
+@pytest.mark.parametrize("min_roi", [-1e6, -50.0, 0.0, 25.0])
+def test_brrr_no_cash_flow_sentinel_meets_no_floor(min_roi):
+    assert not DealFilters(min_roi=min_roi).accepts({"cash_flow": -50.0, "roi": -2.0}, brrr=True)
+
+
+def test_flip_roi_has_no_sentinels():
+    # -1.0 and -2.0 are ordinary (small) losses on a flip.
+    assert DealFilters(min_roi=-5.0).accepts({"roi": -2.0})
+    assert not DealFilters(min_roi=0.0).accepts({"roi": -1.0})
@@ -0,0 +1,85 @@
+"""Materialized deal metrics: refreshed on writes, served on list reads,
+and checkable for drift."""
+
+import uuid
+
+import deal_metrics
+from models import BrrrActiveDeal, DealMetrics
+from tests.test_lazy_breakdown import BRRR_DEAL
+
+
+def _metrics_row(db_session, table, deal_id):
+    db_session.expire_all()
+    return db_session.get(DealMetrics, (table, uuid.UUID(deal_id)))
+
+
+def test_create_update_duplicate_and_delete_keep_cache_in_sync(api_client, db_session):
+    created = api_client.post("/active-deals", json=BRRR_DEAL).json()
+    row = _metrics_row(db_session, "active_deals", created["id"])
+    assert row.metrics["cash_flow"] == created["cash_flow"]
+    original_hash = row.input_hash
+
+    # Non-input edits (stage moves) keep the cached row as-is.
+    api_client.put(f"/active-deals/{created['id']}", json={**BRRR_DEAL, "stage": 3})
+    assert _metrics_row(db_session, "active_deals", created["id"]).input_hash == original_hash
+
+    updated = api_client.put(f"/active-deals/{created['id']}", json={**BRRR_DEAL, "rent": "2600"}).json()
+    row = _metrics_row(db_session, "active_deals", created["id"])
+    assert row.input_hash != original_hash
+    assert row.cash_flow == updated["cash_flow"] > created["cash_flow"]
+
+    copy = api_client.post(f"/active-deals/{created['id']}/duplicate").json()
+    assert _metrics_row(db_session, "active_deals", copy["id"]).input_hash == row.input_hash
+
+    bought = api_client.post(f"/bought-deals/from-active/{created['id']}").json()
+    assert _metrics_row(db_session, "bought_brrrr_deals", bought["id"]) is not None
+
+    api_client.delete(f"/active-deals/{copy['id']}")
+    assert _metrics_row(db_session, "active_deals", copy["id"]) is None
+
+
+def test_list_serves_cached_metrics_identical_to_live_calculation(api_client):
+    api_client.post("/active-deals", json=BRRR_DEAL)
+    api_client.post("/active-deals", json={**BRRR_DEAL, "rent": "3100"})
+
+    cached = api_client.get("/active-deals").json()
+    live = api_client.get("/active-deals", params={"include_breakdown": True}).json()
+
+    for row in live:
+        row["breakdowns"] = None
+    assert cached == live
+
+
+def test_list_heals_rows_edited_outside_the_api(api_client, db_session):
+    deal_id = api_client.post("/active-deals", json=BRRR_DEAL).json()["id"]
+    deal = db_session.get(BrrrActiveDeal, uuid.UUID(deal_id))
+    deal.rent = 3000
+    db_session.commit()
+
+    listed = api_client.get("/active-deals").json()[0]
+    live = api_client.get(f"/active-deals/{deal_id}/breakdown").json()
+
+    assert listed["cash_flow"] == live["cash_flow"]
+    assert _metrics_row(db_session, "active_deals", deal_id).cash_flow == live["cash_flow"]
+
+
+def test_check_reports_missing_and_drift_and_backfill_repairs(api_client, db_session):
+    first = api_client.post("/active-deals", json=BRRR_DEAL).json()["id"]
+    second = api_client.post("/active-deals", json={**BRRR_DEAL, "rent": "2500"}).json()["id"]
+
+    db_session.delete(_metrics_row(db_session, "active_deals", first))
+    tampered = _metrics_row(db_session, "active_deals", second)
+    tampered.metrics = {**tampered.metrics, "roi": 999.0}
+    db_session.commit()
+
+    report = deal_metrics.check(db_session, sample=10, seed=1)
+    kinds = {p["deal_id"]: p["kind"] for p in report["problems"]}
+    assert kinds == {first: "missing", second: "drift"}
+    assert report["tables"]["active_deals"] == {"total": 2, "checked": 2}
+
+    assert deal_metrics.backfill(db_session)["active_deals"] == 1
+    # Drift with a matching hash is only fixed by a version bump; clear it here.
+    db_session.delete(_metrics_row(db_session, "active_deals", second))
+    db_session.commit()
+    deal_metrics.backfill(db_session)
+    assert deal_metrics.check(db_session, sample=10)["problems"] == []
@@ -0,0 +1,23 @@
+"""Shared render setup in `deal_pdf`: one style registry, branding drawn once."""
+
+import pytest
+
+import deal_pdf
+from main import calculate_brrr_results
+from tests.test_brrr_batch import _brrr_payload
+
+
+def test_style_registry_is_shared_and_read_only():
+    styles = deal_pdf._styles()
+    assert deal_pdf._styles() is styles
+    with pytest.raises(TypeError):
+        styles["body"] = None
+
+
+def test_branding_is_one_form_referenced_by_every_page():
+    result = calculate_brrr_results(_brrr_payload()).model_dump()
+    pdf = deal_pdf.build_deal_pdf("1 Main St", "BRRRR", result)
+    pages = pdf.count(b"/Type /Page\n") + pdf.count(b"/Type /Page ")
+    assert pages >= 2
+    assert pdf.count(b"/Subtype /Form") == 1
+    assert b"/ASCII85Decode" not in pdf
@@ -0,0 +1,230 @@
+"""Offer email queue: delivery over a reused SMTP session, retry/backoff and
+the /send-offer tracking endpoints, against the local SMTP stub."""
+
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+import email_queue
+from models import OutboundEmail
+from tests.smtp_stub import SmtpStub
+
+NOW = datetime(2026, 3, 2, 12, 0, tzinfo=timezone.utc)
+
+OFFER = {
+    "agent_name": "Dana Agent",
+    "agent_email": "dana@example.com",
+    "property_address": "12 Harbor Ln",
+    "purchase_price": "185000",
+    "inspection_period_days": 10,
+}
+
+
+@pytest.fixture()
+def stub():
+    with SmtpStub() as server:
+        yield server
+
+
+@pytest.fixture()
+def smtp_env(monkeypatch, stub):
+    monkeypatch.setenv("EMAIL_SMTP_HOST", "127.0.0.1")
+    monkeypatch.setenv("EMAIL_SMTP_PORT", str(stub.port))
+    monkeypatch.setenv("EMAIL_SMTP_SSL", "0")
+    monkeypatch.setenv("EMAIL_PASSWORD", "app-password")
+    return stub
+
+
+@pytest.fixture()
+def factory(db_session):
+    return sessionmaker(bind=db_session.get_bind())
+
+
+def _enqueue(factory, n, now=NOW):
+    with factory() as db:
+        ids = []
+        for i in range(n):
+            row = email_queue.enqueue(db, f"agent{i}@example.com", f"Offer {i}", f"<p>offer {i}</p>")
+            row.next_attempt_at = now
+            row.created_at = now + timedelta(microseconds=i)
+            db.commit()
+            ids.append(row.id)
+        return ids
+
+
+def _rows(factory, ids):
+    with factory() as db:
+        return [db.get(OutboundEmail, i) for i in ids]
+
+
+def _naive(dt):
+    return dt.replace(tzinfo=None)
+
+
+def test_many_messages_share_one_authenticated_session(smtp_env, factory):
+    ids = _enqueue(factory, 5)
+    smtp = email_queue.SmtpSession(email_queue.load_settings())
+    assert email_queue.process_due(factory, smtp, now=NOW) == 5
+    smtp.close()
+
+    assert smtp_env.connections == 1 and smtp.connects == 1
+    assert smtp_env.logins == [(email_queue.DEFAULT_SENDER, "app-password")]
+    assert [m["Subject"] for m in smtp_env.messages] == [f"Offer {i}" for i in range(5)]
+    assert smtp_env.envelopes[0][1] == ["<agent0@example.com>"]
+    assert all(r.status == "sent" and r.attempts == 1 and r.sent_at for r in _rows(factory, ids))
+
+    # Nothing left to do.
+    assert email_queue.process_due(factory, smtp, now=NOW) == 0
+
+
+def test_transient_failure_retries_with_backoff(smtp_env, factory):
+    [row_id] = _enqueue(factory, 1)
+    smtp = email_queue.SmtpSession(email_queue.load_settings())
+    smtp_env.fail_next(451)
+
+    assert email_queue.process_due(factory, smtp, now=NOW) == 1
+    [row] = _rows(factory, [row_id])
+    assert row.status == "queued" and row.attempts == 1
+    assert "451" in row.last_error
+    assert _naive(row.next_attempt_at) == _naive(NOW + email_queue.BACKOFF_BASE)
+
+    # Not due yet; then due and delivered on a fresh connection.
+    assert email_queue.process_due(factory, smtp, now=NOW + timedelta(seconds=10)) == 0
+    assert email_queue.process_due(factory, smtp, now=NOW + timedelta(seconds=31)) == 1
+    [row] = _rows(factory, [row_id])
+    assert row.status == "sent" and row.attempts == 2 and row.last_error is None
+    assert len(smtp_env.messages) == 1
+    smtp.close()
+
+
+def test_permanent_failure_and_attempt_limit(smtp_env, factory):
+    rejected, flaky = _enqueue(factory, 2)
+    smtp = email_queue.SmtpSession(email_queue.load_settings())
+    smtp_env.fail_next(550)
+    smtp_env.fail_next(421, count=email_queue.MAX_ATTEMPTS)
+
+    now = NOW
+    for _ in range(email_queue.MAX_ATTEMPTS):
+        email_queue.process_due(factory, smtp, now=now)
+        now += email_queue.BACKOFF_MAX
+    rejected_row, flaky_row = _rows(factory, [rejected, flaky])
+    assert rejected_row.status == "failed" and rejected_row.attempts == 1
+    assert flaky_row.status == "failed" and flaky_row.attempts == email_queue.MAX_ATTEMPTS
+    assert smtp_env.messages == []
+    smtp.close()
+
+
+def test_rejected_login_leaves_rows_queued(smtp_env, factory):
+    ids = _enqueue(factory, 3)
+    smtp = email_queue.SmtpSession(email_queue.load_settings())
+    smtp_env.reject_logins = True
+
+    for _ in range(2):
+        with pytest.raises(email_queue.SmtpUnavailable, match="535"):
+            email_queue.process_due(factory, smtp, now=NOW)
+    # One login per pass, not one per row, and no row was charged for it.
+    assert len(smtp_env.logins) == 2 and not smtp.is_open
+    assert all(r.status == "queued" and r.attempts == 0 and r.last_error is None for r in _rows(factory, ids))
+
+    smtp_env.reject_logins = False
+    assert email_queue.process_due(factory, smtp, now=NOW) == 3
+    assert all(r.status == "sent" and r.attempts == 1 for r in _rows(factory, ids))
+    smtp.close()
+
+
+def test_dispatcher_backs_off_while_login_is_rejected(smtp_env, factory, monkeypatch):
+    _enqueue(factory, 1)
+    monkeypatch.setattr(email_queue, "BACKOFF_BASE", timedelta(seconds=0.2))
+    smtp_env.reject_logins = True
+    dispatcher = email_queue.Dispatcher(factory, poll_seconds=0.01)
+    dispatcher.start()
+    try:
+        time.sleep(0.5)
+        for _ in range(5):
+            dispatcher.wake()  # new mail doesn't cut the backoff short
+    finally:
+        dispatcher.stop()
+    # 0.2s then 0.4s apart instead of every 10ms poll.
+    assert 1 <= len(smtp_env.logins) <= 3
+    assert dispatcher.unavailable_passes == len(smtp_env.logins)
+
+
+def test_backoff_is_exponential_and_capped():
+    assert [email_queue.backoff(n).total_seconds() for n in range(1, 5)] == [30, 60, 120, 240]
+    assert email_queue.backoff(20) == email_queue.BACKOFF_MAX
+
+
+def test_reconnects_after_server_hangs_up(smtp_env, factory):
+    ids = _enqueue(factory, 2)
+    smtp = email_queue.SmtpSession(email_queue.load_settings())
+    email_queue.process_due(factory, smtp, now=NOW, limit=1)
+    smtp_env.hang_up_next()
+    email_queue.process_due(factory, smtp, now=NOW)
+    smtp.close()
+
+    assert all(r.status == "sent" and r.attempts == 1 for r in _rows(factory, ids))
+    assert smtp.connects == 2 and len(smtp_env.messages) == 2
+
+
+def test_in_flight_rows_are_leased(smtp_env, factory):
+    [row_id] = _enqueue(factory, 1)
+    with factory() as db:
+        row = db.get(OutboundEmail, row_id)
+        row.status = "sending"
+        row.next_attempt_at = NOW + email_queue.SENDING_LEASE
+        db.commit()
+    smtp = email_queue.SmtpSession(email_queue.load_settings())
+    assert email_queue.process_due(factory, smtp, now=NOW) == 0
+    # The sender died: once the lease expires another pass picks it up.
+    assert email_queue.process_due(factory, smtp, now=NOW + email_queue.SENDING_LEASE) == 1
+    assert _rows(factory, [row_id])[0].status == "sent"
+    smtp.close()
+
+
+def test_missing_gmail_password_is_a_config_error(monkeypatch):
+    monkeypatch.delenv("EMAIL_SMTP_HOST", raising=False)
+    monkeypatch.delenv("EMAIL_PASSWORD", raising=False)
+    with pytest.raises(email_queue.EmailConfigError):
+        email_queue.load_settings()
+
+
+def test_send_offer_returns_tracking_id_and_delivers(api_client, smtp_env, factory, monkeypatch):
+    import main
+
+    main._email_dispatcher.stop()
+    dispatcher = email_queue.Dispatcher(factory, poll_seconds=0.05)
+    monkeypatch.setattr(main, "_email_dispatcher", dispatcher)
+    dispatcher.start()
+    try:
+        res = api_client.post("/send-offer", json=OFFER)
+        assert res.status_code == 200, res.text
+        body = res.json()
+        assert body["success"] and body["status"] == "queued" and body["id"]
+
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            status = api_client.get(f"/send-offer/{body['id']}").json()
+            if status["status"] == "sent":
+                break
+            time.sleep(0.02)
+    finally:
+        dispatcher.stop()
+
+    assert status["status"] == "sent", status
+    assert status["to_address"] == "dana@example.com" and status["attempts"] == 1
+    [msg] = smtp_env.messages
+    assert msg["Subject"] == "Cash Offer for 12 Harbor Ln"
+    assert "12 Harbor Ln" in msg.get_payload()[0].get_payload(decode=True).decode()
+
+
+def test_send_offer_errors(api_client, monkeypatch):
+    monkeypatch.delenv("EMAIL_SMTP_HOST", raising=False)
+    monkeypatch.delenv("EMAIL_PASSWORD", raising=False)
+    res = api_client.post("/send-offer", json=OFFER)
+    assert res.status_code == 503
+    assert res.json()["detail"] == "Email password not configured"
+
+    assert api_client.get("/send-offer/00000000-0000-0000-0000-000000000000").status_code == 404
+    assert api_client.get("/send-offer/not-a-uuid").status_code == 422
@@ -0,0 +1,155 @@
+"""Parity tests: the vectorized Flip batch engine must reproduce
+`calculate_flip_results` / `validate_flip_inputs` to the cent.
+"""
+
+import random
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+
+import vector_calc
+from main import calculate_flip_results, validate_flip_inputs
+from ReqRes.analyzeFlip.analyzeFlipReq import analyzeFlipReq
+
+_HEADLINE = (
+    "net_profit",
+    "roi",
+    "annualized_roi",
+    "total_cash_needed",
+    "total_cash_needed_with_buffer",
+    "total_holding_costs",
+    "total_hml_interest",
+)
+
+# Batch-only metrics and the breakdown step that carries the scalar value.
+_FROM_BREAKDOWN = {
+    "hml_amount": ("total_hml_interest", "HML Amount"),
+    "selling_costs": ("net_profit", "Selling Costs"),
+    "capital_gains_tax": ("net_profit", "Capital Gains Tax"),
+}
+
+
+def _flip_payload(**overrides) -> analyzeFlipReq:
+    values = dict(
+        purchase_price_in_thousands=Decimal("180"),
+        rehab_cost_in_thousands=Decimal("45"),
+        rehab_contingency_percent=Decimal("10"),
+        sale_price_in_thousands=Decimal("320"),
+        down_payment=Decimal("10"),
+        closing_costs_buy_in_thousands=Decimal("5"),
+        use_HM_for_rehab=True,
+        HML_points=Decimal("2"),
+        HML_interest_rate=Decimal("12"),
+        holding_time_months=6,
+        buyer_agent_selling_fee=Decimal("2.5"),
+        seller_agent_selling_fee=Decimal("2.5"),
+        selling_closing_costs_in_thousands=Decimal("4"),
+        annual_property_taxes=Decimal("3600"),
+        annual_insurance=Decimal("2000"),
+        montly_hoa=Decimal("0"),
+        monthly_utilities=Decimal("250"),
+        capital_gains_tax_rate=Decimal("20"),
+    )
+    values.update(overrides)
+    by_alias = {
+        (analyzeFlipReq.model_fields[k].alias or k): v for k, v in values.items()
+    }
+    return analyzeFlipReq.model_validate(by_alias)
+
+
+def _random_flip_payload(rng: random.Random) -> analyzeFlipReq:
+    def d(lo, hi):
+        return Decimal(str(round(rng.uniform(lo, hi), 2)))
+
+    return _flip_payload(
+        purchase_price_in_thousands=d(40, 700),
+        rehab_cost_in_thousands=d(0, 200),
+        rehab_contingency_percent=d(0, 25),
+        # Wide sale range so both profitable and losing flips (no cap gains) occur.
+        sale_price_in_thousands=d(50, 1100),
+        down_payment=d(0, 40),
+        closing_costs_buy_in_thousands=d(0, 20),
+        use_HM_for_rehab=rng.random() < 0.5,
+        HML_points=d(0, 5),
+        HML_interest_rate=d(0, 16),
+        holding_time_months=rng.randint(1, 24),
+        buyer_agent_selling_fee=d(0, 3),
+        seller_agent_selling_fee=d(0, 3),
+        selling_closing_costs_in_thousands=d(0, 12),
+        annual_property_taxes=d(0, 15000),
+        annual_insurance=d(0, 6000),
+        montly_hoa=d(0, 500),
+        monthly_utilities=d(0, 600),
+        capital_gains_tax_rate=d(0, 37),
+    )
+
+
+def _breakdown_value(result, key, label):
+    return next(step.value for step in result.breakdowns[key] if step.label == label)
+
+
+def test_flip_batch_matches_scalar_engine_to_the_cent():
+    rng = random.Random(4321)
+    payloads = [_random_flip_payload(rng) for _ in range(400)]
+
+    result = vector_calc.analyze_flip_batch(vector_calc.flip_columns_from_payloads(payloads))
+
+    assert result["errors"] == []
+    for i, payload in enumerate(payloads):
+        scalar = calculate_flip_results(payload)
+        for metric in _HEADLINE:
+            assert result["metrics"][metric][i] == pytest.approx(
+                getattr(scalar, metric), abs=0.005
+            ), (i, metric)
+        for metric, (key, label) in _FROM_BREAKDOWN.items():
+            assert result["metrics"][metric][i] == pytest.approx(
+                _breakdown_value(scalar, key, label), abs=0.005
+            ), (i, metric)
+
+
+def test_flip_batch_covers_losing_deals_and_zero_cash_invested():
+    payloads = [
+        _flip_payload(sale_price_in_thousands=Decimal("100")),
+        _flip_payload(
+            down_payment=Decimal("0"),
+            closing_costs_buy_in_thousands=Decimal("0"),
+            HML_points=Decimal("0"),
+            HML_interest_rate=Decimal("0"),
+            annual_property_taxes=Decimal("0"),
+            annual_insurance=Decimal("0"),
+            monthly_utilities=Decimal("0"),
+        ),
+    ]
+
+    result = vector_calc.analyze_flip_batch(vector_calc.flip_columns_from_payloads(payloads))
+
+    for i, payload in enumerate(payloads):
+        scalar = calculate_flip_results(payload)
+        for metric in _HEADLINE:
+            assert result["metrics"][metric][i] == pytest.approx(getattr(scalar, metric), abs=0.005)
+    assert result["metrics"]["capital_gains_tax"][0] == 0
+    assert result["metrics"]["roi"][1] == 0
+
+
+def test_flip_invalid_rows_are_reported_by_index_with_scalar_messages():
+    bad = _flip_payload(sale_price_in_thousands=Decimal("0"), seller_agent_selling_fee=Decimal("101"))
+    payloads = [_flip_payload(), bad]
+
+    result = vector_calc.analyze_flip_batch(vector_calc.flip_columns_from_payloads(payloads))
+
+    with pytest.raises(HTTPException) as scalar_error:
+        validate_flip_inputs(bad)
+    assert result["errors"] == [{"index": 1, "detail": scalar_error.value.detail}]
+    assert all(result["metrics"][m][1] is None for m in vector_calc.FLIP_METRICS)
+
+
+def test_flip_batch_endpoint_accepts_columns(api_client):
+    deal = _flip_payload().model_dump(by_alias=True, mode="json")
+    columns = {key: [float(value)] * 3 for key, value in deal.items()}
+
+    res = api_client.post("/analyze/flip/batch", json={"columns": columns})
+
+    assert res.status_code == 200
+    single = api_client.post("/analyze/flip", json=deal).json()
+    assert res.json()["metrics"]["net_profit"] == [pytest.approx(single["net_profit"], abs=0.005)] * 3
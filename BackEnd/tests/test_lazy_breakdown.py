@@ -0,0 +1,94 @@
+"""Breakdown narration is opt-in on list endpoints and deferred until
+serialization everywhere else."""
+
+from decimal import Decimal
+
+from calc_breakdown import CalcBreakdown
+from main import calculate_brrr_results, calculate_flip_results
+from tests.test_brrr_batch import _brrr_payload
+from tests.test_flip_batch import _flip_payload
+
+
+BRRR_DEAL = {
+    "deal_type": "BRRRR",
+    "section": 1,
+    "stage": 1,
+    "address": "12 Elm St",
+    "purchasePrice": "150",
+    "rehabCost": "40",
+    "down_payment": "10",
+    "HMLInterestRate": "12",
+    "monthsUntilRefi": "6",
+    "arv_in_thousands": "250",
+    "ltv_as_precent": "75",
+    "interestRate": "7",
+    "rent": "2100",
+}
+
+
+def test_formulas_are_not_evaluated_until_serialized():
+    calls = []
+
+    def formula():
+        calls.append(1)
+        return "a + b"
+
+    breakdown = CalcBreakdown()
+    breakdown.add(["cash_flow", "dscr"], "Step", Decimal("1.5"), formula)
+    assert calls == []
+
+    out = breakdown.to_dict()
+    assert calls == [1]
+    assert out["cash_flow"] == out["dscr"] == [{"label": "Step", "value": 1.5, "formula": "a + b"}]
+
+
+def test_disabled_breakdown_skips_formulas_and_serializes_to_none():
+    breakdown = CalcBreakdown(enabled=False)
+    breakdown.add("roi", "Step", 1, lambda: 1 / 0)
+    assert breakdown.to_dict() is None
+
+
+def test_metrics_are_identical_with_and_without_breakdown():
+    for calc, payload in (
+        (calculate_brrr_results, _brrr_payload()),
+        (calculate_flip_results, _flip_payload()),
+    ):
+        full = calc(payload)
+        lean = calc(payload, include_breakdown=False)
+        assert lean.breakdowns is None
+        assert full.breakdowns
+        assert lean.model_dump(exclude={"breakdowns"}) == full.model_dump(exclude={"breakdowns"})
+
+
+def test_brrr_breakdown_renders_branch_specific_formulas():
+    def coc_formula(**overrides):
+        result = calculate_brrr_results(_brrr_payload(**overrides))
+        return next(s.formula for s in result.breakdowns["cash_on_cash"] if s.label == "Cash on Cash")
+
+    assert coc_formula().startswith("Cash Flow (")
+    assert coc_formula(rent=Decimal("3500")).startswith("Annual Cash Flow (")
+
+
+def test_active_deal_list_omits_breakdowns_unless_requested(api_client):
+    created = api_client.post("/active-deals", json=BRRR_DEAL)
+    assert created.status_code == 200
+    assert created.json()["breakdowns"]
+
+    listed = api_client.get("/active-deals").json()
+    assert listed[0]["breakdowns"] is None
+    assert listed[0]["cash_flow"] == created.json()["cash_flow"]
+
+    with_breakdown = api_client.get("/active-deals", params={"include_breakdown": True}).json()
+    assert with_breakdown[0]["breakdowns"] == created.json()["breakdowns"]
+
+
+def test_breakdown_endpoint_returns_narration_for_one_deal(api_client):
+    deal_id = api_client.post("/active-deals", json=BRRR_DEAL).json()["id"]
+
+    res = api_client.get(f"/active-deals/{deal_id}/breakdown", params={"deal_type": "BRRRR"})
+
+    assert res.status_code == 200
+    assert "cash_flow" in res.json()["breakdowns"]
+
+    missing = api_client.get(f"/active-deals/{deal_id}/breakdown", params={"deal_type": "FLIP"})
+    assert missing.status_code == 404
@@ -0,0 +1,180 @@
+"""Materialized daily liquidity table: CRUD writes keep it equal to a full
+recomputation without rebuilding, reads come from the table, and
+rebuild/verify repair and detect drift."""
+
+import random
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+
+import crud_liquidity
+import liquidity_daily
+from models import LiquidityDailyBalance
+from ReqRes.liquidity.liquidityReq import LiquidityRecurringTransactionUpdate, LiquidityTransactionUpdate
+
+OPENING = date.today() - timedelta(days=30)
+
+
+def _iso(d):
+    return d.isoformat()
+
+
+@pytest.fixture()
+def materialized(api_client, db_session, monkeypatch):
+    api_client.put("/liquidity/settings", json={
+        "opening_balance_k": 80, "opening_balance_date": _iso(OPENING), "reserve_k": 10,
+    })
+    assert liquidity_daily.rebuild(db_session) > 700
+    rebuilds = []
+    original = liquidity_daily.rebuild
+    monkeypatch.setattr(liquidity_daily, "rebuild", lambda *a, **kw: rebuilds.append(1) or original(*a, **kw))
+    return rebuilds
+
+
+def _assert_in_sync(db_session):
+    db_session.expire_all()
+    report = liquidity_daily.verify(db_session)
+    assert report["mismatches"] == [] and report["missing_days"] == 0, report
+    assert report["range_current"]
+
+
+def test_crud_writes_update_the_table_incrementally(api_client, db_session, materialized):
+    rng = random.Random(3)
+    txn_ids, rule_ids = [], []
+    for step in range(40):
+        op = rng.choice(["add_txn", "add_txn", "edit_txn", "del_txn", "add_rule", "edit_rule", "del_rule"])
+        day = OPENING + timedelta(days=rng.randrange(-20, 500))
+        if op == "add_txn" or (op in ("edit_txn", "del_txn") and not txn_ids):
+            res = api_client.post("/liquidity/transactions", json={
+                "effective_date": _iso(day), "description": f"t{step}", "amount_k": round(rng.uniform(-40, 40), 2),
+            })
+            assert res.status_code == 201, res.text
+            txn_ids.append(res.json()["id"])
+        # Edits and deletes go through crud_liquidity: SQLite can't bind the
+        # routes' string ids to the Uuid column.
+        elif op == "edit_txn":
+            assert crud_liquidity.update_transaction(db_session, uuid.UUID(rng.choice(txn_ids)), LiquidityTransactionUpdate(
+                effective_date=day, amount_k=Decimal(str(round(rng.uniform(-40, 40), 2))),
+            ))
+        elif op == "del_txn":
+            assert crud_liquidity.delete_transaction(db_session, uuid.UUID(txn_ids.pop()))
+        elif op == "add_rule" or not rule_ids:
+            res = api_client.post("/liquidity/recurring", json={
+                "description": f"r{step}", "amount_k": round(rng.uniform(-5, 5), 2) or 1,
+                "start_date": _iso(day), "frequency": rng.choice(["daily", "weekly", "monthly", "quarterly"]),
+                "interval": rng.choice([1, 2]),
+                "occurrences": rng.choice([None, 5, 30]),
+            })
+            assert res.status_code == 201, res.text
+            rule_ids.append(res.json()["id"])
+        elif op == "edit_rule":
+            assert crud_liquidity.update_recurring(db_session, uuid.UUID(rng.choice(rule_ids)), LiquidityRecurringTransactionUpdate(
+                amount_k=Decimal(str(round(rng.uniform(-5, 5), 2) or 1)), start_date=day,
+            ))
+        else:
+            assert crud_liquidity.delete_recurring(db_session, uuid.UUID(rule_ids.pop()))
+        _assert_in_sync(db_session)
+
+    api_client.put("/liquidity/settings", json={"opening_balance_k": 120, "reserve_k": 3})
+    _assert_in_sync(db_session)
+    assert materialized == []  # every write above stayed incremental
+
+    # Moving the anchor rebuilds.
+    api_client.put("/liquidity/settings", json={"opening_balance_date": _iso(OPENING + timedelta(days=5))})
+    _assert_in_sync(db_session)
+    assert materialized == [1]
+
+
+def test_write_outside_the_range_rebuilds_and_extends_it(api_client, db_session, materialized):
+    _, hi = liquidity_daily.coverage(db_session)
+    far = hi + timedelta(days=400)
+    api_client.post("/liquidity/transactions", json={
+        "effective_date": _iso(far), "description": "balloon", "amount_k": -50,
+    })
+    assert materialized == [1]
+    assert liquidity_daily.coverage(db_session)[1] == far + timedelta(days=60)
+    _assert_in_sync(db_session)
+
+
+def test_series_reads_the_table_and_verify_catches_drift(api_client, db_session, materialized):
+    api_client.post("/liquidity/transactions", json={
+        "effective_date": _iso(OPENING + timedelta(days=3)), "description": "draw", "amount_k": -30,
+    })
+    window = {"from": _iso(OPENING), "to": _iso(OPENING + timedelta(days=5))}
+    assert api_client.get("/liquidity/series", params=window).json()["balance_k"] == [80, 80, 80, 50, 50, 50]
+
+    row = db_session.get(LiquidityDailyBalance, OPENING + timedelta(days=4))
+    row.balance_k = 999
+    db_session.commit()
+    assert api_client.get("/liquidity/series", params=window).json()["balance_k"][4] == 999
+
+    report = liquidity_daily.verify(db_session)
+    assert report["mismatch_count"] == 1
+    assert report["mismatches"][0]["day"] == _iso(OPENING + timedelta(days=4))
+    assert report["mismatches"][0]["expected_balance_k"] == 50
+
+    liquidity_daily.rebuild(db_session)
+    _assert_in_sync(db_session)
+
+
+def test_windows_outside_the_table_are_computed(api_client, db_session, materialized):
+    lo, _ = liquidity_daily.coverage(db_session)
+    window = {"from": _iso(lo - timedelta(days=10)), "to": _iso(lo + timedelta(days=2))}
+    body = api_client.get("/liquidity/series", params=window).json()
+    assert len(body["balance_k"]) == 13 and set(body["balance_k"]) == {80}
+
+
+def test_reads_build_the_table_lazily(api_client, db_session):
+    api_client.put("/liquidity/settings", json={
+        "opening_balance_k": 5, "opening_balance_date": _iso(OPENING), "reserve_k": 1,
+    })
+    assert liquidity_daily.coverage(db_session) is None
+    api_client.get("/liquidity/series")
+    assert liquidity_daily.coverage(db_session) is not None
+    _assert_in_sync(db_session)
+
+
+def test_table_rolls_forward_with_the_default_window(api_client, db_session, materialized):
+    api_client.post("/liquidity/recurring", json={
+        "description": "rent", "amount_k": 2.5, "start_date": _iso(OPENING), "frequency": "monthly",
+    })
+    _, built_hi = liquidity_daily.coverage(db_session)
+    settings = liquidity_daily._settings(db_session)
+
+    for days_later in (1, 45, 200):
+        today = date.today() + timedelta(days=days_later)
+        start, end = liquidity_daily.materialized_range(db_session, settings, today=today)
+        served = liquidity_daily.read_series(db_session, start, end, today=today)
+        assert served is not None
+        live = liquidity_daily._compute(db_session, settings, start, end)
+        assert served["dates"] == live["dates"]
+        assert served["balance_k"] == pytest.approx(live["balance_k"], abs=1e-4)
+        assert served["net_k"] == pytest.approx(live["net_k"], abs=1e-4)
+        hi = liquidity_daily.coverage(db_session)[1]
+        assert hi == end + timedelta(days=liquidity_daily.EXTEND_AHEAD_DAYS)
+    assert hi > built_hi and materialized == []  # extended, never rebuilt
+    _assert_in_sync(db_session)
+
+    # The next day is still inside the extension: nothing is written.
+    today = date.today() + timedelta(days=201)
+    start, end = liquidity_daily.materialized_range(db_session, settings, today=today)
+    liquidity_daily.read_series(db_session, start, end, today=today)
+    assert liquidity_daily.coverage(db_session)[1] == hi
+
+
+def test_window_past_the_horizon_computes_only_the_rest(api_client, db_session, materialized):
+    api_client.post("/liquidity/recurring", json={
+        "description": "hoa", "amount_k": -0.4, "start_date": _iso(OPENING), "frequency": "weekly",
+    })
+    settings = liquidity_daily._settings(db_session)
+    _, hi = liquidity_daily.coverage(db_session)
+    for start, end in ((hi - timedelta(days=20), hi + timedelta(days=400)),
+                       (hi + timedelta(days=900), hi + timedelta(days=950))):
+        served = liquidity_daily.read_series(db_session, start, end)
+        live = liquidity_daily._compute(db_session, settings, start, end)
+        assert served["dates"] == live["dates"]
+        assert served["balance_k"] == pytest.approx(live["balance_k"], abs=1e-4)
+    # Only today's horizon is materialized, not the far-out request.
+    assert liquidity_daily.coverage(db_session)[1] == hi
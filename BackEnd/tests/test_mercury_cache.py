@@ -0,0 +1,151 @@
+"""Mercury balance cache: fresh hits skip Mercury, stale hits are served
+immediately while one background refresh runs, and every refresh is kept
+as a snapshot for warm starts and the balance history."""
+
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+import mercury_cache
+from mercury_service import MercuryApiError, MercuryConfigError
+from models import MercuryBalanceSnapshot
+
+
+class FakeMercury:
+    def __init__(self):
+        self.calls = 0
+        self.balance = 100.0
+        self.error = None
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def __call__(self):
+        self.gate.wait(5)
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return {
+            "total_balance_k": self.balance,
+            "total_available_k": self.balance - 1,
+            "account_count": 2,
+            "workspace_count": 1,
+            "workspaces": [],
+            "workspace_errors": [],
+            "accounts": [],
+        }
+
+
+@pytest.fixture()
+def factory(db_session):
+    return sessionmaker(bind=db_session.get_bind())
+
+
+@pytest.fixture()
+def fake():
+    return FakeMercury()
+
+
+def _later(seconds):
+    return datetime.now(timezone.utc) + timedelta(seconds=seconds)
+
+
+def test_fresh_balance_is_served_from_memory(factory, fake):
+    cache = mercury_cache.BalanceCache(factory, fetch=fake, ttl=timedelta(minutes=5))
+    first = cache.get()
+    second = cache.get()
+    assert fake.calls == 1
+    assert first["total_balance_k"] == second["total_balance_k"] == 100.0
+    assert first["as_of"] == second["as_of"] and not second["stale"]
+
+    # Callers can't mutate the cached summary.
+    second["total_balance_k"] = 0
+    assert cache.get()["total_balance_k"] == 100.0
+
+
+def test_stale_balance_is_served_while_refreshing(factory, fake):
+    cache = mercury_cache.BalanceCache(factory, fetch=fake, ttl=timedelta(minutes=5))
+    cache.get()
+    fake.balance = 250.0
+    fake.gate.clear()  # hold the background refresh
+
+    stale = cache.get(now=_later(301))
+    assert stale["total_balance_k"] == 100.0 and stale["stale"] and stale["refreshing"]
+    # A second stale hit doesn't start another refresh.
+    thread = cache.refresh_in_background()
+    cache.get(now=_later(302))
+    assert cache.refresh_in_background() is thread
+
+    fake.gate.set()
+    thread.join(5)
+    fresh = cache.get()
+    assert fake.calls == 2
+    assert fresh["total_balance_k"] == 250.0 and not fresh["stale"] and not fresh["refreshing"]
+
+
+def test_failed_background_refresh_keeps_last_balance(factory, fake):
+    cache = mercury_cache.BalanceCache(factory, fetch=fake, ttl=timedelta(minutes=5))
+    cache.get()
+    fake.error = MercuryApiError("HTTP 503: down")
+    cache.refresh_in_background().join(5)
+
+    out = cache.get(now=_later(301))
+    assert out["total_balance_k"] == 100.0 and out["stale"]
+    assert out["refresh_error"] == "HTTP 503: down"
+    cache.refresh_in_background().join(5)
+
+    with pytest.raises(MercuryApiError):
+        cache.get(force_refresh=True)
+
+
+def test_restart_warms_from_latest_snapshot(factory, fake):
+    mercury_cache.BalanceCache(factory, fetch=fake).get()
+    fake.balance = 175.0
+    mercury_cache.BalanceCache(factory, fetch=fake).refresh()
+    assert fake.calls == 2
+
+    restarted = mercury_cache.BalanceCache(factory, fetch=fake, ttl=timedelta(minutes=5))
+    out = restarted.get()
+    assert fake.calls == 2
+    assert out["total_balance_k"] == 175.0
+
+
+def test_cold_cache_surfaces_mercury_errors(api_client, factory, fake, monkeypatch):
+    import main
+
+    cache = mercury_cache.BalanceCache(factory, fetch=fake)
+    monkeypatch.setattr(main, "_mercury_balance_cache", cache)
+
+    fake.error = MercuryConfigError("No Mercury tokens found.")
+    assert api_client.get("/liquidity/mercury-balance").status_code == 503
+    fake.error = MercuryApiError("auth failed (401)")
+    assert api_client.get("/liquidity/mercury-balance").status_code == 502
+
+    fake.error = None
+    body = api_client.get("/liquidity/mercury-balance").json()
+    assert body["total_balance_k"] == 100.0 and body["as_of"] and body["refresh_error"] is None
+    assert api_client.get("/liquidity/mercury-balance", params={"refresh": "true"}).status_code == 200
+    assert fake.calls == 4
+
+
+def test_history_endpoint(api_client, db_session):
+    for day, hour, balance in ((1, 9, 10.0), (1, 17, 12.0), (2, 9, 15.0), (4, 9, 11.0)):
+        db_session.add(MercuryBalanceSnapshot(
+            as_of=datetime(2026, 3, day, hour, tzinfo=timezone.utc),
+            total_balance_k=balance, total_available_k=balance,
+            account_count=1, workspace_count=1, summary={},
+        ))
+    db_session.commit()
+
+    points = api_client.get("/liquidity/mercury-balance/history").json()["points"]
+    assert [(p["date"], p["total_balance_k"]) for p in points] == [
+        ("2026-03-01", 12.0), ("2026-03-02", 15.0), ("2026-03-04", 11.0),
+    ]
+    points = api_client.get("/liquidity/mercury-balance/history", params={
+        "start": "2026-03-01", "end": "2026-03-02", "daily": "false",
+    }).json()["points"]
+    assert [p["total_balance_k"] for p in points] == [10.0, 12.0, 15.0]
+    assert api_client.get("/liquidity/mercury-balance/history", params={
+        "start": "2026-03-02", "end": "2026-03-01",
+    }).status_code == 400
@@ -0,0 +1,137 @@
+"""Multi-workspace Mercury balance fetch against a local stub of `GET
+/accounts`: workspaces load concurrently over pooled keep-alive connections,
+and slow or failing ones are reported without losing the rest."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import mercury_service
+from mercury_service import MercuryApiError
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        token = self.headers.get("Authorization", "").removeprefix("Bearer ")
+        delay, status, balance = self.server.behaviour[token]
+        time.sleep(delay)
+        if status == 200:
+            body = json.dumps({"accounts": [
+                {"id": token, "name": f"{token} checking", "type": "checking", "status": "active",
+                 "currentBalance": balance, "availableBalance": balance - 100},
+                {"id": f"{token}-old", "status": "archived", "currentBalance": 999_999},
+            ]}).encode()
+        else:
+            body = b'{"errors": "nope"}'
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client gave up on a deliberately slow workspace
+
+
+@pytest.fixture()
+def mercury(monkeypatch):
+    """Stub server; `behaviour[token] = (delay_s, http_status, balance)`."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.connections = 0
+    server.behaviour = {}
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    for key in list(mercury_service.os.environ):
+        if key.startswith("MERCURY_API_TOKEN"):
+            monkeypatch.delenv(key)
+    monkeypatch.setattr(mercury_service, "MERCURY_API_BASE", f"http://127.0.0.1:{server.server_address[1]}/api/v1")
+    mercury_service._reset_session()
+
+    def workspace(label, delay=0.0, status=200, balance=10_000.0):
+        monkeypatch.setenv(f"MERCURY_API_TOKEN_{label}", f"tok-{label}")
+        server.behaviour[f"tok-{label}"] = (delay, status, balance)
+
+    server.workspace = workspace
+    yield server
+    mercury_service._reset_session()
+    server.shutdown()
+    server.server_close()
+
+
+def test_workspaces_are_fetched_concurrently(mercury):
+    for label, balance in (("A", 10_000.0), ("B", 20_000.0), ("C", 30_000.0), ("D", 40_000.0)):
+        mercury.workspace(label, delay=0.3, balance=balance)
+
+    start = time.perf_counter()
+    summary = mercury_service.summarize_balance()
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.9, elapsed  # sequential would be >= 1.2s
+    assert [ws["workspace"] for ws in summary["workspaces"]] == ["A", "B", "C", "D"]
+    assert summary["total_balance_k"] == pytest.approx(100.0)
+    assert summary["total_available_k"] == pytest.approx(99.6)
+    assert summary["account_count"] == 4 and summary["workspace_count"] == 4
+    assert summary["workspace_errors"] == []
+    assert len(summary["accounts"]) == 8
+
+
+def test_connections_are_reused_across_loads(mercury):
+    mercury.workspace("A")
+    mercury.workspace("B")
+    for _ in range(3):
+        mercury_service.summarize_balance()
+    assert mercury.connections <= 2
+
+
+def test_slow_and_failing_workspaces_keep_partial_results(mercury, monkeypatch):
+    monkeypatch.setattr(mercury_service, "MERCURY_TIMEOUT_SECONDS", 0.5)
+    mercury.workspace("FAST", balance=5_000.0)
+    mercury.workspace("SLOW", delay=2.0)
+    mercury.workspace("DENIED", status=401)
+
+    start = time.perf_counter()
+    summary = mercury_service.summarize_balance()
+    assert time.perf_counter() - start < 1.5
+
+    assert [ws["workspace"] for ws in summary["workspaces"]] == ["FAST"]
+    assert summary["total_balance_k"] == pytest.approx(5.0)
+    errors = {e["workspace"]: e["error"] for e in summary["workspace_errors"]}
+    assert errors["DENIED"] == "auth failed (401)"
+    assert "SLOW" in errors
+
+
+def test_workspaces_queued_past_the_budget_are_reported(mercury, monkeypatch):
+    monkeypatch.setattr(mercury_service, "MERCURY_TIMEOUT_SECONDS", 0.5)
+    monkeypatch.setattr(mercury_service, "MAX_CONCURRENT_WORKSPACES", 2)
+    mercury.workspace("A", balance=5_000.0)
+    mercury.workspace("B", delay=2.0)
+    mercury.workspace("C", delay=2.0)
+    mercury.workspace("D")  # queued behind B and C until the budget runs out
+
+    summary = mercury_service.summarize_balance()
+    assert [ws["workspace"] for ws in summary["workspaces"]] == ["A"]
+    errors = {e["workspace"]: e["error"] for e in summary["workspace_errors"]}
+    assert set(errors) == {"B", "C", "D"}
+    assert errors["B"].startswith("timed out") and errors["D"].startswith("not started")
+
+
+def test_all_workspaces_failing_raises(mercury):
+    mercury.workspace("A", status=500)
+    mercury.workspace("B", status=403)
+    with pytest.raises(MercuryApiError, match="A: HTTP 500.*B: auth failed"):
+        mercury_service.summarize_balance()
@@ -0,0 +1,118 @@
+"""Monte Carlo simulation: parity with the scalar calculators, seeding and
+the process-pool mode."""
+
+import pytest
+
+import monte_carlo
+from main import calculate_brrr_results, calculate_flip_results
+from tests.test_brrr_batch import _brrr_payload
+from tests.test_flip_batch import _flip_payload
+
+
+ASSUMPTIONS = {
+    "arv_pct": {"kind": "normal", "sd": 8},
+    "rehab_overrun_pct": {"kind": "triangular", "low": 0, "mode": 10, "high": 40},
+    "months_delta": {"kind": "uniform", "low": 0, "high": 4},
+    "rent_pct": {"kind": "normal", "sd": 5},
+    "interest_rate_delta": {"kind": "normal", "sd": 0.75},
+}
+
+
+def _brrr_body(**extra):
+    return {"deal": _brrr_payload(rent=3500).model_dump(mode="json", by_alias=True), **extra}
+
+
+def _flip_body(**extra):
+    return {"deal": _flip_payload().model_dump(mode="json", by_alias=True), **extra}
+
+
+def test_without_uncertainty_every_draw_is_the_scalar_result(api_client):
+    res = api_client.post("/analyze/brrr/montecarlo", json=_brrr_body(draws=50, seed=1))
+    assert res.status_code == 200, res.text
+    out = res.json()["results"][0]
+    expected = calculate_brrr_results(_brrr_payload(rent=3500), include_breakdown=False)
+    assert out["valid_draws"] == 50
+    for name in ("cash_out", "cash_flow", "net_profit"):
+        summary = out["metrics"][name]
+        assert summary["std"] == pytest.approx(0, abs=1e-6)
+        assert summary["percentiles"]["p50"] == pytest.approx(float(getattr(expected, name)), abs=0.005)
+    assert out["prob_negative_net_profit"] == float(expected.net_profit < 0)
+
+    flip = api_client.post("/analyze/flip/montecarlo", json=_flip_body(draws=10, seed=1)).json()["results"][0]
+    expected = calculate_flip_results(_flip_payload(), include_breakdown=False)
+    assert flip["metrics"]["net_profit"]["mean"] == pytest.approx(float(expected.net_profit), abs=0.005)
+    assert flip["prob_negative_cash_flow"] is None
+
+
+def test_seeded_runs_are_reproducible(api_client):
+    body = _brrr_body(assumptions=ASSUMPTIONS, draws=20_000, seed=42)
+    first = api_client.post("/analyze/brrr/montecarlo", json=body).json()
+    second = api_client.post("/analyze/brrr/montecarlo", json=body).json()
+    other = api_client.post("/analyze/brrr/montecarlo", json={**body, "seed": 43}).json()
+    assert first == second
+    assert first["seed"] == 42
+    assert first["results"] != other["results"]
+
+    unseeded = api_client.post("/analyze/brrr/montecarlo", json={**body, "seed": None}).json()
+    replay = api_client.post("/analyze/brrr/montecarlo", json={**body, "seed": unseeded["seed"]}).json()
+    assert replay == unseeded
+
+
+def test_downside_scenarios_raise_loss_probability(api_client):
+    mild = api_client.post("/analyze/flip/montecarlo", json=_flip_body(
+        assumptions={"arv_pct": {"kind": "normal", "sd": 2}}, draws=20_000, seed=3,
+    )).json()["results"][0]
+    crash = api_client.post("/analyze/flip/montecarlo", json=_flip_body(
+        assumptions={"arv_pct": {"kind": "normal", "mean": -30, "sd": 5}}, draws=20_000, seed=3,
+    )).json()["results"][0]
+    assert crash["prob_negative_net_profit"] > mild["prob_negative_net_profit"]
+    p = crash["metrics"]["net_profit"]["percentiles"]
+    assert p["p5"] <= p["p25"] <= p["p50"] <= p["p75"] <= p["p95"]
+
+
+def test_parallel_mode_matches_inline(api_client, monkeypatch):
+    monkeypatch.setenv("MONTE_CARLO_WORKERS", "2")
+    deals = [
+        _brrr_payload(arv_in_thousands=arv).model_dump(mode="json", by_alias=True)
+        for arv in (220, 250, 280)
+    ]
+    body = {"deals": deals, "assumptions": ASSUMPTIONS, "draws": 5_000, "seed": 9}
+    try:
+        inline = api_client.post("/analyze/brrr/montecarlo", json=body).json()
+        pooled = api_client.post("/analyze/brrr/montecarlo", json={**body, "parallel": True}).json()
+    finally:
+        monte_carlo._reset_pool()
+    assert len(inline["results"]) == 3
+    assert pooled == inline
+
+
+@pytest.mark.parametrize("path, body", [
+    ("/analyze/flip/montecarlo", _flip_body(assumptions={"rent_pct": {"kind": "normal", "sd": 1}})),
+    ("/analyze/brrr/montecarlo", _brrr_body(assumptions={"arv_pct": {"kind": "uniform", "low": 5}})),
+    ("/analyze/brrr/montecarlo", _brrr_body(assumptions={"arv_pct": {"kind": "triangular", "low": 0, "mode": 9, "high": 5}})),
+    ("/analyze/brrr/montecarlo", _brrr_body(draws=0)),
+    ("/analyze/brrr/montecarlo", {"assumptions": {}}),
+])
+def test_malformed_requests(api_client, path, body):
+    assert api_client.post(path, json=body).status_code == 422
+
+
+def test_draws_times_deals_is_capped(api_client):
+    deal = _brrr_payload(rent=3500).model_dump(mode="json", by_alias=True)
+    per_deal = monte_carlo.MAX_TOTAL_DRAWS // 10
+    res = api_client.post("/analyze/brrr/montecarlo", json={"deals": [deal] * 11, "draws": per_deal})
+    assert res.status_code == 400
+    assert str(monte_carlo.MAX_TOTAL_DRAWS) in res.json()["detail"]
+
+    flip = _flip_payload().model_dump(mode="json", by_alias=True)
+    res = api_client.post("/analyze/flip/montecarlo", json={"deals": [flip] * 200, "draws": 10_001})
+    assert res.status_code == 400
+    assert api_client.post("/analyze/brrr/montecarlo", json=_brrr_body(draws=monte_carlo.MAX_DRAWS + 1)).status_code == 422
+
+
+def test_invalid_deal_is_rejected(api_client):
+    body = _brrr_body()
+    body["deal"]["monthsUntilRefi"] = 0
+    res = api_client.post("/analyze/brrr/montecarlo", json=body)
+    assert res.status_code == 400
+    assert "Months until refi" in res.json()["detail"]
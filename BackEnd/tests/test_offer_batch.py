@@ -0,0 +1,125 @@
+"""Offer campaigns: compiled template rendering, batch dedupe and the send
+rate caps."""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+import email_queue
+import offer_email
+from models import OutboundEmail
+from ReqRes.email.sendOfferReq import SendOfferReq
+from tests.smtp_stub import SmtpStub
+
+NOW = datetime(2026, 3, 2, 12, 0, tzinfo=timezone.utc)
+
+
+def _offer(i=0, **overrides):
+    offer = {
+        "agent_name": f"Agent {i}",
+        "agent_email": f"agent{i}@example.com",
+        "property_address": f"{i} Harbor Ln",
+        "purchase_price": "185000",
+        "inspection_period_days": 10,
+    }
+    offer.update(overrides)
+    return offer
+
+
+@pytest.fixture()
+def stub_env(monkeypatch):
+    with SmtpStub() as stub:
+        monkeypatch.setenv("EMAIL_SMTP_HOST", "127.0.0.1")
+        monkeypatch.setenv("EMAIL_SMTP_PORT", str(stub.port))
+        monkeypatch.setenv("EMAIL_SMTP_SSL", "0")
+        monkeypatch.delenv("EMAIL_PASSWORD", raising=False)
+        yield stub
+
+
+def test_template_matches_format_and_escapes_fields():
+    details = SendOfferReq(**_offer(purchase_price=Decimal("185000.5")))
+    subject, body = offer_email.render_offer_email(details)
+    assert subject == "Cash Offer for 0 Harbor Ln"
+    assert body == offer_email._OFFER_HTML.format(**offer_email.offer_fields(details))
+    assert "Purchase Price: $185,000.50" in body and "10-Day inspection" in body
+    assert "body {" in body and "{{" not in body
+
+    _, body = offer_email.render_offer_email(SendOfferReq(**_offer(agent_name="<b>Lee & Co</b>")))
+    assert "Hi &lt;b&gt;Lee &amp; Co&lt;/b&gt;," in body
+
+
+def test_dedupe_key_normalises_email_and_address():
+    assert offer_email.dedupe_key(" Agent@Example.com", "12  Harbor Ln.") == offer_email.dedupe_key(
+        "agent@example.com", "12 harbor ln"
+    )
+    assert offer_email.dedupe_key("a@x.com", "12 Harbor Ln") != offer_email.dedupe_key("a@x.com", "14 Harbor Ln")
+
+
+def test_batch_queues_dedupes_and_rejects(api_client, db_session, stub_env, monkeypatch):
+    import main
+
+    monkeypatch.setattr(main._email_dispatcher, "wake", lambda: None)
+    earlier = api_client.post("/send-offer", json=_offer(7)).json()
+
+    offers = [
+        _offer(1),
+        _offer(2),
+        _offer(1, agent_email="AGENT1@example.com", property_address="1  harbor ln"),
+        _offer(3, agent_email="not-an-email"),
+        _offer(7),
+    ]
+    res = api_client.post("/send-offer/batch", json={"offers": offers})
+    assert res.status_code == 200, res.text
+    body = res.json()
+    assert (body["queued"], body["duplicates"], body["rejected"]) == (2, 2, 1)
+    assert body["max_per_minute"] == email_queue.DEFAULT_MAX_PER_MINUTE
+
+    results = body["results"]
+    assert [r["status"] for r in results] == ["queued", "queued", "duplicate", "rejected", "duplicate"]
+    assert results[2]["duplicate_of"] == 0 and results[2]["id"] is None
+    assert results[3]["detail"] == "Invalid agent email address"
+    assert results[4]["id"] == earlier["id"] and results[4]["detail"] == "Offer already queued"
+
+    status = api_client.get(f"/send-offer/{results[1]['id']}").json()
+    assert status["status"] == "queued" and status["subject"] == "Cash Offer for 2 Harbor Ln"
+
+    # Queued offers stay deduped; a failed one may go out in a later campaign.
+    again = api_client.post("/send-offer/batch", json={"offers": [_offer(1), _offer(2)]}).json()
+    assert [r["status"] for r in again["results"]] == ["duplicate", "duplicate"]
+    db_session.get(OutboundEmail, uuid.UUID(results[0]["id"])).status = "failed"
+    db_session.commit()
+    again = api_client.post("/send-offer/batch", json={"offers": [_offer(1)]}).json()
+    assert again["results"][0]["status"] == "queued" and again["results"][0]["id"] != results[0]["id"]
+
+
+def test_batch_limits(api_client, stub_env):
+    assert api_client.post("/send-offer/batch", json={"offers": []}).status_code == 422
+    too_many = [_offer(i) for i in range(501)]
+    assert api_client.post("/send-offer/batch", json={"offers": too_many}).status_code == 422
+
+
+def test_sending_is_throttled_to_the_rate_caps(stub_env, db_session, monkeypatch):
+    monkeypatch.setenv("EMAIL_MAX_PER_MINUTE", "3")
+    monkeypatch.setenv("EMAIL_MAX_PER_DAY", "4")
+    factory = sessionmaker(bind=db_session.get_bind())
+    with factory() as db:
+        rows = email_queue.enqueue_many(db, [(f"a{i}@example.com", "s", "<p>b</p>", None) for i in range(6)])
+        for row in rows:
+            row.next_attempt_at = NOW
+        db.commit()
+
+    smtp = email_queue.SmtpSession(email_queue.load_settings())
+    assert email_queue.process_due(factory, smtp, now=NOW) == 3
+    assert email_queue.process_due(factory, smtp, now=NOW + timedelta(seconds=30)) == 0
+    # Minute window frees up, but the daily cap leaves room for one more.
+    assert email_queue.process_due(factory, smtp, now=NOW + timedelta(seconds=61)) == 1
+    assert email_queue.process_due(factory, smtp, now=NOW + timedelta(minutes=5)) == 0
+    assert email_queue.process_due(factory, smtp, now=NOW + timedelta(days=1, minutes=1)) == 2
+    smtp.close()
+
+    with factory() as db:
+        assert db.query(OutboundEmail).filter_by(status="sent").count() == 6
+    assert len(stub_env.messages) == 6 and stub_env.connections == 1
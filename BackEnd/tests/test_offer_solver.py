@@ -0,0 +1,133 @@
+"""Max-offer solver: offers must satisfy the targets under the authoritative
+Decimal calculators, and one tolerance step higher must not."""
+
+import random
+from decimal import Decimal
+
+import pytest
+
+from main import calculate_brrr_results, calculate_flip_results
+from tests.test_brrr_batch import _brrr_payload, _random_brrr_payload
+from tests.test_flip_batch import _flip_payload, _random_flip_payload
+
+TOL = 0.01
+
+BRRR_TARGETS = [
+    {"metric": "cash_out", "min": -20000},
+    {"metric": "dscr", "min": 1.0},
+    {"metric": "cash_on_cash", "min": 12},
+]
+FLIP_TARGETS = [{"metric": "roi", "min": 20}, {"metric": "net_profit", "min": 15000}]
+
+
+def _meets(result, targets, sentinels=()):
+    for t in targets:
+        value = float(getattr(result, t["metric"]))
+        if t["metric"] in sentinels and value in (-1.0, -2.0):
+            if value == -2.0:
+                return False
+            continue
+        if value < t["min"] - 1e-6:
+            return False
+    return True
+
+
+def _check(calc, payload, price, targets, sentinels=()):
+    at = calc(payload.model_copy(update={"purchase_price_in_thousands": Decimal(str(price))}), include_breakdown=False)
+    above = calc(payload.model_copy(update={"purchase_price_in_thousands": Decimal(str(round(price + 2 * TOL, 6)))}), include_breakdown=False)
+    assert _meets(at, targets, sentinels), price
+    assert not _meets(above, targets, sentinels), price
+
+
+def test_brrr_offers_match_decimal_calculator(api_client):
+    rng = random.Random(11)
+    payloads = [_random_brrr_payload(rng).model_copy(update={"rent": Decimal("3200")}) for _ in range(40)]
+    res = api_client.post("/analyze/brrr/max-offer", json={
+        "deals": [p.model_dump(mode="json", by_alias=True) for p in payloads],
+        "targets": BRRR_TARGETS,
+    })
+    assert res.status_code == 200, res.text
+    results = res.json()["results"]
+    assert [r["index"] for r in results] == list(range(40))
+
+    solved = 0
+    for payload, r in zip(payloads, results):
+        if r["detail"] is not None or not r["feasible"] or r["capped"]:
+            continue
+        solved += 1
+        assert r["max_purchase_price"] == pytest.approx(r["max_purchase_price_in_thousands"] * 1000)
+        assert r["binding"]
+        _check(calculate_brrr_results, payload, r["max_purchase_price_in_thousands"], BRRR_TARGETS, ("cash_on_cash",))
+    assert solved >= 10
+
+
+def test_flip_offers_match_decimal_calculator(api_client):
+    rng = random.Random(5)
+    payloads = [_random_flip_payload(rng) for _ in range(40)]
+    res = api_client.post("/analyze/flip/max-offer", json={
+        "deals": [p.model_dump(mode="json", by_alias=True) for p in payloads],
+        "targets": FLIP_TARGETS,
+    })
+    assert res.status_code == 200, res.text
+    solved = 0
+    for payload, r in zip(payloads, res.json()["results"]):
+        if not r["feasible"] or r["capped"]:
+            continue
+        solved += 1
+        _check(calculate_flip_results, payload, r["max_purchase_price_in_thousands"], FLIP_TARGETS)
+        assert r["metrics"]["roi"] >= 20 - 1e-6
+    assert solved >= 10
+
+
+def test_single_deal_outcomes(api_client):
+    deal = _flip_payload().model_dump(mode="json", by_alias=True)
+
+    ok = api_client.post("/analyze/flip/max-offer", json={"deal": deal, "targets": FLIP_TARGETS}).json()["results"][0]
+    assert ok["feasible"] and not ok["capped"]
+    assert ok["max_purchase_price_in_thousands"] == pytest.approx(round(ok["max_purchase_price_in_thousands"], 2))
+
+    impossible = api_client.post("/analyze/flip/max-offer", json={
+        "deal": deal, "targets": [{"metric": "net_profit", "min": 10_000_000}],
+    }).json()["results"][0]
+    assert not impossible["feasible"]
+    assert impossible["binding"] == ["net_profit >= 1e+07"]
+    assert impossible["max_purchase_price"] is None
+
+    capped = api_client.post("/analyze/flip/max-offer", json={
+        "deal": deal, "targets": [{"metric": "net_profit", "min": -10_000_000}], "max_price_in_thousands": 150,
+    }).json()["results"][0]
+    assert capped["capped"] and capped["max_purchase_price_in_thousands"] == 150
+
+
+def test_price_independent_target_is_all_or_nothing(api_client):
+    deal = _brrr_payload(rent=Decimal("1200")).model_dump(mode="json", by_alias=True)
+    out = api_client.post("/analyze/brrr/max-offer", json={
+        "deal": deal, "targets": [{"metric": "dscr", "min": 1.25}],
+    }).json()["results"][0]
+    assert not out["feasible"] and out["binding"] == ["dscr >= 1.25"]
+
+
+def test_invalid_rows_and_bad_requests(api_client):
+    bad = _brrr_payload(Months_until_refi=Decimal("0")).model_dump(mode="json", by_alias=True)
+    out = api_client.post("/analyze/brrr/max-offer", json={
+        "deals": [bad], "targets": BRRR_TARGETS,
+    }).json()["results"][0]
+    assert out["detail"] == "Months until refi must be a positive number."
+
+    deal = _brrr_payload().model_dump(mode="json", by_alias=True)
+    res = api_client.post("/analyze/brrr/max-offer", json={"deal": deal, "targets": [{"metric": "irr", "min": 1}]})
+    assert res.status_code == 400
+    assert api_client.post("/analyze/brrr/max-offer", json={"deal": deal, "targets": []}).status_code == 422
+
+
+@pytest.mark.parametrize("path, payload, metric", [
+    ("/analyze/brrr/max-offer", _brrr_payload, "total_cash_needed_for_deal"),
+    ("/analyze/brrr/max-offer", _brrr_payload, "total_cash_needed_for_deal_with_buffer"),
+    ("/analyze/flip/max-offer", _flip_payload, "hml_amount"),
+    ("/analyze/flip/max-offer", _flip_payload, "total_holding_costs"),
+])
+def test_price_increasing_targets_are_rejected(api_client, path, payload, metric):
+    deal = payload().model_dump(mode="json", by_alias=True)
+    res = api_client.post(path, json={"deal": deal, "targets": [{"metric": metric, "min": 1}]})
+    assert res.status_code == 400
+    assert metric in res.json()["detail"]
@@ -0,0 +1,139 @@
+"""PDF reports: disk cache, ETag revalidation and the background job mode."""
+
+import os
+import time
+
+import pytest
+
+import main
+import pdf_jobs
+from tests.test_brrr_batch import _brrr_payload
+from tests.test_flip_batch import _flip_payload
+
+
+@pytest.fixture(autouse=True)
+def pdf_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("PDF_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("PDF_WORKERS", "1")
+    yield tmp_path
+    pdf_jobs._reset_pool()
+    pdf_jobs._jobs.clear()
+    pdf_jobs._failures.clear()
+
+
+def _brrr_body():
+    return _brrr_payload().model_dump(mode="json", by_alias=True)
+
+
+def _wait(api_client, job_id, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = api_client.get(f"/reports/jobs/{job_id}").json()
+        if job["status"] in ("done", "failed"):
+            return job
+        time.sleep(0.1)
+    raise AssertionError("render did not finish")
+
+
+def test_sync_report_is_cached_and_revalidated(api_client, monkeypatch):
+    first = api_client.post("/reports/brrr-pdf", json=_brrr_body(), params={"address": "1 Main St"})
+    assert first.status_code == 200
+    assert first.content.startswith(b"%PDF")
+    etag = first.headers["etag"]
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cached report was recalculated")
+
+    monkeypatch.setattr(main, "calculate_brrr_results", fail)
+    monkeypatch.setattr(main, "build_deal_pdf", fail)
+    again = api_client.post("/reports/brrr-pdf", json=_brrr_body(), params={"address": "1 Main St"})
+    assert again.content == first.content
+    assert again.headers["etag"] == etag
+    assert 'filename="BigWhales_BRRRR_1_Main_St.pdf"' in again.headers["content-disposition"]
+
+    revalidated = api_client.post(
+        "/reports/brrr-pdf", json=_brrr_body(), params={"address": "1 Main St"},
+        headers={"If-None-Match": f'W/"nope", {etag}'},
+    )
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+
+
+def test_cache_key_covers_inputs_address_and_template(monkeypatch):
+    inputs = _brrr_payload().model_dump(mode="json")
+    key = pdf_jobs.report_key("BRRRR", "A", inputs)
+    assert key == pdf_jobs.report_key("BRRRR", "A", dict(reversed(list(inputs.items()))))
+    assert key != pdf_jobs.report_key("BRRRR", "B", inputs)
+    assert key != pdf_jobs.report_key("BRRRR", "A", {**inputs, "rent": "2101"})
+    monkeypatch.setattr(pdf_jobs.deal_pdf, "TEMPLATE_VERSION", "test")
+    assert key != pdf_jobs.report_key("BRRRR", "A", inputs)
+
+
+def test_job_mode_renders_in_the_pool(api_client):
+    body = _flip_payload().model_dump(mode="json", by_alias=True)
+    res = api_client.post("/reports/flip-pdf", json=body, params={"address": "9 Elm", "mode": "job"})
+    assert res.status_code == 202
+    job = res.json()
+    assert job["status"] in ("pending", "running", "done")
+    # Submitting the same report again joins the existing job.
+    assert api_client.post("/reports/flip-pdf", json=body, params={"address": "9 Elm", "mode": "job"}).json()["job_id"] == job["job_id"]
+
+    assert _wait(api_client, job["job_id"])["status"] == "done"
+    pdf = api_client.get(job["download_url"])
+    assert pdf.status_code == 200
+    assert pdf.content.startswith(b"%PDF")
+    assert pdf.headers["etag"] == f'"{job["job_id"]}"'
+    assert 'filename="BigWhales_FLIP_9_Elm.pdf"' in pdf.headers["content-disposition"]
+    assert api_client.get(job["download_url"], headers={"If-None-Match": pdf.headers["etag"]}).status_code == 304
+
+    # The synchronous endpoint now serves the pool's render.
+    sync = api_client.post("/reports/flip-pdf", json=body, params={"address": "9 Elm"})
+    assert sync.content == pdf.content
+
+
+def test_failed_and_unknown_jobs(api_client, pdf_cache):
+    key = "f" * 64
+    pdf_jobs.submit(key, "X", "BRRRR", None)
+    job = _wait(api_client, key)
+    assert job["status"] == "failed" and job["detail"]
+    # The failed future is not kept around; only a bounded failure record is.
+    deadline = time.monotonic() + 5
+    while key in pdf_jobs._jobs and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert key not in pdf_jobs._jobs and key in pdf_jobs._failures
+    assert api_client.get(f"/reports/jobs/{key}").json()["status"] == "failed"
+    assert api_client.get(f"/reports/jobs/{key}/pdf").status_code == 409
+
+    assert api_client.get(f"/reports/jobs/{'0' * 64}").status_code == 404
+    assert api_client.get("/reports/jobs/../../etc/passwd/pdf").status_code == 404
+    assert api_client.get("/reports/jobs/not-a-key/pdf").status_code == 404
+
+
+def test_prune_keeps_newest(pdf_cache):
+    for i in range(5):
+        path = pdf_cache / f"{i:064x}.pdf"
+        path.write_bytes(b"%PDF")
+        os.utime(path, (i, i))
+    assert pdf_jobs.prune_cache(str(pdf_cache), keep=2) == 3
+    assert sorted(p.name for p in pdf_cache.iterdir()) == [f"{i:064x}.pdf" for i in (3, 4)]
+
+
+def test_sync_renders_enforce_the_cache_limit(api_client, pdf_cache, monkeypatch):
+    monkeypatch.setattr(pdf_jobs, "MAX_CACHED_FILES", 2)
+    for i in range(4):
+        res = api_client.post("/reports/brrr-pdf", json=_brrr_body(), params={"address": f"{i} Main St"})
+        assert res.status_code == 200
+    assert len(list(pdf_cache.glob("*.pdf"))) == 2
+
+
+def test_job_mode_serves_a_cached_report_without_recalculating(api_client, monkeypatch):
+    body = _brrr_body()
+    assert api_client.post("/reports/brrr-pdf", json=body, params={"address": "5 Elm"}).status_code == 200
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cached report was recalculated or resubmitted")
+
+    monkeypatch.setattr(main, "calculate_brrr_results", fail)
+    monkeypatch.setattr(pdf_jobs, "submit", fail)
+    res = api_client.post("/reports/brrr-pdf", json=body, params={"address": "5 Elm", "mode": "job"})
+    assert res.status_code == 202 and res.json()["status"] == "done"
@@ -0,0 +1,88 @@
+"""Portfolio PDF book: one streamed document for a set of saved deals."""
+
+import io
+import re
+import uuid
+
+import deal_pdf
+from models import BrrrActiveDeal
+from tests.test_deal_listing import FLIP_DEAL
+from tests.test_lazy_breakdown import BRRR_DEAL
+
+
+def _pages(pdf: bytes) -> int:
+    return len(re.findall(rb"/Type /Page\b(?!s)", pdf))
+
+
+def _create(api_client, body, address):
+    return api_client.post("/active-deals", json={**body, "address": address}).json()["id"]
+
+
+def test_book_has_cover_and_one_section_per_deal(api_client):
+    refs = [{"id": _create(api_client, BRRR_DEAL, f"{i} Elm St"), "deal_type": "BRRRR"} for i in range(3)]
+    refs.append({"id": _create(api_client, FLIP_DEAL, "7 Oak Ave"), "deal_type": "FLIP"})
+
+    with api_client.stream("POST", "/reports/portfolio-pdf", json={"title": "Q3 Meeting", "deals": refs}) as res:
+        assert res.status_code == 200
+        assert res.headers["content-type"] == "application/pdf"
+        assert 'filename="BigWhales_Portfolio_Q3_Meeting.pdf"' in res.headers["content-disposition"]
+        pdf = res.read()
+    assert pdf.startswith(b"%PDF") and pdf.rstrip().endswith(b"%%EOF")
+    # Cover + at least one page per deal.
+    assert _pages(pdf) >= 1 + len(refs)
+
+
+def test_unevaluable_deal_gets_a_note_not_a_failure(api_client, db_session):
+    ok = _create(api_client, BRRR_DEAL, "1 Good St")
+    bad = _create(api_client, BRRR_DEAL, "2 Bad St")
+    deal = db_session.get(BrrrActiveDeal, uuid.UUID(bad))
+    deal.interest_rate = 0
+    db_session.commit()
+
+    res = api_client.post("/reports/portfolio-pdf", json={"deals": [
+        {"id": ok, "deal_type": "BRRRR"}, {"id": bad, "deal_type": "BRRRR"},
+    ]})
+    assert res.status_code == 200
+    assert res.content.startswith(b"%PDF")
+
+
+def test_bought_source_and_missing_deals(api_client):
+    active = _create(api_client, FLIP_DEAL, "5 Pine Rd")
+    bought = api_client.post(f"/bought-deals/from-active/{active}", params={"deal_type": "FLIP"}).json()
+
+    res = api_client.post("/reports/portfolio-pdf", json={
+        "source": "bought", "deals": [{"id": bought["id"], "deal_type": "FLIP"}],
+    })
+    assert res.status_code == 200
+
+    missing = str(uuid.uuid4())
+    res = api_client.post("/reports/portfolio-pdf", json={"deals": [
+        {"id": bought["id"], "deal_type": "FLIP"}, {"id": missing, "deal_type": "BRRRR"},
+    ]})
+    assert res.status_code == 404
+    assert bought["id"] in res.json()["detail"] and missing in res.json()["detail"]
+    assert api_client.post("/reports/portfolio-pdf", json={"deals": []}).status_code == 422
+
+
+def test_cover_totals():
+    styles = deal_pdf._styles()
+    table = deal_pdf._portfolio_table([
+        {"address": "A", "deal_type": "BRRRR", "result": {"net_profit": 1000, "roi": 10, "total_cash_needed_for_deal": 500, "cash_flow": 200}},
+        {"address": "B", "deal_type": "FLIP", "result": {"net_profit": 2500.5, "roi": 20, "total_cash_needed": 700}},
+        {"address": "C", "deal_type": "FLIP", "error": "bad inputs"},
+    ], styles)
+    rows = table._cellvalues
+    assert rows[2][-1] == "-"
+    assert rows[3][2:] == ["-", "-", "-", "-"]
+    assert rows[-1][2:] == [deal_pdf._money(3500.5), "", deal_pdf._money(1200), deal_pdf._money(200)]
+
+
+
+def test_stream_yields_bounded_chunks(monkeypatch):
+    monkeypatch.setattr(deal_pdf, "STREAM_CHUNK_BYTES", 1024)
+    chunks = list(deal_pdf.stream_portfolio_pdf("T", [{"address": "A", "deal_type": "FLIP", "error": "x"}]))
+    assert len(chunks) > 1 and all(len(c) <= 1024 for c in chunks)
+
+    out = io.BytesIO()
+    deal_pdf.build_portfolio_pdf("T", [{"address": "A", "deal_type": "FLIP", "error": "x"}], out)
+    assert len(out.getvalue()) == len(b"".join(chunks))
@@ -0,0 +1,81 @@
+"""`precision=fast|exact`: the float64 and Decimal backends must agree (to the
+cent, or to 1e-6 relative for ratios) across randomized deals, and report
+the same validation errors."""
+
+import random
+
+import pytest
+
+import vector_calc
+from ReqRes.analyzeFlip.analyzeFlipRes import analyzeFlipRes
+from tests.test_brrr_batch import _brrr_payload, _random_brrr_payload
+from tests.test_flip_batch import _flip_payload, _random_flip_payload
+
+
+def _close(fast, exact):
+    if fast is None or exact is None:
+        return fast is exact
+    return fast == pytest.approx(exact, rel=1e-6, abs=0.005)
+
+
+def _same_metrics(fast, exact, metrics):
+    return all(_close(fast[m], exact[m]) for m in metrics)
+
+
+@pytest.mark.parametrize("path, make, metrics", [
+    ("/analyze/brrr", _random_brrr_payload, vector_calc.BRRR_METRICS),
+    ("/analyze/flip", _random_flip_payload, [m for m in vector_calc.FLIP_METRICS if m in analyzeFlipRes.model_fields]),
+])
+def test_single_deal_parity(api_client, path, make, metrics):
+    rng = random.Random(2024)
+    compared = 0
+    for _ in range(60):
+        body = make(rng).model_dump(mode="json", by_alias=True)
+        exact = api_client.post(path, json=body)
+        fast = api_client.post(path, json=body, params={"precision": "fast"})
+        assert fast.status_code == exact.status_code
+        if exact.status_code != 200:
+            assert fast.json()["detail"] == exact.json()["detail"]
+            continue
+        compared += 1
+        assert _same_metrics(fast.json(), exact.json(), metrics), body
+        assert fast.json()["breakdowns"] is None
+        assert exact.json()["breakdowns"]
+    assert compared >= 30
+
+
+@pytest.mark.parametrize("path, make, metrics", [
+    ("/analyze/brrr/batch", _random_brrr_payload, vector_calc.BRRR_METRICS),
+    ("/analyze/flip/batch", _random_flip_payload, vector_calc.FLIP_METRICS),
+])
+def test_batch_parity(api_client, path, make, metrics):
+    rng = random.Random(7)
+    deals = [make(rng).model_dump(mode="json", by_alias=True) for _ in range(200)]
+    fast = api_client.post(path, json={"deals": deals}).json()
+    exact = api_client.post(path, json={"deals": deals}, params={"precision": "exact"}).json()
+    assert fast["errors"] == exact["errors"]
+    assert fast["valid_count"] == exact["valid_count"] > 100
+    for name in metrics:
+        assert all(_close(f, e) for f, e in zip(fast["metrics"][name], exact["metrics"][name])), name
+
+
+def test_exact_batch_accepts_columns(api_client):
+    deals = [_brrr_payload(), _brrr_payload(rent=3100), _brrr_payload(Months_until_refi=0)]
+    rows = [d.model_dump(mode="json", by_alias=True) for d in deals]
+    columns = {key: [float(r[key]) for r in rows] for key in rows[0]}
+    by_deals = api_client.post("/analyze/brrr/batch", json={"deals": rows}, params={"precision": "exact"}).json()
+    by_columns = api_client.post("/analyze/brrr/batch", json={"columns": columns}, params={"precision": "exact"})
+    assert by_columns.status_code == 200, by_columns.text
+    assert by_columns.json() == by_deals
+    assert [e["index"] for e in by_deals["errors"]] == [2]
+
+
+def test_fast_single_errors_and_unknown_precision(api_client):
+    body = _flip_payload(holding_time_months=0).model_dump(mode="json", by_alias=True)
+    exact = api_client.post("/analyze/flip", json=body)
+    fast = api_client.post("/analyze/flip", json=body, params={"precision": "fast"})
+    assert exact.status_code == fast.status_code == 400
+    assert fast.json() == exact.json()
+
+    body = _brrr_payload().model_dump(mode="json", by_alias=True)
+    assert api_client.post("/analyze/brrr", json=body, params={"precision": "approx"}).status_code == 422
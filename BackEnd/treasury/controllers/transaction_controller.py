@@ -1,9 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from datetime import datetime
+from decimal import Decimal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
 from db import get_db
+from treasury.repositories.transaction_repository import LedgerFilters
 from treasury.schemas.transaction_schemas import (
     TransactionLedgerCreate,
+    TransactionLedgerSummary,
     TransactionLedgerUpdate,
     TransactionLedgerRes,
 )
@@ -27,17 +32,65 @@ def _to_res(txn) -> TransactionLedgerRes:
         sub_bucket_assignment=txn.sub_bucket_assignment,
         transaction_type=txn.transaction_type,
         settlement_batch_id=txn.settlement_batch_id,
+        external_id=txn.external_id,
         created_at=txn.created_at.isoformat() if txn.created_at else None,
         updated_at=txn.updated_at.isoformat() if txn.updated_at else None,
     )
 
 
+def _ledger_filters(
+    llc_id: str | None = Query(default=None),
+    property_id: str | None = Query(default=None),
+    transaction_type: str | None = Query(default=None),
+    is_real_bank_tx: bool | None = Query(default=None),
+    sub_bucket_assignment: str | None = Query(default=None),
+    start: datetime | None = Query(default=None, description="Inclusive lower timestamp bound."),
+    end: datetime | None = Query(default=None, description="Inclusive upper timestamp bound."),
+    min_amount: Decimal | None = Query(default=None),
+    max_amount: Decimal | None = Query(default=None),
+) -> LedgerFilters:
+    return LedgerFilters(
+        llc_id=llc_id,
+        property_id=property_id,
+        transaction_type=transaction_type,
+        is_real_bank_tx=is_real_bank_tx,
+        sub_bucket_assignment=sub_bucket_assignment,
+        start=start,
+        end=end,
+        min_amount=min_amount,
+        max_amount=max_amount,
+    )
+
+
 @router.get("", response_model=list[TransactionLedgerRes])
 def list_transactions(
-    property_id: str | None = Query(default=None),
+    response: Response,
+    filters: LedgerFilters = Depends(_ledger_filters),
+    limit: int | None = Query(default=None, ge=1, le=transaction_service.MAX_PAGE_SIZE),
+    cursor: str | None = Query(default=None),
+    db: Session = Depends(get_db),
+):
+    """Audit log, newest first. Without `limit` every matching row comes
+    back as before; paged responses carry the next cursor in `X-Next-Cursor`.
+    """
+    try:
+        page = transaction_service.list_transactions(db, filters, limit=limit, cursor=cursor)
+    except ValidationError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return [_to_res(txn) for txn in page.transactions]
+
+
+@router.get("/summary", response_model=TransactionLedgerSummary)
+def summarize_transactions(
+    filters: LedgerFilters = Depends(_ledger_filters),
     db: Session = Depends(get_db),
 ):
-    return [_to_res(txn) for txn in transaction_service.list_transactions(db, property_id)]
+    try:
+        return transaction_service.summarize_transactions(db, filters)
+    except ValidationError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
 
 
 @router.post("", response_model=TransactionLedgerRes, status_code=201)
@@ -4,7 +4,7 @@ bucket mutation, rent-milestone checks, veil protection) lives in the
 router just adapts HTTP in and out.
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from db import get_db
@@ -27,6 +27,7 @@ def _to_res(txn) -> TransactionLedgerRes:
         sub_bucket_assignment=txn.sub_bucket_assignment,
         transaction_type=txn.transaction_type,
         settlement_batch_id=txn.settlement_batch_id,
+        external_id=txn.external_id,
         created_at=txn.created_at.isoformat() if txn.created_at else None,
         updated_at=txn.updated_at.isoformat() if txn.updated_at else None,
     )
@@ -38,6 +39,7 @@ def _to_result(result: dict) -> WebhookIngestResult:
         transaction=_to_res(result["transaction"]),
         overflow_transaction=_to_res(overflow) if overflow is not None else None,
         waterfall=result.get("waterfall"),
+        duplicate=result.get("duplicate", False),
     )
 
 
@@ -59,19 +61,29 @@ def ingest_bank_transaction(payload: BankWebhookPayload, db: Session = Depends(g
 
 
 @router.post("/nightly-sync", response_model=list[WebhookIngestResult], status_code=201)
-def run_nightly_sync(payloads: list[BankWebhookPayload], db: Session = Depends(get_db)):
+def run_nightly_sync(
+    payloads: list[BankWebhookPayload],
+    bulk: bool = Query(True, description="One transaction for the whole batch; false = per-row commits"),
+    db: Session = Depends(get_db),
+):
     """Batch variant of the same pipeline used for continuous nightly
     reconciliation — NOT a monthly lookback script. Each payload runs
     through the identical parse -> ingest -> mutate -> milestone-check
     pipeline as a live webhook; nothing here recomputes historical state.
+
+    By default the batch is applied all-or-nothing in a single database
+    transaction (`ingest_webhook_batch`); `bulk=false` falls back to
+    committing each payload as the live webhook does.
     """
     try:
-        results = [
-            transaction_routing_service.ingest_webhook_transaction(
-                db, webhook_parser_service.parse_bank_webhook(payload)
-            )
-            for payload in payloads
-        ]
+        parsed = [webhook_parser_service.parse_bank_webhook(payload) for payload in payloads]
+        if bulk:
+            results = transaction_routing_service.ingest_webhook_batch(db, parsed)
+        else:
+            results = [
+                transaction_routing_service.ingest_webhook_transaction(db, payload)
+                for payload in parsed
+            ]
         return [_to_result(result) for result in results]
     except ValidationError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
@@ -2,12 +2,14 @@ from treasury.models.llc_configuration import LLCConfiguration
 from treasury.models.property_status import PropertyStatus
 from treasury.models.transaction_ledger import TransactionLedger, VALID_SUB_BUCKETS, VALID_TRANSACTION_TYPES
 from treasury.models.property_cash_flow_history import PropertyCashFlowHistory
+from treasury.models.ledger_monthly_aggregate import LedgerMonthlyAggregate
 
 __all__ = [
     "LLCConfiguration",
     "PropertyStatus",
     "TransactionLedger",
     "PropertyCashFlowHistory",
+    "LedgerMonthlyAggregate",
     "VALID_SUB_BUCKETS",
     "VALID_TRANSACTION_TYPES",
 ]
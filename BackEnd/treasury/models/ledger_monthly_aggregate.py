@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Integer, Numeric, String
+
+from db import Base
+
+
+class LedgerMonthlyAggregate(Base):
+    """Running per-property, per-month ledger totals.
+
+    Derived state maintained by `ledger_aggregate_service` alongside every
+    `TransactionLedger` write, so month-to-date rent and virtual bucket
+    allocation lookups are a single-row read instead of a SUM over the
+    ledger. `kind` is `"rent"` (real-bank Rent) or a sub-bucket name
+    (virtual `"Tax"` / `"General Reserve"` allocations); `month` is the
+    first day of the UTC calendar month.
+
+    `max_timestamp` is the latest ledger timestamp ever counted in the row
+    (never lowered on delete), so a reader can tell whether the month total
+    is also the total up to a given moment.
+    """
+
+    __tablename__ = "ledger_monthly_aggregates"
+
+    property_id = Column(
+        String,
+        ForeignKey("property_status.property_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    month = Column(Date, primary_key=True)
+    kind = Column(String, primary_key=True)
+    total = Column(Numeric(14, 2), nullable=False, default=0)
+    row_count = Column(Integer, nullable=False, default=0)
+    max_timestamp = Column(DateTime(timezone=True), nullable=True)
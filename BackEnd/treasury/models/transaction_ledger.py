@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import Column, String, Numeric, Boolean, ForeignKey, DateTime, func
+from sqlalchemy import Column, String, Numeric, Boolean, ForeignKey, DateTime, Index, func
 from sqlalchemy.orm import relationship
 
 from db import Base
@@ -30,7 +30,6 @@ class TransactionLedger(Base):
         String,
         ForeignKey("property_status.property_id", ondelete="SET NULL"),
         nullable=True,
-        index=True,
     )
     amount = Column(Numeric(14, 2), nullable=False)
     description = Column(String, nullable=False)
@@ -39,6 +38,9 @@ class TransactionLedger(Base):
     sub_bucket_assignment = Column(String, nullable=True)
     transaction_type = Column(String, nullable=False)
     settlement_batch_id = Column(String, nullable=True)
+    # Bank-side transaction id / idempotency key. Unique so webhook retries
+    # and nightly-sync overlap resolve to the row already ingested.
+    external_id = Column(String, nullable=True, unique=True, index=True)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(
@@ -46,3 +48,33 @@ class TransactionLedger(Base):
     )
 
     property = relationship("PropertyStatus", back_populates="transactions")
+
+    # Matched to the month-to-date SUM predicates; `amount` comes last so
+    # the sum is answered from the index without touching the table.
+    __table_args__ = (
+        # cumulative_rent_received: real-bank Rent in a timestamp window.
+        Index(
+            "ix_transaction_ledger_rent_window",
+            "property_id", "transaction_type", "is_real_bank_tx", "timestamp", "amount",
+        ),
+        # window_bucket_allocated: virtual Tax / Reserve allocations.
+        Index(
+            "ix_transaction_ledger_bucket_window",
+            "property_id", "sub_bucket_assignment", "is_real_bank_tx", "timestamp", "amount",
+        ),
+    )
+
+
+# Audit log keyset pages, newest first, across all properties or for one.
+# The second also serves plain property_id lookups.
+Index(
+    "ix_transaction_ledger_timestamp_id",
+    TransactionLedger.timestamp.desc(),
+    TransactionLedger.transaction_id.desc(),
+)
+Index(
+    "ix_transaction_ledger_property_timestamp_id",
+    TransactionLedger.property_id,
+    TransactionLedger.timestamp.desc(),
+    TransactionLedger.transaction_id.desc(),
+)
@@ -1,14 +1,25 @@
-"""Pure data-access layer for `TransactionLedger`."""
+"""Pure data-access layer for `TransactionLedger`.
 
-from typing import Optional
+Every write also folds the row into `ledger_monthly_aggregates` before
+committing, so the aggregates move in the same transaction as the ledger.
+"""
 
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Iterable, Optional
+
+from sqlalchemy import and_, case, func, or_, select
 from sqlalchemy.orm import Session
 
+from treasury.models.property_status import PropertyStatus
 from treasury.models.transaction_ledger import TransactionLedger
+from treasury.services import ledger_aggregate_service
 
 
 def create(db: Session, txn: TransactionLedger) -> TransactionLedger:
     db.add(txn)
+    ledger_aggregate_service.record(db, added=[txn])
     db.commit()
     db.refresh(txn)
     return txn
@@ -18,24 +29,111 @@ def get_by_id(db: Session, transaction_id: str) -> Optional[TransactionLedger]:
     return db.get(TransactionLedger, transaction_id)
 
 
-def list_all(
+def get_by_external_id(db: Session, external_id: str) -> Optional[TransactionLedger]:
+    return db.query(TransactionLedger).filter(TransactionLedger.external_id == external_id).first()
+
+
+def get_by_external_ids(db: Session, external_ids: Iterable[str]) -> dict[str, TransactionLedger]:
+    ids = list(set(external_ids))
+    found: dict[str, TransactionLedger] = {}
+    # Chunked to stay under SQLite's bound-parameter limit.
+    for i in range(0, len(ids), 500):
+        query = db.query(TransactionLedger).filter(TransactionLedger.external_id.in_(ids[i:i + 500]))
+        found.update((txn.external_id, txn) for txn in query)
+    return found
+
+
+@dataclass
+class LedgerFilters:
+    """Audit-log filters; every bound is inclusive and None means "any"."""
+
+    llc_id: Optional[str] = None
+    property_id: Optional[str] = None
+    transaction_type: Optional[str] = None
+    is_real_bank_tx: Optional[bool] = None
+    sub_bucket_assignment: Optional[str] = None
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    min_amount: Optional[Decimal] = None
+    max_amount: Optional[Decimal] = None
+
+    def clauses(self) -> list:
+        clauses = []
+        if self.llc_id is not None:
+            clauses.append(TransactionLedger.property_id.in_(
+                select(PropertyStatus.property_id).where(PropertyStatus.llc_id == self.llc_id)
+            ))
+        for column, value in (
+            (TransactionLedger.property_id, self.property_id),
+            (TransactionLedger.transaction_type, self.transaction_type),
+            (TransactionLedger.is_real_bank_tx, self.is_real_bank_tx),
+            (TransactionLedger.sub_bucket_assignment, self.sub_bucket_assignment),
+        ):
+            if value is not None:
+                clauses.append(column == value)
+        if self.start is not None:
+            clauses.append(TransactionLedger.timestamp >= self.start)
+        if self.end is not None:
+            clauses.append(TransactionLedger.timestamp <= self.end)
+        if self.min_amount is not None:
+            clauses.append(TransactionLedger.amount >= self.min_amount)
+        if self.max_amount is not None:
+            clauses.append(TransactionLedger.amount <= self.max_amount)
+        return clauses
+
+
+def list_page(
     db: Session,
-    property_id: Optional[str] = None,
+    filters: LedgerFilters,
+    limit: Optional[int] = None,
+    after: Optional[tuple[datetime, str]] = None,
 ) -> list[TransactionLedger]:
-    query = db.query(TransactionLedger)
-    if property_id is not None:
-        query = query.filter(TransactionLedger.property_id == property_id)
-    return query.order_by(TransactionLedger.timestamp.desc()).all()
+    """Rows newest first by `(timestamp, transaction_id)`, strictly after
+    the `after` keyset when given; all of them when `limit` is None.
+    """
+    query = db.query(TransactionLedger).filter(*filters.clauses())
+    if after is not None:
+        timestamp, transaction_id = after
+        query = query.filter(
+            # Redundant with the OR below, but lets the planner seek the
+            # timestamp index instead of scanning it from the newest row.
+            TransactionLedger.timestamp <= timestamp,
+            or_(
+                TransactionLedger.timestamp < timestamp,
+                and_(TransactionLedger.timestamp == timestamp, TransactionLedger.transaction_id < transaction_id),
+            ),
+        )
+    query = query.order_by(TransactionLedger.timestamp.desc(), TransactionLedger.transaction_id.desc())
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
+
+
+def summarize(db: Session, filters: LedgerFilters) -> tuple[int, Decimal, Decimal, Decimal]:
+    """`(count, total, inflow, outflow)` over every row matching `filters`."""
+    amount = TransactionLedger.amount
+    row = db.execute(
+        select(
+            func.count(),
+            func.coalesce(func.sum(amount), 0),
+            func.coalesce(func.sum(case((amount > 0, amount), else_=0)), 0),
+            func.coalesce(func.sum(case((amount < 0, amount), else_=0)), 0),
+        ).select_from(TransactionLedger).where(*filters.clauses())
+    ).one()
+    return row[0], Decimal(row[1]), Decimal(row[2]), Decimal(row[3])
 
 
 def update(db: Session, txn: TransactionLedger, changes: dict) -> TransactionLedger:
+    before = ledger_aggregate_service.snapshot(txn)
     for key, value in changes.items():
         setattr(txn, key, value)
+    ledger_aggregate_service.record(db, removed=[before], added=[txn])
     db.commit()
     db.refresh(txn)
     return txn
 
 
 def delete(db: Session, txn: TransactionLedger) -> None:
+    ledger_aggregate_service.record(db, removed=[txn])
     db.delete(txn)
     db.commit()
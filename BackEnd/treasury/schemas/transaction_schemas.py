@@ -17,6 +17,7 @@ class TransactionLedgerCreate(BaseModel):
     sub_bucket_assignment: Optional[str] = None
     transaction_type: str
     settlement_batch_id: Optional[str] = None
+    external_id: Optional[str] = Field(None, min_length=1, max_length=200)
 
     @field_validator("sub_bucket_assignment")
     @classmethod
@@ -77,7 +78,17 @@ class TransactionLedgerRes(BaseModel):
     sub_bucket_assignment: Optional[str] = None
     transaction_type: str
     settlement_batch_id: Optional[str] = None
+    external_id: Optional[str] = None
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
 
     model_config = {"from_attributes": True}
+
+
+class TransactionLedgerSummary(BaseModel):
+    """Totals over every row matching the audit-log filters, not one page."""
+
+    count: int
+    total_amount: Decimal
+    inflow: Decimal
+    outflow: Decimal
@@ -25,6 +25,9 @@ class BankWebhookPayload(BaseModel):
     is_real_bank_tx: Optional[bool] = None
     sub_bucket_assignment: Optional[str] = None
     settlement_batch_id: Optional[str] = None
+    # The bank's own transaction id. Replays of an id already ingested
+    # return the existing row instead of applying it twice.
+    external_id: Optional[str] = Field(None, min_length=1, max_length=200)
 
 
 class WebhookIngestResult(BaseModel):
@@ -34,3 +37,6 @@ class WebhookIngestResult(BaseModel):
     overflow_transaction: Optional[TransactionLedgerRes] = None
     # Present when a real-bank Rent payment ran the 5-step waterfall.
     waterfall: Optional[dict] = None
+    # True when `external_id` was already ingested: `transaction` is the
+    # original row and nothing was applied again.
+    duplicate: bool = False
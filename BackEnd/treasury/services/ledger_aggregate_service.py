@@ -0,0 +1,272 @@
+"""Running per-property monthly ledger aggregates.
+
+`rent_milestone_service.cumulative_rent_received` and
+`settlement_service.window_bucket_allocated` both ask "how much has landed
+in this property's <kind> since the start of the month, up to <when>?" —
+twice per Rent ingestion, plus once per property in the missed-rent check.
+`ledger_monthly_aggregates` answers that with a single-row read:
+
+  * `transaction_repository` create / update / delete (and the bulk
+    nightly-sync insert) call `record` before committing, so the aggregate
+    moves in the same transaction as the ledger row.
+  * `month_to_date` serves a lookup from the aggregate when the window is
+    the whole UTC month so far and nothing later than `when` has been
+    counted in it (`max_timestamp`). Anything else — a backdated lookup, a
+    window not starting on the UTC month boundary, a month with no
+    aggregate yet — returns None and the caller runs its exact SUM.
+
+Ledger writes that bypass `transaction_repository` (raw SQL, ad-hoc
+scripts) are not seen. Run
+`python -m treasury.services.ledger_aggregate_service verify` to compare the
+table with a rebuild from the ledger (exit code 1 on drift) and `rebuild`
+to repair it. Startup backfills an empty table automatically.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Any, Iterable, Optional, Sequence
+
+from sqlalchemy import case, delete, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from treasury.models.ledger_monthly_aggregate import LedgerMonthlyAggregate
+from treasury.models.transaction_ledger import TransactionLedger
+
+RENT = "rent"
+ALLOCATION_BUCKETS = ("Tax", "General Reserve")
+
+_CENTS = Decimal("0.01")
+_FIELDS = (
+    "property_id", "amount", "timestamp", "is_real_bank_tx",
+    "transaction_type", "sub_bucket_assignment",
+)
+_table = LedgerMonthlyAggregate.__table__
+
+Key = tuple[str, date, str]
+
+
+def _field(txn: Any, name: str) -> Any:
+    return txn[name] if isinstance(txn, dict) else getattr(txn, name)
+
+
+def _utc(ts: datetime) -> datetime:
+    """Aware UTC; naive timestamps (SQLite reads) are taken as UTC."""
+    return ts.astimezone(timezone.utc) if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+
+def month_of(ts: datetime) -> date:
+    ts = _utc(ts)
+    return date(ts.year, ts.month, 1)
+
+
+def kind_of(txn: Any) -> Optional[str]:
+    """Aggregate a ledger row counts toward: `"rent"` for real-bank Rent,
+    the sub-bucket for virtual Tax / General Reserve allocations, else None.
+    """
+    if _field(txn, "property_id") is None:
+        return None
+    if _field(txn, "is_real_bank_tx"):
+        return RENT if _field(txn, "transaction_type") == "Rent" else None
+    bucket = _field(txn, "sub_bucket_assignment")
+    return bucket if bucket in ALLOCATION_BUCKETS else None
+
+
+def snapshot(txn: TransactionLedger) -> dict:
+    """The fields `record` needs, captured before an in-place edit."""
+    return {name: getattr(txn, name) for name in _FIELDS}
+
+
+def _accumulate(into: dict[Key, list], txn: Any, sign: int) -> None:
+    kind = kind_of(txn)
+    if kind is None:
+        return
+    ts = _utc(_field(txn, "timestamp"))
+    entry = into.setdefault((_field(txn, "property_id"), month_of(ts), kind), [Decimal("0"), 0, None])
+    entry[0] += sign * Decimal(_field(txn, "amount")).quantize(_CENTS)
+    entry[1] += sign
+    if sign > 0 and (entry[2] is None or ts > entry[2]):
+        entry[2] = ts
+
+
+def record(db: Session, removed: Iterable[Any] = (), added: Iterable[Any] = ()) -> None:
+    """Fold ledger rows leaving (`removed`) and entering (`added`) the ledger
+    into the aggregates. Rows may be ORM objects, `snapshot` dicts or bulk
+    insert dicts. Does not commit.
+    """
+    deltas: dict[Key, list] = {}
+    for txn in removed:
+        _accumulate(deltas, txn, -1)
+    for txn in added:
+        _accumulate(deltas, txn, 1)
+    # A month with rent gets (zero) allocation rows too, so the waterfall's
+    # remaining-need lookups right after it are single-row reads as well.
+    for property_id, month, kind in list(deltas):
+        if kind == RENT and deltas[(property_id, month, kind)][1] > 0:
+            for bucket in ALLOCATION_BUCKETS:
+                deltas.setdefault((property_id, month, bucket), [Decimal("0"), 0, None])
+
+    for (property_id, month, kind), (total, count, max_ts) in deltas.items():
+        key = (
+            (_table.c.property_id == property_id)
+            & (_table.c.month == month)
+            & (_table.c.kind == kind)
+        )
+        values: dict[str, Any] = {
+            "total": _table.c.total + total,
+            "row_count": _table.c.row_count + count,
+        }
+        if max_ts is not None:
+            values["max_timestamp"] = case(
+                (or_(_table.c.max_timestamp.is_(None), _table.c.max_timestamp < max_ts), max_ts),
+                else_=_table.c.max_timestamp,
+            )
+        if db.execute(update(_table).where(key).values(**values)).rowcount:
+            continue
+        if count < 0:
+            # Nothing aggregated for this month yet (pre-backfill data); the
+            # reader falls back to the ledger and `rebuild` sorts it out.
+            continue
+        db.execute(insert(_table).values(
+            property_id=property_id, month=month, kind=kind,
+            total=total, row_count=count, max_timestamp=max_ts,
+        ))
+
+
+def month_to_date(
+    db: Session,
+    property_id: str,
+    kind: str,
+    window_start: datetime,
+    when: datetime,
+) -> Optional[Decimal]:
+    """Sum of `kind` rows with `window_start <= timestamp <= when`, from the
+    aggregate; None when the aggregate can't answer exactly.
+    """
+    month = month_of(when)
+    if _utc(window_start) != datetime(month.year, month.month, 1, tzinfo=timezone.utc):
+        return None
+    row = db.execute(
+        select(_table.c.total, _table.c.max_timestamp).where(
+            _table.c.property_id == property_id,
+            _table.c.month == month,
+            _table.c.kind == kind,
+        )
+    ).first()
+    if row is None:
+        return None
+    if row.max_timestamp is not None and _utc(row.max_timestamp) > _utc(when):
+        return None
+    return Decimal(row.total)
+
+
+# --- Rebuild / reconciliation ---
+
+def _from_ledger(db: Session) -> dict[Key, list]:
+    expected: dict[Key, list] = {}
+    rows = db.query(*(getattr(TransactionLedger, name) for name in _FIELDS)).filter(
+        TransactionLedger.property_id.isnot(None),
+        or_(
+            (TransactionLedger.is_real_bank_tx.is_(True)) & (TransactionLedger.transaction_type == "Rent"),
+            (TransactionLedger.is_real_bank_tx.is_(False))
+            & TransactionLedger.sub_bucket_assignment.in_(ALLOCATION_BUCKETS),
+        ),
+    )
+    for row in rows:
+        _accumulate(expected, dict(zip(_FIELDS, row)), 1)
+    return expected
+
+
+def rebuild(db: Session, commit: bool = True) -> int:
+    """Recompute every aggregate from the ledger; returns rows written."""
+    expected = _from_ledger(db)
+    db.execute(delete(_table))
+    if expected:
+        db.execute(insert(_table), [
+            {
+                "property_id": property_id, "month": month, "kind": kind,
+                "total": total, "row_count": count, "max_timestamp": max_ts,
+            }
+            for (property_id, month, kind), (total, count, max_ts) in expected.items()
+        ])
+    if commit:
+        db.commit()
+    return len(expected)
+
+
+def ensure_backfilled(db: Session) -> int:
+    """Rebuild when the table is empty but the ledger is not (first deploy).
+
+    Several workers starting together may all see an empty table; the ones
+    that lose the race hit the primary key and leave the winner's rows.
+    """
+    if db.execute(select(_table.c.kind).limit(1)).first() is not None:
+        return 0
+    try:
+        return rebuild(db)
+    except IntegrityError:
+        db.rollback()
+        return 0
+
+
+def reconcile(db: Session, limit: int = 20) -> dict[str, Any]:
+    """Compare stored aggregates with a rebuild from the ledger.
+
+    A stored `max_timestamp` later than the ledger's is fine (deletes never
+    lower it; it only makes readers fall back), an earlier one is not.
+    Zero rows with no ledger counterpart are fine too.
+    """
+    expected = _from_ledger(db)
+    stored = {
+        (r.property_id, r.month, r.kind): (Decimal(r.total), r.row_count, r.max_timestamp)
+        for r in db.execute(select(_table))
+    }
+    report: dict[str, Any] = {"rows": len(stored), "mismatch_count": 0, "mismatches": []}
+    for key in sorted(set(expected) | set(stored), key=lambda k: (k[0], k[1], k[2])):
+        want_total, want_count, want_max = expected.get(key, (Decimal("0"), 0, None))
+        have_total, have_count, have_max = stored.get(key, (None, None, None))
+        ok = (
+            have_total is not None
+            and have_total == want_total
+            and have_count == want_count
+            and (want_max is None or (have_max is not None and _utc(have_max) >= want_max))
+        ) or (have_total is None and want_count == 0)
+        if ok:
+            continue
+        report["mismatch_count"] += 1
+        if len(report["mismatches"]) < limit:
+            report["mismatches"].append({
+                "property_id": key[0], "month": key[1].isoformat(), "kind": key[2],
+                "stored_total": None if have_total is None else str(have_total),
+                "expected_total": str(want_total),
+                "stored_count": have_count, "expected_count": want_count,
+            })
+    return report
+
+
+def _main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Maintain the ledger_monthly_aggregates table.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("rebuild", help="recompute every aggregate from the ledger")
+    verify_parser = sub.add_parser("verify", help="compare aggregates with the ledger")
+    verify_parser.add_argument("--limit", type=int, default=20, help="mismatches to list (default 20)")
+    args = parser.parse_args(argv)
+
+    import main  # noqa: F401  (runs migrations so the table exists)
+    from db import SessionLocal
+
+    with SessionLocal() as db:
+        if args.command == "rebuild":
+            print(json.dumps({"rows": rebuild(db)}, indent=2))
+            return 0
+        report = reconcile(db, limit=args.limit)
+        print(json.dumps(report, indent=2))
+        return 1 if report["mismatch_count"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(_main())
@@ -0,0 +1,58 @@
+"""Bounded in-process cache of recently ingested bank transaction ids.
+
+Bank webhooks retry in bursts (timeouts, 5xx on our side, at-least-once
+delivery), and the nightly sync re-sends lines the live webhook already
+delivered. The unique index on `TransactionLedger.external_id` is the
+source of truth for "already ingested"; this cache only remembers the
+most recent `external_id -> transaction_id` pairs so a hot retry resolves
+to its ledger row by primary key instead of an index probe.
+
+Entries are advisory: a hit is always confirmed against the row it points
+at, and a miss always falls through to the index, so a stale or evicted
+entry (another worker, a deleted row, a restart) can never cause a
+double-apply or hide a new transaction.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+DEFAULT_MAX_ENTRIES = 10_000
+
+
+class RecentIdCache:
+    """Thread-safe LRU map of `external_id -> transaction_id`."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, external_id: str) -> Optional[str]:
+        with self._lock:
+            transaction_id = self._entries.get(external_id)
+            if transaction_id is not None:
+                self._entries.move_to_end(external_id)
+            return transaction_id
+
+    def put(self, external_id: str, transaction_id: str) -> None:
+        with self._lock:
+            self._entries[external_id] = transaction_id
+            self._entries.move_to_end(external_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, external_id: Optional[str]) -> None:
+        if external_id is None:
+            return
+        with self._lock:
+            self._entries.pop(external_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
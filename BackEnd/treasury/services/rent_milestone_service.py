@@ -24,6 +24,7 @@ from sqlalchemy.orm import Session
 
 from treasury.models.transaction_ledger import TransactionLedger
 from treasury.repositories import property_repository, transaction_repository
+from treasury.services import ledger_aggregate_service
 
 ApplyEffect = Callable[[Session, TransactionLedger], None]
 
@@ -40,8 +41,14 @@ def cumulative_rent_received(
     window_end: datetime,
 ) -> Decimal:
     """Sum of real-bank Rent transactions for a property within the window
-    (inclusive on both ends), straight from the ledger.
+    (inclusive on both ends). Month-to-date windows read the running
+    aggregate; anything else sums the ledger directly.
     """
+    aggregated = ledger_aggregate_service.month_to_date(
+        db, property_id, ledger_aggregate_service.RENT, window_start, window_end
+    )
+    if aggregated is not None:
+        return aggregated
     total = (
         db.query(func.coalesce(func.sum(TransactionLedger.amount), 0))
         .filter(
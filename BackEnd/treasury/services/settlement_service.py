@@ -23,7 +23,7 @@ from sqlalchemy.orm import Session
 
 from treasury.models.transaction_ledger import TransactionLedger
 from treasury.repositories import property_repository, transaction_repository
-from treasury.services import allocation_engine, rent_milestone_service
+from treasury.services import allocation_engine, ledger_aggregate_service, rent_milestone_service
 from treasury.services.allocation_engine import WaterfallInput, WaterfallResult
 from treasury.services.exceptions import NotFoundError, ValidationError
 
@@ -61,6 +61,9 @@ def window_bucket_allocated(
     """
     when = as_of or datetime.now(timezone.utc)
     window_start = rent_milestone_service._window_start(when)
+    aggregated = ledger_aggregate_service.month_to_date(db, property_id, sub_bucket, window_start, when)
+    if aggregated is not None:
+        return _money(aggregated)
     total = (
         db.query(func.coalesce(func.sum(TransactionLedger.amount), 0))
         .filter(
@@ -75,40 +78,18 @@ def window_bucket_allocated(
     return _money(total)
 
 
-def apply_waterfall_to_property(
-    db: Session,
-    property_id: str,
+def waterfall_input(
+    prop,
     rent_received: Decimal,
     *,
-    checking_balance: Decimal = Decimal("0"),
-    pi_amount: Decimal = Decimal("0"),
-    uncollected_reserve_targets: Decimal = Decimal("0"),
-    tax_already_allocated: Optional[Decimal] = None,
-    reserve_already_allocated: Optional[Decimal] = None,
-    as_of: Optional[datetime] = None,
-    source_transaction_id: Optional[str] = None,
-) -> WaterfallResult:
-    """Run recovery rent through the 5-step waterfall and persist the plan.
-
-    The paused `pending_overflow` (if any) is intentionally NOT auto-applied
-    — it awaits the operator's A/B/C decision via `resolve_overflow_decision`.
-
-    Virtual Tax / General Reserve ledger rows are minted for the allocated
-    amounts so the audit log and remaining-need tracker stay consistent.
-    These rows do NOT re-apply bucket effects (the balances are mutated
-    directly below) — they are bookkeeping markers only.
-    """
-    prop = _get_property(db, property_id)
-    when = as_of or datetime.now(timezone.utc)
-
-    if tax_already_allocated is None:
-        tax_already_allocated = window_bucket_allocated(db, property_id, "Tax", as_of=when)
-    if reserve_already_allocated is None:
-        reserve_already_allocated = window_bucket_allocated(
-            db, property_id, "General Reserve", as_of=when
-        )
-
-    inp = WaterfallInput(
+    checking_balance: Decimal,
+    pi_amount: Decimal,
+    uncollected_reserve_targets: Decimal,
+    tax_already_allocated: Decimal,
+    reserve_already_allocated: Decimal,
+) -> WaterfallInput:
+    """Snapshot a property's current bucket state as engine input."""
+    return WaterfallInput(
         rent_received=_money(rent_received),
         pi_amount=_money(pi_amount),
         checking_balance=_money(checking_balance),
@@ -122,24 +103,34 @@ def apply_waterfall_to_property(
         chase_reserves=bool(prop.chase_reserves),
         uncollected_reserve_targets=_money(uncollected_reserve_targets),
     )
-    result = allocation_engine.run_waterfall(inp)
 
+
+def apply_waterfall_result(prop, result: WaterfallResult) -> None:
+    """Mutate `prop`'s debt / bucket / settlement columns per the plan (no commit)."""
     prop.reserve_debt = result.new_reserve_debt
     prop.reserve_bucket_balance = _money(prop.reserve_bucket_balance) + result.reserve_balance_delta
     prop.reserve_to_settle = _money(prop.reserve_to_settle) + result.reserve_to_settle_delta
     prop.tax_bucket_balance = _money(prop.tax_bucket_balance) + result.tax_balance_delta
     prop.tax_to_settle = _money(prop.tax_to_settle) + result.tax_to_settle_delta
-    db.commit()
-    db.refresh(prop)
 
-    # Prefix WATERFALL- so the routing layer never re-applies / reverses these
-    # bookkeeping markers (balances were already mutated above).
+
+def waterfall_markers(
+    property_id: str,
+    result: WaterfallResult,
+    when: datetime,
+    source_transaction_id: Optional[str],
+) -> list[TransactionLedger]:
+    """Virtual Tax / General Reserve bookkeeping rows for an applied plan.
+
+    Prefixed WATERFALL- so the routing layer never re-applies / reverses
+    them (the balances were already mutated by `apply_waterfall_result`).
+    """
     batch_id = f"WATERFALL-{source_transaction_id or 'manual'}"
+    markers = []
     if result.tax_balance_delta > 0:
-        transaction_repository.create(
-            db,
+        markers.append(
             TransactionLedger(
-                property_id=prop.property_id,
+                property_id=property_id,
                 amount=result.tax_balance_delta,
                 description=f"Waterfall Step 2 tax allocation (source {batch_id})",
                 timestamp=when,
@@ -147,13 +138,12 @@ def apply_waterfall_to_property(
                 sub_bucket_assignment="Tax",
                 transaction_type="Rent",
                 settlement_batch_id=batch_id,
-            ),
+            )
         )
     if result.reserve_filled > 0:
-        transaction_repository.create(
-            db,
+        markers.append(
             TransactionLedger(
-                property_id=prop.property_id,
+                property_id=property_id,
                 amount=result.reserve_filled,
                 description=f"Waterfall Step 3 reserve allocation (source {batch_id})",
                 timestamp=when,
@@ -161,8 +151,61 @@ def apply_waterfall_to_property(
                 sub_bucket_assignment="General Reserve",
                 transaction_type="Rent",
                 settlement_batch_id=batch_id,
-            ),
+            )
+        )
+    return markers
+
+
+def apply_waterfall_to_property(
+    db: Session,
+    property_id: str,
+    rent_received: Decimal,
+    *,
+    checking_balance: Decimal = Decimal("0"),
+    pi_amount: Decimal = Decimal("0"),
+    uncollected_reserve_targets: Decimal = Decimal("0"),
+    tax_already_allocated: Optional[Decimal] = None,
+    reserve_already_allocated: Optional[Decimal] = None,
+    as_of: Optional[datetime] = None,
+    source_transaction_id: Optional[str] = None,
+) -> WaterfallResult:
+    """Run recovery rent through the 5-step waterfall and persist the plan.
+
+    The paused `pending_overflow` (if any) is intentionally NOT auto-applied
+    — it awaits the operator's A/B/C decision via `resolve_overflow_decision`.
+
+    Virtual Tax / General Reserve ledger rows are minted for the allocated
+    amounts so the audit log and remaining-need tracker stay consistent.
+    These rows do NOT re-apply bucket effects (the balances are mutated
+    directly below) — they are bookkeeping markers only.
+    """
+    prop = _get_property(db, property_id)
+    when = as_of or datetime.now(timezone.utc)
+
+    if tax_already_allocated is None:
+        tax_already_allocated = window_bucket_allocated(db, property_id, "Tax", as_of=when)
+    if reserve_already_allocated is None:
+        reserve_already_allocated = window_bucket_allocated(
+            db, property_id, "General Reserve", as_of=when
         )
+
+    inp = waterfall_input(
+        prop,
+        rent_received,
+        checking_balance=checking_balance,
+        pi_amount=pi_amount,
+        uncollected_reserve_targets=uncollected_reserve_targets,
+        tax_already_allocated=tax_already_allocated,
+        reserve_already_allocated=reserve_already_allocated,
+    )
+    result = allocation_engine.run_waterfall(inp)
+
+    apply_waterfall_result(prop, result)
+    db.commit()
+    db.refresh(prop)
+
+    for marker in waterfall_markers(prop.property_id, result, when, source_transaction_id):
+        transaction_repository.create(db, marker)
     return result
 
 
@@ -8,18 +8,27 @@ module so the ledger and each property's virtual bucket state can never
 drift apart.
 """
 
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
-from typing import Optional
+from typing import Optional, Sequence
 
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from treasury.models.property_status import PropertyStatus
 from treasury.models.transaction_ledger import TransactionLedger
 from treasury.repositories import property_repository, transaction_repository
 from treasury.schemas.transaction_schemas import (
     TransactionLedgerCreate,
     TransactionLedgerUpdate,
 )
+from treasury.services import allocation_engine, ledger_aggregate_service
 from treasury.services.exceptions import NotFoundError, ValidationError
+from treasury.services.recent_id_cache import RecentIdCache
+from treasury.services.rent_milestone_service import _window_start
 
 # Maps a sub-bucket assignment to the (balance, settlement-queue) columns
 # it mutates on `PropertyStatus`. Anything not in this map (i.e. `None`,
@@ -30,6 +39,11 @@ _BUCKET_FIELDS = {
     "General Reserve": ("reserve_bucket_balance", "reserve_to_settle"),
 }
 
+# external_id -> transaction_id for recently ingested bank lines, so webhook
+# retries short-circuit without an index probe. Advisory only; the unique
+# index on `external_id` decides.
+_recent_ids = RecentIdCache()
+
 
 def _is_waterfall_marker(txn: TransactionLedger) -> bool:
     """Waterfall bookkeeping rows — balances already mutated by the engine."""
@@ -125,18 +139,58 @@ def _run_rent_waterfall(db: Session, created: TransactionLedger):
     )
 
 
+def _find_ingested(db: Session, external_id: str) -> Optional[TransactionLedger]:
+    """The ledger row already holding `external_id`, if any."""
+    transaction_id = _recent_ids.get(external_id)
+    if transaction_id is not None:
+        txn = transaction_repository.get_by_id(db, transaction_id)
+        if txn is not None and txn.external_id == external_id:
+            return txn
+        _recent_ids.discard(external_id)
+    txn = transaction_repository.get_by_external_id(db, external_id)
+    if txn is not None:
+        _recent_ids.put(external_id, txn.transaction_id)
+    return txn
+
+
 def _ingest(
     db: Session,
     payload: TransactionLedgerCreate,
-) -> tuple[TransactionLedger, Optional[object]]:
+) -> tuple[TransactionLedger, Optional[object], bool]:
+    """Insert + apply one payload; returns `(row, waterfall, duplicate)`.
+
+    A payload whose `external_id` is already in the ledger is a replay
+    (bank retry, nightly sync overlapping the live webhook): the existing
+    row comes back with `duplicate=True` and nothing is re-applied.
+    """
+    if payload.external_id is not None:
+        existing = _find_ingested(db, payload.external_id)
+        if existing is not None:
+            return existing, None, True
+
     if payload.property_id is not None and property_repository.get_by_id(db, payload.property_id) is None:
         raise ValidationError(f"Property '{payload.property_id}' not found.")
 
     txn = TransactionLedger(**payload.model_dump())
-    created = transaction_repository.create(db, txn)
+    try:
+        created = transaction_repository.create(db, txn)
+    except IntegrityError:
+        # Lost a race with a concurrent delivery of the same bank line.
+        db.rollback()
+        existing = (
+            transaction_repository.get_by_external_id(db, payload.external_id)
+            if payload.external_id is not None
+            else None
+        )
+        if existing is None:
+            raise
+        _recent_ids.put(existing.external_id, existing.transaction_id)
+        return existing, None, True
+    if created.external_id is not None:
+        _recent_ids.put(created.external_id, created.transaction_id)
     _apply_effect(db, created)
     waterfall = _run_rent_waterfall(db, created)
-    return created, waterfall
+    return created, waterfall, False
 
 
 def create_transaction_with_effects(
@@ -147,7 +201,7 @@ def create_transaction_with_effects(
 
     Same real-time bucket-mutation + rent-waterfall pipeline as a webhook.
     """
-    created, _waterfall = _ingest(db, payload)
+    created, _waterfall, _duplicate = _ingest(db, payload)
     return created
 
 
@@ -158,16 +212,202 @@ def ingest_webhook_transaction(
     """Webhook / nightly-sync entry point.
 
     Returns the primary ledger row plus the waterfall result (when the
-    payload was a real-bank Rent payment that ran Steps 0–4).
+    payload was a real-bank Rent payment that ran Steps 0–4). Replays of
+    an already-ingested `external_id` return the original row with
+    `duplicate=True`.
     """
-    created, waterfall = _ingest(db, payload)
+    created, waterfall, duplicate = _ingest(db, payload)
     return {
         "transaction": created,
         "overflow_transaction": None,  # legacy field kept for API compat
         "waterfall": waterfall.as_dict() if waterfall is not None else None,
+        "duplicate": duplicate,
     }
 
 
+# Columns a waterfall marker carries into the bulk INSERT (ids and audit
+# timestamps are minted by `add_row`).
+_MARKER_COLUMNS = [
+    c for c in TransactionLedger.__table__.columns
+    if c.key not in ("transaction_id", "created_at", "updated_at")
+]
+
+
+def _utc(ts: datetime) -> datetime:
+    """Naive-UTC comparison key (SQLite hands timestamps back naive)."""
+    return ts.astimezone(timezone.utc).replace(tzinfo=None) if ts.tzinfo else ts
+
+
+def _load_window_allocations(
+    db: Session,
+    rent: Sequence[TransactionLedgerCreate],
+) -> dict[tuple[str, str], list[tuple[datetime, Decimal]]]:
+    """Existing virtual Tax / General Reserve rows that any rent payment in
+    the batch could count toward its month's already-allocated amount, as
+    `(property_id, bucket) -> [(utc timestamp, amount)]`.
+    """
+    allocations: dict[tuple[str, str], list[tuple[datetime, Decimal]]] = defaultdict(list)
+    if not rent:
+        return allocations
+    # A day of slack each side; the exact window is applied in memory.
+    lo = min(_utc(_window_start(p.timestamp)) for p in rent) - timedelta(days=1)
+    hi = max(_utc(p.timestamp) for p in rent) + timedelta(days=1)
+    rows = db.query(
+        TransactionLedger.property_id,
+        TransactionLedger.sub_bucket_assignment,
+        TransactionLedger.timestamp,
+        TransactionLedger.amount,
+    ).filter(
+        TransactionLedger.property_id.in_({p.property_id for p in rent}),
+        TransactionLedger.sub_bucket_assignment.in_(_BUCKET_FIELDS),
+        TransactionLedger.is_real_bank_tx.is_(False),
+        TransactionLedger.timestamp >= lo,
+        TransactionLedger.timestamp <= hi,
+    )
+    for property_id, bucket, timestamp, amount in rows:
+        allocations[(property_id, bucket)].append((_utc(timestamp), Decimal(amount)))
+    return allocations
+
+
+def ingest_webhook_batch(
+    db: Session,
+    payloads: Sequence[TransactionLedgerCreate],
+) -> list[dict]:
+    try:
+        return _ingest_batch(db, payloads)
+    except IntegrityError:
+        # A concurrent delivery inserted one of our external ids after we
+        # looked; nothing was written, so re-plan with it counted as ingested.
+        return _ingest_batch(db, payloads)
+
+
+def _ingest_batch(
+    db: Session,
+    payloads: Sequence[TransactionLedgerCreate],
+) -> list[dict]:
+    """Nightly-sync bulk path: same end state as calling
+    `ingest_webhook_transaction` for each payload in order, in ONE commit.
+
+    Every referenced property is loaded once and mutated in memory; bucket
+    effects and rent waterfalls run against that state, with each month's
+    already-allocated tax / reserve tracked from the ledger rows loaded up
+    front plus the rows this batch adds. Ledger rows (payloads and waterfall
+    markers) go in as one bulk INSERT and each touched `PropertyStatus` gets
+    a single UPDATE at flush. A missing property rejects the whole batch
+    before anything is written; any database error rolls it all back.
+
+    External ids already in the ledger (one indexed IN lookup), or repeated
+    earlier in the batch, come back as `duplicate` results without being
+    applied, so a batch can be re-run safely.
+
+    Properties never interact here (bucket effects and allocation windows
+    are per property), so per-property state is all the ordering that
+    matters.
+    """
+    # Local import avoids a circular dependency at module load time.
+    from treasury.services import settlement_service
+
+    ingested = transaction_repository.get_by_external_ids(
+        db, (p.external_id for p in payloads if p.external_id is not None)
+    )
+    fresh = []
+    for payload in payloads:
+        if payload.external_id is None or payload.external_id not in ingested:
+            fresh.append(payload)
+            if payload.external_id is not None:
+                ingested[payload.external_id] = None  # claimed by this batch
+
+    property_ids = {p.property_id for p in fresh if p.property_id is not None}
+    props = {
+        prop.property_id: prop
+        for prop in db.query(PropertyStatus).filter(PropertyStatus.property_id.in_(property_ids))
+    } if property_ids else {}
+    for payload in fresh:
+        if payload.property_id is not None and payload.property_id not in props:
+            raise ValidationError(f"Property '{payload.property_id}' not found.")
+
+    def runs_waterfall(p: TransactionLedgerCreate) -> bool:
+        return p.transaction_type == "Rent" and p.is_real_bank_tx and p.property_id is not None
+
+    allocations = _load_window_allocations(db, [p for p in fresh if runs_waterfall(p)])
+    now = datetime.now(timezone.utc)
+    rows: list[dict] = []
+    results = []
+
+    def add_row(**values) -> TransactionLedger:
+        values["amount"] = Decimal(values["amount"]).quantize(Decimal("0.01"))
+        values["transaction_id"] = values.get("transaction_id") or uuid.uuid4().hex
+        values.update(created_at=now, updated_at=now)
+        rows.append(values)
+        bucket = values["sub_bucket_assignment"]
+        if values["property_id"] is not None and bucket in _BUCKET_FIELDS and not values["is_real_bank_tx"]:
+            allocations[(values["property_id"], bucket)].append((_utc(values["timestamp"]), values["amount"]))
+        # Detached copy for the response; the session never tracks it.
+        return TransactionLedger(**values)
+
+    def allocated(property_id: str, bucket: str, start: datetime, end: datetime) -> Decimal:
+        return sum(
+            (amount for ts, amount in allocations[(property_id, bucket)] if start <= ts <= end),
+            Decimal("0"),
+        )
+
+    fresh_ids = {id(p) for p in fresh}
+    for payload in payloads:
+        if id(payload) not in fresh_ids:
+            results.append({
+                "transaction": ingested[payload.external_id],
+                "overflow_transaction": None,
+                "waterfall": None,
+                "duplicate": True,
+            })
+            continue
+        created = add_row(**payload.model_dump())
+        if created.external_id is not None:
+            ingested[created.external_id] = created
+        prop = props.get(created.property_id)
+        if prop is not None and created.sub_bucket_assignment in _BUCKET_FIELDS and not _is_waterfall_marker(created):
+            balance_field, settle_field = _BUCKET_FIELDS[created.sub_bucket_assignment]
+            setattr(prop, balance_field, Decimal(getattr(prop, balance_field)) + created.amount)
+            setattr(prop, settle_field, Decimal(getattr(prop, settle_field)) + created.amount)
+
+        waterfall = None
+        if runs_waterfall(payload):
+            start, end = _utc(_window_start(created.timestamp)), _utc(created.timestamp)
+            waterfall = allocation_engine.run_waterfall(settlement_service.waterfall_input(
+                prop,
+                created.amount,
+                checking_balance=Decimal("0"),
+                pi_amount=Decimal("0"),
+                uncollected_reserve_targets=Decimal("0"),
+                tax_already_allocated=allocated(prop.property_id, "Tax", start, end),
+                reserve_already_allocated=allocated(prop.property_id, "General Reserve", start, end),
+            ))
+            settlement_service.apply_waterfall_result(prop, waterfall)
+            for marker in settlement_service.waterfall_markers(
+                prop.property_id, waterfall, created.timestamp, created.transaction_id
+            ):
+                add_row(**{c.key: getattr(marker, c.key) for c in _MARKER_COLUMNS})
+        results.append({
+            "transaction": created,
+            "overflow_transaction": None,
+            "waterfall": waterfall.as_dict() if waterfall is not None else None,
+            "duplicate": False,
+        })
+
+    try:
+        if rows:
+            db.execute(insert(TransactionLedger), rows)
+            ledger_aggregate_service.record(db, added=rows)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    for row in rows:
+        if row.get("external_id") is not None:
+            _recent_ids.put(row["external_id"], row["transaction_id"])
+    return results
+
+
 def apply_manual_override(
     db: Session,
     transaction_id: str,
@@ -213,4 +453,5 @@ def delete_transaction_with_effects(db: Session, transaction_id: str) -> None:
     if txn is None:
         raise NotFoundError(f"Transaction '{transaction_id}' not found.")
     _reverse_effect(db, txn)
+    _recent_ids.discard(txn.external_id)
     transaction_repository.delete(db, txn)
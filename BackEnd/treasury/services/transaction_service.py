@@ -4,18 +4,82 @@ All bucket-mutation-aware domain logic (real-time balance/settlement
 mutation, rent-milestone overflow, multi-LLC veil protection) lives in
 `transaction_routing_service` — this module exists so the controller's
 import surface stays stable while that logic evolves underneath it.
+
+The audit-log listing is paged with a keyset cursor over
+`(timestamp, transaction_id)`, newest first, so every page is an indexed
+range read however deep the client scrolls.
 """
 
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+
 from sqlalchemy.orm import Session
 
-from treasury.models.transaction_ledger import TransactionLedger
+from treasury.models.transaction_ledger import (
+    VALID_SUB_BUCKETS,
+    VALID_TRANSACTION_TYPES,
+    TransactionLedger,
+)
 from treasury.repositories import transaction_repository
+from treasury.repositories.transaction_repository import LedgerFilters
 from treasury.schemas.transaction_schemas import (
     TransactionLedgerCreate,
+    TransactionLedgerSummary,
     TransactionLedgerUpdate,
 )
 from treasury.services import transaction_routing_service
-from treasury.services.exceptions import NotFoundError
+from treasury.services.exceptions import NotFoundError, ValidationError
+
+MAX_PAGE_SIZE = 500
+
+_CENTS = Decimal("0.01")
+
+
+@dataclass
+class TransactionPage:
+    transactions: list[TransactionLedger]
+    next_cursor: Optional[str]
+
+
+def encode_cursor(txn: TransactionLedger) -> str:
+    raw = json.dumps([txn.timestamp.isoformat(), txn.transaction_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """Inverse of `encode_cursor`; raises `ValidationError` for anything malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, transaction_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(transaction_id, str):
+            raise ValueError(transaction_id)
+        return datetime.fromisoformat(timestamp), transaction_id
+    except (TypeError, ValueError, json.JSONDecodeError) as exc:
+        raise ValidationError("Invalid cursor.") from exc
+
+
+def _validate_filters(filters: LedgerFilters) -> None:
+    if filters.transaction_type is not None and filters.transaction_type not in VALID_TRANSACTION_TYPES:
+        raise ValidationError(
+            f"transaction_type must be one of {sorted(VALID_TRANSACTION_TYPES)}, got '{filters.transaction_type}'"
+        )
+    if filters.sub_bucket_assignment is not None and filters.sub_bucket_assignment not in VALID_SUB_BUCKETS:
+        raise ValidationError(
+            f"sub_bucket_assignment must be one of {sorted(VALID_SUB_BUCKETS)}, "
+            f"got '{filters.sub_bucket_assignment}'"
+        )
+    if filters.start is not None and filters.end is not None and filters.start > filters.end:
+        raise ValidationError("start must not be after end.")
+    if (
+        filters.min_amount is not None
+        and filters.max_amount is not None
+        and filters.min_amount > filters.max_amount
+    ):
+        raise ValidationError("min_amount must not exceed max_amount.")
 
 
 def create_transaction(
@@ -34,9 +98,37 @@ def get_transaction(db: Session, transaction_id: str) -> TransactionLedger:
 
 def list_transactions(
     db: Session,
-    property_id: str | None = None,
-) -> list[TransactionLedger]:
-    return transaction_repository.list_all(db, property_id=property_id)
+    filters: LedgerFilters | None = None,
+    limit: int | None = None,
+    cursor: str | None = None,
+) -> TransactionPage:
+    """One page of the audit log (every matching row when `limit` is None)."""
+    filters = filters or LedgerFilters()
+    _validate_filters(filters)
+    after = decode_cursor(cursor) if cursor else None
+    rows = transaction_repository.list_page(
+        db, filters, limit=None if limit is None else limit + 1, after=after
+    )
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1])
+    return TransactionPage(transactions=rows, next_cursor=next_cursor)
+
+
+def summarize_transactions(
+    db: Session,
+    filters: LedgerFilters | None = None,
+) -> TransactionLedgerSummary:
+    filters = filters or LedgerFilters()
+    _validate_filters(filters)
+    count, total, inflow, outflow = transaction_repository.summarize(db, filters)
+    return TransactionLedgerSummary(
+        count=count,
+        total_amount=total.quantize(_CENTS),
+        inflow=inflow.quantize(_CENTS),
+        outflow=outflow.quantize(_CENTS),
+    )
 
 
 def update_transaction(
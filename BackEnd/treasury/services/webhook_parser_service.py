@@ -112,4 +112,5 @@ def parse_bank_webhook(payload: BankWebhookPayload) -> TransactionLedgerCreate:
         sub_bucket_assignment=sub_bucket_assignment,
         transaction_type=transaction_type,
         settlement_batch_id=payload.settlement_batch_id,
+        external_id=payload.external_id,
     )
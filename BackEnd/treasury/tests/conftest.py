@@ -16,12 +16,14 @@ from treasury.models.llc_configuration import LLCConfiguration
 from treasury.models.property_status import PropertyStatus
 from treasury.models.property_cash_flow_history import PropertyCashFlowHistory
 from treasury.models.transaction_ledger import TransactionLedger
+from treasury.models.ledger_monthly_aggregate import LedgerMonthlyAggregate
 
 _TREASURY_TABLES = [
     LLCConfiguration.__table__,
     PropertyStatus.__table__,
     PropertyCashFlowHistory.__table__,
     TransactionLedger.__table__,
+    LedgerMonthlyAggregate.__table__,
 ]
 
 
@@ -0,0 +1,125 @@
+"""Audit-log listing: keyset pages walk every matching row exactly once,
+filters run in SQL, and the summary totals the whole filtered set.
+"""
+
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from treasury.models.llc_configuration import LLCConfiguration
+from treasury.models.property_status import PropertyStatus
+from treasury.models.transaction_ledger import TransactionLedger
+from treasury.repositories import transaction_repository
+from treasury.services import transaction_routing_service
+from treasury.tests.test_nightly_sync_bulk import _random_batch, _seed
+
+_TIE = datetime(2026, 7, 20, 12, tzinfo=timezone.utc)
+
+
+@pytest.fixture()
+def ledger(db_session):
+    _seed(db_session)
+    db_session.add(LLCConfiguration(llc_id="llc-2", llc_name="Other LLC"))
+    db_session.get(PropertyStatus, "prop-3").llc_id = "llc-2"
+    db_session.commit()
+    transaction_routing_service.ingest_webhook_batch(db_session, _random_batch(7, n=80))
+    # Same timestamp, so only transaction_id orders them.
+    for i in range(7):
+        transaction_repository.create(db_session, TransactionLedger(
+            property_id=f"prop-{i % 4}", amount=Decimal(i * 10 - 30), description=f"tie {i}",
+            timestamp=_TIE, is_real_bank_tx=True, transaction_type="Repair",
+        ))
+    llc_of = {p.property_id: p.llc_id for p in db_session.query(PropertyStatus)}
+    rows = sorted(db_session.query(TransactionLedger), key=lambda t: (t.timestamp, t.transaction_id), reverse=True)
+    return rows, llc_of
+
+
+def _walk(client, params, limit):
+    ids, cursor, pages = [], None, 0
+    while True:
+        res = client.get("/treasury/transactions", params={**params, "limit": limit, **({"cursor": cursor} if cursor else {})})
+        assert res.status_code == 200, res.text
+        assert len(res.json()) <= limit
+        ids += [t["transaction_id"] for t in res.json()]
+        pages += 1
+        cursor = res.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return ids, pages
+
+
+def _naive(value):
+    return datetime.fromisoformat(value).astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _matches(txn, llc_of, params):
+    checks = {
+        "llc_id": lambda v: llc_of.get(txn.property_id) == v,
+        "property_id": lambda v: txn.property_id == v,
+        "transaction_type": lambda v: txn.transaction_type == v,
+        "is_real_bank_tx": lambda v: txn.is_real_bank_tx == (v == "true"),
+        "sub_bucket_assignment": lambda v: txn.sub_bucket_assignment == v,
+        "start": lambda v: txn.timestamp >= _naive(v),
+        "end": lambda v: txn.timestamp <= _naive(v),
+        "min_amount": lambda v: txn.amount >= Decimal(v),
+        "max_amount": lambda v: txn.amount <= Decimal(v),
+    }
+    return all(checks[k](v) for k, v in params.items())
+
+
+@pytest.mark.parametrize("params", [
+    {},
+    {"llc_id": "llc-2"},
+    {"property_id": "prop-0"},
+    {"transaction_type": "Rent", "is_real_bank_tx": "true"},
+    {"is_real_bank_tx": "false", "sub_bucket_assignment": "Tax"},
+    {"start": "2026-07-20T12:00:00+00:00", "end": "2026-08-10T00:00:00+00:00"},
+    {"min_amount": "-100", "max_amount": "400.50"},
+    {"llc_id": "llc-1", "transaction_type": "Repair", "end": _TIE.isoformat()},
+])
+def test_pages_and_summary_match_the_filtered_ledger(client, ledger, params):
+    rows, llc_of = ledger
+    expected = [t for t in rows if _matches(t, llc_of, params)]
+    assert expected or params.get("llc_id") == "llc-2"
+
+    full = client.get("/treasury/transactions", params=params)
+    assert "X-Next-Cursor" not in full.headers
+    assert [t["transaction_id"] for t in full.json()] == [t.transaction_id for t in expected]
+
+    ids, pages = _walk(client, params, limit=6)
+    assert ids == [t.transaction_id for t in expected]
+    assert pages == max(1, -(-len(expected) // 6))
+
+    summary = client.get("/treasury/transactions/summary", params=params).json()
+    amounts = [Decimal(t.amount) for t in expected]
+    assert summary == {
+        "count": len(expected),
+        "total_amount": str(sum(amounts, Decimal("0.00"))),
+        "inflow": str(sum((a for a in amounts if a > 0), Decimal("0.00"))),
+        "outflow": str(sum((a for a in amounts if a < 0), Decimal("0.00"))),
+    }
+
+
+def test_page_boundary_inside_a_timestamp_tie(client, ledger):
+    rows, _ = ledger
+    tied = [t.transaction_id for t in rows if t.description.startswith("tie ")]
+    ids, _ = _walk(client, {"transaction_type": "Repair", "start": _TIE.isoformat(), "end": _TIE.isoformat()}, limit=3)
+    assert ids == tied and len(set(ids)) == 7
+
+
+@pytest.mark.parametrize("params", [
+    {"cursor": "not-a-cursor"},
+    {"transaction_type": "Rent-ish"},
+    {"sub_bucket_assignment": "Insurance"},
+    {"start": "2026-08-01T00:00:00Z", "end": "2026-07-01T00:00:00Z"},
+    {"min_amount": "10", "max_amount": "5"},
+])
+def test_bad_audit_log_queries_are_rejected(client, params):
+    assert client.get("/treasury/transactions", params=params).status_code == 400
+    if "cursor" not in params:
+        assert client.get("/treasury/transactions/summary", params=params).status_code == 400
+
+
+def test_limit_is_bounded(client):
+    assert client.get("/treasury/transactions", params={"limit": 0}).status_code == 422
+    assert client.get("/treasury/transactions", params={"limit": 501}).status_code == 422
@@ -0,0 +1,159 @@
+"""Monthly ledger aggregates: kept exact through every ledger write path,
+used for month-to-date lookups, and reconcilable against the ledger.
+"""
+
+import random
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event, text
+
+from treasury.models.ledger_monthly_aggregate import LedgerMonthlyAggregate
+from treasury.models.transaction_ledger import TransactionLedger
+from treasury.schemas.transaction_schemas import TransactionLedgerUpdate
+from treasury.services import (
+    ledger_aggregate_service,
+    missed_rent_service,
+    rent_milestone_service,
+    settlement_service,
+    transaction_routing_service,
+)
+from treasury.tests.test_nightly_sync_bulk import _random_batch, _seed
+
+
+def _in_sync(db):
+    report = ledger_aggregate_service.reconcile(db)
+    assert report["mismatch_count"] == 0, report
+
+
+def test_every_write_path_keeps_aggregates_exact(db_session):
+    _seed(db_session)
+    rng = random.Random(5)
+    batches = iter(_random_batch(seed, n=15) for seed in range(100, 200))
+    ids = []
+    for step in range(40):
+        op = rng.choice(["webhook", "webhook", "bulk", "edit", "delete", "missed_rent"])
+        if op == "webhook" or (op in ("edit", "delete") and not ids):
+            for payload in next(batches)[:3]:
+                ids.append(transaction_routing_service.ingest_webhook_transaction(db_session, payload)["transaction"].transaction_id)
+        elif op == "bulk":
+            ids += [r["transaction"].transaction_id for r in transaction_routing_service.ingest_webhook_batch(db_session, next(batches))]
+        elif op == "edit":
+            txn_id = ids[rng.randrange(len(ids))]
+            transaction_routing_service.apply_manual_override(db_session, txn_id, TransactionLedgerUpdate(**rng.choice([
+                {"amount": Decimal(rng.randrange(100, 90_000)) / 100},
+                {"property_id": f"prop-{rng.randrange(4)}"},
+                {"sub_bucket_assignment": rng.choice(["Tax", "General Reserve"]), "is_real_bank_tx": False},
+                {"timestamp": datetime(2026, rng.choice([6, 7, 8]), rng.randrange(1, 28), tzinfo=timezone.utc)},
+                {"clear_property": True},
+            ])))
+        elif op == "delete":
+            transaction_routing_service.delete_transaction_with_effects(db_session, ids.pop(rng.randrange(len(ids))))
+        else:
+            missed_rent_service.run_missed_rent_check(
+                db_session, f"prop-{rng.randrange(4)}", Decimal("800"),
+                as_of=datetime(2026, 8, 8, 23, 59, tzinfo=timezone.utc), send=False,
+            )
+        _in_sync(db_session)
+
+
+def _statements_during(db, fn):
+    statements = []
+    listener = lambda conn, cursor, sql, *rest: statements.append(sql.lower())  # noqa: E731
+    event.listen(db.get_bind(), "before_cursor_execute", listener)
+    try:
+        fn()
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", listener)
+    return statements
+
+
+def test_in_order_rent_ingestion_never_sums_the_ledger(db_session):
+    _seed(db_session)
+    batch = sorted(_random_batch(3, n=40), key=lambda p: p.timestamp)
+    statements = _statements_during(db_session, lambda: [
+        transaction_routing_service.ingest_webhook_transaction(db_session, p) for p in batch
+    ])
+    assert sum("ledger_monthly_aggregates" in s and s.startswith("select") for s in statements) >= 2 * sum(
+        p.transaction_type == "Rent" and p.is_real_bank_tx and p.property_id is not None for p in batch
+    )
+    assert not [s for s in statements if "sum(transaction_ledger.amount)" in s]
+
+
+def _ledger_sum(db, property_id, when, **filters):
+    start = rent_milestone_service._window_start(when)
+    return sum(
+        (Decimal(t.amount) for t in db.query(TransactionLedger).filter_by(property_id=property_id, **filters)
+         if start.replace(tzinfo=None) <= t.timestamp <= when.replace(tzinfo=None)),
+        Decimal("0"),
+    )
+
+
+@pytest.mark.parametrize("day", [1, 9, 15, 31])
+def test_lookups_match_the_ledger_for_any_moment(db_session, day):
+    _seed(db_session)
+    transaction_routing_service.ingest_webhook_batch(db_session, _random_batch(11, n=120))
+    when = datetime(2026, 7, day, 12, tzinfo=timezone.utc)
+    for i in range(4):
+        pid = f"prop-{i}"
+        assert rent_milestone_service.cumulative_rent_received(
+            db_session, pid, rent_milestone_service._window_start(when), when
+        ) == _ledger_sum(db_session, pid, when, transaction_type="Rent", is_real_bank_tx=True)
+        for bucket in ("Tax", "General Reserve"):
+            assert settlement_service.window_bucket_allocated(db_session, pid, bucket, as_of=when) == _ledger_sum(
+                db_session, pid, when, sub_bucket_assignment=bucket, is_real_bank_tx=False
+            )
+
+    # Month-to-date after the last row of the month comes from the aggregate.
+    end = datetime(2026, 7, 31, 23, 59, tzinfo=timezone.utc)
+    assert ledger_aggregate_service.month_to_date(
+        db_session, "prop-0", "rent", rent_milestone_service._window_start(end), end
+    ) == _ledger_sum(db_session, "prop-0", end, transaction_type="Rent", is_real_bank_tx=True)
+
+
+def test_reconcile_reports_and_rebuild_repairs_drift(db_session):
+    _seed(db_session)
+    transaction_routing_service.ingest_webhook_batch(db_session, _random_batch(2, n=60))
+    _in_sync(db_session)
+
+    db_session.execute(text("UPDATE ledger_monthly_aggregates SET total = total + 5 WHERE kind = 'rent'"))
+    db_session.execute(text("DELETE FROM ledger_monthly_aggregates WHERE kind = 'Tax' AND property_id = 'prop-0'"))
+    db_session.commit()
+    report = ledger_aggregate_service.reconcile(db_session, limit=3)
+    assert report["mismatch_count"] > 3 and len(report["mismatches"]) == 3
+    assert {m["kind"] for m in report["mismatches"]} <= {"rent", "Tax"}
+
+    ledger_aggregate_service.rebuild(db_session)
+    _in_sync(db_session)
+
+
+def test_startup_backfill_only_when_empty(db_session):
+    _seed(db_session)
+    transaction_routing_service.ingest_webhook_batch(db_session, _random_batch(4, n=30))
+    assert ledger_aggregate_service.ensure_backfilled(db_session) == 0
+
+    db_session.query(LedgerMonthlyAggregate).delete()
+    db_session.commit()
+    assert ledger_aggregate_service.ensure_backfilled(db_session) > 0
+    _in_sync(db_session)
+
+
+def test_concurrent_startup_backfill_keeps_the_winners_rows(db_session, monkeypatch):
+    _seed(db_session)
+    transaction_routing_service.ingest_webhook_batch(db_session, _random_batch(4, n=30))
+    db_session.query(LedgerMonthlyAggregate).delete()
+    db_session.commit()
+
+    # Another worker commits its backfill after our emptiness check, so our
+    # own insert collides with its rows.
+    real_rebuild = ledger_aggregate_service.rebuild
+
+    def lose_the_race(db, commit=True):
+        real_rebuild(db)
+        winners = [dict(r._mapping) for r in db.execute(LedgerMonthlyAggregate.__table__.select())]
+        db.execute(LedgerMonthlyAggregate.__table__.insert(), winners)
+
+    monkeypatch.setattr(ledger_aggregate_service, "rebuild", lose_the_race)
+    assert ledger_aggregate_service.ensure_backfilled(db_session) == 0
+    _in_sync(db_session)
@@ -0,0 +1,73 @@
+"""The ledger's hot queries are served by the composite indexes, not a
+table scan (checked against SQLite's query planner).
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import event
+
+from treasury.repositories import transaction_repository
+from treasury.repositories.transaction_repository import LedgerFilters
+from treasury.services import rent_milestone_service, settlement_service
+
+_WHEN = datetime(2026, 7, 15, tzinfo=timezone.utc)
+
+
+def _plan_of_ledger_query(db, fn):
+    captured = []
+
+    def listener(conn, cursor, sql, params, *rest):
+        if "from transaction_ledger" in sql.lower():
+            captured.append((sql, params))
+
+    event.listen(db.get_bind(), "before_cursor_execute", listener)
+    try:
+        fn()
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", listener)
+    assert len(captured) == 1, captured
+    sql, params = captured[0]
+    rows = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", params).all()
+    return " | ".join(row[-1] for row in rows)
+
+
+@pytest.mark.parametrize(
+    "query, index",
+    [
+        (
+            lambda db: rent_milestone_service.cumulative_rent_received(
+                db, "prop-0", rent_milestone_service._window_start(_WHEN), _WHEN
+            ),
+            "USING COVERING INDEX ix_transaction_ledger_rent_window",
+        ),
+        (
+            lambda db: settlement_service.window_bucket_allocated(db, "prop-0", "Tax", as_of=_WHEN),
+            "USING COVERING INDEX ix_transaction_ledger_bucket_window",
+        ),
+        (
+            lambda db: transaction_repository.list_page(db, LedgerFilters(), limit=51),
+            "USING INDEX ix_transaction_ledger_timestamp_id",
+        ),
+        (
+            lambda db: transaction_repository.list_page(db, LedgerFilters(property_id="prop-0"), limit=51),
+            "USING INDEX ix_transaction_ledger_property_timestamp_id (property_id=?)",
+        ),
+        # A deep keyset page seeks straight to the cursor.
+        (
+            lambda db: transaction_repository.list_page(db, LedgerFilters(), limit=51, after=(_WHEN, "f" * 32)),
+            "SEARCH transaction_ledger USING INDEX ix_transaction_ledger_timestamp_id (timestamp<?)",
+        ),
+        (
+            lambda db: transaction_repository.list_page(
+                db, LedgerFilters(property_id="prop-0"), limit=51, after=(_WHEN, "f" * 32)
+            ),
+            "USING INDEX ix_transaction_ledger_property_timestamp_id (property_id=? AND timestamp<?)",
+        ),
+    ],
+)
+def test_hot_queries_use_composite_indexes(db_session, query, index):
+    # No aggregate rows yet, so the window lookups run their ledger SUM.
+    plan = _plan_of_ledger_query(db_session, lambda: query(db_session))
+    assert index in plan
+    assert "USE TEMP B-TREE FOR ORDER BY" not in plan
@@ -0,0 +1,156 @@
+"""Bulk nightly-sync ingestion: identical end state to the per-row webhook
+path, one commit per batch, and all-or-nothing on bad input.
+"""
+
+import random
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from db import Base
+from treasury.models.llc_configuration import LLCConfiguration
+from treasury.models.property_status import PropertyStatus
+from treasury.models.transaction_ledger import TransactionLedger
+from treasury.repositories import transaction_repository
+from treasury.schemas.webhook_schemas import BankWebhookPayload
+from treasury.services import transaction_routing_service, webhook_parser_service
+from treasury.services.exceptions import ValidationError
+from treasury.tests.conftest import _TREASURY_TABLES
+
+_BALANCES = (
+    "tax_bucket_balance", "tax_to_settle", "reserve_bucket_balance",
+    "reserve_to_settle", "reserve_debt",
+)
+
+
+@pytest.fixture()
+def other_session():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine, tables=_TREASURY_TABLES)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def _seed(db, n_properties=4):
+    """Same LLC + properties (fixed ids) in any database."""
+    db.add(LLCConfiguration(llc_id="llc-1", llc_name="Bulk LLC"))
+    for i in range(n_properties):
+        db.add(PropertyStatus(
+            property_id=f"prop-{i}",
+            llc_id="llc-1",
+            property_name=f"bulk-{i}",
+            base_rent_target=Decimal("1500.00"),
+            precentage_of_rent_to_reserve=Decimal("10.00"),
+            target_tax_allocation=Decimal("180.00"),
+            reserve_debt=Decimal("250.00") if i % 2 else Decimal("0"),
+            reserve_bucket_cap=Decimal("400.00") if i == 2 else Decimal("0"),
+            reserve_bucket_balance=Decimal("320.00") if i == 2 else Decimal("0"),
+            chase_reserves=i == 3,
+        ))
+    db.commit()
+    # A prior allocation this month that partial rent must not re-allocate.
+    transaction_repository.create(db, TransactionLedger(
+        property_id="prop-0", amount=Decimal("60.00"), description="earlier tax",
+        timestamp=datetime(2026, 7, 1, tzinfo=timezone.utc), is_real_bank_tx=False,
+        sub_bucket_assignment="Tax", transaction_type="Rent",
+    ))
+
+
+def _random_batch(seed, n=200, n_properties=4):
+    rng = random.Random(seed)
+    categories = ["rent", "rent", "rent", "tax_allocation", "reserve_allocation", "repair", "principal_interest"]
+    start = datetime(2026, 7, 1, tzinfo=timezone.utc)
+    batch = []
+    for i in range(n):
+        category = rng.choice(categories)
+        amount = Decimal(rng.randrange(5_000, 90_000)) / 100
+        batch.append(BankWebhookPayload(
+            property_id=None if rng.random() < 0.05 else f"prop-{rng.randrange(n_properties)}",
+            amount=-amount if category in ("repair", "principal_interest") else amount,
+            description=f"{category} #{i}",
+            timestamp=start + timedelta(days=rng.randrange(0, 75), hours=rng.randrange(24)),
+            category=category,
+        ))
+    return [webhook_parser_service.parse_bank_webhook(p) for p in batch]
+
+
+def _state(db):
+    db.expire_all()
+    props = {
+        p.property_id: tuple(Decimal(getattr(p, f)) for f in _BALANCES)
+        for p in db.query(PropertyStatus)
+    }
+    # Waterfall markers name their (randomly keyed) source row; compare
+    # them by step instead.
+    ledger = Counter(
+        (t.property_id, Decimal(t.amount), t.description.split(" (source")[0],
+         t.sub_bucket_assignment, t.is_real_bank_tx, t.timestamp)
+        for t in db.query(TransactionLedger)
+    )
+    return props, ledger
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_bulk_batch_matches_per_row_ingestion(db_session, other_session, seed):
+    _seed(db_session)
+    _seed(other_session)
+    batch = _random_batch(seed)
+
+    per_row = [transaction_routing_service.ingest_webhook_transaction(db_session, p) for p in batch]
+    bulk = transaction_routing_service.ingest_webhook_batch(other_session, batch)
+
+    assert _state(other_session) == _state(db_session)
+    assert [r["waterfall"] for r in bulk] == [r["waterfall"] for r in per_row]
+    assert sum(r["waterfall"] is not None for r in bulk) > 20
+
+
+def test_bulk_batch_commits_once(db_session):
+    _seed(db_session)
+    commits = []
+    event.listen(db_session, "after_commit", lambda _s: commits.append(1))
+    results = transaction_routing_service.ingest_webhook_batch(db_session, _random_batch(7, n=300))
+    assert len(results) == 300 and len(commits) == 1
+
+
+def test_bulk_batch_is_all_or_nothing(db_session):
+    _seed(db_session)
+    before = _state(db_session)
+    batch = _random_batch(1, n=50)
+    batch[30] = batch[30].model_copy(update={"property_id": "gone"})
+
+    with pytest.raises(ValidationError, match="gone"):
+        transaction_routing_service.ingest_webhook_batch(db_session, batch)
+    assert _state(db_session) == before
+
+
+def test_nightly_sync_route_rejects_whole_batch(client, db_session):
+    _seed(db_session)
+    rent = {
+        "property_id": "prop-0", "amount": "900.00", "description": "Rent",
+        "timestamp": datetime(2026, 7, 3, tzinfo=timezone.utc).isoformat(), "category": "rent",
+    }
+    res = client.post("/treasury/webhooks/nightly-sync", json=[rent, dict(rent, category="crypto_yield")])
+    assert res.status_code == 400
+    assert db_session.query(TransactionLedger).count() == 1  # just the seeded allocation
+
+    res = client.post("/treasury/webhooks/nightly-sync", json=[rent, rent])
+    assert res.status_code == 201, res.text
+    body = res.json()
+    assert len({r["transaction"]["transaction_id"] for r in body}) == 2
+    assert body[0]["transaction"]["created_at"] is not None
+    # $180 tax target less $60 already allocated this month.
+    assert body[0]["waterfall"]["tax_balance_delta"] == "120.00"
+    assert body[1]["waterfall"]["tax_balance_delta"] == "0.00"
@@ -0,0 +1,146 @@
+"""Idempotent ingestion: bank transaction ids are applied once no matter
+how often the webhook retries or the nightly sync re-sends them.
+"""
+
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from treasury.models.property_status import PropertyStatus
+from treasury.models.transaction_ledger import TransactionLedger
+from treasury.repositories import transaction_repository
+from treasury.schemas.webhook_schemas import BankWebhookPayload
+from treasury.services import transaction_routing_service, webhook_parser_service
+from treasury.services.recent_id_cache import RecentIdCache
+from treasury.tests.test_nightly_sync_bulk import _seed
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    cache = RecentIdCache()
+    monkeypatch.setattr(transaction_routing_service, "_recent_ids", cache)
+    return cache
+
+
+def _line(external_id, amount="900.00", category="rent", day=3, **extra):
+    return {
+        "property_id": "prop-0", "amount": amount, "description": f"{category} {external_id}",
+        "timestamp": datetime(2026, 7, day, tzinfo=timezone.utc).isoformat(),
+        "category": category, "external_id": external_id, **extra,
+    }
+
+
+def _balances(db):
+    db.expire_all()
+    prop = db.get(PropertyStatus, "prop-0")
+    return prop.tax_bucket_balance, prop.reserve_bucket_balance, prop.reserve_to_settle
+
+
+def test_webhook_retry_returns_original_row(client, db_session, monkeypatch):
+    _seed(db_session)
+    first = client.post("/treasury/webhooks/bank-transactions", json=_line("bank-1"))
+    assert first.status_code == 201 and first.json()["duplicate"] is False
+    assert first.json()["transaction"]["external_id"] == "bank-1"
+    after_first = _balances(db_session)
+    rows = db_session.query(TransactionLedger).count()
+
+    # Hot retry resolves through the recent-id cache, not the index.
+    monkeypatch.setattr(transaction_repository, "get_by_external_id", pytest.fail)
+    retry = client.post("/treasury/webhooks/bank-transactions", json=_line("bank-1"))
+    assert retry.status_code == 201
+    body = retry.json()
+    assert body["duplicate"] is True and body["waterfall"] is None
+    assert body["transaction"]["transaction_id"] == first.json()["transaction"]["transaction_id"]
+    assert _balances(db_session) == after_first
+    assert db_session.query(TransactionLedger).count() == rows
+
+
+def test_replay_after_restart_hits_the_index(client, db_session, fresh_cache):
+    _seed(db_session)
+    client.post("/treasury/webhooks/bank-transactions", json=_line("bank-2", category="tax_allocation"))
+    fresh_cache.clear()
+    res = client.post("/treasury/webhooks/bank-transactions", json=_line("bank-2", category="tax_allocation"))
+    assert res.json()["duplicate"] is True
+    assert _balances(db_session)[0] == Decimal("900.00")  # applied once
+    assert fresh_cache.get("bank-2") == res.json()["transaction"]["transaction_id"]
+
+
+def test_deleted_row_is_not_served_from_cache(client, db_session, fresh_cache):
+    _seed(db_session)
+    txn_id = client.post(
+        "/treasury/webhooks/bank-transactions", json=_line("bank-3", category="tax_allocation")
+    ).json()["transaction"]["transaction_id"]
+    assert client.delete(f"/treasury/transactions/{txn_id}").status_code in (200, 204)
+    assert fresh_cache.get("bank-3") is None
+
+    res = client.post("/treasury/webhooks/bank-transactions", json=_line("bank-3", category="tax_allocation"))
+    assert res.json()["duplicate"] is False
+    assert _balances(db_session)[0] == Decimal("900.00")
+
+
+def test_concurrent_insert_resolves_to_existing_row(db_session, monkeypatch):
+    _seed(db_session)
+    payload = webhook_parser_service.parse_bank_webhook(BankWebhookPayload(**_line("bank-4")))
+    original = transaction_routing_service.ingest_webhook_transaction(db_session, payload)
+    # Simulate a second worker that checked before the first one committed.
+    monkeypatch.setattr(transaction_routing_service, "_find_ingested", lambda db, ext: None)
+    replay = transaction_routing_service.ingest_webhook_transaction(db_session, payload)
+    assert replay["duplicate"] is True
+    assert replay["transaction"].transaction_id == original["transaction"].transaction_id
+    assert db_session.query(TransactionLedger).filter_by(external_id="bank-4").count() == 1
+
+
+def test_nightly_sync_is_safely_rerunnable(client, db_session):
+    _seed(db_session)
+    client.post("/treasury/webhooks/bank-transactions", json=_line("live-1", amount="300.00"))
+    batch = [
+        _line("live-1", amount="300.00"),  # already delivered live
+        _line("night-1", amount="700.00", day=10),
+        _line("night-2", amount="250.00", category="reserve_allocation", day=11),
+        _line("night-2", amount="250.00", category="reserve_allocation", day=11),  # repeated in batch
+        _line(None, amount="50.00", category="repair", day=12),
+    ]
+    first = client.post("/treasury/webhooks/nightly-sync", json=batch)
+    assert first.status_code == 201, first.text
+    assert [r["duplicate"] for r in first.json()] == [True, False, False, True, False]
+    assert first.json()[3]["transaction"]["transaction_id"] == first.json()[2]["transaction"]["transaction_id"]
+    state = _balances(db_session), db_session.query(TransactionLedger).count()
+
+    again = client.post("/treasury/webhooks/nightly-sync", json=batch[:4])
+    assert all(r["duplicate"] for r in again.json())
+    assert (_balances(db_session), db_session.query(TransactionLedger).count()) == state
+
+
+def test_bulk_batch_replans_after_losing_a_race(db_session, monkeypatch):
+    _seed(db_session)
+    parsed = [
+        webhook_parser_service.parse_bank_webhook(BankWebhookPayload(**_line(ext, day=day)))
+        for ext, day in (("race-1", 4), ("race-2", 5))
+    ]
+    transaction_routing_service.ingest_webhook_transaction(db_session, parsed[0])
+
+    lookups = []
+    real = transaction_repository.get_by_external_ids
+
+    def stale_first_lookup(db, ids):
+        lookups.append(1)
+        return {} if len(lookups) == 1 else real(db, ids)
+
+    monkeypatch.setattr(transaction_repository, "get_by_external_ids", stale_first_lookup)
+    results = transaction_routing_service.ingest_webhook_batch(db_session, parsed)
+    assert [r["duplicate"] for r in results] == [True, False]
+    assert len(lookups) == 2 and results[1]["waterfall"] is not None
+    assert db_session.query(TransactionLedger).filter(TransactionLedger.external_id.isnot(None)).count() == 2
+
+
+def test_recent_id_cache_is_bounded_lru():
+    cache = RecentIdCache(max_entries=2)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    assert cache.get("a") == "1"  # refreshes "a"
+    cache.put("c", "3")
+    assert cache.get("b") is None and cache.get("a") == "1" and len(cache) == 2
+    cache.discard("a")
+    cache.discard(None)
+    assert cache.get("a") is None
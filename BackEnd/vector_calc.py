@@ -0,0 +1,519 @@
+"""Vectorized (NumPy float64) deal math for bulk screening.
+
+`main.calculate_brrr_results` / `main.calculate_flip_results` are the
+authoritative, self-documenting Decimal implementations used for single
+deals, saved deals and PDFs. This module
+evaluates the *same formulas* over whole columns of deals at once so we can
+screen thousands of scraped listings in one request. No breakdown narration
+is produced here — only the headline metrics.
+
+Inputs are "columns": a dict mapping each request field name (e.g.
+`arv_in_thousands`) to a 1-D float array, one entry per deal. Rows that fail
+validation are reported by index and their metrics come back as NaN.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Callable, Iterable, Mapping, Optional, Sequence
+
+import numpy as np
+
+from ReqRes.analyzeBRRR.analyzeBRRRReq import analyzeBRRRReq
+from ReqRes.analyzeFlip.analyzeFlipReq import analyzeFlipReq
+
+
+Columns = dict[str, np.ndarray]
+
+BRRR_INPUT_FIELDS: tuple[str, ...] = tuple(analyzeBRRRReq.model_fields)
+
+# Order matches `analyzeBRRRRes` so batch and single-deal payloads line up.
+BRRR_METRICS: tuple[str, ...] = (
+    "cash_flow",
+    "dscr",
+    "cash_out",
+    "cash_out_routi",
+    "cash_on_cash",
+    "roi",
+    "equity",
+    "net_profit",
+    "total_cash_needed_for_deal",
+    "total_cash_needed_for_deal_with_buffer",
+)
+
+FLIP_INPUT_FIELDS: tuple[str, ...] = tuple(analyzeFlipReq.model_fields)
+
+# `analyzeFlipRes` headline fields, then the intermediate amounts screeners
+# sort on (they appear as breakdown steps in the single-deal response).
+FLIP_METRICS: tuple[str, ...] = (
+    "net_profit",
+    "roi",
+    "annualized_roi",
+    "total_cash_needed",
+    "total_cash_needed_with_buffer",
+    "total_holding_costs",
+    "total_hml_interest",
+    "hml_amount",
+    "selling_costs",
+    "capital_gains_tax",
+)
+
+MORTGAGE_ERROR = "Unable to calculate mortgage payment."
+UNDEFINED_ERROR = "Unable to evaluate deal."
+
+
+# --- Column builders ---
+
+def _columns_from_rows(rows: Sequence[Any], fields: Iterable[str]) -> Columns:
+    """Transpose objects with attribute access (Pydantic payloads or ORM rows)."""
+    return {
+        name: np.fromiter((float(getattr(r, name)) for r in rows), dtype=float, count=len(rows))
+        for name in fields
+    }
+
+
+def _field_lookup(model) -> dict[str, str]:
+    """Map every field name and alias of `model` to the field name."""
+    by_key: dict[str, str] = {}
+    for name, info in model.model_fields.items():
+        by_key[name] = name
+        if info.alias:
+            by_key[info.alias] = name
+    return by_key
+
+
+def _columns_from_mapping(model, mapping: Mapping[str, Sequence[Any]]) -> Columns:
+    """Build columns from columnar JSON keyed by field name or alias.
+
+    Missing optional columns are filled with the model default; missing
+    required columns, unknown keys and ragged lengths raise `ValueError`.
+    """
+    by_key = _field_lookup(model)
+
+    unknown = sorted(k for k in mapping if k not in by_key)
+    if unknown:
+        raise ValueError(f"Unknown columns: {', '.join(unknown)}.")
+
+    lengths = {len(v) for v in mapping.values()}
+    if len(lengths) > 1:
+        raise ValueError("All columns must have the same length.")
+    n = lengths.pop() if lengths else 0
+
+    columns: Columns = {}
+    for key, values in mapping.items():
+        try:
+            columns[by_key[key]] = np.asarray([float(v) for v in values], dtype=float)
+        except (TypeError, ValueError):
+            raise ValueError(f"Column '{key}' must contain only numbers.")
+
+    missing = []
+    for name, info in model.model_fields.items():
+        if name in columns:
+            continue
+        if info.is_required():
+            missing.append(info.alias or name)
+            continue
+        columns[name] = np.full(n, float(info.default), dtype=float)
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}.")
+    return columns
+
+
+def brrr_columns_from_payloads(rows: Sequence[Any]) -> Columns:
+    return _columns_from_rows(rows, BRRR_INPUT_FIELDS)
+
+
+def brrr_columns_from_mapping(mapping: Mapping[str, Sequence[Any]]) -> Columns:
+    return _columns_from_mapping(analyzeBRRRReq, mapping)
+
+
+def flip_columns_from_payloads(rows: Sequence[Any]) -> Columns:
+    return _columns_from_rows(rows, FLIP_INPUT_FIELDS)
+
+
+def flip_columns_from_mapping(mapping: Mapping[str, Sequence[Any]]) -> Columns:
+    return _columns_from_mapping(analyzeFlipReq, mapping)
+
+
+def column_length(columns: Columns) -> int:
+    return len(next(iter(columns.values()))) if columns else 0
+
+
+# --- Validation ---
+# Each rule mirrors one `if` in `main.validate_brrr_inputs`, in the same order,
+# so a row's joined messages equal the scalar endpoint's 400 detail.
+
+Rule = tuple[str, Callable[[np.ndarray], np.ndarray], str]
+
+
+def _not_positive(x: np.ndarray) -> np.ndarray:
+    return x <= 0
+
+
+def _negative(x: np.ndarray) -> np.ndarray:
+    return x < 0
+
+
+def _outside_pct(x: np.ndarray) -> np.ndarray:
+    return (x < 0) | (x > 100)
+
+
+def _outside_positive_pct(x: np.ndarray) -> np.ndarray:
+    return (x <= 0) | (x > 100)
+
+
+BRRR_RULES: tuple[Rule, ...] = (
+    ("arv_in_thousands", _not_positive, "ARV (in thousands) must be greater than 0."),
+    ("purchase_price_in_thousands", _not_positive, "Purchase price (in thousands) must be greater than 0."),
+    ("rent", _not_positive, "Rent must be greater than 0."),
+    ("rehab_cost_in_thousands", _negative, "Rehab cost cannot be negative."),
+    ("rehab_contingency_percent", _outside_pct, "Rehab contingency percentage must be between 0% and 100%."),
+    ("closing_costs_buy_in_thousands", _negative, "Closing costs (buy) cannot be negative."),
+    ("closing_cost_refi_in_thousands", _negative, "Refi closing costs cannot be negative."),
+    ("refi_points", _outside_pct, "Refi points must be between 0% and 100%."),
+    ("cash_reserve_in_thousands", _negative, "Cash reserve cannot be negative."),
+    ("annual_property_taxes", _negative, "Annual property taxes cannot be negative."),
+    ("annual_insurance", _negative, "Annual insurance cannot be negative."),
+    ("montly_hoa", _negative, "HOA dues cannot be negative."),
+    ("down_payment", _outside_pct, "Down payment percentage must be between 0% and 100%."),
+    ("ltv_as_precent", _outside_positive_pct, "LTV must be between 0% and 100%."),
+    ("HML_points", _outside_pct, "HML points must be between 0% and 100%."),
+    ("HML_interest_rate", _outside_pct, "HML interest rate must be between 0% and 100%."),
+    ("Months_until_refi", _not_positive, "Months until refi must be a positive number."),
+    ("loan_term_years", _not_positive, "Loan term must be at least 1 year."),
+    ("interest_rate", _outside_pct, "Interest rate must be between 0% and 100%."),
+    ("vacancy_percent", _outside_pct, "Vacancy percentage must be between 0% and 100%."),
+    ("property_managment_fee_precentages_from_rent", _outside_pct, "Property management percentage must be between 0% and 100%."),
+    ("maintenance_percent", _outside_pct, "Maintenance percentage must be between 0% and 100%."),
+    ("capex_percent_of_rent", _outside_pct, "CapEx percentage must be between 0% and 100%."),
+)
+
+
+FLIP_RULES: tuple[Rule, ...] = (
+    ("sale_price_in_thousands", _not_positive, "Sale price (ARV) must be greater than 0."),
+    ("purchase_price_in_thousands", _not_positive, "Purchase price must be greater than 0."),
+    ("holding_time_months", _not_positive, "Holding time must be greater than 0 months."),
+    ("rehab_cost_in_thousands", _negative, "Rehab cost cannot be negative."),
+    ("rehab_contingency_percent", _outside_pct, "Rehab contingency percentage must be between 0% and 100%."),
+    ("down_payment", _outside_pct, "Down payment percentage must be between 0% and 100%."),
+    ("HML_points", _outside_pct, "HML points must be between 0% and 100%."),
+    ("buyer_agent_selling_fee", _outside_pct, "Buyer agent fee must be between 0% and 100%."),
+    ("seller_agent_selling_fee", _outside_pct, "Seller agent fee must be between 0% and 100%."),
+    ("selling_closing_costs_in_thousands", _negative, "Selling closing cost cannot be negative."),
+)
+
+
+def validate_columns(columns: Columns, rules: Sequence[Rule]) -> dict[int, list[str]]:
+    """Return `{row_index: [messages...]}` for every row breaking a rule."""
+    errors: dict[int, list[str]] = {}
+    for field, predicate, message in rules:
+        for idx in np.flatnonzero(predicate(columns[field])):
+            errors.setdefault(int(idx), []).append(message)
+    return errors
+
+
+# --- Shared math ---
+
+def rehab_with_contingency(c: Columns):
+    rehab_cost_base = c["rehab_cost_in_thousands"] * 1000.0
+    return rehab_cost_base + rehab_cost_base * (c["rehab_contingency_percent"] / 100.0)
+
+
+def hml_amount(purchase_price, down_payment, rehab_cost, use_hm):
+    """Vector form of `main.get_HML_amount` (`use_hm` is a 0/1 array)."""
+    return purchase_price * (1 - down_payment / 100.0) + rehab_cost * use_hm
+
+
+def mortgage_payment(loan_amount, interest_rate, loan_term_years):
+    """Vector form of `main.calc_mortgage_payment`.
+
+    Rows where the annuity denominator is zero (0% rate) come back as NaN;
+    the scalar path raises a 400 for the same input.
+    """
+    monthly_rate = (interest_rate / 100.0) / 12.0
+    factor = (1 + monthly_rate) ** (loan_term_years * 12)
+    denominator = factor - 1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        payment = loan_amount * monthly_rate * factor / denominator
+    return np.where(denominator == 0, np.nan, payment)
+
+
+def total_cash_needed(down_payment_cash, holding, closing_costs_buy, hml_points, rehab_cost, hml_interest, use_hm):
+    """Vector form of `main.get_total_cash_needed_for_deal` -> (plain, buffered)."""
+    rehab_cash = rehab_cost * (1 - use_hm)
+    plain = down_payment_cash + holding + closing_costs_buy + hml_points + rehab_cash + hml_interest
+    buffered = (
+        down_payment_cash + holding * 1.5 + closing_costs_buy * 1.1 + hml_points
+        + (rehab_cash + 0.1 * rehab_cost) + hml_interest * 1.5
+    )
+    return plain, buffered
+
+
+# --- BRRRR math ---
+
+def _sentinel_ratio(cash_out, cash_flow, numerator):
+    """Shared shape of `calc_cash_on_cash` / `calc_roi`: -1 when no equity is
+    at risk, -2 when cash flow is non-positive, else a percentage."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = numerator / np.abs(cash_out) * 100.0
+    return np.where(cash_out >= 0, -1.0, np.where(cash_flow <= 0, -2.0, ratio))
+
+
+def calculate_brrr_columns(c: Columns) -> Columns:
+    """Evaluate `calculate_brrr_results` over every row of `c` at once."""
+    use_hm = c["use_HM_for_rehab"]
+    months = c["Months_until_refi"]
+    taxes = c["annual_property_taxes"]
+    insurance = c["annual_insurance"]
+    hoa = c["montly_hoa"]
+    rent = c["rent"]
+
+    arv = c["arv_in_thousands"] * 1000.0
+    purchase_price = c["purchase_price_in_thousands"] * 1000.0
+    rehab_cost = rehab_with_contingency(c)
+
+    hml = hml_amount(purchase_price, c["down_payment"], rehab_cost, use_hm)
+    hml_interest = c["HML_interest_rate"] / 12.0 / 100.0 * hml * months
+    hml_points = c["HML_points"] / 100.0 * hml
+    monthly_fixed = taxes / 12.0 + insurance / 12.0 + hoa
+    holding = monthly_fixed * months
+
+    operating_expenses = (
+        taxes / 12.0 + insurance / 12.0
+        + rent * (c["property_managment_fee_precentages_from_rent"] / 100.0)
+        + hoa
+        + rent * (c["maintenance_percent"] / 100.0)
+        + rent * (c["capex_percent_of_rent"] / 100.0)
+        + rent * (c["vacancy_percent"] / 100.0)
+    )
+
+    closing_costs_buy = c["closing_costs_buy_in_thousands"] * 1000.0
+    closing_cost_refi = c["closing_cost_refi_in_thousands"] * 1000.0
+    ltv = c["ltv_as_precent"] / 100.0
+    loan_amount = arv * ltv
+    refi_points = (c["refi_points"] / 100.0) * loan_amount
+    cash_reserve = c["cash_reserve_in_thousands"] * 1000.0
+
+    down_payment_cash = (c["down_payment"] / 100.0) * purchase_price
+    rehab_cash = rehab_cost * (1 - use_hm)
+    total_cash_invested = down_payment_cash + closing_costs_buy + hml_points + rehab_cash + hml_interest + holding
+    cash_out_routi = loan_amount - hml - closing_cost_refi - refi_points - cash_reserve
+    cash_out = cash_out_routi - total_cash_invested
+
+    mortgage = mortgage_payment(loan_amount, c["interest_rate"], c["loan_term_years"])
+    cash_flow = rent - operating_expenses - mortgage
+
+    pitia = mortgage + monthly_fixed
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dscr = np.where(pitia == 0, 0.0, rent / pitia)
+
+    cash_on_cash = _sentinel_ratio(cash_out, cash_flow, cash_flow * 12)
+    equity = arv * (1 - ltv) + cash_reserve
+    net_profit = equity + cash_out
+    roi = _sentinel_ratio(cash_out, cash_flow, cash_flow * 12 + net_profit)
+
+    plain_cash_needed, buffered_cash_needed = total_cash_needed(
+        down_payment_cash, holding, closing_costs_buy, hml_points, rehab_cost, hml_interest, use_hm
+    )
+
+    # The scalar path fails the whole deal when the mortgage can't be
+    # amortized, so every metric for that row is undefined.
+    bad = np.isnan(mortgage)
+    out = {
+        "cash_flow": cash_flow,
+        "dscr": dscr,
+        "cash_out": cash_out,
+        "cash_out_routi": cash_out_routi,
+        "cash_on_cash": cash_on_cash,
+        "roi": roi,
+        "equity": equity,
+        "net_profit": net_profit,
+        "total_cash_needed_for_deal": plain_cash_needed,
+        "total_cash_needed_for_deal_with_buffer": buffered_cash_needed,
+    }
+    return {k: np.where(bad, np.nan, v) for k, v in out.items()}
+
+
+# --- Flip math ---
+
+def calculate_flip_columns(c: Columns) -> Columns:
+    """Evaluate `calculate_flip_results` over every row of `c` at once."""
+    use_hm = c["use_HM_for_rehab"]
+    months = c["holding_time_months"]
+
+    purchase_price = c["purchase_price_in_thousands"] * 1000.0
+    rehab_cost = rehab_with_contingency(c)
+    sale_price = c["sale_price_in_thousands"] * 1000.0
+    closing_costs_buy = c["closing_costs_buy_in_thousands"] * 1000.0
+
+    hml = hml_amount(purchase_price, c["down_payment"], rehab_cost, use_hm)
+    hml_points = (c["HML_points"] / 100.0) * hml
+    total_hml_interest = (c["HML_interest_rate"] / 100.0 / 12.0) * hml * months
+
+    monthly_operating = (
+        c["annual_property_taxes"] / 12.0 + c["annual_insurance"] / 12.0
+        + c["montly_hoa"] + c["monthly_utilities"]
+    )
+    total_operating = monthly_operating * months
+    total_holding_costs = total_hml_interest + total_operating
+
+    agent_fees_percent = c["buyer_agent_selling_fee"] + c["seller_agent_selling_fee"]
+    selling_costs = sale_price * (agent_fees_percent / 100.0) + c["selling_closing_costs_in_thousands"] * 1000.0
+
+    down_payment_cash = (c["down_payment"] / 100.0) * purchase_price
+    plain_cash_needed, buffered_cash_needed = total_cash_needed(
+        down_payment_cash, total_operating, closing_costs_buy, hml_points, rehab_cost, total_hml_interest, use_hm
+    )
+    rehab_cash = rehab_cost * (1 - use_hm)
+    total_cash_invested = down_payment_cash + closing_costs_buy + hml_points + total_holding_costs + rehab_cash
+
+    total_cost_basis = purchase_price + rehab_cost + closing_costs_buy + total_holding_costs + selling_costs + hml_points
+    gross_profit = sale_price - total_cost_basis
+    capital_gains_tax = np.where(gross_profit > 0, gross_profit * (c["capital_gains_tax_rate"] / 100.0), 0.0)
+    net_profit = gross_profit - capital_gains_tax
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        roi = np.where(total_cash_invested > 0, net_profit / total_cash_invested * 100.0, 0.0)
+        years = months / 12.0
+        annualized_roi = np.where(years > 0, roi / years, 0.0)
+
+    return {
+        "net_profit": net_profit,
+        "roi": roi,
+        "annualized_roi": annualized_roi,
+        "total_cash_needed": plain_cash_needed,
+        "total_cash_needed_with_buffer": buffered_cash_needed,
+        "total_holding_costs": total_holding_costs,
+        "total_hml_interest": total_hml_interest,
+        "hml_amount": hml,
+        "selling_costs": selling_costs,
+        "capital_gains_tax": capital_gains_tax,
+    }
+
+
+# --- Batch driver ---
+
+def _run_batch(
+    columns: Columns,
+    rules: Sequence[Rule],
+    calculate: Callable[[Columns], Columns],
+    metrics: Sequence[str],
+    undefined_error: str,
+    shape: Optional[tuple[int, ...]] = None,
+) -> dict:
+    n = column_length(columns)
+    errors = validate_columns(columns, rules)
+    # Invalid rows are evaluated too (it's cheaper than masking the inputs);
+    # silence the overflow/NaN warnings they may trigger.
+    with np.errstate(all="ignore"):
+        results = calculate(columns) if n else {m: np.empty(0) for m in metrics}
+
+    invalid = np.zeros(n, dtype=bool)
+    if errors:
+        invalid[list(errors)] = True
+    # Valid inputs the formulas still can't evaluate (e.g. a 0% mortgage).
+    for idx in np.flatnonzero(np.isnan(results[metrics[0]]) & ~invalid):
+        errors[int(idx)] = [undefined_error]
+        invalid[idx] = True
+
+    payload: dict[str, list] = {}
+    for name in metrics:
+        values = results[name].astype(object)
+        values[invalid] = None
+        payload[name] = (values.reshape(shape) if shape else values).tolist()
+
+    return {
+        "count": n,
+        "valid_count": int(n - invalid.sum()),
+        "metrics": payload,
+        "errors": [
+            {"index": idx, "detail": " ".join(msgs)}
+            for idx, msgs in sorted(errors.items())
+        ],
+    }
+
+
+def analyze_brrr_batch(columns: Columns) -> dict:
+    """Validate + evaluate a BRRRR batch; shaped like `analyzeBRRRBatchRes`."""
+    return _run_batch(columns, BRRR_RULES, calculate_brrr_columns, BRRR_METRICS, MORTGAGE_ERROR)
+
+
+def analyze_flip_batch(columns: Columns) -> dict:
+    """Validate + evaluate a Flip batch; shaped like `analyzeFlipBatchRes`."""
+    return _run_batch(columns, FLIP_RULES, calculate_flip_columns, FLIP_METRICS, UNDEFINED_ERROR)
+
+
+# --- Sensitivity grids ---
+
+# 50 x 50 x 20 = 50k points is the typical slider grid; this cap keeps a
+# single request from allocating unbounded memory.
+MAX_GRID_POINTS = 250_000
+
+Axis = tuple[str, Sequence[float]]
+
+
+def resolve_brrr_field(key: str) -> str:
+    """Field name for a BRRRR field name or alias; `ValueError` if unknown."""
+    try:
+        return _field_lookup(analyzeBRRRReq)[key]
+    except KeyError:
+        raise ValueError(f"Unknown field: {key}.")
+
+
+def check_grid_size(shape: Sequence[int]) -> int:
+    """Number of grid points for axes of these lengths; `ValueError` past the cap.
+
+    Called with the requested lengths before any axis is materialized, so an
+    oversized `steps` is rejected without allocating it.
+    """
+    n = math.prod(int(length) for length in shape)
+    if n > MAX_GRID_POINTS:
+        raise ValueError(f"Grid has {n} points; the maximum is {MAX_GRID_POINTS}.")
+    return n
+
+
+def axis_length(values=None, steps=None) -> int:
+    """Points an axis will have, without building it."""
+    return len(values) if values is not None else steps
+
+
+def axis_values(values=None, start=None, stop=None, steps=None) -> np.ndarray:
+    """Explicit axis `values`, or `steps` evenly spaced points from `start` to `stop`."""
+    if values is not None:
+        return np.asarray(values, dtype=float)
+    return np.linspace(start, stop, steps)
+
+
+def grid_columns(base: Columns, axes: Sequence[Axis]) -> tuple[Columns, tuple[int, ...]]:
+    """Broadcast the single deal in `base` over the cartesian product of `axes`.
+
+    Grid points are laid out row-major (the last axis varies fastest).
+    """
+    names = [name for name, _ in axes]
+    if len(set(names)) != len(names):
+        raise ValueError("Each field may only be swept once.")
+    shape = tuple(len(values) for _, values in axes)
+    n = check_grid_size(shape)
+
+    columns = {name: np.full(n, column[0]) for name, column in base.items()}
+    mesh = np.meshgrid(*(np.asarray(values, dtype=float) for _, values in axes), indexing="ij")
+    for name, grid in zip(names, mesh):
+        columns[name] = grid.ravel()
+    return columns, shape
+
+
+def analyze_brrr_sensitivity(
+    base: Columns,
+    axes: Sequence[Axis],
+    metrics: Optional[Sequence[str]] = None,
+) -> dict:
+    """Evaluate one BRRRR deal over a 1-3 axis grid; shaped like `analyzeBRRRSensitivityRes`."""
+    metrics = tuple(metrics) if metrics else BRRR_METRICS
+    unknown = sorted(set(metrics) - set(BRRR_METRICS))
+    if unknown:
+        raise ValueError(f"Unknown metrics: {', '.join(unknown)}.")
+    columns, shape = grid_columns(base, axes)
+    result = _run_batch(columns, BRRR_RULES, calculate_brrr_columns, metrics, MORTGAGE_ERROR, shape)
+    result["shape"] = list(shape)
+    result["axes"] = [{"field": name, "values": [float(v) for v in values]} for name, values in axes]
+    return result